@@ -0,0 +1,162 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+"""Parallel download of data into a file.
+
+The data is split into parts, such as byte ranges of one object or the
+segments of a large object, fetched concurrently and written in place with
+:func:`os.pwrite` into a file preallocated to the final size.
+"""
+
+import concurrent.futures
+import os
+
+from openstack import exceptions
+from openstack import utils
+
+#: Default size in bytes of the chunks read from the wire.
+DEFAULT_CHUNK_SIZE = 1024 * 1024
+#: Default size in bytes of the ranges fetched by one request.
+DEFAULT_PART_SIZE = 64 * 1024 * 1024
+#: Default number of parts downloaded concurrently.
+DEFAULT_MAX_WORKERS = 4
+
+
+def is_supported():
+    """Whether parallel downloads are possible on this platform."""
+    return hasattr(os, 'pwrite')
+
+
+class Part:
+    """A part of the data to download.
+
+    :param url: URL of the data.
+    :param offset: Offset of the part in the downloaded file.
+    :param length: Length of the part in bytes.
+    :param ranged: Whether to only request the ``length`` bytes at ``offset``
+        of ``url`` instead of all of it.
+    :param md5: Optional md5 checksum of the part.
+    """
+
+    def __init__(self, url, offset, length, ranged=False, md5=None):
+        self.url = url
+        self.offset = offset
+        self.length = length
+        self.ranged = ranged
+        self.md5 = md5
+
+
+def split_ranges(url, size, part_size=DEFAULT_PART_SIZE):
+    """Split ``size`` bytes of ``url`` into ranged parts."""
+    return [
+        Part(url, offset, min(part_size, size - offset), ranged=True)
+        for offset in range(0, size, part_size)
+    ]
+
+
+def _download_part(session, fd, part, chunk_size):
+    headers = {}
+    if part.ranged:
+        headers['Range'] = 'bytes=%d-%d' % (
+            part.offset, part.offset + part.length - 1)
+    response = session.get(part.url, headers=headers, stream=True)
+    try:
+        exceptions.raise_from_response(response)
+        if part.ranged and response.status_code != 206:
+            raise exceptions.SDKException(
+                "Server does not support range requests for %s" % part.url)
+        md5 = utils.md5(usedforsecurity=False) if part.md5 else None
+        position = part.offset
+        for chunk in response.iter_content(chunk_size=chunk_size):
+            os.pwrite(fd, chunk, position)
+            position += len(chunk)
+            if md5:
+                md5.update(chunk)
+    finally:
+        response.close()
+    if position - part.offset != part.length:
+        raise exceptions.SDKException(
+            "Expected %d bytes from %s, got %d" % (
+                part.length, part.url, position - part.offset))
+    if md5 and md5.hexdigest() != part.md5.strip('"'):
+        raise exceptions.InvalidResponse(
+            "checksum mismatch for %s: %s != %s" % (
+                part.url, part.md5, md5.hexdigest()))
+
+
+def _hash_file_range(fd, md5, offset, length):
+    end = offset + length
+    while offset < end:
+        chunk = os.pread(fd, min(utils._HASH_CHUNK_SIZE, end - offset), offset)
+        if not chunk:
+            break
+        md5.update(chunk)
+        offset += len(chunk)
+
+
+def download_parts(
+    session,
+    path,
+    size,
+    parts,
+    max_workers=DEFAULT_MAX_WORKERS,
+    chunk_size=DEFAULT_CHUNK_SIZE,
+    checksum=None,
+):
+    """Download parts concurrently into the file at ``path``.
+
+    :param session: Session or proxy performing the requests.
+    :param path: Path of the file to write, truncated to ``size`` bytes.
+    :param size: Total size of the data.
+    :param parts: List of :class:`Part` covering the data.
+    :param max_workers: Number of parts downloaded concurrently.
+    :param chunk_size: Size in bytes of the chunks read from the wire.
+    :param checksum: Optional md5 checksum of the whole data. It is computed
+        as the parts complete, from the part of the file written so far
+        without any gap, rather than once the whole file is written.
+    :raises: :class:`~openstack.exceptions.InvalidResponse` when a checksum
+        does not match.
+    """
+    parts = sorted(parts, key=lambda part: part.offset)
+    md5 = utils.md5(usedforsecurity=False) if checksum else None
+    done = [False] * len(parts)
+    # Index of the first part not hashed yet
+    hashed = 0
+
+    fd = os.open(path, os.O_RDWR | os.O_CREAT | os.O_TRUNC, 0o666)
+    try:
+        os.ftruncate(fd, size)
+        with concurrent.futures.ThreadPoolExecutor(
+                max_workers=max_workers) as executor:
+            futures = {
+                executor.submit(
+                    _download_part, session, fd, part, chunk_size): index
+                for index, part in enumerate(parts)
+            }
+            try:
+                for future in concurrent.futures.as_completed(futures):
+                    future.result()
+                    done[futures[future]] = True
+                    while md5 and hashed < len(parts) and done[hashed]:
+                        _hash_file_range(
+                            fd, md5, parts[hashed].offset,
+                            parts[hashed].length)
+                        hashed += 1
+            finally:
+                for future in futures:
+                    future.cancel()
+    finally:
+        os.close(fd)
+
+    if md5 and md5.hexdigest() != checksum.strip('"'):
+        raise exceptions.InvalidResponse(
+            "checksum mismatch: %s != %s" % (checksum, md5.hexdigest()))
@@ -0,0 +1,171 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+"""JSON codecs of request and response bodies.
+
+A connection encodes request bodies and decodes response bodies with one of
+the codecs of :data:`CODECS`, chosen with its ``json_codec`` option. The
+faster codecs only handle what they are known to handle like the standard
+library does, everything else, errors included, is left to the standard
+library so that all codecs produce the same results.
+"""
+
+import datetime
+import functools
+import json
+import uuid
+
+import requests
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+try:
+    import ujson
+except ImportError:
+    ujson = None
+
+from openstack import exceptions
+
+
+class JSONCodec:
+    """The standard library :mod:`json` codec.
+
+    Request bodies are left to keystoneauth and response bodies to
+    requests, both of which use :mod:`json` already.
+    """
+
+    name = 'json'
+
+    def dumps(self, obj):
+        """Return the encoded ``obj``, or None to leave it to keystoneauth."""
+        return None
+
+    def loads(self, data):
+        """Return the decoded UTF-8 ``data``, or raise ValueError."""
+        return json.loads(data)
+
+    def attach(self, response):
+        """Make ``response.json()`` decode with the codec."""
+
+
+class _FastJSONCodec(JSONCodec):
+    """Base of the codecs of third party libraries."""
+
+    def decode_response(self, response, **kwargs):
+        """Return the decoded body of a response.
+
+        Behaves like :meth:`requests.Response.json`, which is used for what
+        :meth:`loads` does not handle.
+        """
+        if not kwargs and response.encoding in (None, 'utf-8', 'UTF-8'):
+            try:
+                return self.loads(response.content)
+            except ValueError:
+                pass
+        return requests.Response.json(response, **kwargs)
+
+    def attach(self, response):
+        if isinstance(response, requests.Response):
+            response.json = functools.partial(self.decode_response, response)
+
+
+def _orjson_default(obj):
+    # Objects the standard library encodes differently from orjson, or
+    # encodes at all, as keystoneauth does. Dict subclasses such as
+    # resources are encoded from their items() like the standard library
+    # does.
+    if isinstance(obj, dict):
+        return dict(obj.items())
+    if isinstance(obj, (list, tuple)):
+        return list(obj)
+    if isinstance(obj, str):
+        return str(obj)
+    if isinstance(obj, int):
+        return int(obj)
+    if isinstance(obj, datetime.datetime):
+        return obj.isoformat()
+    if isinstance(obj, uuid.UUID):
+        return str(obj)
+    # Anything else, netaddr objects included
+    raise TypeError
+
+
+class ORJSONCodec(_FastJSONCodec):
+    """The :mod:`orjson` codec.
+
+    orjson decodes integers which do not fit in 64 bits as floats, unlike
+    the standard library. No API returns any, and spotting them would cost
+    more than what orjson saves.
+    """
+
+    name = 'orjson'
+
+    def dumps(self, obj):
+        try:
+            return orjson.dumps(
+                obj,
+                default=_orjson_default,
+                option=orjson.OPT_PASSTHROUGH_SUBCLASS
+                | orjson.OPT_PASSTHROUGH_DATETIME
+                | orjson.OPT_NON_STR_KEYS,
+            )
+        except TypeError:
+            # Such as integers larger than 64 bits, or objects only
+            # keystoneauth knows how to encode.
+            return None
+
+    def loads(self, data):
+        return orjson.loads(data)
+
+
+class UJSONCodec(_FastJSONCodec):
+    """The :mod:`ujson` codec.
+
+    ujson encodes dict subclasses from their storage rather than from
+    their items(), which is not what resources hold, so it is only used to
+    decode.
+    """
+
+    name = 'ujson'
+
+    def loads(self, data):
+        return ujson.loads(data)
+
+
+#: Available codecs by name, the fastest first.
+CODECS = {}
+if orjson is not None:
+    CODECS[ORJSONCodec.name] = ORJSONCodec()
+if ujson is not None:
+    CODECS[UJSONCodec.name] = UJSONCodec()
+CODECS[JSONCodec.name] = JSONCodec()
+
+
+def get_codec(name=None):
+    """Return the codec named ``name``.
+
+    :param name: Name of a codec of :data:`CODECS`. ``None`` or ``auto``
+        select the fastest one available.
+    :raises: :class:`~openstack.exceptions.ConfigException` when the codec
+        is not available.
+    """
+    if name is None or name == 'auto':
+        return next(iter(CODECS.values()))
+    try:
+        return CODECS[name]
+    except KeyError:
+        raise exceptions.ConfigException(
+            "JSON codec {name} is not available, available codecs are"
+            " auto, {names}".format(name=name, names=', '.join(CODECS))
+        )
@@ -0,0 +1,170 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+"""Incremental decoding of JSON lists.
+
+The items of a list in a JSON document, such as the resources of a page of
+a listing, are decoded one at a time as the document is read, instead of
+once all of it has been read and decoded. Only the item being decoded has
+to be held in memory along with a chunk of the document.
+
+Every item is decoded by :meth:`json.JSONDecoder.raw_decode`, and so by the
+C scanner of the standard library when it is available.
+"""
+
+import codecs
+import json
+import json.decoder
+
+#: Default size in bytes of the chunks read from the wire.
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+_DECODER = json.JSONDecoder()
+_WHITESPACE = json.decoder.WHITESPACE
+
+
+class _Reader:
+    """The text of a JSON document read in chunks of bytes."""
+
+    def __init__(self, chunks):
+        self._chunks = iter(chunks)
+        self._text = codecs.getincrementaldecoder('utf-8')()
+        self.buffer = ''
+        self.pos = 0
+        self.eof = False
+
+    def _read(self):
+        # Drop what has been decoded already
+        self.buffer = self.buffer[self.pos :]
+        self.pos = 0
+        for chunk in self._chunks:
+            text = self._text.decode(chunk)
+            if text:
+                self.buffer += text
+                return
+        self.buffer += self._text.decode(b'', final=True)
+        self.eof = True
+
+    def _error(self, message):
+        return json.JSONDecodeError(message, self.buffer, self.pos)
+
+    def peek(self):
+        """Return the next character which is not whitespace, if any."""
+        while True:
+            self.pos = _WHITESPACE.match(self.buffer, self.pos).end()
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if self.eof:
+                return ''
+            self._read()
+
+    def expect(self, delimiters):
+        """Consume the next character, which must be one of ``delimiters``."""
+        char = self.peek()
+        if not char or char not in delimiters:
+            raise self._error(
+                "Expecting {expected}".format(
+                    expected=' or '.join(repr(d) for d in delimiters)
+                )
+            )
+        self.pos += 1
+        return char
+
+    def value(self):
+        """Decode the next value."""
+        self.peek()
+        wanted = 0
+        while True:
+            available = len(self.buffer) - self.pos
+            if self.eof or available >= wanted:
+                try:
+                    value, end = _DECODER.raw_decode(self.buffer, self.pos)
+                except json.JSONDecodeError:
+                    if self.eof:
+                        raise
+                else:
+                    # A number at the end of the buffer may go on in the next
+                    # chunk, anything else is followed by a delimiter.
+                    if self.eof or end < len(self.buffer):
+                        self.pos = end
+                        return value
+                # Only try again once twice as much has been read, so that
+                # values larger than a chunk are not decoded over and over.
+                wanted = 2 * available
+            self._read()
+
+    def end(self):
+        """Check that nothing but whitespace is left."""
+        if self.peek():
+            raise self._error("Extra data")
+
+    def items(self):
+        """Yield the items of the list which is the next value."""
+        self.expect('[')
+        if self.peek() == ']':
+            self.pos += 1
+            return
+        while True:
+            yield self.value()
+            if self.expect(',]') == ']':
+                return
+
+
+def iter_items(chunks, key=None, rest=None):
+    """Yield the items of a list of a JSON document as it is read.
+
+    :param chunks: Iterable of the bytes of the UTF-8 encoded document, such
+        as :meth:`requests.Response.iter_content`.
+    :param key: Key of the list in the object the document is made of, or
+        ``None`` when the document is the list. A value which is not a list
+        is yielded as the only item.
+    :param dict rest: Dict updated with the other members of the object the
+        document is made of as they are read. All of them are only there
+        once all items have been yielded.
+    :raises: :class:`json.JSONDecodeError` when the document is not valid
+        JSON.
+    :raises: :class:`KeyError` when the object has no ``key`` member.
+    """
+    reader = _Reader(chunks)
+    if key is None:
+        if reader.peek() == '[':
+            yield from reader.items()
+        else:
+            yield reader.value()
+        reader.end()
+        return
+
+    found = False
+    reader.expect('{')
+    if reader.peek() == '}':
+        reader.pos += 1
+    else:
+        while True:
+            name = reader.value()
+            if not isinstance(name, str):
+                raise reader._error("Expecting property name")
+            reader.expect(':')
+            if name == key:
+                found = True
+                if reader.peek() == '[':
+                    yield from reader.items()
+                else:
+                    yield reader.value()
+            else:
+                value = reader.value()
+                if rest is not None:
+                    rest[name] = value
+            if reader.expect(',}') == '}':
+                break
+    reader.end()
+    if not found:
+        raise KeyError(key)
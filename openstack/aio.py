@@ -0,0 +1,229 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+"""asyncio interface to a Connection.
+
+:class:`AsyncConnection` mirrors the attributes of a
+:class:`~openstack.connection.Connection`, but every call returns an
+awaitable and every listing can be consumed with ``async for``::
+
+    conn = openstack.connect(cloud='example')
+
+    async def main():
+        port = await conn.aio.network.create_port(network_id=net_id)
+        async for server in conn.aio.compute.servers():
+            print(server.name)
+
+The calls go through the very same :class:`~openstack.proxy.Proxy` and
+:class:`~openstack.resource.Resource` code as the synchronous interface, so
+query mappings, microversion negotiation, caching and metrics behave the
+same way. Blocking keystoneauth calls are run on an executor dedicated to the
+asyncio interface, so any number of coroutines may be awaiting results while
+the number of threads stays bounded by ``max_workers``.
+"""
+
+import asyncio
+import collections.abc
+import concurrent.futures
+import functools
+import itertools
+
+from openstack import proxy as _proxy
+
+#: Default number of threads performing blocking calls.
+DEFAULT_MAX_WORKERS = 32
+#: Default number of items pulled from a listing per executor round trip.
+DEFAULT_BATCH_SIZE = 100
+
+
+class AsyncIterator:
+    """Asynchronous iterator over a synchronous iterator.
+
+    Items are pulled from ``iterator`` on ``executor`` in batches of
+    ``batch_size`` so that the event loop is never blocked on a request and
+    the cost of switching threads is shared between many items.
+    """
+
+    def __init__(self, iterator, executor, batch_size=DEFAULT_BATCH_SIZE):
+        self._iterator = iterator
+        self._executor = executor
+        self._batch_size = batch_size
+        self._batch = []
+
+    def __aiter__(self):
+        return self
+
+    def _next_batch(self):
+        return list(itertools.islice(self._iterator, self._batch_size))
+
+    async def __anext__(self):
+        if not self._batch:
+            if self._iterator is None:
+                raise StopAsyncIteration
+            loop = asyncio.get_running_loop()
+            batch = await loop.run_in_executor(
+                self._executor, self._next_batch
+            )
+            if not batch:
+                self._iterator = None
+                raise StopAsyncIteration
+            batch.reverse()
+            self._batch = batch
+        return self._batch.pop()
+
+
+class AsyncCall(collections.abc.Coroutine):
+    """A pending call to a synchronous method.
+
+    Awaiting it runs the method on the executor and returns its result.
+    Methods returning generators (such as ``conn.compute.servers()``) can
+    also be consumed directly with ``async for``. Being a coroutine, it can
+    also be handed to :func:`asyncio.run` or :func:`asyncio.create_task`.
+    """
+
+    def __init__(self, executor, batch_size, method, *args, **kwargs):
+        self._executor = executor
+        self._batch_size = batch_size
+        self._call = functools.partial(method, *args, **kwargs)
+        self._coro = None
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        result = await loop.run_in_executor(self._executor, self._call)
+        if _is_iterator(result):
+            return AsyncIterator(result, self._executor, self._batch_size)
+        return result
+
+    def _get_coro(self):
+        if self._coro is None:
+            self._coro = self._run()
+        return self._coro
+
+    def send(self, value):
+        return self._get_coro().send(value)
+
+    def throw(self, *args):
+        return self._get_coro().throw(*args)
+
+    def close(self):
+        if self._coro is not None:
+            self._coro.close()
+
+    def __await__(self):
+        return self._get_coro().__await__()
+
+    def __aiter__(self):
+        return _DeferredIterator(self)
+
+
+class _DeferredIterator:
+    """Iterate over the result of an AsyncCall started on first use."""
+
+    def __init__(self, call):
+        self._call = call
+        self._iterator = None
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        if self._iterator is None:
+            result = await self._call
+            if not isinstance(result, AsyncIterator):
+                # Plain lists returned by some of the cloud layer methods
+                result = AsyncIterator(
+                    iter(result), self._call._executor,
+                    self._call._batch_size,
+                )
+            self._iterator = result
+        return await self._iterator.__anext__()
+
+
+def _is_iterator(value):
+    return hasattr(value, '__next__') and not isinstance(value, dict)
+
+
+class _AsyncWrapper:
+    """Expose callables of a wrapped object as AsyncCall factories."""
+
+    def __init__(self, wrapped, executor, batch_size):
+        self._wrapped = wrapped
+        self._executor = executor
+        self._batch_size = batch_size
+
+    def __getattr__(self, name):
+        value = getattr(self._wrapped, name)
+        if isinstance(value, _proxy.Proxy):
+            return AsyncProxy(value, self._executor, self._batch_size)
+        if not callable(value) or isinstance(value, type):
+            return value
+
+        @functools.wraps(value)
+        def method(*args, **kwargs):
+            return AsyncCall(
+                self._executor, self._batch_size, value, *args, **kwargs
+            )
+
+        return method
+
+
+class AsyncProxy(_AsyncWrapper):
+    """asyncio mirror of a :class:`~openstack.proxy.Proxy`."""
+
+    def __init__(self, proxy, executor, batch_size=DEFAULT_BATCH_SIZE):
+        super().__init__(proxy, executor, batch_size)
+
+    @property
+    def proxy(self):
+        """The synchronous :class:`~openstack.proxy.Proxy` being wrapped."""
+        return self._wrapped
+
+
+class AsyncConnection(_AsyncWrapper):
+    """asyncio mirror of a :class:`~openstack.connection.Connection`.
+
+    Service proxies are returned as :class:`AsyncProxy` objects, and the
+    cloud-layer methods of the Connection are exposed as awaitables too.
+
+    :param connection: The :class:`~openstack.connection.Connection` to wrap.
+    :param executor: A :class:`concurrent.futures.Executor` running the
+        blocking calls. Defaults to a ThreadPoolExecutor with ``max_workers``
+        threads which is shut down by :meth:`close`.
+    :param int max_workers: Maximum number of blocking calls in flight when
+        no ``executor`` is given.
+    :param int batch_size: Number of items pulled from a listing per
+        executor round trip.
+    """
+
+    def __init__(
+        self,
+        connection,
+        executor=None,
+        max_workers=DEFAULT_MAX_WORKERS,
+        batch_size=DEFAULT_BATCH_SIZE,
+    ):
+        self._own_executor = executor is None
+        if executor is None:
+            executor = concurrent.futures.ThreadPoolExecutor(
+                max_workers=max_workers, thread_name_prefix='openstack-aio'
+            )
+        super().__init__(connection, executor, batch_size)
+
+    @property
+    def connection(self):
+        """The synchronous Connection being wrapped."""
+        return self._wrapped
+
+    def close(self):
+        """Release the executor if it was created by this object."""
+        if self._own_executor:
+            self._executor.shutdown(wait=False)
@@ -10,6 +10,8 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 
+import concurrent.futures
+
 from openstack.baremetal.v1 import _common
 from openstack.baremetal.v1 import allocation as _allocation
 from openstack.baremetal.v1 import chassis as _chassis
@@ -25,6 +27,15 @@ from openstack import exceptions
 from openstack import proxy
 from openstack import utils
 
+#: Number of nodes fetched at the same time while waiting for nodes.
+DEFAULT_WAIT_CONCURRENCY = 8
+#: Number of nodes waited for above which all the nodes are listed at once
+#: instead of fetching every node.
+WAIT_LIST_THRESHOLD = 50
+# The fields of the nodes listed while waiting for them, enough to check
+# their provision state.
+_WAIT_FIELDS = ('id', 'name', 'provision_state', 'last_error')
+
 
 class Proxy(proxy.Proxy):
 
@@ -432,7 +443,7 @@ class Proxy(proxy.Proxy):
     def wait_for_nodes_provision_state(self, nodes, expected_state,
                                        timeout=None,
                                        abort_on_failed_state=True,
-                                       fail=True):
+                                       fail=True, max_concurrency=None):
         """Wait for the nodes to reach the expected state.
 
         :param nodes: List of nodes - name, ID or
@@ -447,6 +458,10 @@ class Proxy(proxy.Proxy):
             ``manageable`` transition is ``enroll`` again.
         :param fail: If set to ``False`` this call will not raise on timeouts
             and provisioning failures.
+        :param max_concurrency: Number of nodes fetched at the same time.
+            Defaults to ``DEFAULT_WAIT_CONCURRENCY``. When more than
+            ``WAIT_LIST_THRESHOLD`` nodes are waited for, they are all listed
+            at once instead.
 
         :return: If `fail` is ``True`` (the default), the list of
             :class:`~openstack.baremetal.v1.node.Node` instances that reached
@@ -456,20 +471,89 @@ class Proxy(proxy.Proxy):
             reaches an error state and ``abort_on_failed_state`` is ``True``.
         :raises: :class:`~openstack.exceptions.ResourceTimeout` on timeout.
         """
+        finished = []
+        failed = []
+        remaining = []
+        for n, error in self._poll_nodes_provision_state(
+                nodes, expected_state, timeout, abort_on_failed_state,
+                max_concurrency):
+            if error is None:
+                finished.append(n)
+            elif fail:
+                raise error
+            elif isinstance(error, exceptions.ResourceTimeout):
+                remaining.append(n)
+            else:
+                failed.append(n)
+
+        if fail:
+            return finished
+        else:
+            return _node.WaitResult(finished, failed, remaining)
+
+    def iter_nodes_provision_state(self, nodes, expected_state,
+                                   timeout=None, abort_on_failed_state=True,
+                                   max_concurrency=None):
+        """Yield the nodes as they reach the expected state.
+
+        Unlike :meth:`wait_for_nodes_provision_state`, every node is
+        yielded as soon as it reaches the state, so that it can be used
+        while waiting for the others:
+
+        .. code-block:: python
+
+          for node in conn.baremetal.iter_nodes_provision_state(
+                  nodes, 'active', timeout=3600):
+              print("%s is deployed" % node.name)
+
+        The parameters are those of :meth:`wait_for_nodes_provision_state`.
+
+        :return: A generator of :class:`~openstack.baremetal.v1.node.Node`
+            instances that reached the requested state.
+        :raises: :class:`~openstack.exceptions.ResourceFailure` if a node
+            reaches an error state and ``abort_on_failed_state`` is ``True``.
+        :raises: :class:`~openstack.exceptions.ResourceTimeout` on timeout.
+        """
+        for n, error in self._poll_nodes_provision_state(
+                nodes, expected_state, timeout, abort_on_failed_state,
+                max_concurrency):
+            if error is not None:
+                raise error
+            yield n
+
+    def _poll_nodes_provision_state(self, nodes, expected_state, timeout,
+                                    abort_on_failed_state, max_concurrency):
+        """Yield ``(node, error)`` for every node once it is resolved.
+
+        ``error`` is None for the nodes which reached the expected state, a
+        :class:`~openstack.exceptions.ResourceFailure` for the nodes which
+        failed and a :class:`~openstack.exceptions.ResourceTimeout` for the
+        nodes still remaining on timeout. The nodes checked from a listing
+        only have the fields needed to check them, so they are all fetched
+        before being yielded.
+        """
+        if max_concurrency is None:
+            max_concurrency = DEFAULT_WAIT_CONCURRENCY
         log_nodes = ', '.join(n.id if isinstance(n, _node.Node) else n
                               for n in nodes)
 
-        finished = []
-        failed = []
         remaining = nodes
+        listed = False
         try:
             for count in utils.iterate_timeout(
                     timeout,
                     "Timeout waiting for nodes %(nodes)s to reach "
                     "target state '%(state)s'" % {'nodes': log_nodes,
-                                                  'state': expected_state}):
-                nodes = [self.get_node(n) for n in remaining]
+                                                  'state': expected_state},
+                    strategy=utils.get_wait_strategy(self)):
+                listed = len(remaining) > WAIT_LIST_THRESHOLD
+                if listed:
+                    nodes = self._list_nodes(remaining, max_concurrency)
+                else:
+                    nodes = self._get_nodes(remaining, max_concurrency)
                 remaining = []
+                finished = []
+                failed = []
                 for n in nodes:
                     try:
                         if n._check_state_reached(self, expected_state,
@@ -477,28 +561,68 @@ class Proxy(proxy.Proxy):
                             finished.append(n)
                         else:
                             remaining.append(n)
-                    except exceptions.ResourceFailure:
-                        if fail:
-                            raise
-                        else:
-                            failed.append(n)
+                    except exceptions.ResourceFailure as e:
+                        failed.append((n, e))
+
+                if listed:
+                    failed = list(zip(
+                        self._get_nodes([n for n, _ in failed],
+                                        max_concurrency),
+                        [e for _, e in failed]))
+                for n, e in failed:
+                    yield n, e
+
+                if listed:
+                    finished = self._get_nodes(finished, max_concurrency)
+                for n in finished:
+                    yield n, None
 
                 if not remaining:
-                    if fail:
-                        return finished
-                    else:
-                        return _node.WaitResult(finished, failed, [])
+                    return
 
                 self.log.debug(
                     'Still waiting for nodes %(nodes)s to reach state '
                     '"%(target)s"',
                     {'nodes': ', '.join(n.id for n in remaining),
                      'target': expected_state})
-        except exceptions.ResourceTimeout:
-            if fail:
-                raise
-            else:
-                return _node.WaitResult(finished, failed, remaining)
+        except exceptions.ResourceTimeout as e:
+            if listed:
+                remaining = self._get_nodes(remaining, max_concurrency)
+            for n in remaining:
+                yield n, e
+
+    def _get_nodes(self, nodes, max_concurrency):
+        """Fetch nodes, up to ``max_concurrency`` at the same time."""
+        nodes = list(nodes)
+        if max_concurrency <= 1 or len(nodes) <= 1:
+            return [self.get_node(n) for n in nodes]
+        with concurrent.futures.ThreadPoolExecutor(
+            max_workers=min(max_concurrency, len(nodes))
+        ) as executor:
+            return list(executor.map(self.get_node, nodes))
+
+    def _list_nodes(self, nodes, max_concurrency):
+        """Refresh nodes with a single listing of the nodes.
+
+        The nodes missing from the listing are fetched.
+        """
+        listed = {}
+        for n in self.nodes(fields=_WAIT_FIELDS):
+            listed[n.id] = n
+            if n.name:
+                listed.setdefault(n.name, n)
+
+        result = []
+        missing = []
+        for index, n in enumerate(nodes):
+            found = listed.get(n.id if isinstance(n, _node.Node) else n)
+            if found is None:
+                missing.append(index)
+            result.append(found)
+        for index, n in zip(missing, self._get_nodes(
+                [nodes[index] for index in missing], max_concurrency)):
+            result[index] = n
+        return result
 
     def set_node_power_state(self, node, target, wait=False, timeout=None):
         """Run an action modifying node's power state.
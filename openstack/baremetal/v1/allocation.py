@@ -89,7 +89,8 @@ class Allocation(_common.ListMixin, resource.Resource):
 
         for count in utils.iterate_timeout(
                 timeout,
-                "Timeout waiting for the allocation %s" % self.id):
+                "Timeout waiting for the allocation %s" % self.id,
+                strategy=utils.get_wait_strategy(session)):
             self.fetch(session)
 
             if self.state == 'error' and not ignore_error:
@@ -469,7 +469,8 @@ class Node(_common.ListMixin, resource.Resource):
                 timeout,
                 "Timeout waiting for node %(node)s to reach "
                 "power state '%(state)s'" % {'node': self.id,
-                                             'state': expected_state}):
+                                             'state': expected_state},
+                strategy=utils.get_wait_strategy(session)):
             self.fetch(session)
             if self.power_state == expected_state:
                 return self
@@ -504,7 +505,8 @@ class Node(_common.ListMixin, resource.Resource):
                 timeout,
                 "Timeout waiting for node %(node)s to reach "
                 "target state '%(state)s'" % {'node': self.id,
-                                              'state': expected_state}):
+                                              'state': expected_state},
+                strategy=utils.get_wait_strategy(session)):
             self.fetch(session)
             if self._check_state_reached(session, expected_state,
                                          abort_on_failed_state):
@@ -545,7 +547,8 @@ class Node(_common.ListMixin, resource.Resource):
         for count in utils.iterate_timeout(
                 timeout,
                 "Timeout waiting for the lock to be released on node %s" %
-                self.id):
+                self.id,
+                strategy=utils.get_wait_strategy(session)):
             self.fetch(session)
             if self.reservation is None:
                 return self
@@ -122,7 +122,8 @@ class Introspection(resource.Resource):
 
         for count in utils.iterate_timeout(
                 timeout,
-                "Timeout waiting for introspection on node %s" % self.id):
+                "Timeout waiting for introspection on node %s" % self.id,
+                strategy=utils.get_wait_strategy(session)):
             self.fetch(session)
             if self._check_state(ignore_error):
                 return self
@@ -1399,55 +1399,49 @@ class Proxy(_base_proxy.BaseBlockStorageProxy):
 
     def _service_cleanup(self, dry_run=True, client_status_queue=None,
                          identified_resources=None,
-                         filters=None, resource_evaluation_fn=None):
-        backups = []
-        for obj in self.backups(details=False):
-            need_delete = self._service_cleanup_del_res(
-                self.delete_backup,
-                obj,
-                dry_run=dry_run,
-                client_status_queue=client_status_queue,
-                identified_resources=identified_resources,
-                filters=filters,
-                resource_evaluation_fn=resource_evaluation_fn)
-            if not dry_run and need_delete:
-                backups.append(obj)
+                         filters=None, resource_evaluation_fn=None,
+                         max_concurrency=1, rate_limiter=None,
+                         errors=None, wait_timeout=120):
+        cleanup_kwargs = dict(
+            max_concurrency=max_concurrency,
+            dry_run=dry_run,
+            client_status_queue=client_status_queue,
+            identified_resources=identified_resources,
+            filters=filters,
+            resource_evaluation_fn=resource_evaluation_fn,
+            rate_limiter=rate_limiter,
+            errors=errors)
+
+        backups = self._service_cleanup_del_res_many(
+            self.delete_backup, self.backups(details=False),
+            **cleanup_kwargs)
 
         # Before deleting snapshots need to wait for backups to be deleted
-        for obj in backups:
+        if not dry_run:
             try:
-                self.wait_for_delete(obj)
-            except exceptions.SDKException:
+                self._wait_for_delete_many(
+                    backups, lambda: self.backups(details=False),
+                    wait=wait_timeout)
+            except exceptions.SDKException as e:
                 # Well, did our best, still try further
-                pass
-
-        snapshots = []
-        for obj in self.snapshots(details=False):
-            need_delete = self._service_cleanup_del_res(
-                self.delete_snapshot,
-                obj,
-                dry_run=dry_run,
-                client_status_queue=client_status_queue,
-                identified_resources=identified_resources,
-                filters=filters,
-                resource_evaluation_fn=resource_evaluation_fn)
-            if not dry_run and need_delete:
-                snapshots.append(obj)
+                if errors is not None:
+                    errors.append((None, e))
+
+        snapshots = self._service_cleanup_del_res_many(
+            self.delete_snapshot, self.snapshots(details=False),
+            **cleanup_kwargs)
 
         # Before deleting volumes need to wait for snapshots to be deleted
-        for obj in snapshots:
+        if not dry_run:
             try:
-                self.wait_for_delete(obj)
-            except exceptions.SDKException:
+                self._wait_for_delete_many(
+                    snapshots, lambda: self.snapshots(details=False),
+                    wait=wait_timeout)
+            except exceptions.SDKException as e:
                 # Well, did our best, still try further
-                pass
-
-        for obj in self.volumes(details=True):
-            self._service_cleanup_del_res(
-                self.delete_volume,
-                obj,
-                dry_run=dry_run,
-                client_status_queue=client_status_queue,
-                identified_resources=identified_resources,
-                filters=filters,
-                resource_evaluation_fn=resource_evaluation_fn)
+                if errors is not None:
+                    errors.append((None, e))
+
+        self._service_cleanup_del_res_many(
+            self.delete_volume, self.volumes(details=True),
+            **cleanup_kwargs)
@@ -257,7 +257,8 @@ class BaremetalCloudMixin:
                 for count in utils.iterate_timeout(
                         timeout,
                         "Timeout waiting for node transition to "
-                        "available state"):
+                        "available state",
+                        strategy=utils.get_wait_strategy(self.baremetal)):
 
                     machine = self.get_machine(machine['uuid'])
 
@@ -293,7 +294,9 @@ class BaremetalCloudMixin:
                     for count in utils.iterate_timeout(
                             lock_timeout,
                             "Timeout waiting for reservation to clear "
-                            "before setting provide state"):
+                            "before setting provide state",
+                            strategy=utils.get_wait_strategy(
+                                self.baremetal)):
                         machine = self.get_machine(machine['uuid'])
                         if (machine['reservation'] is None
                                 and machine['provision_state'] != 'enroll'):
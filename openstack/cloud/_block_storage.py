@@ -16,7 +16,10 @@
 import types  # noqa
 import warnings
 
+from openstack.block_storage.v3 import backup as _backup
 from openstack.block_storage.v3 import quota_set as _qs
+from openstack.block_storage.v3 import snapshot as _snapshot
+from openstack.block_storage.v3 import volume as _volume
 from openstack.cloud import _utils
 from openstack.cloud import exc
 from openstack import exceptions
@@ -167,8 +170,6 @@ class BlockStorageCloudMixin:
 
         volume = self.block_storage.create_volume(**kwargs)
 
-        self.list_volumes.invalidate(self)
-
         if volume['status'] == 'error':
             raise exc.OpenStackCloudException("Error in creating volume")
 
@@ -196,8 +197,6 @@ class BlockStorageCloudMixin:
         volume = self.block_storage.update_volume(
             volume, **kwargs)
 
-        self.list_volumes.invalidate(self)
-
         return volume
 
     def set_volume_bootable(self, name_or_id, bootable=True):
@@ -688,7 +687,12 @@ class BlockStorageCloudMixin:
 
         :returns: A list of volume ``Volume`` objects, if any are found.
         """
-        volumes = self.list_volumes()
+        pushdown, _ = _utils._split_filters(_volume.Volume, filters)
+        if pushdown:
+            volumes = list(self.block_storage.volumes(**pushdown))
+        else:
+            # Without filters to push down, use the cached listing
+            volumes = self.list_volumes()
         return _utils._filter_list(
             volumes, name_or_id, filters)
 
@@ -716,7 +720,8 @@ class BlockStorageCloudMixin:
 
         :returns: A list of volume ``Snapshot`` objects, if any are found.
         """
-        volumesnapshots = self.list_volume_snapshots()
+        pushdown, _ = _utils._split_filters(_snapshot.Snapshot, filters)
+        volumesnapshots = self.list_volume_snapshots(filters=pushdown)
         return _utils._filter_list(
             volumesnapshots, name_or_id, filters)
 
@@ -744,7 +749,8 @@ class BlockStorageCloudMixin:
 
         :returns: A list of volume ``Backup`` objects, if any are found.
         """
-        volume_backups = self.list_volume_backups()
+        pushdown, _ = _utils._split_filters(_backup.Backup, filters)
+        volume_backups = self.list_volume_backups(filters=pushdown)
         return _utils._filter_list(
             volume_backups, name_or_id, filters)
 
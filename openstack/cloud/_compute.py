@@ -17,7 +17,6 @@ import base64
 import datetime
 import functools
 import operator
-import threading
 import time
 import types  # noqa
 
@@ -27,6 +26,7 @@ from openstack.cloud import _normalize
 from openstack.cloud import _utils
 from openstack.cloud import exc
 from openstack.cloud import meta
+from openstack.compute.v2 import keypair as _keypair
 from openstack.compute.v2 import quota_set as _qs
 from openstack.compute.v2 import server as _server
 from openstack import exceptions
@@ -37,9 +37,8 @@ from openstack import utils
 class ComputeCloudMixin(_normalize.Normalizer):
 
     def __init__(self):
-        self._servers = None
-        self._servers_time = 0
-        self._servers_lock = threading.Lock()
+        self._servers_cache = self._make_snapshot_cache(
+            'servers', self._list_servers, '_SERVER_AGE', ('id',))
 
     @property
     def _compute_region(self):
@@ -97,9 +96,8 @@ class ComputeCloudMixin(_normalize.Normalizer):
         :returns: A list of compute ``Keypair`` objects matching the search
             criteria.
         """
-        keypairs = self.list_keypairs(
-            filters=filters if isinstance(filters, dict) else None
-        )
+        pushdown, _ = _utils._split_filters(_keypair.Keypair, filters)
+        keypairs = self.list_keypairs(filters=pushdown)
         return _utils._filter_list(keypairs, name_or_id, filters)
 
     def search_flavors(self, name_or_id=None, filters=None, get_extra=True):
@@ -128,8 +126,10 @@ class ComputeCloudMixin(_normalize.Normalizer):
         :returns: A list of compute ``Server`` objects matching the search
             criteria.
         """
+        pushdown, _ = _utils._split_filters(_server.Server, filters)
         servers = self.list_servers(
-            detailed=detailed, all_projects=all_projects, bare=bare)
+            detailed=detailed, all_projects=all_projects, bare=bare,
+            filters=pushdown)
         return _utils._filter_list(servers, name_or_id, filters)
 
     def search_server_groups(self, name_or_id=None, filters=None):
@@ -323,29 +323,10 @@ class ComputeCloudMixin(_normalize.Normalizer):
                 filters=filters,
             )
 
-        if (time.time() - self._servers_time) >= self._SERVER_AGE:
-            # Since we're using cached data anyway, we don't need to
-            # have more than one thread actually submit the list
-            # servers task.  Let the first one submit it while holding
-            # a lock, and the non-blocking acquire method will cause
-            # subsequent threads to just skip this and use the old
-            # data until it succeeds.
-            # Initially when we never got data, block to retrieve some data.
-            first_run = self._servers is None
-            if self._servers_lock.acquire(first_run):
-                try:
-                    if not (first_run and self._servers is not None):
-                        self._servers = self._list_servers(
-                            detailed=detailed,
-                            all_projects=all_projects,
-                            bare=bare)
-                        self._servers_time = time.time()
-                finally:
-                    self._servers_lock.release()
-        # Wrap the return with filter_list so that if filters were passed
-        # but we were batching/caching and thus always fetching the whole
-        # list from the cloud, we still return a filtered list.
-        return _utils._filter_list(self._servers, None, filters)
+        # Otherwise get all the servers, from a snapshot shared by all the
+        # callers while caching, and filter them locally.
+        return self._servers_cache.get(
+            detailed, all_projects, bare).select(filters)
 
     def _list_servers(self, detailed=False, all_projects=False, bare=False,
                       filters=None):
@@ -1059,7 +1040,8 @@ class ComputeCloudMixin(_normalize.Normalizer):
                 timeout_message,
                 # if _SERVER_AGE is 0 we still want to wait a bit
                 # to be friendly with the server.
-                wait=self._SERVER_AGE or 2):
+                wait=self._SERVER_AGE or 2,
+                strategy=utils.get_wait_strategy(self.compute)):
             try:
                 # Use the get_server call so that the list_servers
                 # cache can be leveraged
@@ -1315,9 +1297,9 @@ class ComputeCloudMixin(_normalize.Normalizer):
         if reset_volume_cache:
             self.list_volumes.invalidate(self)
 
-        # Reset the list servers cache time so that the next list server
-        # call gets a new list
-        self._servers_time = self._servers_time - self._SERVER_AGE
+        # Drop the list servers cache so that the next list server call
+        # gets a new list
+        self._servers_cache.invalidate()
         return True
 
     @_utils.valid_kwargs(
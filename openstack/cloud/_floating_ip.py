@@ -24,6 +24,7 @@ from openstack.cloud import _utils
 from openstack.cloud import exc
 from openstack.cloud import meta
 from openstack import exceptions
+from openstack.network.v2 import floating_ip as _floating_ip
 from openstack import proxy
 from openstack import utils
 
@@ -45,9 +46,9 @@ class FloatingIPCloudMixin(_normalize.Normalizer):
             else:
                 self._floating_ip_source = self._floating_ip_source.lower()
 
-        self._floating_ips = None
-        self._floating_ips_time = 0
-        self._floating_ips_lock = threading.Lock()
+        self._floating_ips_cache = self._make_snapshot_cache(
+            'floating_ips', self._list_floating_ips, '_FLOAT_AGE',
+            ('id', 'port'))
 
         self._floating_network_by_router = None
         self._floating_network_by_router_run = False
@@ -65,14 +66,8 @@ class FloatingIPCloudMixin(_normalize.Normalizer):
         # `filters` could be a jmespath expression which Neutron server doesn't
         # understand, obviously.
         if self._use_neutron_floating() and isinstance(filters, dict):
-            filter_keys = ['router_id', 'status', 'tenant_id', 'project_id',
-                           'revision_number', 'description',
-                           'floating_network_id', 'fixed_ip_address',
-                           'floating_ip_address', 'port_id', 'sort_dir',
-                           'sort_key', 'tags', 'tags-any', 'not-tags',
-                           'not-tags-any', 'fields']
-            neutron_filters = {k: v for k, v in filters.items()
-                               if k in filter_keys}
+            neutron_filters, _ = _utils._split_filters(
+                _floating_ip.FloatingIP, filters)
             kwargs = {'filters': neutron_filters}
         else:
             kwargs = {}
@@ -198,26 +193,9 @@ class FloatingIPCloudMixin(_normalize.Normalizer):
         if filters and self._FLOAT_AGE == 0:
             return self._list_floating_ips(filters)
 
-        if (time.time() - self._floating_ips_time) >= self._FLOAT_AGE:
-            # Since we're using cached data anyway, we don't need to
-            # have more than one thread actually submit the list
-            # floating ips task.  Let the first one submit it while holding
-            # a lock, and the non-blocking acquire method will cause
-            # subsequent threads to just skip this and use the old
-            # data until it succeeds.
-            # Initially when we never got data, block to retrieve some data.
-            first_run = self._floating_ips is None
-            if self._floating_ips_lock.acquire(first_run):
-                try:
-                    if not (first_run and self._floating_ips is not None):
-                        self._floating_ips = self._list_floating_ips()
-                        self._floating_ips_time = time.time()
-                finally:
-                    self._floating_ips_lock.release()
-        # Wrap the return with filter_list so that if filters were passed
-        # but we were batching/caching and thus always fetching the whole
-        # list from the cloud, we still return a filtered list.
-        return _utils._filter_list(self._floating_ips, None, filters)
+        # Otherwise get all the floating IPs, from a snapshot shared by all
+        # the callers while caching, and filter them locally.
+        return self._floating_ips_cache.get().select(filters)
 
     def get_floating_ip_by_id(self, id):
         """ Get a floating ip by ID
@@ -506,7 +484,8 @@ class FloatingIPCloudMixin(_normalize.Normalizer):
                             timeout,
                             "Timeout waiting for the floating IP"
                             " to be ACTIVE",
-                            wait=self._FLOAT_AGE):
+                            wait=self._FLOAT_AGE,
+                            strategy=utils.get_wait_strategy(self.network)):
                         fip = self.get_floating_ip(fip_id)
                         if fip and fip['status'] == 'ACTIVE':
                             break
@@ -718,7 +697,8 @@ class FloatingIPCloudMixin(_normalize.Normalizer):
             for _ in utils.iterate_timeout(
                     timeout,
                     "Timeout waiting for the floating IP to be attached.",
-                    wait=self._SERVER_AGE):
+                    wait=self._SERVER_AGE,
+                    strategy=utils.get_wait_strategy(self.compute)):
                 server = self.get_server_by_id(server_id)
                 ext_ip = meta.get_server_ip(
                     server, ext_tag='floating', public=True)
@@ -1084,7 +1064,8 @@ class FloatingIPCloudMixin(_normalize.Normalizer):
         for count in utils.iterate_timeout(
                 timeout,
                 "Timeout waiting for port to show up in list",
-                wait=self._PORT_AGE):
+                wait=self._PORT_AGE,
+                strategy=utils.get_wait_strategy(self.network)):
             try:
                 port_filter = {'device_id': server['id']}
                 ports = self.search_ports(filters=port_filter)
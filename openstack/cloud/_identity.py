@@ -153,7 +153,6 @@ class IdentityCloudMixin:
         if enabled is not None:
             kwargs.update({'enabled': enabled})
         project = self.identity.update_project(project, **kwargs)
-        self.list_projects.invalidate(self)
         return project
 
     def create_project(
@@ -315,7 +314,6 @@ class IdentityCloudMixin:
             del kwargs['domain_id']
         user = self.identity.update_user(user, **kwargs)
 
-        self.list_users.invalidate(self)
         return user
 
     def create_user(
@@ -335,7 +333,6 @@ class IdentityCloudMixin:
 
         user = self.identity.create_user(**params)
 
-        self.list_users.invalidate(self)
         return user
 
     @_utils.valid_kwargs('domain_id')
@@ -350,7 +347,6 @@ class IdentityCloudMixin:
                 return False
 
             self.identity.delete_user(user)
-            self.list_users.invalidate(self)
             return True
 
         except exceptions.SDKException:
@@ -910,7 +906,6 @@ class IdentityCloudMixin:
 
         group = self.identity.create_group(**group_ref)
 
-        self.list_groups.invalidate(self)
         return group
 
     def update_group(
@@ -944,7 +939,6 @@ class IdentityCloudMixin:
 
         group = self.identity.update_group(group, **group_ref)
 
-        self.list_groups.invalidate(self)
         return group
 
     def delete_group(self, name_or_id):
@@ -964,7 +958,6 @@ class IdentityCloudMixin:
 
             self.identity.delete_group(group)
 
-            self.list_groups.invalidate(self)
             return True
 
         except exceptions.SDKException:
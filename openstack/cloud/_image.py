@@ -15,6 +15,7 @@
 # openstack.resource.Resource.list and openstack.resource2.Resource.list
 import types  # noqa
 
+from openstack import _download
 from openstack.cloud import _utils
 from openstack.cloud import exc
 from openstack import utils
@@ -118,7 +119,8 @@ class ImageCloudMixin:
         name_or_id,
         output_path=None,
         output_file=None,
-        chunk_size=1024,
+        chunk_size=_download.DEFAULT_CHUNK_SIZE,
+        max_workers=None,
     ):
         """Download an image by name or ID
 
@@ -129,7 +131,9 @@ class ImageCloudMixin:
             image data to. Only write() will be called on this object. Either
             this or output_path must be specified
         :param int chunk_size: size in bytes to read from the wire and buffer
-            at one time. Defaults to 1024
+            at one time. Defaults to 1 MiB
+        :param int max_workers: When output_path is given, download that many
+            ranges of the image concurrently.
         :returns: When output_path and output_file are not given - the bytes
             comprising the given Image when stream is False, otherwise a
             :class:`requests.Response` instance. When output_path or
@@ -154,9 +158,12 @@ class ImageCloudMixin:
             raise exc.OpenStackCloudResourceNotFound(
                 "No images with name or ID %s were found" % name_or_id, None)
 
+        kwargs = {}
+        if max_workers:
+            kwargs['max_workers'] = max_workers
         return self.image.download_image(
             image, output=output_file or output_path,
-            chunk_size=chunk_size)
+            chunk_size=chunk_size, **kwargs)
 
     def get_image_exclude(self, name_or_id, exclude):
         for image in self.search_images(name_or_id):
@@ -182,7 +189,8 @@ class ImageCloudMixin:
     def wait_for_image(self, image, timeout=3600):
         image_id = image['id']
         for count in utils.iterate_timeout(
-                timeout, "Timeout waiting for image to snapshot"):
+                timeout, "Timeout waiting for image to snapshot",
+                strategy=utils.get_wait_strategy(self.image)):
             self.list_images.invalidate(self)
             image = self.get_image(image_id)
             if not image:
@@ -215,7 +223,6 @@ class ImageCloudMixin:
         if not image:
             return False
         self.image.delete_image(image)
-        self.list_images.invalidate(self)
 
         # Task API means an image was uploaded to swift
         # TODO(gtema) does it make sense to move this into proxy?
@@ -230,7 +237,8 @@ class ImageCloudMixin:
         if wait:
             for count in utils.iterate_timeout(
                     timeout,
-                    "Timeout waiting for the image to be deleted."):
+                    "Timeout waiting for the image to be deleted.",
+                    strategy=utils.get_wait_strategy(self.image)):
                 self._get_cache(None).invalidate()
                 if self.get_image(image.id) is None:
                     break
@@ -325,7 +333,8 @@ class ImageCloudMixin:
         try:
             for count in utils.iterate_timeout(
                     timeout,
-                    "Timeout waiting for the image to finish."):
+                    "Timeout waiting for the image to finish.",
+                    strategy=utils.get_wait_strategy(self.image)):
                 image_obj = self.get_image(image.id)
                 if image_obj and image_obj.status not in ('queued', 'saving'):
                     return image_obj
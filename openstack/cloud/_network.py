@@ -13,21 +13,20 @@
 # import types so that we can reference ListType in sphinx param declarations.
 # We can't just use list, because sphinx gets confused by
 # openstack.resource.Resource.list and openstack.resource2.Resource.list
-import threading
-import time
 import types  # noqa
 
 from openstack.cloud import _utils
 from openstack.cloud import exc
 from openstack import exceptions
+from openstack.network.v2 import port as _port
 
 
 class NetworkCloudMixin:
 
     def __init__(self):
-        self._ports = None
-        self._ports_time = 0
-        self._ports_lock = threading.Lock()
+        self._ports_cache = self._make_snapshot_cache(
+            'ports', lambda: self._list_ports({}), '_PORT_AGE',
+            ('id', 'device_id'))
 
     @_utils.cache_on_arguments()
     def _neutron_extensions(self):
@@ -111,10 +110,10 @@ class NetworkCloudMixin:
         # If port caching is enabled, do not push the filter down to
         # neutron; get all the ports (potentially from the cache) and
         # filter locally.
-        if self._PORT_AGE or isinstance(filters, str):
+        if self._PORT_AGE:
             pushdown_filters = None
         else:
-            pushdown_filters = filters
+            pushdown_filters, _ = _utils._split_filters(_port.Port, filters)
         ports = self.list_ports(pushdown_filters)
         return _utils._filter_list(ports, name_or_id, filters)
 
@@ -174,26 +173,9 @@ class NetworkCloudMixin:
         if filters and self._PORT_AGE == 0:
             return self._list_ports(filters)
 
-        if (time.time() - self._ports_time) >= self._PORT_AGE:
-            # Since we're using cached data anyway, we don't need to
-            # have more than one thread actually submit the list
-            # ports task.  Let the first one submit it while holding
-            # a lock, and the non-blocking acquire method will cause
-            # subsequent threads to just skip this and use the old
-            # data until it succeeds.
-            # Initially when we never got data, block to retrieve some data.
-            first_run = self._ports is None
-            if self._ports_lock.acquire(first_run):
-                try:
-                    if not (first_run and self._ports is not None):
-                        self._ports = self._list_ports({})
-                        self._ports_time = time.time()
-                finally:
-                    self._ports_lock.release()
-        # Wrap the return with filter_list so that if filters were passed
-        # but we were batching/caching and thus always fetching the whole
-        # list from the cloud, we still return a filtered list.
-        return _utils._filter_list(self._ports, None, filters or {})
+        # Otherwise get all the ports, from a snapshot shared by all the
+        # callers while caching, and filter them locally.
+        return self._ports_cache.get().select(filters)
 
     def _list_ports(self, filters):
         # If the cloud is running nova-network, just return an empty list.
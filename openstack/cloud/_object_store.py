@@ -19,6 +19,7 @@ import urllib.parse
 
 import keystoneauth1.exceptions
 
+from openstack import _download
 from openstack.cloud import _utils
 from openstack.cloud import exc
 from openstack import exceptions
@@ -258,6 +259,10 @@ class ObjectStoreCloudMixin:
         metadata=None,
         generate_checksums=None,
         data=None,
+        stream_checksums=False,
+        resumable=False,
+        max_concurrency=None,
+        max_inflight_bytes=None,
         **headers,
     ):
         """Create a file object.
@@ -290,6 +295,16 @@ class ObjectStoreCloudMixin:
             uploads of identical data. (optional, defaults to True)
         :param metadata: This dict will get changed into headers that set
             metadata of the object
+        :param stream_checksums: Compute the checksums while uploading the
+            file instead of beforehand when the object does not exist yet.
+            (optional, defaults to False)
+        :param resumable: Keep a journal of the uploaded segments of a large
+            object so that an interrupted upload can be resumed.
+            (optional, defaults to False)
+        :param max_concurrency: Maximum number of segments of a large object
+            uploaded at the same time. (optional, defaults to 5)
+        :param max_inflight_bytes: Maximum total size of the segments of a
+            large object being uploaded at the same time. (optional)
         :returns: The created object store ``Object`` object.
         :raises: ``OpenStackCloudException`` on operation error.
         """
@@ -298,6 +313,10 @@ class ObjectStoreCloudMixin:
             filename=filename, data=data,
             md5=md5, sha256=sha256, use_slo=use_slo,
             generate_checksums=generate_checksums,
+            stream_checksums=stream_checksums,
+            resumable=resumable,
+            max_concurrency=max_concurrency,
+            max_inflight_bytes=max_inflight_bytes,
             metadata=metadata,
             **headers
         )
@@ -434,7 +453,7 @@ class ObjectStoreCloudMixin:
         container,
         obj,
         query_string=None,
-        resp_chunk_size=1024,
+        resp_chunk_size=_download.DEFAULT_CHUNK_SIZE,
     ):
         """Download the content via a streaming iterator.
 
@@ -456,7 +475,8 @@ class ObjectStoreCloudMixin:
             return
 
     def get_object(self, container, obj, query_string=None,
-                   resp_chunk_size=1024, outfile=None, stream=False):
+                   resp_chunk_size=_download.DEFAULT_CHUNK_SIZE,
+                   outfile=None, stream=False, max_workers=None):
         """Get the headers and body of an object
 
         :param string container: Name of the container.
@@ -465,11 +485,13 @@ class ObjectStoreCloudMixin:
             etc.)
         :param int resp_chunk_size: Chunk size of data to read. Only used if
             the results are being written to a file or stream is True.
-            (optional, defaults to 1k)
+            (optional, defaults to 1 MiB)
         :param outfile: Write the object to a file instead of returning the
             contents. If this option is given, body in the return tuple will be
             None. outfile can either be a file path given as a string, or a
             File like object.
+        :param int max_workers: When outfile is a file path, download that
+            many parts of the object concurrently.
         :returns: Tuple (headers, body) of the object, or None if the object
             is not found (404).
         :raises: OpenStackCloudException on operation error.
@@ -479,7 +501,8 @@ class ObjectStoreCloudMixin:
                 obj, container=container,
                 resp_chunk_size=resp_chunk_size,
                 outfile=outfile,
-                remember_content=(outfile is None)
+                remember_content=(outfile is None),
+                max_workers=max_workers,
             )
             headers = {
                 k.lower(): v for k, v in obj._last_headers.items()}
@@ -20,6 +20,7 @@ from openstack.cloud import _normalize
 from openstack.cloud import _utils
 from openstack.cloud import exc
 from openstack import exceptions
+from openstack.network.v2 import security_group as _security_group
 from openstack import proxy
 
 
@@ -30,9 +31,9 @@ class SecurityGroupCloudMixin(_normalize.Normalizer):
 
     def search_security_groups(self, name_or_id=None, filters=None):
         # `filters` could be a dict or a jmespath (str)
-        groups = self.list_security_groups(
-            filters=filters if isinstance(filters, dict) else None
-        )
+        pushdown, _ = _utils._split_filters(
+            _security_group.SecurityGroup, filters)
+        groups = self.list_security_groups(filters=pushdown)
         return _utils._filter_list(groups, name_or_id, filters)
 
     def list_security_groups(self, filters=None):
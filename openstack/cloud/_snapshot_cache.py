@@ -0,0 +1,237 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+"""Snapshots of whole listings shared by the calls of the cloud layer.
+
+Some listings, such as servers while waiting for many of them to become
+active, are polled by many callers at once. A :class:`SnapshotCache` keeps
+the last listing for ``max_age`` seconds and refreshes it in the background
+once it is older than ``refresh_ratio * max_age``, so that callers polling
+regularly are always served a snapshot without waiting for the listing
+(stale-while-revalidate). Only callers finding no snapshot, or an expired
+one, fetch the listing themselves, one at a time.
+"""
+
+import threading
+import time
+
+from openstack import _log
+from openstack.cloud import _utils
+
+
+class Snapshot:
+    """The items of a listing as fetched at a point in time."""
+
+    __slots__ = ('items', 'time', '_index_names', '_indexes')
+
+    def __init__(self, items, fetched_at, index_names=()):
+        self.items = items
+        self.time = fetched_at
+        self._index_names = index_names
+        self._indexes = {}
+
+    def lookup(self, name, value):
+        """Return the items whose ``name`` is ``value``.
+
+        The index of ``name`` is built on the first lookup.
+        """
+        index = self._indexes.get(name)
+        if index is None:
+            index = {}
+            for item in self.items:
+                try:
+                    index.setdefault(item.get(name), []).append(item)
+                except TypeError:
+                    # Unhashable values never equal the scalars looked up
+                    pass
+            self._indexes[name] = index
+        return index.get(value, [])
+
+    def select(self, filters=None):
+        """Return a new list of the items matching ``filters``.
+
+        :param filters: Filters of
+            :func:`~openstack.cloud._utils._filter_list`. When they include
+            an indexed key, only the items with the given value for it are
+            filtered.
+        """
+        if not filters:
+            return list(self.items)
+        items = self.items
+        if isinstance(filters, dict):
+            for name in self._index_names:
+                value = filters.get(name)
+                if value is None or isinstance(value, (dict, list)):
+                    continue
+                try:
+                    items = self.lookup(name, value)
+                except TypeError:
+                    continue
+                break
+        return _utils._filter_list(items, None, filters)
+
+
+class SnapshotCache:
+    """Snapshots of a listing, refreshed in the background before expiry.
+
+    :param name: Name of the listing, used in logs and statistics.
+    :param fetch: Function fetching the listing. Snapshots are kept per
+        arguments given to :meth:`get`, which are passed to ``fetch``.
+    :param max_age: Function returning how long in seconds a snapshot is
+        served. Nothing is cached when it returns 0.
+    :param get_executor: Function returning the
+        :class:`concurrent.futures.Executor` refreshing snapshots in the
+        background. Snapshots are only refreshed when expired without it.
+    :param index_names: Keys of the items for which :meth:`Snapshot.select`
+        looks items up by value.
+    :param refresh_ratio: Fraction of ``max_age`` after which a snapshot is
+        refreshed in the background.
+    """
+
+    def __init__(self, name, fetch, max_age, get_executor=None,
+                 index_names=('id',), refresh_ratio=0.5):
+        self.name = name
+        self._fetch = fetch
+        self._max_age = max_age
+        self._get_executor = get_executor
+        self._index_names = tuple(index_names)
+        self.refresh_ratio = refresh_ratio
+        self._log = _log.setup_logging('openstack.cloud')
+        self._snapshots = {}
+        self._refreshing = set()
+        # Bumped by invalidate() so that listings fetched before it are not
+        # kept.
+        self._generation = 0
+        self._lock = threading.Lock()
+        self._fetch_locks = {}
+        self._stats = dict.fromkeys(
+            ('hits', 'stale_hits', 'misses', 'refreshes', 'errors'), 0)
+
+    def _count(self, stat):
+        with self._lock:
+            self._stats[stat] += 1
+
+    def _fetch_lock(self, key):
+        with self._lock:
+            return self._fetch_locks.setdefault(key, threading.Lock())
+
+    def get(self, *key):
+        """Return a :class:`Snapshot` of the listing for ``key``.
+
+        A snapshot younger than ``max_age`` is returned as is, and
+        refreshed in the background when older than ``refresh_ratio *
+        max_age``. Otherwise the listing is fetched, once for all the
+        callers waiting for it.
+        """
+        max_age = self._max_age()
+        if not max_age:
+            self._count('misses')
+            return Snapshot(
+                list(self._fetch(*key)), time.monotonic(), self._index_names)
+
+        snapshot = self._snapshots.get(key)
+        if snapshot is not None:
+            age = time.monotonic() - snapshot.time
+            if age < max_age * self.refresh_ratio:
+                self._count('hits')
+                return snapshot
+            if age < max_age and self._refresh_in_background(key):
+                self._count('stale_hits')
+                return snapshot
+
+        with self._fetch_lock(key):
+            # The listing may have been fetched while waiting for the lock
+            snapshot = self._snapshots.get(key)
+            if (snapshot is not None
+                    and time.monotonic() - snapshot.time < max_age):
+                self._count('hits')
+                return snapshot
+            self._count('misses')
+            return self._update(key)
+
+    def _update(self, key):
+        with self._lock:
+            generation = self._generation
+        fetched_at = time.monotonic()
+        snapshot = Snapshot(
+            list(self._fetch(*key)), fetched_at, self._index_names)
+        with self._lock:
+            if generation == self._generation:
+                self._snapshots[key] = snapshot
+        return snapshot
+
+    def _refresh_in_background(self, key):
+        """Schedule a refresh of the snapshot of ``key``.
+
+        :returns: Whether the snapshot is being refreshed.
+        """
+        if self._get_executor is None:
+            return False
+        with self._lock:
+            if key in self._refreshing:
+                return True
+            self._refreshing.add(key)
+        try:
+            self._get_executor().submit(self._refresh, key)
+        except RuntimeError:
+            # The executor has been shut down
+            with self._lock:
+                self._refreshing.discard(key)
+            return False
+        return True
+
+    def _refresh(self, key):
+        try:
+            with self._fetch_lock(key):
+                self._update(key)
+            self._count('refreshes')
+        except Exception:
+            # The snapshot expires as if it had not been refreshed and the
+            # next caller gets the error.
+            self._count('errors')
+            self._log.debug(
+                "Background refresh of the %s listing failed", self.name,
+                exc_info=True)
+        finally:
+            with self._lock:
+                self._refreshing.discard(key)
+
+    def invalidate(self):
+        """Drop all the snapshots, including those being fetched."""
+        with self._lock:
+            self._generation += 1
+            self._snapshots.clear()
+
+    def discard(self, id):
+        """Remove the item ``id`` from the snapshots.
+
+        The snapshots keep their age, but those being fetched are dropped
+        as they might still have the item.
+        """
+        with self._lock:
+            self._generation += 1
+            for key, snapshot in list(self._snapshots.items()):
+                items = [
+                    item for item in snapshot.items if item.get('id') != id]
+                if len(items) != len(snapshot.items):
+                    self._snapshots[key] = Snapshot(
+                        items, snapshot.time, self._index_names)
+
+    def get_stats(self):
+        """Return the counts of hits, stale hits, misses and refreshes.
+
+        Stale hits are snapshots returned while being refreshed in the
+        background, misses are calls which fetched the listing, and errors
+        are failed background refreshes.
+        """
+        with self._lock:
+            return dict(self._stats)
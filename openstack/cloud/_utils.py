@@ -16,6 +16,7 @@ import contextlib
 import fnmatch
 import functools
 import inspect
+import operator
 import re
 import time
 import uuid
@@ -27,6 +28,7 @@ import sre_constants
 
 from openstack import _log
 from openstack.cloud import exc
+from openstack import utils
 
 
 _decorated_methods = []
@@ -60,6 +62,120 @@ def _dictify_resource(resource):
             return resource
 
 
+# The logger is openstack.fnmatch to allow a user/operator to configure
+# logging not to communicate about fnmatch misses (they shouldn't be too
+# spammy, but one never knows)
+_fnmatch_log = _log.setup_logging('openstack.fnmatch')
+
+
+@functools.lru_cache(maxsize=256)
+def _compile_pattern(name_or_id):
+    """Return the match method of the regex of a glob pattern, or None."""
+    try:
+        return re.compile(fnmatch.translate(name_or_id)).match
+    except sre_constants.error:
+        return None
+
+
+@functools.lru_cache(maxsize=256)
+def _compile_jmespath(expression):
+    return jmespath.compile(expression)
+
+
+def _compile_dict_filter(filters, nested=False):
+    """Return a predicate matching a dict against filters of _filter_list."""
+    checks = [
+        (key, _compile_dict_filter(value, nested=True), None)
+        if isinstance(value, dict) else (key, None, value)
+        for key, value in filters.items()
+    ]
+
+    def match(d):
+        # Nested values have to be there, unlike the elements themselves
+        if nested and not d:
+            return False
+        for key, sub_filter, value in checks:
+            if sub_filter is not None:
+                if not sub_filter(d.get(key, None)):
+                    return False
+            elif d.get(key, None) != value:
+                return False
+        return True
+
+    return match
+
+
+class _CompiledFilter:
+    """Name or ID and meta data filters of :func:`_filter_list`, compiled.
+
+    Glob patterns and jmespath expressions are compiled once and cached
+    across calls, and dict filters are turned into a single predicate, so
+    that filtering a list only evaluates the filters for every element.
+    """
+
+    def __init__(self, name_or_id, filters):
+        self.name_or_id = str(name_or_id) if name_or_id else None
+        self.pattern_match = None
+        if self.name_or_id:
+            self.pattern_match = _compile_pattern(self.name_or_id)
+        self.jmespath = None
+        self.dict_filter = None
+        if filters:
+            if isinstance(filters, str):
+                self.jmespath = _compile_jmespath(filters)
+            else:
+                self.dict_filter = _compile_dict_filter(filters)
+
+    def match_identifier(self, e):
+        """Whether the ID or name of an element matches name_or_id.
+
+        :returns: True or False, or None if it does not match exactly and
+            the glob pattern is invalid.
+        """
+        name_or_id = self.name_or_id
+        # str() is what _make_unicode comes down to, without its Python 2
+        # fallbacks which cost more than the comparisons.
+        e_id = str(e.get('id', None))
+        e_name = str(e.get('name', None))
+        if ((e_id and e_id == name_or_id)
+                or (e_name and e_name == name_or_id)):
+            return True
+        # Only try fnmatch if we don't match exactly
+        pattern_match = self.pattern_match
+        if pattern_match is None:
+            return None
+        return bool((e_id and pattern_match(e_id))
+                    or (e_name and pattern_match(e_name)))
+
+    def __call__(self, data):
+        """Return the elements of data matching the filters.
+
+        A jmespath expression returns whatever it evaluates to instead.
+        """
+        if self.name_or_id:
+            match_identifier = self.match_identifier
+            identifier_matches = []
+            bad_pattern = False
+            for e in data:
+                matched = match_identifier(e)
+                if matched:
+                    identifier_matches.append(e)
+                elif matched is None:
+                    bad_pattern = True
+            if not identifier_matches and bad_pattern:
+                # Log it in case the user DID pass a pattern but did it
+                # poorly and wants to know what went wrong with their search
+                _fnmatch_log.debug("Bad pattern passed to fnmatch")
+            data = identifier_matches
+
+        if self.jmespath is not None:
+            return self.jmespath.search(data)
+        if self.dict_filter is not None:
+            dict_filter = self.dict_filter
+            return [e for e in data if dict_filter(e)]
+        return data
+
+
 def _filter_list(data, name_or_id, filters):
     """Filter a list by name/ID and arbitrary meta data.
 
@@ -82,73 +198,63 @@ def _filter_list(data, name_or_id, filters):
 
         A string containing a jmespath expression for further filtering.
     """
-    # The logger is openstack.cloud.fmmatch to allow a user/operator to
-    # configure logging not to communicate about fnmatch misses
-    # (they shouldn't be too spammy, but one never knows)
-    log = _log.setup_logging('openstack.fnmatch')
-    if name_or_id:
-        # name_or_id might already be unicode
-        name_or_id = _make_unicode(name_or_id)
-        identifier_matches = []
-        bad_pattern = False
-        try:
-            fn_reg = re.compile(fnmatch.translate(name_or_id))
-        except sre_constants.error:
-            # If the fnmatch re doesn't compile, then we don't care,
-            # but log it in case the user DID pass a pattern but did
-            # it poorly and wants to know what went wrong with their
-            # search
-            fn_reg = None
-        for e in data:
-            e_id = _make_unicode(e.get('id', None))
-            e_name = _make_unicode(e.get('name', None))
-
-            if ((e_id and e_id == name_or_id)
-                    or (e_name and e_name == name_or_id)):
-                identifier_matches.append(e)
-            else:
-                # Only try fnmatch if we don't match exactly
-                if not fn_reg:
-                    # If we don't have a pattern, skip this, but set the flag
-                    # so that we log the bad pattern
-                    bad_pattern = True
-                    continue
-                if ((e_id and fn_reg.match(e_id))
-                        or (e_name and fn_reg.match(e_name))):
-                    identifier_matches.append(e)
-        if not identifier_matches and bad_pattern:
-            log.debug("Bad pattern passed to fnmatch", exc_info=True)
-        data = identifier_matches
+    return _CompiledFilter(name_or_id, filters)(data)
 
-    if not filters:
-        return data
 
-    if isinstance(filters, str):
-        return jmespath.search(filters, data)
+def _split_filters(resource_type, filters):
+    """Split search filters into those the API can apply and the others.
 
-    def _dict_filter(f, d):
-        if not d:
-            return False
-        for key in f.keys():
-            if isinstance(f[key], dict):
-                if not _dict_filter(f[key], d.get(key, None)):
-                    return False
-            elif d.get(key, None) != f[key]:
-                return False
-        return True
+    A filter can be sent as a query parameter of the listing of
+    ``resource_type`` when its key is both a query parameter and an
+    attribute of ``resource_type`` and its value is a scalar or a list.
+    Nested filters, jmespath expressions and everything else have to be
+    applied by :func:`_filter_list`.
 
-    filtered = []
-    for e in data:
-        filtered.append(e)
-        for key in filters.keys():
-            if isinstance(filters[key], dict):
-                if not _dict_filter(filters[key], e.get(key, None)):
-                    filtered.pop()
-                    break
-            elif e.get(key, None) != filters[key]:
-                filtered.pop()
-                break
-    return filtered
+    The API may well apply filters more loosely than :func:`_filter_list`,
+    such as Nova matching names as regular expressions, or ignore unknown
+    ones, so the result of the listing still has to go through
+    :func:`_filter_list` with all the filters. It only has much less to go
+    through.
+
+    :param resource_type: Class of the resources searched.
+    :param filters: Filters of a ``search_*`` method, a dict or a jmespath
+        expression.
+    :returns: A tuple of the dict of filters to send as query parameters
+        and of the filters only :func:`_filter_list` can apply.
+    """
+    if not filters or not isinstance(filters, dict):
+        return {}, filters
+
+    query_mapping = resource_type._query_mapping._mapping
+    query_names = set(query_mapping)
+    query_names.update(
+        value.get('name', key) if isinstance(value, dict) else value
+        for key, value in query_mapping.items()
+    )
+    schema = resource_type._get_schema()
+    attribute_names = {attr for attr, _ in schema.attributes}
+    attribute_names.update(schema.body_names)
+
+    pushdown = {}
+    local = {}
+    for key, value in filters.items():
+        if (
+            key in query_names
+            and key in attribute_names
+            and value is not None
+            and not isinstance(value, dict)
+            and not (
+                isinstance(value, list)
+                and any(isinstance(item, (dict, list)) for item in value)
+            )
+        ):
+            pushdown[key] = value
+        else:
+            local[key] = value
+    _log.setup_logging('openstack.cloud').debug(
+        "Searching %s with filters %s applied by the API and %s applied"
+        " locally", resource_type.__name__, sorted(pushdown), sorted(local))
+    return pushdown, local
 
 
 def _get_entity(cloud, resource, name_or_id, filters, **kwargs):
@@ -413,6 +519,17 @@ def _call_client_and_retry(client, url, retry_on=None,
         return ret_val
 
 
+_RANGE_RE = re.compile(r'(<|>|<=|>=){0,1}(\d+)$')
+
+_RANGE_OPERATORS = {
+    None: operator.eq,
+    '<': operator.lt,
+    '>': operator.gt,
+    '<=': operator.le,
+    '>=': operator.ge,
+}
+
+
 def parse_range(value):
     """Parse a numerical range string.
 
@@ -439,7 +556,7 @@ def parse_range(value):
     if value is None:
         return None
 
-    range_exp = re.match(r'(<|>|<=|>=){0,1}(\d+)$', value)
+    range_exp = _RANGE_RE.match(value)
     if range_exp is None:
         return None
 
@@ -448,69 +565,57 @@ def parse_range(value):
     return (op, num)
 
 
-def range_filter(data, key, range_exp):
-    """Filter a list by a single range expression.
+def compile_range_filter(data, key, range_exp):
+    """Compile a single range expression into a predicate.
+
+    Minimum and maximum values are looked up in the data set once, so that
+    the predicate only compares the value of each element.
 
     :param list data: List of dictionaries to be searched.
     :param string key: Key name to search within the data set.
     :param string range_exp: The expression describing the range of values.
 
-    :returns: A list subset of the original data set.
+    :returns: A function returning whether a dictionary of the data set
+        matches the range, or None if nothing can match.
     :raises: OpenStackCloudException on invalid range expressions.
     """
-    filtered = []
     range_exp = str(range_exp).upper()
 
     if range_exp == "MIN":
-        key_min = safe_dict_min(key, data)
-        if key_min is None:
-            return []
-        for d in data:
-            if int(d[key]) == key_min:
-                filtered.append(d)
-        return filtered
+        op, value = None, safe_dict_min(key, data)
     elif range_exp == "MAX":
-        key_max = safe_dict_max(key, data)
-        if key_max is None:
-            return []
-        for d in data:
-            if int(d[key]) == key_max:
-                filtered.append(d)
-        return filtered
-
-    # Not looking for a min or max, so a range or exact value must
-    # have been supplied.
-    val_range = parse_range(range_exp)
-
-    # If parsing the range fails, it must be a bad value.
-    if val_range is None:
-        raise exc.OpenStackCloudException(
-            "Invalid range value: {value}".format(value=range_exp))
-
-    op = val_range[0]
-    if op:
-        # Range matching
-        for d in data:
-            d_val = int(d[key])
-            if op == '<':
-                if d_val < val_range[1]:
-                    filtered.append(d)
-            elif op == '>':
-                if d_val > val_range[1]:
-                    filtered.append(d)
-            elif op == '<=':
-                if d_val <= val_range[1]:
-                    filtered.append(d)
-            elif op == '>=':
-                if d_val >= val_range[1]:
-                    filtered.append(d)
-        return filtered
+        op, value = None, safe_dict_max(key, data)
     else:
-        # Exact number match
-        for d in data:
-            if int(d[key]) == val_range[1]:
-                filtered.append(d)
-        return filtered
+        # Not looking for a min or max, so a range or exact value must
+        # have been supplied.
+        val_range = parse_range(range_exp)
+
+        # If parsing the range fails, it must be a bad value.
+        if val_range is None:
+            raise exc.OpenStackCloudException(
+                "Invalid range value: {value}".format(value=range_exp))
+        op, value = val_range
+
+    if value is None:
+        return None
+    compare = _RANGE_OPERATORS[op]
+    return lambda d: compare(int(d[key]), value)
+
+
+def range_filter(data, key, range_exp):
+    """Filter a list by a single range expression.
+
+    :param list data: List of dictionaries to be searched.
+    :param string key: Key name to search within the data set.
+    :param string range_exp: The expression describing the range of values.
+
+    :returns: A list subset of the original data set.
+    :raises: OpenStackCloudException on invalid range expressions.
+    """
+    predicate = compile_range_filter(data, key, range_exp)
+    if predicate is None:
+        return []
+    return [d for d in data if predicate(d)]
 
 
 def generate_patches_from_kwargs(operation, **kwargs):
@@ -532,26 +637,49 @@ def generate_patches_from_kwargs(operation, **kwargs):
 
 
 class FileSegment:
-    """File-like object to pass to requests."""
+    """File-like object to pass to requests.
+
+    The file is only opened once the segment is read, so that the segments
+    of a large file do not each hold a file descriptor until uploaded. It is
+    read through a memory mapping where possible, in which case reads return
+    :class:`memoryview` slices of the file rather than copies of it.
+    """
 
     def __init__(self, filename, offset, length):
         self.filename = filename
         self.offset = offset
         self.length = length
         self.pos = 0
-        self._file = open(filename, 'rb')
-        self.seek(0)
+        self._file = None
+        self._mapping = None
+
+    def _open(self):
+        if self._file is not None or self._mapping is not None:
+            return
+        file_obj = open(self.filename, 'rb')
+        try:
+            self._mapping = utils._FileMapping(
+                file_obj.fileno(), self.offset, self.length)
+        except (OSError, ValueError):
+            # Not a regular file, or shorter than the segment
+            file_obj.seek(self.offset + self.pos)
+            self._file = file_obj
+        else:
+            file_obj.close()
 
     def tell(self):
-        return self._file.tell() - self.offset
+        return self.pos
 
     def seek(self, offset, whence=0):
         if whence == 0:
-            self._file.seek(self.offset + offset, whence)
+            self.pos = offset
         elif whence == 1:
-            self._file.seek(offset, whence)
+            self.pos += offset
         elif whence == 2:
-            self._file.seek(self.offset + self.length - offset, 0)
+            self.pos = self.length + offset
+        if self._file is not None:
+            self._file.seek(self.offset + self.pos)
+        return self.pos
 
     def read(self, size=-1):
         remaining = self.length - self.pos
@@ -559,13 +687,26 @@ class FileSegment:
             return b''
 
         to_read = remaining if size < 0 else min(size, remaining)
-        chunk = self._file.read(to_read)
+        self._open()
+        if self._mapping is not None:
+            self._mapping.release(self.pos)
+            chunk = self._mapping.slice(self.pos, self.pos + to_read)
+        else:
+            chunk = self._file.read(to_read)
         self.pos += len(chunk)
 
         return chunk
 
     def reset(self):
-        self._file.seek(self.offset, 0)
+        self.seek(0)
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        if self._mapping is not None:
+            self._mapping.close()
+            self._mapping = None
 
 
 def _format_uuid_string(string):
@@ -15,12 +15,14 @@
 
 import argparse
 import json
+import os
 import sys
 
 import yaml
 
 import openstack.cloud
 import openstack.cloud.inventory
+from openstack.config import loader
 
 
 def output_format_dict(data, use_yaml):
@@ -46,6 +48,20 @@ def parse_args():
                         help='Output data in nicely readable yaml')
     parser.add_argument('--debug', action='store_true', default=False,
                         help='Enable debug output')
+    parser.add_argument('--batched', action='store_true', default=False,
+                        help='Fetch supplemental server data once per cloud'
+                             ' instead of once per server')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='Number of clouds to query concurrently')
+    parser.add_argument('--snapshot', action='store_true', default=False,
+                        help='Keep a snapshot of the hosts on disk and only'
+                             ' fetch the changes since the last run')
+    parser.add_argument('--snapshot-dir',
+                        default=os.path.join(loader.CACHE_PATH, 'inventory'),
+                        help='Directory of the snapshots')
+    parser.add_argument('--snapshot-max-age', type=int, default=0,
+                        help='Age in seconds under which a snapshot is used'
+                             ' without fetching the changes')
     return parser.parse_args()
 
 
@@ -55,9 +71,11 @@ def main():
         openstack.enable_logging(debug=args.debug)
         inventory = openstack.cloud.inventory.OpenStackInventory(
             refresh=args.refresh, private=args.private,
-            cloud=args.cloud)
+            cloud=args.cloud, max_workers=args.workers,
+            snapshot_dir=args.snapshot_dir if args.snapshot else None,
+            snapshot_max_age=args.snapshot_max_age)
         if args.list:
-            output = inventory.list_hosts()
+            output = inventory.list_hosts(batched=args.batched)
         elif args.host:
             output = inventory.get_host(args.host)
         print(output_format_dict(output, args.yaml))
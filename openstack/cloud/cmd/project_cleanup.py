@@ -0,0 +1,128 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+import argparse
+import concurrent.futures
+import json
+import queue
+import sys
+
+import openstack
+from openstack.cloud import project_cleanup
+from openstack import exceptions
+
+
+def _key_value(value):
+    key, sep, value = value.partition('=')
+    if not sep:
+        raise argparse.ArgumentTypeError(
+            "{value} is not in the KEY=VALUE format".format(value=key))
+    return key, value
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description='Cleanup the resources of many OpenStack projects')
+    parser.add_argument('--cloud', default=None,
+                        help='Cloud to connect to, with the admin role')
+    group = parser.add_mutually_exclusive_group(required=True)
+    group.add_argument('--project', dest='projects', action='append',
+                       help='Name or ID of a project to clean up, may be'
+                            ' repeated')
+    group.add_argument('--project-filter', dest='project_filters',
+                       action='append', type=_key_value,
+                       metavar='KEY=VALUE',
+                       help='Clean up the projects having VALUE as KEY, may'
+                            ' be repeated')
+    parser.add_argument('--domain', default=None,
+                        help='ID of the domain of the projects')
+    parser.add_argument('--created-before', default=None,
+                        help='Only delete resources created before this'
+                             ' date')
+    parser.add_argument('--updated-before', default=None,
+                        help='Only delete resources updated before this'
+                             ' date')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='Number of projects cleaned up concurrently')
+    parser.add_argument('--max-concurrency', type=int, default=1,
+                        help='Number of resources of a service deleted'
+                             ' concurrently in each project')
+    parser.add_argument('--max-rate', type=float, default=None,
+                        help='Maximum number of resources deleted per'
+                             ' second across all projects')
+    parser.add_argument('--wait-timeout', type=int, default=120,
+                        help='Maximum number of seconds given to each'
+                             ' service of a project to complete the cleanup')
+    parser.add_argument('--delete', action='store_true', default=False,
+                        help='Delete the resources instead of only listing'
+                             ' them')
+    parser.add_argument('--progress', action='store_true', default=False,
+                        help='Write the progress events on stderr, one JSON'
+                             ' object per line')
+    parser.add_argument('--debug', action='store_true', default=False,
+                        help='Enable debug output')
+    return parser.parse_args(argv)
+
+
+def _write_events(events, stream):
+    while True:
+        try:
+            event = events.get_nowait()
+        except queue.Empty:
+            return
+        stream.write(json.dumps(event, sort_keys=True) + '\n')
+        stream.flush()
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    openstack.enable_logging(debug=args.debug)
+
+    filters = {}
+    if args.created_before:
+        filters['created_at'] = args.created_before
+    if args.updated_before:
+        filters['updated_at'] = args.updated_before
+
+    events = queue.Queue() if args.progress else None
+    try:
+        cloud = openstack.connect(cloud=args.cloud)
+        cleanup = project_cleanup.MultiProjectCleanup(
+            cloud,
+            projects=args.projects,
+            project_filters=dict(args.project_filters or ()),
+            domain_id=args.domain,
+            max_workers=args.workers,
+            status_queue=events)
+        with concurrent.futures.ThreadPoolExecutor(max_workers=1) as executor:
+            future = executor.submit(
+                cleanup.run,
+                dry_run=not args.delete,
+                wait_timeout=args.wait_timeout,
+                filters=filters or None,
+                max_concurrency=args.max_concurrency,
+                max_rate=args.max_rate)
+            while events is not None and not future.done():
+                concurrent.futures.wait([future], timeout=0.5)
+                _write_events(events, sys.stderr)
+            summary = future.result()
+        if events is not None:
+            _write_events(events, sys.stderr)
+    except exceptions.SDKException as e:
+        sys.stderr.write(str(e) + '\n')
+        sys.exit(1)
+    print(json.dumps(summary, sort_keys=True, indent=2))
+    sys.exit(1 if summary['total']['failed'] else 0)
+
+
+if __name__ == '__main__':
+    main()
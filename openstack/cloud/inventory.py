@@ -12,25 +12,141 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import concurrent.futures
+import datetime
 import functools
+import json
+import os
+import re
+import time
+
+import munch
 
 from openstack.cloud import _utils
+from openstack.cloud import meta
 from openstack.config import loader
 from openstack import connection
 from openstack import exceptions
 
 __all__ = ['OpenStackInventory']
 
+#: Version of the on-disk snapshot format.
+SNAPSHOT_VERSION = 2
+#: Seconds subtracted from the snapshot time when asking the clouds for
+#: changes, to cover clock skew between this host and the API servers.
+SNAPSHOT_CLOCK_SKEW = 60
+
+
+def _format_time(timestamp):
+    return datetime.datetime.fromtimestamp(
+        timestamp, datetime.timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
+
+
+def _get_addresses(host):
+    addresses = set()
+    for network in (host.get('addresses') or {}).values():
+        for address in network:
+            addresses.add(address.get('addr'))
+    return addresses
+
+
+class InventorySnapshot:
+    """Hosts of one cloud stored on disk.
+
+    Besides the hosts, the snapshot records the time it was taken, which
+    server each port is attached to and the address and port of every
+    floating IP, which is what is needed to merge the changes reported by
+    Nova and Neutron since then.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.timestamp = None
+        self.hosts = {}
+        self.port_devices = {}
+        self.floating_ips = {}
+
+    @classmethod
+    def load(cls, path):
+        """Load a snapshot, returning an empty one if it is not usable."""
+        snapshot = cls(path)
+        try:
+            with open(path) as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return snapshot
+        if data.get('version') != SNAPSHOT_VERSION:
+            return snapshot
+        snapshot.timestamp = data['timestamp']
+        snapshot.hosts = {
+            host['id']: munch.Munch.fromDict(host) for host in data['hosts']
+        }
+        snapshot.port_devices = data['port_devices']
+        snapshot.floating_ips = {
+            fip_id: tuple(fip) for fip_id, fip in data['floating_ips'].items()
+        }
+        return snapshot
+
+    def save(self):
+        """Atomically write the snapshot, readable by the owner only."""
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp_path = '%s.%d.tmp' % (self.path, os.getpid())
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, 'w') as f:
+            json.dump(dict(
+                version=SNAPSHOT_VERSION,
+                timestamp=self.timestamp,
+                hosts=list(self.hosts.values()),
+                port_devices=self.port_devices,
+                floating_ips=self.floating_ips,
+            ), f)
+        os.replace(tmp_path, self.path)
+
+    def remove(self, host_id):
+        """Remove a host and the ports attached to it."""
+        self.hosts.pop(host_id, None)
+        self.port_devices = {
+            port_id: device_id
+            for port_id, device_id in self.port_devices.items()
+            if device_id != host_id
+        }
+
+    def find_address(self, address):
+        """Return the IDs of the hosts having the given address."""
+        return [
+            host_id for host_id, host in self.hosts.items()
+            if address in _get_addresses(host)
+        ]
+
+    def list_hosts(self):
+        return list(self.hosts.values())
+
 
 class OpenStackInventory:
 
     # Put this here so the capability can be detected with hasattr on the class
     extra_config = None
 
+    #: Maximum number of clouds queried concurrently by default.
+    DEFAULT_MAX_WORKERS = 16
+
     def __init__(
             self, config_files=None, refresh=False, private=False,
             config_key=None, config_defaults=None, cloud=None,
-            use_direct_get=False):
+            use_direct_get=False, max_workers=None, snapshot_dir=None,
+            snapshot_max_age=0):
+        """Inventory of the servers of one or all configured clouds.
+
+        :param max_workers: Number of clouds queried (and authenticated)
+            concurrently. Defaults to one worker per cloud, capped to
+            ``DEFAULT_MAX_WORKERS``.
+        :param snapshot_dir: Directory keeping a snapshot of the hosts of
+            every cloud. When set, only the servers, ports and floating IPs
+            changed since the last snapshot are queried and merged into it.
+            ``refresh`` discards the snapshots.
+        :param snapshot_max_age: Age in seconds under which a snapshot is
+            returned as is, without asking the cloud for changes.
+        """
         if config_files is None:
             config_files = []
         config = loader.OpenStackConfig(
@@ -48,6 +164,12 @@ class OpenStackInventory:
                 connection.Connection(config=config.get_one(cloud))
             ]
 
+        self.snapshot_dir = snapshot_dir
+        self.snapshot_max_age = snapshot_max_age
+        self.refresh = refresh
+        self.max_workers = max_workers or min(
+            len(self.clouds), self.DEFAULT_MAX_WORKERS) or 1
+
         if private:
             for cloud in self.clouds:
                 cloud.private = True
@@ -57,20 +179,192 @@ class OpenStackInventory:
             for cloud in self.clouds:
                 cloud._cache.invalidate()
 
-    def list_hosts(self, expand=True, fail_on_cloud_config=True,
-                   all_projects=False):
-        hostvars = []
+    def _list_cloud_hosts(self, cloud, expand, all_projects, batched):
+        if self.snapshot_dir:
+            return self._list_snapshot_hosts(
+                cloud, expand, all_projects, batched)
+        return self._query_cloud_hosts(cloud, expand, all_projects, batched)
+
+    def _query_cloud_hosts(self, cloud, expand, all_projects, batched):
+        if expand and batched:
+            return meta.get_hostvars_from_servers(
+                cloud,
+                cloud.list_servers(bare=True, all_projects=all_projects))
+        return cloud.list_servers(detailed=expand, all_projects=all_projects)
+
+    def _expand_servers(self, cloud, servers, expand, batched):
+        if expand and batched:
+            return meta.get_hostvars_from_servers(cloud, servers)
+        return [
+            cloud._expand_server(server, detailed=expand, bare=False)
+            for server in servers
+        ]
+
+    def _get_snapshot_path(self, cloud, expand, all_projects):
+        name = '_'.join(filter(None, [
+            cloud.name,
+            cloud.config.get_region_name(),
+            'expanded' if expand else 'plain',
+            'all' if all_projects else None,
+        ]))
+        return os.path.join(
+            self.snapshot_dir, re.sub(r'[^\w.-]', '-', name) + '.json')
+
+    def _list_snapshot_hosts(self, cloud, expand, all_projects, batched):
+        snapshot = InventorySnapshot.load(
+            self._get_snapshot_path(cloud, expand, all_projects))
+        # Take the time before querying so that changes made while we are
+        # querying are picked up by the next refresh.
+        now = time.time()
+        if snapshot.timestamp is None or self.refresh:
+            hosts = self._query_cloud_hosts(
+                cloud, expand, all_projects, batched)
+            snapshot.hosts = {host['id']: host for host in hosts}
+            snapshot.port_devices = {}
+            snapshot.floating_ips = {}
+            if cloud.has_service('network'):
+                snapshot.port_devices = self._list_port_devices(cloud)
+                snapshot.floating_ips = self._list_floating_ips(cloud)
+        elif now - snapshot.timestamp < self.snapshot_max_age:
+            return snapshot.list_hosts()
+        else:
+            self._update_snapshot(snapshot, cloud, expand, all_projects,
+                                  batched)
+        snapshot.timestamp = now
+        snapshot.save()
+        return snapshot.list_hosts()
+
+    def _update_snapshot(self, snapshot, cloud, expand, all_projects,
+                         batched):
+        """Merge the changes since the snapshot was taken into it."""
+        since = _format_time(snapshot.timestamp - SNAPSHOT_CLOCK_SKEW)
+        changed = {}
+        for server in cloud.compute.servers(
+                details=True, all_projects=all_projects, changes_since=since):
+            # changes-since also returns the servers deleted since then
+            if server.status == 'DELETED':
+                snapshot.remove(server.id)
+            else:
+                changed[server.id] = server
+
+        if cloud.has_service('network'):
+            # A server's addresses change without the server being updated
+            # when its ports or floating IPs are, so refresh their servers.
+            # changed_since does not return the deleted ports and floating
+            # IPs, which are found by comparing their IDs with the snapshot.
+            stale = set()
+            port_devices = self._list_port_devices(cloud)
+            floating_ips = self._list_floating_ips(cloud)
+            for port_id in set(port_devices) | set(snapshot.port_devices):
+                device_id = port_devices.get(port_id)
+                old_device_id = snapshot.port_devices.get(port_id)
+                if device_id != old_device_id:
+                    stale.update((device_id, old_device_id))
+            for fip_id, (address, port_id) in snapshot.floating_ips.items():
+                if floating_ips.get(fip_id) != (address, port_id):
+                    stale.add(snapshot.port_devices.get(port_id))
+                    stale.update(snapshot.find_address(address))
+            for port in cloud.network.ports(changed_since=since):
+                stale.add(port_devices.get(port.id))
+            for fip in cloud.network.ips(changed_since=since):
+                stale.add(port_devices.get(fip.port_id))
+                stale.update(snapshot.find_address(fip.floating_ip_address))
+            snapshot.port_devices = port_devices
+            snapshot.floating_ips = floating_ips
+            for server_id in stale:
+                if server_id not in snapshot.hosts or server_id in changed:
+                    continue
+                try:
+                    changed[server_id] = cloud.compute.get_server(server_id)
+                except exceptions.ResourceNotFound:
+                    snapshot.remove(server_id)
+
+        for host in self._expand_servers(
+                cloud, list(changed.values()), expand, batched):
+            snapshot.hosts[host['id']] = host
+
+    def _list_port_devices(self, cloud):
+        """Map the ports attached to a device to its ID."""
+        return {
+            port.id: port.device_id
+            for port in cloud.network.ports(fields=['id', 'device_id'])
+            if port.device_id
+        }
 
-        for cloud in self.clouds:
+    def _list_floating_ips(self, cloud):
+        """Map the floating IPs to their address and port ID."""
+        return {
+            fip.id: (fip.floating_ip_address, fip.port_id)
+            for fip in cloud.network.ips(
+                fields=['id', 'floating_ip_address', 'port_id'])
+        }
+
+    def _iter_cloud_hosts(self, expand, fail_on_cloud_config, all_projects,
+                          batched):
+        """Yield (cloud index, servers) tuples as each cloud completes."""
+        with concurrent.futures.ThreadPoolExecutor(
+                max_workers=self.max_workers) as executor:
+            futures = {
+                executor.submit(
+                    self._list_cloud_hosts, cloud, expand, all_projects,
+                    batched): index
+                for index, cloud in enumerate(self.clouds)
+            }
             try:
-                # Cycle on servers
-                for server in cloud.list_servers(detailed=expand,
-                                                 all_projects=all_projects):
-                    hostvars.append(server)
-            except exceptions.OpenStackCloudException:
-                # Don't fail on one particular cloud as others may work
-                if fail_on_cloud_config:
-                    raise
+                for future in concurrent.futures.as_completed(futures):
+                    try:
+                        servers = future.result()
+                    except exceptions.OpenStackCloudException:
+                        # Don't fail on one particular cloud as others may
+                        # work
+                        if fail_on_cloud_config:
+                            raise
+                        continue
+                    yield futures[future], servers
+            finally:
+                # Do not start querying clouds nobody is waiting for anymore
+                for future in futures:
+                    future.cancel()
+
+    def iter_hosts(self, expand=True, fail_on_cloud_config=True,
+                   all_projects=False, batched=False):
+        """Yield servers of all clouds as soon as each cloud returned them.
+
+        Clouds are authenticated and queried concurrently using up to
+        ``max_workers`` threads. Parameters are the same as for
+        :meth:`list_hosts`.
+        """
+        for _, servers in self._iter_cloud_hosts(
+                expand, fail_on_cloud_config, all_projects, batched):
+            for server in servers:
+                yield server
+
+    def list_hosts(self, expand=True, fail_on_cloud_config=True,
+                   all_projects=False, batched=False):
+        """List servers of all clouds.
+
+        Clouds are authenticated and queried concurrently using up to
+        ``max_workers`` threads. The servers are returned in the order of the
+        clouds.
+
+        :param expand: Whether to expand the hostvars of the servers.
+        :param fail_on_cloud_config: Whether to raise when a cloud fails
+            instead of skipping it.
+        :param all_projects: Whether to list servers from all projects.
+        :param batched: When expanding, list the supplemental data (ports,
+            floating IPs, security groups, flavors, images and volumes) once
+            per cloud and join it locally instead of querying it per server.
+        """
+        results = sorted(
+            self._iter_cloud_hosts(
+                expand, fail_on_cloud_config, all_projects, batched),
+            key=lambda result: result[0])
+
+        hostvars = []
+        for _, servers in results:
+            # Cycle on servers
+            for server in servers:
+                hostvars.append(server)
 
         return hostvars
 
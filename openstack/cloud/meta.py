@@ -393,7 +393,7 @@ def _make_address_dict(fip, port):
     return address
 
 
-def _get_supplemental_addresses(cloud, server):
+def _get_supplemental_addresses(cloud, server, lookups=None):
     fixed_ip_mapping = {}
     for name, network in server['addresses'].items():
         for address in network:
@@ -409,12 +409,20 @@ def _get_supplemental_addresses(cloud, server):
         if (cloud.has_service('network')
                 and cloud._has_floating_ips()
                 and server['status'] == 'ACTIVE'):
-            for port in cloud.search_ports(
-                    filters=dict(device_id=server['id'])):
+            if lookups is not None:
+                ports = lookups.ports_by_device.get(server['id'], [])
+            else:
+                ports = cloud.search_ports(
+                    filters=dict(device_id=server['id']))
+            for port in ports:
                 # This SHOULD return one and only one FIP - but doing it as a
                 # search/list lets the logic work regardless
-                for fip in cloud.search_floating_ips(
-                        filters=dict(port_id=port['id'])):
+                if lookups is not None:
+                    fips = lookups.fips_by_port.get(port['id'], [])
+                else:
+                    fips = cloud.search_floating_ips(
+                        filters=dict(port_id=port['id']))
+                for fip in fips:
                     fixed_net = fixed_ip_mapping.get(fip['fixed_ip_address'])
                     if fixed_net is None:
                         log = _log.setup_logging('openstack')
@@ -436,7 +444,7 @@ def _get_supplemental_addresses(cloud, server):
     return server['addresses']
 
 
-def add_server_interfaces(cloud, server):
+def add_server_interfaces(cloud, server, lookups=None):
     """Add network interface information to server.
 
     Query the cloud as necessary to add information to the server record
@@ -444,10 +452,14 @@ def add_server_interfaces(cloud, server):
 
     Ensures that public_v4, public_v6, private_v4, private_v6, interface_ip,
                  accessIPv4 and accessIPv6 are always set.
+
+    :param lookups: Optional indexes returned by :func:`get_server_lookups`
+        used instead of querying the cloud for this server only.
     """
     # First, add an IP address. Set it to '' rather than None if it does
     # not exist to remain consistent with the pre-existing missing values
-    server['addresses'] = _get_supplemental_addresses(cloud, server)
+    server['addresses'] = _get_supplemental_addresses(
+        cloud, server, lookups=lookups)
     server['public_v4'] = get_server_external_ipv4(cloud, server) or ''
     # If we're forcing IPv4, then don't report IPv6 interfaces which
     # are likely to be unconfigured.
@@ -471,7 +483,18 @@ def add_server_interfaces(cloud, server):
     return server
 
 
-def expand_server_security_groups(cloud, server):
+def expand_server_security_groups(cloud, server, lookups=None):
+    if lookups is not None and lookups.security_groups is not None:
+        groups = []
+        seen = set()
+        for port in lookups.ports_by_device.get(server['id'], []):
+            for group_id in port['security_group_ids'] or []:
+                group = lookups.security_groups.get(group_id)
+                if group is not None and group_id not in seen:
+                    seen.add(group_id)
+                    groups.append(group)
+        server['security_groups'] = groups
+        return
     try:
         groups = cloud.list_server_security_groups(server)
     except exc.OpenStackCloudException:
@@ -479,22 +502,107 @@ def expand_server_security_groups(cloud, server):
     server['security_groups'] = groups or []
 
 
-def get_hostvars_from_server(cloud, server, mounts=None):
+def _index_by(items, key):
+    index = {}
+    for item in items:
+        index.setdefault(item[key], []).append(item)
+    return index
+
+
+def get_server_lookups(cloud):
+    """Fetch the data needed to expand the hostvars of many servers.
+
+    Ports, floating IPs, security groups, flavors, images and volumes are
+    listed once for the whole cloud and indexed, so that
+    :func:`get_hostvars_from_server` can join them locally instead of making
+    several API calls per server. Lookups that cannot be fetched are set to
+    ``None``, in which case the per-server queries are used for them.
+
+    :param cloud: the cloud we're working with
+    :returns: a ``munch.Munch`` with the indexes.
+    """
+    lookups = munch.Munch(
+        ports_by_device={},
+        fips_by_port={},
+        security_groups=None,
+        flavor_names=None,
+        image_names=None,
+        volumes_by_server=None,
+    )
+
+    def _fetch(func, *args, **kwargs):
+        try:
+            return func(*args, **kwargs)
+        except exc.OpenStackCloudException:
+            # This is an attempt to provide additional data and should not
+            # block forward progress.
+            return None
+
+    if not cloud._has_secgroups():
+        lookups.security_groups = {}
+
+    if cloud.has_service('network'):
+        # If listing ports fails the per-server queries would fail as well,
+        # so simply leave the indexes empty.
+        ports = _fetch(cloud.list_ports)
+        if ports is not None:
+            lookups.ports_by_device = _index_by(ports, 'device_id')
+            if (lookups.security_groups is None
+                    and cloud._use_neutron_secgroups()):
+                groups = _fetch(cloud.list_security_groups)
+                if groups is not None:
+                    lookups.security_groups = {g['id']: g for g in groups}
+        if cloud._has_floating_ips():
+            fips = _fetch(cloud.list_floating_ips)
+            if fips is not None:
+                lookups.fips_by_port = _index_by(
+                    [fip for fip in fips if fip.get('port_id')], 'port_id')
+
+    flavors = _fetch(cloud.list_flavors, get_extra=False)
+    if flavors is not None:
+        lookups.flavor_names = {f['id']: f['name'] for f in flavors}
+
+    images = _fetch(cloud.list_images)
+    if images is not None:
+        lookups.image_names = {i['id']: i['name'] for i in images}
+
+    if cloud.has_service('volume'):
+        volumes = _fetch(cloud.list_volumes)
+        if volumes is not None:
+            lookups.volumes_by_server = {}
+            for volume in volumes:
+                for attach in volume['attachments']:
+                    lookups.volumes_by_server.setdefault(
+                        attach['server_id'], []).append(volume)
+    else:
+        lookups.volumes_by_server = {}
+
+    return lookups
+
+
+def get_hostvars_from_server(cloud, server, mounts=None, lookups=None):
     """Expand additional server information useful for ansible inventory.
 
     Variables in this function may make additional cloud queries to flesh out
     possibly interesting info, making it more expensive to call than
     expand_server_vars if caching is not set up. If caching is set up,
     the extra cost should be minimal.
+
+    :param lookups: Optional indexes returned by :func:`get_server_lookups`.
+        When expanding many servers, pass the same lookups to every call (or
+        use :func:`get_hostvars_from_servers`) to avoid per-server queries.
     """
     server_vars = obj_to_munch(
-        add_server_interfaces(cloud, server))
+        add_server_interfaces(cloud, server, lookups=lookups))
 
     flavor_id = server['flavor'].get('id')
     if flavor_id:
         # In newer nova, the flavor record can be kept around for flavors
         # that no longer exist. The id and name are not there.
-        flavor_name = cloud.get_flavor_name(flavor_id)
+        if lookups is not None and lookups.flavor_names is not None:
+            flavor_name = lookups.flavor_names.get(flavor_id)
+        else:
+            flavor_name = cloud.get_flavor_name(flavor_id)
         if flavor_name:
             server_vars['flavor']['name'] = flavor_name
     elif 'original_name' in server['flavor']:
@@ -502,7 +610,7 @@ def get_hostvars_from_server(cloud, server, mounts=None):
         # original_name.
         server_vars['flavor']['name'] = server['flavor']['original_name']
 
-    expand_server_security_groups(cloud, server)
+    expand_server_security_groups(cloud, server, lookups=lookups)
 
     # OpenStack can return image as a string when you've booted from volume
     if str(server['image']) == server['image']:
@@ -511,7 +619,10 @@ def get_hostvars_from_server(cloud, server, mounts=None):
     else:
         image_id = server['image'].get('id', None)
     if image_id:
-        image_name = cloud.get_image_name(image_id)
+        if lookups is not None and lookups.image_names is not None:
+            image_name = lookups.image_names.get(image_id)
+        else:
+            image_name = cloud.get_image_name(image_id)
         if image_name:
             server_vars['image']['name'] = image_name
 
@@ -521,14 +632,29 @@ def get_hostvars_from_server(cloud, server, mounts=None):
         server_vars['image'] = server_vars['image'].to_dict(computed=False)
 
     volumes = []
-    if cloud.has_service('volume'):
+    if lookups is not None and lookups.volumes_by_server is not None:
+        server_volumes = lookups.volumes_by_server.get(server['id'], [])
+    elif cloud.has_service('volume'):
         try:
-            for volume in cloud.get_volumes(server):
-                # Make things easier to consume elsewhere
-                volume['device'] = volume['attachments'][0]['device']
-                volumes.append(volume)
+            server_volumes = cloud.get_volumes(server)
         except exc.OpenStackCloudException:
-            pass
+            server_volumes = []
+    else:
+        server_volumes = []
+    for volume in server_volumes:
+        # A volume can be attached to several servers, and the lookups share
+        # it between them, so every server gets a copy of its own.
+        if hasattr(volume, 'to_dict'):
+            volume = volume.to_dict(computed=False)
+        else:
+            volume = volume.copy()
+        # Make things easier to consume elsewhere
+        attachments = volume['attachments']
+        volume['device'] = next(
+            (attach['device'] for attach in attachments
+             if attach.get('server_id') == server['id']),
+            attachments[0]['device'])
+        volumes.append(volume)
     server_vars['volumes'] = volumes
     if mounts:
         for mount in mounts:
@@ -540,6 +666,28 @@ def get_hostvars_from_server(cloud, server, mounts=None):
     return server_vars
 
 
+def get_hostvars_from_servers(cloud, servers, mounts=None):
+    """Expand the hostvars of many servers with a fixed number of queries.
+
+    This is the batched version of :func:`get_hostvars_from_server`: the
+    supplemental data is listed once per cloud with
+    :func:`get_server_lookups` and joined to every server locally.
+
+    :param cloud: the cloud we're working with
+    :param servers: list of servers to expand.
+    :param mounts: optional mounts passed to
+        :func:`get_hostvars_from_server`.
+    :returns: list of expanded servers.
+    """
+    if not servers:
+        return []
+    lookups = get_server_lookups(cloud)
+    return [
+        get_hostvars_from_server(cloud, server, mounts=mounts, lookups=lookups)
+        for server in servers
+    ]
+
+
 def obj_to_munch(obj):
     """ Turn an object with attributes into a dict suitable for serializing.
 
@@ -26,13 +26,29 @@ import requests.models
 import requestsexceptions
 
 from openstack import _log
+from openstack.block_storage.v2 import volume as _volume_v2
+from openstack.block_storage.v3 import volume as _volume_v3
 from openstack.cloud import _floating_ip
 from openstack.cloud import _object_store
+from openstack.cloud import _snapshot_cache
 from openstack.cloud import _utils
 from openstack.cloud import exc
 from openstack.cloud import meta
+from openstack.compute.v2 import flavor as _flavor
+from openstack.compute.v2 import server as _server
+from openstack.compute.v2 import volume_attachment as _volume_attachment
 import openstack.config
 from openstack.config import cloud_region as cloud_region_mod
+from openstack.identity.v2 import tenant as _tenant
+from openstack.identity.v2 import user as _user_v2
+from openstack.identity.v3 import group as _group
+from openstack.identity.v3 import project as _project
+from openstack.identity.v3 import user as _user
+from openstack.image.v1 import image as _image_v1
+from openstack.image.v2 import image as _image_v2
+from openstack.network.v2 import floating_ip as _network_floating_ip
+from openstack.network.v2 import port as _port
+from openstack.orchestration.v1 import stack as _stack
 from openstack import proxy
 from openstack import utils
 
@@ -47,6 +63,43 @@ DEFAULT_MAX_FILE_SIZE = _object_store.DEFAULT_MAX_FILE_SIZE
 OBJECT_CONTAINER_ACLS = _object_store.OBJECT_CONTAINER_ACLS
 
 
+class _FrozenMunch(munch.Munch):
+    """A ``munch.Munch`` which can not be modified.
+
+    Instances are shared, so copying one returns it as is, except for
+    :meth:`copy` which returns a modifiable ``munch.Munch``.
+    """
+
+    def __init__(self, *args, **kwargs):
+        dict.__init__(self, *args, **kwargs)
+
+    def _read_only(self, *args, **kwargs):
+        raise TypeError(
+            "{cls} objects are read-only, use copy() to get a modifiable"
+            " one".format(cls=type(self).__name__))
+
+    __setitem__ = __delitem__ = __ior__ = _read_only
+    clear = pop = popitem = setdefault = update = _read_only
+
+    def __setattr__(self, k, v):
+        raise AttributeError(k)
+
+    def __delattr__(self, k):
+        raise AttributeError(k)
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def __reduce__(self):
+        return (type(self), (dict(self),))
+
+    def copy(self):
+        return munch.Munch.fromDict(self)
+
+
 class _OpenStackCloudMixin:
     """Represent a connection to an OpenStack Cloud.
 
@@ -73,6 +126,9 @@ class _OpenStackCloudMixin:
     _SHADE_OBJECT_AUTOCREATE_KEY = 'x-object-meta-x-shade-autocreated'
 
     def __init__(self):
+        # Snapshots of listings polled by many callers, by name, which the
+        # other mixins make as they are initialized, see _make_snapshot_cache
+        self._snapshot_caches = {}
 
         super(_OpenStackCloudMixin, self).__init__()
 
@@ -97,6 +153,9 @@ class _OpenStackCloudMixin:
                 warnings.filterwarnings('ignore', category=category)
 
         self._disable_warnings = {}
+        # Locations are shared for as long as the token they come from is
+        # used, see _get_current_location
+        self._location_cache = (None, {})
 
         cache_expiration_time = int(self.config.get_cache_expiration_time())
         cache_class = self.config.get_cache_class()
@@ -150,7 +209,9 @@ class _OpenStackCloudMixin:
         self._PORT_AGE = 0
         self._FLOAT_AGE = 0
 
-        self._api_cache_keys = set()
+        self._api_cache_keys = utils.CacheKeyIndex(
+            lambda key: self._cache.delete(key))
+        self._observe_writes()
         self._container_cache = dict()
         self._file_hash_cache = dict()
 
@@ -317,6 +378,77 @@ class _OpenStackCloudMixin:
             expiration_time=expiration_time,
             arguments=arguments)
 
+    def _make_snapshot_cache(self, name, fetch, age_attr, index_names):
+        """Make a cache of snapshots of a listing.
+
+        :param name: Name of the listing.
+        :param fetch: Function fetching the listing.
+        :param age_attr: Attribute holding how long in seconds a snapshot is
+            served, 0 disabling the cache.
+        :param index_names: Keys of the listed items searched by value.
+        """
+        cache = _snapshot_cache.SnapshotCache(
+            name, fetch,
+            max_age=lambda: getattr(self, age_attr),
+            get_executor=lambda: self._pool_executor,
+            index_names=index_names)
+        self._snapshot_caches[name] = cache
+        return cache
+
+    def _observe_writes(self):
+        """Keep the cached listings up to date with the writes of proxies.
+
+        Listings cached with :func:`~openstack.cloud._utils.cache_on_arguments`
+        are invalidated when resources they list are written, snapshots of
+        listings lose the deleted resources and are invalidated otherwise.
+        """
+        for resource_types, method in (
+            ((_volume_v2.Volume, _volume_v3.Volume,
+              _volume_attachment.VolumeAttachment), 'list_volumes'),
+            ((_image_v1.Image, _image_v2.Image), 'list_images'),
+            (_flavor.Flavor, 'list_flavors'),
+            ((_user_v2.User, _user.User), 'list_users'),
+            (_group.Group, 'list_groups'),
+            ((_tenant.Tenant, _project.Project), 'list_projects'),
+            (_stack.Stack, 'list_stacks'),
+        ):
+            self._write_observers.add(
+                resource_types,
+                functools.partial(self._invalidate_listing, method))
+        for resource_type, name in (
+            (_server.Server, 'servers'),
+            (_port.Port, 'ports'),
+            (_network_floating_ip.FloatingIP, 'floating_ips'),
+        ):
+            self._write_observers.add(
+                resource_type,
+                functools.partial(self._update_snapshot_cache, name))
+
+    def _invalidate_listing(self, method, action, res):
+        getattr(self, method).invalidate(self)
+
+    def _update_snapshot_cache(self, name, action, res):
+        # The caches are made again when the mixins are initialized again
+        cache = self._snapshot_caches.get(name)
+        if cache is None:
+            return
+        if action == 'delete' and res.id:
+            cache.discard(res.id)
+        else:
+            cache.invalidate()
+
+    def get_snapshot_cache_stats(self):
+        """Get the statistics of the caches of server, port and floating IP
+        listings.
+
+        :returns: A dict of the counts of hits, stale hits, misses, background
+            refreshes and background refresh errors of each listing.
+        """
+        return {
+            name: cache.get_stats()
+            for name, cache in self._snapshot_caches.items()
+        }
+
     def _make_cache_key(self, namespace, fn):
         fname = fn.__name__
         if namespace is None:
@@ -584,13 +716,47 @@ class _OpenStackCloudMixin:
         return self._get_current_location()
 
     def _get_current_location(self, project_id=None, zone=None):
-        return munch.Munch(
+        """Return the location of resources in a project and zone.
+
+        Every resource listed from the same project and zone has the same
+        location, so it is built once per token and the same read-only
+        instance is returned until the token changes.
+        """
+        key = (project_id, zone)
+        cached_ref, locations = self._location_cache
+        auth_ref = self._get_location_auth_ref()
+        if auth_ref is not None and auth_ref is cached_ref:
+            try:
+                return locations[key]
+            except KeyError:
+                pass
+        location = self._make_location(project_id, zone)
+        # Building the location may well have fetched the first token
+        auth_ref = self._get_location_auth_ref()
+        if auth_ref is not None:
+            if auth_ref is not cached_ref:
+                locations = {}
+                self._location_cache = (auth_ref, locations)
+            locations[key] = location
+        return location
+
+    def _get_location_auth_ref(self):
+        """Return what identifies the token locations come from, if any."""
+        auth = self.session.auth
+        if auth is None:
+            return None
+        # Identity plugins replace their auth_ref with every new token, other
+        # plugins always use the same credentials.
+        return getattr(auth, 'auth_ref', auth)
+
+    def _make_location(self, project_id=None, zone=None):
+        return _FrozenMunch(
             cloud=self.name,
             # TODO(efried): This is wrong, but it only seems to be used in a
             # repr; can we get rid of it?
             region_name=self.config.get_region_name(),
             zone=zone,
-            project=self._get_project_info(project_id),
+            project=_FrozenMunch(self._get_project_info(project_id)),
         )
 
     def _get_identity_location(self):
@@ -673,23 +839,16 @@ class _OpenStackCloudMixin:
         :returns: A list subset of the original data set.
         :raises: OpenStackCloudException on invalid range expressions.
         """
-        filtered = []
-
-        for key, range_value in filters.items():
-            # We always want to operate on the full data set so that
-            # calculations for minimum and maximum are correct.
-            results = _utils.range_filter(data, key, range_value)
-
-            if not filtered:
-                # First set of results
-                filtered = results
-            else:
-                # The combination of all searches should be the intersection of
-                # all result sets from each search. So adjust the current set
-                # of filtered data by computing its intersection with the
-                # latest result set.
-                filtered = [r for r in results for f in filtered if r == f]
-
+        # The ranges are compiled against the full data set so that
+        # calculations for minimum and maximum are correct, then the data set
+        # is searched once for the elements matching all of them.
+        predicates = [
+            _utils.compile_range_filter(data, key, range_value)
+            for key, range_value in filters.items()
+        ]
+        if not predicates or None in predicates:
+            return []
+        filtered = [d for d in data if all(p(d) for p in predicates)]
         return filtered
 
     def _get_and_munchify(self, key, data):
@@ -758,7 +917,9 @@ class _OpenStackCloudMixin:
         wait_timeout=120,
         status_queue=None,
         filters=None,
-        resource_evaluation_fn=None
+        resource_evaluation_fn=None,
+        max_concurrency=1,
+        max_rate=None
     ):
         """Cleanup the project resources.
 
@@ -766,7 +927,8 @@ class _OpenStackCloudMixin:
 
         :param bool dry_run: Cleanup or only list identified resources.
         :param int wait_timeout: Maximum amount of time given to each service
-            to comlete the cleanup.
+            to complete the cleanup, and to the resources it deleted to be
+            gone when the service waits for them.
         :param queue status_queue: a threading queue object used to get current
             process status. The queue contain processed resources.
         :param dict filters: Additional filters for the cleanup (only resources
@@ -775,7 +937,21 @@ class _OpenStackCloudMixin:
         :param resource_evaluation_fn: A callback function, which will be
             invoked for each resurce and must return True/False depending on
             whether resource need to be deleted or not.
+        :param int max_concurrency: Maximum number of resources deleted at
+            the same time by each service.
+        :param float max_rate: Maximum number of resources deleted per second
+            by all the services together. Not limited by default. A
+            :class:`~openstack.utils.RateLimiter` can be given instead to
+            share the bound with other cleanups.
+        :returns: The list of the errors met, as ``(service, resource,
+            exception)`` tuples. ``resource`` is ``None`` for the errors of
+            a service cleanup which are not about a resource.
+        :raises: :class:`~openstack.exceptions.ResourceTimeout` if the
+            cleanup did not finish within ``wait_timeout``.
         """
+        rate_limiter = max_rate
+        if max_rate and not isinstance(max_rate, utils.RateLimiter):
+            rate_limiter = utils.RateLimiter(max_rate)
         dependencies = {}
         get_dep_fn_name = '_get_cleanup_dependencies'
         cleanup_fn_name = '_service_cleanup'
@@ -802,6 +978,8 @@ class _OpenStackCloudMixin:
                 dep_graph.add_edge(dep, k)
 
         cleanup_resources = dict()
+        # service -> list of the (resource, exception) met by the cleanup
+        cleanup_errors = dict()
 
         for service in dep_graph.walk(timeout=wait_timeout):
             fn = None
@@ -809,17 +987,23 @@ class _OpenStackCloudMixin:
                 proxy = getattr(self, service)
                 cleanup_fn = getattr(proxy, cleanup_fn_name, None)
                 if cleanup_fn:
+                    cleanup_errors[service] = []
                     fn = functools.partial(
                         cleanup_fn,
                         dry_run=dry_run,
                         client_status_queue=status_queue,
                         identified_resources=cleanup_resources,
                         filters=filters,
-                        resource_evaluation_fn=resource_evaluation_fn
+                        resource_evaluation_fn=resource_evaluation_fn,
+                        max_concurrency=max_concurrency,
+                        rate_limiter=rate_limiter,
+                        errors=cleanup_errors[service],
+                        wait_timeout=wait_timeout
                     )
             if fn:
                 self._pool_executor.submit(
-                    cleanup_task, dep_graph, service, fn
+                    cleanup_task, dep_graph, service, fn,
+                    cleanup_errors[service]
                 )
             else:
                 dep_graph.node_done(service)
@@ -829,14 +1013,20 @@ class _OpenStackCloudMixin:
                 message="Timeout waiting for cleanup to finish",
                 wait=1):
             if dep_graph.is_complete():
-                return
+                return [
+                    (service, resource, error)
+                    for service, errors in cleanup_errors.items()
+                    for resource, error in errors
+                ]
 
 
-def cleanup_task(graph, service, fn):
+def cleanup_task(graph, service, fn, errors=None):
     try:
         fn()
-    except Exception:
+    except Exception as e:
         log = _log.setup_logging('openstack.project_cleanup')
         log.exception('Error in the %s cleanup function' % service)
+        if errors is not None:
+            errors.append((None, e))
     finally:
         graph.node_done(service)
@@ -0,0 +1,233 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+"""Cleanup of many projects at once.
+
+:class:`MultiProjectCleanup` runs
+:meth:`~openstack.connection.Connection.project_cleanup`
+for every given project from a connection with the admin role, a few
+projects at a time, and reports its progress as events.
+"""
+
+import collections
+import concurrent.futures
+import threading
+import time
+
+from openstack import _log
+from openstack import exceptions
+from openstack import utils
+
+__all__ = ['MultiProjectCleanup']
+
+
+def _describe(resource):
+    return dict(
+        type=(
+            getattr(resource, 'resource_key', None)
+            or type(resource).__name__),
+        id=getattr(resource, 'id', None),
+        name=getattr(resource, 'name', None))
+
+
+class _ProjectStatusQueue:
+    """Status queue of one project, turning resources into events."""
+
+    def __init__(self, cleanup, project):
+        self._cleanup = cleanup
+        self._project = project
+        self._lock = threading.Lock()
+        self.resources = collections.Counter()
+
+    def put(self, resource, *args, **kwargs):
+        # Called from the threads of every service and deletion
+        description = _describe(resource)
+        with self._lock:
+            self.resources[description['type']] += 1
+        self._cleanup._emit('resource', self._project, resource=description)
+
+
+class MultiProjectCleanup:
+    """Cleanup of the resources of many projects.
+
+    Every project is cleaned up with a connection scoped to it, made from
+    ``cloud`` with
+    :meth:`~openstack.connection.Connection.connect_as_project`,
+    which shares the discovery cache of ``cloud``. Up to ``max_workers``
+    projects are cleaned up at the same time.
+
+    Progress is reported by putting events in ``status_queue``. Events are
+    dicts with the ``event`` name, the ``time`` it happened and the
+    ``project_id`` and ``project_name`` it is about:
+
+    * ``start`` when the cleanup of a project starts.
+    * ``resource`` for every resource identified for deletion, with its
+      ``type``, ``id`` and ``name`` in ``resource``.
+    * ``done`` when the cleanup of a project is complete, with its
+      ``summary``.
+    * ``error`` when the cleanup of a project failed, or some of its
+      resources could not be deleted, with its ``summary``.
+
+    .. code-block:: python
+
+      cloud = openstack.connect(cloud='example-admin')
+      cleanup = MultiProjectCleanup(
+          cloud, project_filters={'tags': 'expired'}, max_workers=8)
+      summary = cleanup.run(dry_run=False)
+
+    :param cloud: The :class:`~openstack.connection.Connection` used to find
+        the projects and to connect to them.
+    :param projects: Names, IDs or ``Project`` objects of the projects to
+        clean up.
+    :param project_filters: Filters of the projects to clean up, given to
+        :meth:`~openstack.connection.Connection.list_projects`
+        when ``projects`` is not given. The project ``cloud`` is scoped to is
+        never selected by filters.
+    :param domain_id: Domain of the projects to clean up.
+    :param max_workers: Number of projects cleaned up at the same time.
+    :param status_queue: A queue receiving the progress events.
+    """
+
+    #: Number of projects cleaned up at the same time by default.
+    DEFAULT_MAX_WORKERS = 4
+
+    def __init__(
+        self, cloud, projects=None, project_filters=None, domain_id=None,
+        max_workers=None, status_queue=None,
+    ):
+        self.cloud = cloud
+        self.projects = projects
+        self.project_filters = project_filters
+        self.domain_id = domain_id
+        self.max_workers = max_workers or self.DEFAULT_MAX_WORKERS
+        self.status_queue = status_queue
+        self.log = _log.setup_logging('openstack.project_cleanup')
+
+    def _emit(self, event, project, **kwargs):
+        if self.status_queue is None:
+            return
+        kwargs.update(
+            event=event,
+            time=time.time(),
+            project_id=project.get('id'),
+            project_name=project.get('name'))
+        self.status_queue.put(kwargs)
+
+    def get_projects(self):
+        """Return the projects to clean up.
+
+        :raises: :class:`~openstack.exceptions.SDKException` if a given
+            project cannot be found.
+        """
+        if self.projects is None:
+            current_project_id = self.cloud.current_project_id
+            return [
+                project for project in self.cloud.list_projects(
+                    domain_id=self.domain_id, filters=self.project_filters)
+                if project['id'] != current_project_id
+            ]
+        projects = []
+        for project in self.projects:
+            if isinstance(project, str):
+                name_or_id = project
+                project = self.cloud.get_project(
+                    name_or_id, domain_id=self.domain_id)
+                if not project:
+                    raise exceptions.SDKException(
+                        "Project {project} not found".format(
+                            project=name_or_id))
+            projects.append(project)
+        return projects
+
+    def _cleanup_project(self, project, **kwargs):
+        self._emit('start', project)
+        status_queue = _ProjectStatusQueue(self, project)
+        start = time.monotonic()
+        summary = dict(
+            id=project.get('id'), name=project.get('name'), status='done',
+            error=None, errors=[])
+        try:
+            with self.cloud.connect_as_project(project) as project_cloud:
+                errors = project_cloud.project_cleanup(
+                    status_queue=status_queue, **kwargs)
+        except Exception as e:
+            self.log.exception(
+                'Error in the cleanup of project %s', project.get('name'))
+            summary.update(status='error', error=str(e))
+        else:
+            if errors:
+                summary.update(
+                    status='error',
+                    error='{count} errors in the cleanup'.format(
+                        count=len(errors)),
+                    errors=[
+                        dict(
+                            service=service,
+                            resource=(
+                                _describe(resource)
+                                if resource is not None else None),
+                            error=str(error))
+                        for service, resource, error in errors
+                    ])
+        summary.update(
+            resources=dict(status_queue.resources),
+            duration=time.monotonic() - start)
+        self._emit(summary['status'], project, summary=summary)
+        return summary
+
+    def run(
+        self, dry_run=True, wait_timeout=120, filters=None,
+        resource_evaluation_fn=None, max_concurrency=1, max_rate=None,
+    ):
+        """Cleanup the projects.
+
+        The parameters are those of
+        :meth:`~openstack.connection.Connection.project_cleanup`,
+        which is called for each project. ``max_rate`` bounds the deletions
+        of all the projects together.
+
+        :returns: A dict summarizing the cleanup, with a summary of every
+            project in ``projects`` and the numbers of projects, failed
+            projects and resources in ``total``. The summary of a project
+            lists the resources which could not be deleted and the services
+            which failed in ``errors``.
+        """
+        rate_limiter = None
+        if max_rate:
+            rate_limiter = utils.RateLimiter(max_rate)
+        cleanup_kwargs = dict(
+            dry_run=dry_run,
+            wait_timeout=wait_timeout,
+            filters=filters,
+            resource_evaluation_fn=resource_evaluation_fn,
+            max_concurrency=max_concurrency,
+            max_rate=rate_limiter)
+
+        projects = self.get_projects()
+        results = []
+        if projects:
+            with concurrent.futures.ThreadPoolExecutor(
+                max_workers=min(self.max_workers, len(projects))
+            ) as executor:
+                results = list(executor.map(
+                    lambda project: self._cleanup_project(
+                        project, **cleanup_kwargs),
+                    projects))
+
+        return dict(
+            dry_run=dry_run,
+            projects=results,
+            total=dict(
+                projects=len(results),
+                failed=sum(1 for r in results if r['status'] == 'error'),
+                resources=sum(sum(r['resources'].values()) for r in results),
+            ))
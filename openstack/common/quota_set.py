@@ -116,7 +116,7 @@ class QuotaSet(resource.Resource):
         self._header.attributes.update(headers)
         self._header.clean()
         self._update_location()
-        dict.update(self, self.to_dict())
+        self._sync_dict()
 
     def _prepare_request_body(self, patch, prepend_key):
         body = self._body.dirty
@@ -40,6 +40,10 @@ from openstack import proxy
 from openstack import resource
 from openstack import utils
 
+# Number of servers whose ports are listed at once during the cleanup, so
+# that the query string stays short.
+_CLEANUP_PORTS_CHUNK_SIZE = 50
+
 
 class Proxy(proxy.Proxy):
 
@@ -2124,6 +2128,52 @@ class Proxy(proxy.Proxy):
             self, server, status, failures, interval, wait,
         )
 
+    def wait_for_servers(
+        self, servers, status='ACTIVE', failures=None, interval=2, wait=120,
+        fail=True, all_projects=False,
+    ):
+        """Wait for many servers to be in a particular status.
+
+        Servers are listed once per check, instead of fetching each of them,
+        and only those changed since the previous check are listed.
+
+        :param servers: The servers to wait on to reach the specified
+            status. Each value can be the ID of a server or a
+            :class:`~openstack.compute.v2.server.Server` instance.
+        :param status: Desired status. ``DELETED`` waits for the servers to
+            be deleted.
+        :type status: str
+        :param failures: Statuses that would be interpreted as failures.
+        :type failures: :py:class:`list`
+        :param interval: Number of seconds to wait before to consecutive
+            checks. Default to 2.
+        :type interval: int
+        :param wait: Maximum number of seconds to wait before the change.
+            Default to 120.
+        :type wait: int
+        :param fail: If set to ``False`` this call will not raise on timeouts
+            and failures.
+        :param bool all_projects: Set to ``True`` to wait for servers of
+            other projects.
+        :returns: If ``fail`` is ``True`` (the default), the list of the
+            servers which reached the status. If ``fail`` is ``False``, a
+            :class:`~openstack.resource.WaitResult`.
+        :raises: :class:`~openstack.exceptions.ResourceTimeout` if transition
+            to the desired status failed to occur in specified seconds.
+        :raises: :class:`~openstack.exceptions.ResourceFailure` if a server
+            has transited to one of the failure statuses.
+        """
+        failures = ['ERROR'] if failures is None else failures
+        query = {}
+        if all_projects:
+            query['all_projects'] = True
+        return resource.wait_for_many(
+            self,
+            [self._get_resource(_server.Server, server) for server in servers],
+            status, failures, interval, wait,
+            fail=fail, base_path='/servers/detail', **query,
+        )
+
     def wait_for_delete(self, res, interval=2, wait=120):
         """Wait for a resource to be deleted.
 
@@ -2148,26 +2198,33 @@ class Proxy(proxy.Proxy):
 
     def _service_cleanup(self, dry_run=True, client_status_queue=None,
                          identified_resources=None,
-                         filters=None, resource_evaluation_fn=None):
-        servers = []
-        for obj in self.servers():
-            need_delete = self._service_cleanup_del_res(
-                self.delete_server,
-                obj,
-                dry_run=dry_run,
-                client_status_queue=client_status_queue,
-                identified_resources=identified_resources,
-                filters=filters,
-                resource_evaluation_fn=resource_evaluation_fn)
-            if not dry_run and need_delete:
-                # In the dry run we identified, that server will go. To propely
-                # identify consequences we need to tell others, that the port
-                # will disappear as well
-                for port in self._connection.network.ports(device_id=obj.id):
-                    identified_resources[port.id] = port
-                servers.append(obj)
+                         filters=None, resource_evaluation_fn=None,
+                         max_concurrency=1, rate_limiter=None,
+                         errors=None, wait_timeout=120):
+        servers = self._service_cleanup_del_res_many(
+            self.delete_server,
+            self.servers(),
+            max_concurrency=max_concurrency,
+            dry_run=dry_run,
+            client_status_queue=client_status_queue,
+            identified_resources=identified_resources,
+            filters=filters,
+            resource_evaluation_fn=resource_evaluation_fn,
+            rate_limiter=rate_limiter,
+            errors=errors)
+        if dry_run or not servers:
+            return
+
+        # In the dry run we identified, that server will go. To propely
+        # identify consequences we need to tell others, that the port
+        # will disappear as well
+        server_ids = [server.id for server in servers]
+        for start in range(0, len(server_ids), _CLEANUP_PORTS_CHUNK_SIZE):
+            for port in self._connection.network.ports(
+                device_id=server_ids[start:start + _CLEANUP_PORTS_CHUNK_SIZE]
+            ):
+                identified_resources[port.id] = port
 
         # We actually need to wait for servers to really disappear, since they
         # might be still holding ports on the subnet
-        for server in servers:
-            self.wait_for_delete(server)
+        self._wait_for_delete_many(servers, self.servers, wait=wait_timeout)
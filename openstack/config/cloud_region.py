@@ -46,6 +46,7 @@ from openstack.config import _util
 from openstack.config import defaults as config_defaults
 from openstack import exceptions
 from openstack import proxy
+from openstack import utils
 from openstack import version as openstack_version
 
 
@@ -551,6 +552,25 @@ class CloudRegion:
                                 fallback_to_unprefixed=True,
                                 converter=int)
 
+    def get_wait_strategy(self, service_type):
+        """Return the polling strategy of the waiters of a service.
+
+        It is configured by ``wait_strategy``, one of ``fixed``, ``backoff``
+        or ``jitter``, and ``wait_max_interval``, both of which may be
+        prefixed by the service type.
+
+        :returns: A :class:`~openstack.utils.PollStrategy`, or None if not
+            configured.
+        """
+        name = self._get_config('wait_strategy', service_type,
+                                fallback_to_unprefixed=True)
+        if not name:
+            return None
+        max_interval = self._get_config('wait_max_interval', service_type,
+                                        fallback_to_unprefixed=True,
+                                        converter=float)
+        return utils.get_poll_strategy(name, max_interval=max_interval)
+
     @property
     def prefer_ipv6(self):
         return not self._force_ipv4
@@ -768,6 +788,8 @@ class CloudRegion:
             'prometheus_histogram', self.get_prometheus_histogram())
         kwargs.setdefault('influxdb_config', self._influxdb_config)
         kwargs.setdefault('influxdb_client', self.get_influxdb_client())
+        kwargs.setdefault('wait_strategy',
+                          self.get_wait_strategy(service_type))
         endpoint_override = self.get_endpoint(service_type)
         version = version_request.version
         min_api_version = (
@@ -189,8 +189,10 @@ except ImportError:
 import keystoneauth1.exceptions
 import requestsexceptions
 
+from openstack import _json_codec
 from openstack import _log
 from openstack import _services_mixin
+from openstack import aio as _aio
 from openstack.cloud import _accelerator
 from openstack.cloud import _baremetal
 from openstack.cloud import _block_storage
@@ -212,6 +214,7 @@ from openstack import config as _config
 from openstack.config import cloud_region
 from openstack import exceptions
 from openstack import service_description
+from openstack import utils
 
 __all__ = [
     'from_config',
@@ -287,6 +290,7 @@ class Connection(
                  global_request_id=None,
                  strict_proxies=False,
                  pool_executor=None,
+                 json_codec=None,
                  **kwargs):
         """Create a connection to a cloud.
 
@@ -359,6 +363,10 @@ class Connection(
             A futurist ``Executor`` object to be used for concurrent background
             activities. Defaults to None in which case a ThreadPoolExecutor
             will be created if needed.
+        :param str json_codec: Name of the library encoding request bodies
+            and decoding response bodies, among ``orjson``, ``ujson`` and
+            ``json``, if installed. Defaults to the ``json_codec`` option of
+            the cloud config, or to ``auto``, which selects the fastest one.
         :param kwargs: If a config is not provided, the rest of the parameters
             provided are assumed to be arguments to be passed to the
             CloudRegion constructor.
@@ -395,9 +403,13 @@ class Connection(
         self._session = None
         self._proxies = {}
         self.__pool_executor = pool_executor
+        self._aio = None
         self._global_request_id = global_request_id
+        self._json_codec = _json_codec.get_codec(
+            json_codec or self.config.config.get('json_codec'))
         self.use_direct_get = use_direct_get
         self.strict_mode = strict
+        self._write_observers = utils.WriteObservers()
         # Call the _*CloudMixin constructors while we work on
         # integrating things better.
         _cloud._OpenStackCloudMixin.__init__(self)
@@ -504,6 +516,33 @@ class Connection(
             )
         self.config.enable_service(service.service_type)
 
+    def add_write_observer(self, resource_types, observer):
+        """Observe the resources written through the proxies.
+
+        ``observer`` is called with the action, one of ``create``, ``update``
+        and ``delete``, and the resource every time a resource of one of
+        ``resource_types`` is created, updated or deleted through the proxies
+        of this Connection, for instance to keep a cache of resources up to
+        date::
+
+            def forget_server(action, server):
+                if action == 'delete':
+                    servers.pop(server.id, None)
+
+            conn.add_write_observer(Server, forget_server)
+
+        The cached listings of the cloud layer are kept up to date this way.
+
+        :param resource_types: A :class:`~openstack.resource.Resource`
+            subclass or a tuple of them. Their subclasses are observed too.
+        :param observer: The function to call.
+        """
+        self._write_observers.add(resource_types, observer)
+
+    def remove_write_observer(self, resource_types, observer):
+        """Stop calling an observer added with :meth:`add_write_observer`."""
+        self._write_observers.remove(resource_types, observer)
+
     def authorize(self):
         """Authorize this Connection
 
@@ -530,10 +569,28 @@ class Connection(
                 max_workers=5)
         return self.__pool_executor
 
+    @property
+    def aio(self):
+        """asyncio interface to this Connection.
+
+        Returns an :class:`~openstack.aio.AsyncConnection` mirroring the
+        services and methods of this Connection with awaitable calls and
+        asynchronous iterators, for example::
+
+            async for server in conn.aio.compute.servers():
+                ...
+            port = await conn.aio.network.create_port(network_id=net_id)
+        """
+        if not self._aio:
+            self._aio = _aio.AsyncConnection(self)
+        return self._aio
+
     def close(self):
         """Release any resources held open."""
         if self.__pool_executor:
             self.__pool_executor.shutdown()
+        if getattr(self, '_aio', None):
+            self._aio.close()
         self.config.set_auth_cache()
 
     def set_global_request_id(self, global_request_id):
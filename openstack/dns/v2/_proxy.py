@@ -534,25 +534,22 @@ class Proxy(proxy.Proxy):
 
     def _service_cleanup(self, dry_run=True, client_status_queue=False,
                          identified_resources=None,
-                         filters=None, resource_evaluation_fn=None):
+                         filters=None, resource_evaluation_fn=None,
+                         max_concurrency=1, rate_limiter=None,
+                         errors=None, wait_timeout=120):
+        cleanup_kwargs = dict(
+            max_concurrency=max_concurrency,
+            dry_run=dry_run,
+            client_status_queue=client_status_queue,
+            identified_resources=identified_resources,
+            filters=filters,
+            resource_evaluation_fn=resource_evaluation_fn,
+            rate_limiter=rate_limiter,
+            errors=errors)
         # Delete all zones
-        for obj in self.zones():
-            self._service_cleanup_del_res(
-                self.delete_zone,
-                obj,
-                dry_run=dry_run,
-                client_status_queue=client_status_queue,
-                identified_resources=identified_resources,
-                filters=filters,
-                resource_evaluation_fn=resource_evaluation_fn)
+        self._service_cleanup_del_res_many(
+            self.delete_zone, self.zones(), **cleanup_kwargs)
         # Unset all floatingIPs
         # NOTE: FloatingIPs are not cleaned when filters are set
-        for obj in self.floating_ips():
-            self._service_cleanup_del_res(
-                self.unset_floating_ip,
-                obj,
-                dry_run=dry_run,
-                client_status_queue=client_status_queue,
-                identified_resources=identified_resources,
-                filters=filters,
-                resource_evaluation_fn=resource_evaluation_fn)
+        self._service_cleanup_del_res_many(
+            self.unset_floating_ip, self.floating_ips(), **cleanup_kwargs)
@@ -152,7 +152,8 @@ class BaseImageProxy(proxy.Proxy, metaclass=abc.ABCMeta):
                 'direct binary object')
         if not (md5 or sha256) and validate_checksum:
             if filename:
-                (md5, sha256) = utils._get_file_hashes(filename)
+                (md5, sha256) = utils._get_file_hashes(
+                    filename, cache=self._connection._file_hash_cache)
             elif data and isinstance(data, bytes):
                 (md5, sha256) = utils._calculate_data_hashes(data)
         if allow_duplicates:
@@ -11,6 +11,7 @@
 # under the License.
 import io
 
+from openstack import _download
 from openstack import exceptions
 from openstack import utils
 
@@ -25,11 +26,15 @@ def _verify_checksum(md5, checksum):
 
 class DownloadMixin:
 
-    def download(self, session, stream=False, output=None, chunk_size=1024):
+    def download(self, session, stream=False, output=None,
+                 chunk_size=_download.DEFAULT_CHUNK_SIZE, max_workers=None):
         """Download the data contained in an image"""
-        # TODO(briancurtin): This method should probably offload the get
-        # operation into another thread or something of that nature.
         url = utils.urljoin(self.base_path, self.id, 'file')
+        if (max_workers and max_workers > 1 and isinstance(output, str)
+                and _download.is_supported()):
+            return self._download_parallel(
+                session, url, output, chunk_size, max_workers)
+
         resp = session.get(url, stream=stream)
 
         # See the following bug report for details on why the checksum
@@ -79,3 +84,22 @@ class DownloadMixin:
                 "Unable to verify the integrity of image %s", (self.id))
 
         return resp
+
+    def _download_parallel(self, session, url, output, chunk_size,
+                           max_workers):
+        details = self
+        if self.size is None:
+            details = self.fetch(session)
+        try:
+            _download.download_parts(
+                session, output, details.size,
+                _download.split_ranges(url, details.size),
+                max_workers=max_workers, chunk_size=chunk_size,
+                checksum=details.checksum)
+        except Exception as e:
+            raise exceptions.SDKException(
+                "Unable to download image: %s" % e)
+        if not details.checksum:
+            session.log.warning(
+                "Unable to verify the integrity of image %s", (self.id))
+        return details
@@ -12,11 +12,18 @@
 #
 
 
+import os
+
+from openstack import utils
+
+
 class IterableChunkedFile:
     """File object chunk iterator using yield.
 
     Represents a local file as an iterable object by splitting the file
     into chunks. Avoids the file from being completely loaded into memory.
+    Regular files are memory mapped and the chunks are :class:`memoryview`
+    slices of the mapping, so large chunks are not copied into new buffers.
     """
 
     def __init__(self, file_object, chunk_size=1024 * 1024 * 128, close=False):
@@ -24,13 +31,40 @@ class IterableChunkedFile:
         self.file_object = file_object
         self.chunk_size = chunk_size
 
+    def _map(self):
+        try:
+            fileno = self.file_object.fileno()
+            position = self.file_object.tell()
+            length = os.fstat(fileno).st_size - position
+            return utils._FileMapping(fileno, position, length)
+        except (AttributeError, OSError, ValueError):
+            # Pipes, empty files or in-memory buffers
+            return None
+
+    def _iter_mapped(self, mapping):
+        try:
+            for start in range(0, mapping.length, self.chunk_size):
+                mapping.release(start)
+                yield mapping.slice(start, start + self.chunk_size)
+            # Leave the file at its end, as when it is read
+            self.file_object.seek(0, os.SEEK_END)
+        finally:
+            mapping.close()
+
+    def _iter_read(self):
+        while True:
+            data = self.file_object.read(self.chunk_size)
+            if not data:
+                break
+            yield data
+
     def __iter__(self):
         try:
-            while True:
-                data = self.file_object.read(self.chunk_size)
-                if not data:
-                    break
-                yield data
+            mapping = self._map()
+            if mapping is None:
+                yield from self._iter_read()
+            else:
+                yield from self._iter_mapped(mapping)
         finally:
             if self.close_after_read:
                 self.file_object.close()
@@ -11,6 +11,7 @@
 # under the License.
 import warnings
 
+from openstack import _download
 from openstack.cloud import exc
 from openstack import exceptions
 from openstack.image import _base_proxy
@@ -181,7 +182,7 @@ class Proxy(_base_proxy.BaseImageProxy):
         return self._update(_image.Image, image, **attrs)
 
     def download_image(self, image, stream=False, output=None,
-                       chunk_size=1024):
+                       chunk_size=_download.DEFAULT_CHUNK_SIZE):
         """Download an image
 
         This will download an image to memory when ``stream=False``, or allow
@@ -208,7 +209,7 @@ class Proxy(_base_proxy.BaseImageProxy):
             contents of the response.
         :param output: Either a file object or a path to store data into.
         :param int chunk_size: size in bytes to read from the wire and buffer
-            at one time. Defaults to 1024
+            at one time. Defaults to 1 MiB
 
         :returns: When output is not given - the bytes comprising the given
             Image when stream is False, otherwise a :class:`requests.Response`
@@ -10,9 +10,12 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 
+import os
 import time
 import warnings
 
+from openstack import _download
+from openstack.cloud import _utils
 from openstack import exceptions
 from openstack.image import _base_proxy
 from openstack.image.v2 import image as _image
@@ -136,10 +139,15 @@ class Proxy(_base_proxy.BaseImageProxy):
                                           .format(status=image.status))
 
         if filename:
-            image.data = open(filename, 'rb')
+            image.data = _utils.FileSegment(
+                filename, 0, os.path.getsize(filename))
         elif data:
             image.data = data
-        image.stage(self)
+        try:
+            image.stage(self)
+        finally:
+            if filename:
+                image.data.close()
 
         # Stage does not return content, but updates the object
         image.fetch(self)
@@ -263,8 +271,11 @@ class Proxy(_base_proxy.BaseImageProxy):
         all_stores_must_succeed=None,
         **image_kwargs,
     ):
-        if filename and not data:
-            image_data = open(filename, 'rb')
+        # Only close the file opened here, not data owned by the caller
+        opened = bool(filename and not data)
+        if opened:
+            image_data = _utils.FileSegment(
+                filename, 0, os.path.getsize(filename))
         else:
             image_data = data
 
@@ -301,8 +312,8 @@ class Proxy(_base_proxy.BaseImageProxy):
             if validate_checksum and (md5 or sha256):
                 # Verify that the hash computed remotely matches the local
                 # value
-                data = image.fetch(self)
-                checksum = data.get('checksum')
+                uploaded = image.fetch(self)
+                checksum = uploaded.get('checksum')
                 if checksum:
                     valid = (checksum == md5 or checksum == sha256)
                     if not valid:
@@ -312,6 +323,9 @@ class Proxy(_base_proxy.BaseImageProxy):
                 "Deleting failed upload of image %s", name)
             self.delete_image(image.id)
             raise
+        finally:
+            if opened:
+                image_data.close()
 
         return image
 
@@ -410,7 +424,8 @@ class Proxy(_base_proxy.BaseImageProxy):
         return _image.Image.existing(connection=self._connection, **kwargs)
 
     def download_image(self, image, stream=False, output=None,
-                       chunk_size=1024):
+                       chunk_size=_download.DEFAULT_CHUNK_SIZE,
+                       max_workers=None):
         """Download an image
 
         This will download an image to memory when ``stream=False``, or allow
@@ -437,7 +452,10 @@ class Proxy(_base_proxy.BaseImageProxy):
             contents of the response.
         :param output: Either a file object or a path to store data into.
         :param int chunk_size: size in bytes to read from the wire and buffer
-            at one time. Defaults to 1024
+            at one time. Defaults to 1 MiB
+        :param int max_workers: When ``output`` is a path, download that
+            many ranges of the image concurrently and write them in place
+            into the file. The checksum is still verified.
 
         :returns: When output is not given - the bytes comprising the given
             Image when stream is False, otherwise a :class:`requests.Response`
@@ -448,7 +466,8 @@ class Proxy(_base_proxy.BaseImageProxy):
         image = self._get_resource(_image.Image, image)
 
         return image.download(
-            self, stream=stream, output=output, chunk_size=chunk_size)
+            self, stream=stream, output=output, chunk_size=chunk_size,
+            max_workers=max_workers)
 
     def delete_image(self, image, ignore_missing=True):
         """Delete an image
@@ -780,7 +799,8 @@ class Proxy(_base_proxy.BaseImageProxy):
         for count in utils.iterate_timeout(
                 timeout=wait,
                 message=msg,
-                wait=interval):
+                wait=interval,
+                strategy=utils.get_wait_strategy(self)):
             task = task.fetch(self)
 
             if not task:
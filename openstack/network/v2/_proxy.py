@@ -87,9 +87,12 @@ class Proxy(proxy.Proxy):
             rv = res.delete(self, if_revision=if_revision)
         except exceptions.ResourceNotFound:
             if ignore_missing:
+                # It might still be cached
+                self._notify_write('delete', res)
                 return None
             raise
 
+        self._notify_write('delete', res)
         return rv
 
     def create_address_group(self, **attrs):
@@ -5082,32 +5085,38 @@ class Proxy(proxy.Proxy):
 
     def _service_cleanup(self, dry_run=True, client_status_queue=None,
                          identified_resources=None,
-                         filters=None, resource_evaluation_fn=None):
+                         filters=None, resource_evaluation_fn=None,
+                         max_concurrency=1, rate_limiter=None,
+                         errors=None, wait_timeout=120):
         project_id = self.get_project_id()
         # Delete floating_ips in the project if no filters defined OR all
         # filters are matching and port_id is empty
-        for obj in self.ips(project_id=project_id):
-            self._service_cleanup_del_res(
-                self.delete_ip,
-                obj,
-                dry_run=dry_run,
-                client_status_queue=client_status_queue,
-                identified_resources=identified_resources,
-                filters=filters,
-                resource_evaluation_fn=fip_cleanup_evaluation)
+        self._service_cleanup_del_res_many(
+            self.delete_ip,
+            self.ips(project_id=project_id),
+            max_concurrency=max_concurrency,
+            dry_run=dry_run,
+            client_status_queue=client_status_queue,
+            identified_resources=identified_resources,
+            filters=filters,
+            resource_evaluation_fn=fip_cleanup_evaluation,
+            rate_limiter=rate_limiter,
+            errors=errors)
 
         # Delete (try to delete) all security groups in the project
         # Let's hope we can't drop SG in use
-        for obj in self.security_groups(project_id=project_id):
-            if obj.name != 'default':
-                self._service_cleanup_del_res(
-                    self.delete_security_group,
-                    obj,
-                    dry_run=dry_run,
-                    client_status_queue=client_status_queue,
-                    identified_resources=identified_resources,
-                    filters=filters,
-                    resource_evaluation_fn=resource_evaluation_fn)
+        self._service_cleanup_del_res_many(
+            self.delete_security_group,
+            (obj for obj in self.security_groups(project_id=project_id)
+             if obj.name != 'default'),
+            max_concurrency=max_concurrency,
+            dry_run=dry_run,
+            client_status_queue=client_status_queue,
+            identified_resources=identified_resources,
+            filters=filters,
+            resource_evaluation_fn=resource_evaluation_fn,
+            rate_limiter=rate_limiter,
+            errors=errors)
 
         # Networks are crazy, try to delete router+net+subnet
         # if there are no "other" ports allocated on the net
@@ -5156,12 +5165,16 @@ class Proxy(proxy.Proxy):
                 if client_status_queue:
                     client_status_queue.put(port)
                 if not dry_run:
+                    if rate_limiter is not None:
+                        rate_limiter.wait()
                     try:
                         self.remove_interface_from_router(
                             router=port.device_id,
                             port_id=port.id)
-                    except exceptions.SDKException:
-                        self.log.error('Cannot delete object %s' % obj)
+                    except exceptions.SDKException as e:
+                        self.log.error('Cannot delete object %s' % port)
+                        if errors is not None:
+                            errors.append((port, e))
                 # router disconnected, drop it
                 self._service_cleanup_del_res(
                     self.delete_router,
@@ -5170,20 +5183,21 @@ class Proxy(proxy.Proxy):
                     client_status_queue=client_status_queue,
                     identified_resources=identified_resources,
                     filters=None,
-                    resource_evaluation_fn=None)
+                    resource_evaluation_fn=None,
+                    rate_limiter=rate_limiter,
+                    errors=errors)
             # Drop all subnets in the net (no further conditions)
-            for obj in self.subnets(
-                project_id=project_id,
-                network_id=net.id
-            ):
-                self._service_cleanup_del_res(
-                    self.delete_subnet,
-                    obj,
-                    dry_run=dry_run,
-                    client_status_queue=client_status_queue,
-                    identified_resources=identified_resources,
-                    filters=None,
-                    resource_evaluation_fn=None)
+            self._service_cleanup_del_res_many(
+                self.delete_subnet,
+                self.subnets(project_id=project_id, network_id=net.id),
+                max_concurrency=max_concurrency,
+                dry_run=dry_run,
+                client_status_queue=client_status_queue,
+                identified_resources=identified_resources,
+                filters=None,
+                resource_evaluation_fn=None,
+                rate_limiter=rate_limiter,
+                errors=errors)
 
             # And now the network itself (we are here definitely only if we
             # need that)
@@ -5194,7 +5208,9 @@ class Proxy(proxy.Proxy):
                 client_status_queue=client_status_queue,
                 identified_resources=identified_resources,
                 filters=None,
-                resource_evaluation_fn=None)
+                resource_evaluation_fn=None,
+                rate_limiter=rate_limiter,
+                errors=errors)
 
         # It might happen, that we have routers not attached to anything
         for obj in self.routers():
@@ -5207,7 +5223,9 @@ class Proxy(proxy.Proxy):
                     client_status_queue=client_status_queue,
                     identified_resources=identified_resources,
                     filters=None,
-                    resource_evaluation_fn=None)
+                    resource_evaluation_fn=None,
+                    rate_limiter=rate_limiter,
+                    errors=errors)
 
 
 def fip_cleanup_evaluation(obj, identified_resources=None, filters=None):
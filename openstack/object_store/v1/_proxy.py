@@ -19,9 +19,11 @@ import os
 import time
 from urllib import parse
 
+from openstack import _download
 from openstack import _log
 from openstack.cloud import _utils
 from openstack import exceptions
+from openstack.object_store.v1 import _upload
 from openstack.object_store.v1 import account as _account
 from openstack.object_store.v1 import container as _container
 from openstack.object_store.v1 import info as _info
@@ -230,8 +232,9 @@ class Proxy(proxy.Proxy):
         raise ValueError("container must be specified")
 
     def get_object(
-        self, obj, container=None, resp_chunk_size=1024,
-        outfile=None, remember_content=False
+        self, obj, container=None,
+        resp_chunk_size=_download.DEFAULT_CHUNK_SIZE,
+        outfile=None, remember_content=False, max_workers=None,
     ):
         """Get the data associated with an object
 
@@ -241,7 +244,7 @@ class Proxy(proxy.Proxy):
             :class:`~openstack.object_store.v1.container.Container` instance.
         :param int resp_chunk_size: chunk size of data to read. Only used if
             the results are being written to a file or stream is True.
-            (optional, defaults to 1k)
+            (optional, defaults to 1 MiB)
         :param outfile: Write the object to a file instead of returning the
             contents. If this option is given, body in the return tuple will be
             None. outfile can either be a file path given as a string, or a
@@ -250,6 +253,11 @@ class Proxy(proxy.Proxy):
             as `data` property of the Object. When left as `false` and
             `outfile` is not defined data will not be saved and need to be
             fetched separately.
+        :param int max_workers: When ``outfile`` is a path, download that many
+            parts of the object concurrently and write them in place into the
+            file. Ranges of the object are downloaded, or the segments of
+            static and dynamic large objects. Checksums are verified as the
+            parts complete.
 
         :returns: Instance of the
             :class:`~openstack.object_store.v1.obj.Object` objects.
@@ -264,6 +272,11 @@ class Proxy(proxy.Proxy):
             container=container_name)
         request = _object._prepare_request()
 
+        if (max_workers and max_workers > 1 and isinstance(outfile, str)
+                and _download.is_supported()):
+            return self._download_object_parallel(
+                _object, request.url, outfile, resp_chunk_size, max_workers)
+
         get_stream = (outfile is not None)
 
         response = self.get(
@@ -291,6 +304,55 @@ class Proxy(proxy.Proxy):
 
         return _object
 
+    def _download_object_parallel(
+            self, _object, url, outfile, chunk_size, max_workers):
+        _object = _object.head(self)
+        checksum = None
+        parts = None
+        if _object.is_static_large_object:
+            parts = self._get_slo_download_parts(url)
+        elif _object.object_manifest:
+            parts = self._get_dlo_download_parts(_object.object_manifest)
+        if parts is None:
+            # The etag of large objects is not the md5 of their content
+            if not _object.is_static_large_object:
+                checksum = _object.etag
+            parts = _download.split_ranges(url, _object.content_length)
+        _download.download_parts(
+            self, outfile, sum(part.length for part in parts), parts,
+            max_workers=max_workers, chunk_size=chunk_size,
+            checksum=checksum)
+        return _object
+
+    def _get_slo_download_parts(self, url):
+        response = self.get(url, params={'multipart-manifest': 'get'})
+        exceptions.raise_from_response(response)
+        parts = []
+        offset = 0
+        for segment in response.json():
+            if 'range' in segment:
+                # Only part of the segment is used, fetch ranges instead
+                return None
+            parts.append(_download.Part(
+                parse.quote(segment['name'].lstrip('/')), offset,
+                segment['bytes'],
+                # The hash of nested manifests is not the md5 of the data
+                md5=None if segment.get('sub_slo') else segment['hash']))
+            offset += segment['bytes']
+        return parts
+
+    def _get_dlo_download_parts(self, object_manifest):
+        container, prefix = parse.unquote(object_manifest).split('/', 1)
+        parts = []
+        offset = 0
+        for segment in self.objects(container, prefix=prefix):
+            parts.append(_download.Part(
+                parse.quote('{container}/{name}'.format(
+                    container=container, name=segment.name)),
+                offset, segment.content_length, md5=segment.etag))
+            offset += segment.content_length
+        return parts
+
     def download_object(self, obj, container=None, **attrs):
         """Download the data contained inside an object.
 
@@ -308,7 +370,8 @@ class Proxy(proxy.Proxy):
             _obj.Object, obj, container=container_name, **attrs)
         return obj.download(self)
 
-    def stream_object(self, obj, container=None, chunk_size=1024, **attrs):
+    def stream_object(self, obj, container=None,
+                      chunk_size=_download.DEFAULT_CHUNK_SIZE, **attrs):
         """Stream the data contained inside an object.
 
         :param obj: The value can be the name of an object or a
@@ -331,6 +394,8 @@ class Proxy(proxy.Proxy):
             md5=None, sha256=None, segment_size=None,
             use_slo=True, metadata=None,
             generate_checksums=None, data=None,
+            stream_checksums=False, resumable=False,
+            max_concurrency=None, max_inflight_bytes=None,
             **headers):
         """Create a file object.
 
@@ -362,6 +427,21 @@ class Proxy(proxy.Proxy):
             uploads of identical data. (optional, defaults to True)
         :param metadata: This dict will get changed into headers that set
             metadata of the object
+        :param stream_checksums: When the checksums have to be generated and
+            the object does not exist yet, compute them while uploading the
+            file rather than reading the whole file beforehand. They are then
+            sent with the large object manifest, or set with an additional
+            metadata request for objects uploaded at once.
+            (optional, defaults to False)
+        :param resumable: Keep a journal of the segments of a large object
+            uploaded so far in the cache directory, so that calling this again
+            after the upload was interrupted only uploads the missing
+            segments. (optional, defaults to False)
+        :param max_concurrency: Maximum number of segments of a large object
+            uploaded at the same time. (optional, defaults to 5)
+        :param max_inflight_bytes: Maximum total size of the segments of a
+            large object being uploaded at the same time. (optional, defaults
+            to no limit besides ``max_concurrency``)
 
         :raises: ``OpenStackCloudException`` on operation error.
         """
@@ -386,18 +466,21 @@ class Proxy(proxy.Proxy):
         if not filename and data is None:
             filename = name
 
+        hash_cache = self._connection._file_hash_cache
         if generate_checksums and (md5 is None or sha256 is None):
-            (md5, sha256) = utils._get_file_hashes(filename)
-        if md5:
-            metadata[self._connection._OBJECT_MD5_KEY] = md5
-        if sha256:
-            metadata[self._connection._OBJECT_SHA256_KEY] = sha256
+            if stream_checksums:
+                (md5, sha256) = utils._get_cached_file_hashes(
+                    filename, hash_cache) or (None, None)
+            else:
+                (md5, sha256) = utils._get_file_hashes(
+                    filename, cache=hash_cache)
 
         container_name = self._get_container_name(container=container)
         endpoint = '{container}/{name}'.format(container=container_name,
                                                name=name)
 
         if data is not None:
+            self._set_checksum_metadata(metadata, md5, sha256)
             self.log.debug(
                 "swift uploading data to %(endpoint)s",
                 {'endpoint': endpoint})
@@ -419,18 +502,35 @@ class Proxy(proxy.Proxy):
                 "swift uploading %(filename)s to %(endpoint)s",
                 {'filename': filename, 'endpoint': endpoint})
 
+            if generate_checksums and md5 is None:
+                # The stale check may have hashed the file already
+                (md5, sha256) = utils._get_cached_file_hashes(
+                    filename, hash_cache) or (None, None)
+            stream = generate_checksums and md5 is None
+            upload_options = dict(
+                resumable=resumable, max_concurrency=max_concurrency,
+                max_inflight_bytes=max_inflight_bytes)
+            self._set_checksum_metadata(metadata, md5, sha256)
+
             if metadata is not None:
                 # Rely on the class headers calculation for requested metadata
                 meta_headers = _obj.Object()._calculate_headers(metadata)
                 headers.update(meta_headers)
 
-            if file_size <= segment_size:
-                self._upload_object(endpoint, filename, headers)
+            if file_size <= segment_size and stream:
+                self._upload_object_streaming_checksums(
+                    endpoint, filename, headers, file_size)
+
+            elif file_size <= segment_size:
+                self._upload_object(endpoint, filename, headers, file_size)
 
             else:
+                # When streaming, the segments are hashed as they are
+                # uploaded, the checksums are only needed for the manifest.
                 self._upload_large_object(
                     endpoint, filename, headers,
-                    file_size, segment_size, use_slo)
+                    file_size, segment_size, use_slo,
+                    stream_checksums=stream, **upload_options)
 
     # Backwards compat
     upload_object = create_object
@@ -536,8 +636,8 @@ class Proxy(proxy.Proxy):
             return True
 
         if not (file_md5 or file_sha256):
-            (file_md5, file_sha256) = \
-                utils._get_file_hashes(filename)
+            (file_md5, file_sha256) = utils._get_file_hashes(
+                filename, cache=self._connection._file_hash_cache)
         md5_key = metadata.get(
             self._connection._OBJECT_MD5_KEY,
             metadata.get(self._connection._SHADE_OBJECT_MD5_KEY, ''))
@@ -560,19 +660,21 @@ class Proxy(proxy.Proxy):
             {'container': container, 'name': name})
         return False
 
+    def _set_checksum_metadata(self, metadata, md5, sha256):
+        if md5:
+            metadata[self._connection._OBJECT_MD5_KEY] = md5
+        if sha256:
+            metadata[self._connection._OBJECT_SHA256_KEY] = sha256
+
     def _upload_large_object(
             self, endpoint, filename,
-            headers, file_size, segment_size, use_slo):
+            headers, file_size, segment_size, use_slo,
+            stream_checksums=False, resumable=False, max_concurrency=None,
+            max_inflight_bytes=None):
         # If the object is big, we need to break it up into segments that
         # are no larger than segment_size, upload each of them individually
-        # and then upload a manifest object. The segments can be uploaded in
-        # parallel, so we'll use the async feature of the TaskManager.
-
-        segment_futures = []
-        segment_results = []
-        retry_results = []
-        retry_futures = []
-        manifest = []
+        # and then upload a manifest object. The segments are uploaded in
+        # parallel by the SegmentUploader.
 
         # Get an OrderedDict with keys being the swift location for the
         # segment, the value a FileSegment file-like object that is a
@@ -580,56 +682,64 @@ class Proxy(proxy.Proxy):
         segments = self._get_file_segments(
             endpoint, filename, file_size, segment_size)
 
-        # Schedule the segments for upload
+        journal = None
+        if resumable:
+            journal = _upload.UploadJournal.open(
+                os.path.join(
+                    self._connection.config.get_cache_path(),
+                    'object-uploads'),
+                endpoint, filename, segment_size)
+
+        hasher = None
+        if stream_checksums:
+            stat_key = utils._get_file_stat_key(filename)
+            hasher = _upload.SegmentHasher(
+                segments, buffer_size=max_inflight_bytes)
+
+        try:
+            etags = _upload.SegmentUploader(
+                self, headers,
+                max_concurrency=max_concurrency,
+                max_inflight_bytes=max_inflight_bytes,
+                journal=journal,
+                hasher=hasher,
+            ).upload(segments)
+        finally:
+            if journal is not None:
+                journal.close()
+
+        manifest = []
         for name, segment in segments.items():
-            # Async call to put - schedules execution and returns a future
-            segment_future = self._connection._pool_executor.submit(
-                self.put,
-                name, headers=headers, data=segment,
-                raise_exc=False)
-            segment_futures.append(segment_future)
-            # TODO(mordred) Collect etags from results to add to this manifest
-            # dict. Then sort the list of dicts by path.
-            manifest.append(dict(
+            entry = dict(
                 # While Object Storage usually expects the name to be
                 # urlencoded in most requests, the SLO manifest requires
                 # plain object names instead.
                 path='/{name}'.format(name=parse.unquote(name)),
-                size_bytes=segment.length))
-
-        # Try once and collect failed results to retry
-        segment_results, retry_results = self._connection._wait_for_futures(
-            segment_futures, raise_on_error=False)
-
-        self._add_etag_to_manifest(segment_results, manifest)
-
-        for result in retry_results:
-            # Grab the FileSegment for the failed upload so we can retry
-            name = self._object_name_from_url(result.url)
-            segment = segments[name]
-            segment.seek(0)
-            # Async call to put - schedules execution and returns a future
-            segment_future = self._connection._pool_executor.submit(
-                self.put,
-                name, headers=headers, data=segment)
-            # TODO(mordred) Collect etags from results to add to this manifest
-            # dict. Then sort the list of dicts by path.
-            retry_futures.append(segment_future)
-
-        # If any segments fail the second time, just throw the error
-        segment_results, retry_results = self._connection._wait_for_futures(
-            retry_futures, raise_on_error=True)
-
-        self._add_etag_to_manifest(segment_results, manifest)
+                size_bytes=segment.length)
+            if etags.get(name):
+                entry['etag'] = etags[name]
+            manifest.append(entry)
+
+        if hasher is not None:
+            hashes = hasher.hexdigests()
+            utils._set_cached_file_hashes(
+                filename, self._connection._file_hash_cache, stat_key, hashes)
+            metadata = {}
+            self._set_checksum_metadata(metadata, *hashes)
+            headers = dict(
+                headers, **_obj.Object()._calculate_headers(metadata))
 
         try:
             if use_slo:
-                return self._finish_large_object_slo(
+                result = self._finish_large_object_slo(
                     endpoint, headers, manifest)
             else:
-                return self._finish_large_object_dlo(
+                result = self._finish_large_object_dlo(
                     endpoint, headers)
         except Exception:
+            if journal is not None:
+                # The segments are removed below
+                journal.discard()
             try:
                 segment_prefix = endpoint.split('/')[-1]
                 self.log.debug(
@@ -642,6 +752,9 @@ class Proxy(proxy.Proxy):
                     "Failed to cleanup image objects for %s:",
                     segment_prefix)
             raise
+        if journal is not None:
+            journal.discard()
+        return result
 
     def _finish_large_object_slo(self, endpoint, headers, manifest):
         # TODO(mordred) send an etag of the manifest, which is the md5sum
@@ -673,10 +786,39 @@ class Proxy(proxy.Proxy):
                 if retries == 0:
                     raise
 
-    def _upload_object(self, endpoint, filename, headers):
-        with open(filename, 'rb') as dt:
-            return self.put(
-                endpoint, headers=headers, data=dt)
+    def _upload_object(self, endpoint, filename, headers, file_size):
+        segment = _utils.FileSegment(filename, 0, file_size)
+        try:
+            return self.put(endpoint, headers=headers, data=segment)
+        finally:
+            segment.close()
+
+    def _upload_object_streaming_checksums(
+            self, endpoint, filename, headers, file_size):
+        stat_key = utils._get_file_stat_key(filename)
+        hasher = utils._DataHasher()
+        segment = _utils.FileSegment(filename, 0, file_size)
+        try:
+            response = self.put(
+                endpoint, headers=headers,
+                data=utils._HashingReader(segment, hasher, file_size))
+        finally:
+            segment.close()
+        exceptions.raise_from_response(response)
+        hashes = hasher.hexdigests()
+        utils._set_cached_file_hashes(
+            filename, self._connection._file_hash_cache, stat_key, hashes)
+        # Setting object metadata replaces all of it, so send all the headers
+        # of the upload again, except those about its data
+        post_headers = {
+            k: v for k, v in headers.items()
+            if k.lower() not in ('content-length', 'etag')
+        }
+        checksums = {}
+        self._set_checksum_metadata(checksums, *hashes)
+        post_headers.update(_obj.Object()._calculate_headers(checksums))
+        return exceptions.raise_from_response(self.post(
+            endpoint, headers=post_headers))
 
     def _get_file_segments(self, endpoint, filename, file_size, segment_size):
         # Use an ordered dict here so that testing can replicate things
@@ -728,17 +870,6 @@ class Proxy(proxy.Proxy):
             object_name = object_name[1:]
         return object_name
 
-    def _add_etag_to_manifest(self, segment_results, manifest):
-        for result in segment_results:
-            if 'Etag' not in result.headers:
-                continue
-            name = self._object_name_from_url(result.url)
-            for entry in manifest:
-                if entry['path'] == '/{name}'.format(
-                        name=parse.unquote(name)
-                ):
-                    entry['etag'] = result.headers['Etag']
-
     def get_info(self):
         """Get infomation about the object-storage service
 
@@ -0,0 +1,412 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+"""Upload of the segments of large objects."""
+
+import collections
+import concurrent.futures
+import hashlib
+import heapq
+import itertools
+import json
+import os
+import threading
+import time
+
+import keystoneauth1
+
+from openstack import exceptions
+from openstack import utils
+
+#: Default number of segments of one object uploaded concurrently.
+DEFAULT_MAX_CONCURRENCY = 5
+#: Default number of attempts made to upload a segment after it failed.
+DEFAULT_RETRIES = 3
+#: Delay in seconds before the first retry, doubled for every other one.
+DEFAULT_BACKOFF = 0.5
+#: Maximum delay in seconds between two attempts.
+MAX_BACKOFF = 30
+#: Default number of bytes of segments kept in memory until the checksums
+#: reach them.
+DEFAULT_HASH_BUFFER_SIZE = 64 * 1024 * 1024
+
+
+def _strip_etag(etag):
+    return etag.strip('"') if etag else etag
+
+
+def _is_retriable(error):
+    """Whether an upload which failed with ``error`` may succeed later."""
+    if isinstance(error, keystoneauth1.exceptions.RetriableConnectionFailure):
+        return True
+    status_code = getattr(error, 'status_code', None)
+    return status_code is not None and (
+        status_code >= 500 or status_code in (408, 429))
+
+
+class UploadJournal:
+    """Record of the segments of a large object already uploaded.
+
+    The journal is an append-only file of one JSON document per uploaded
+    segment. Its name is derived from the destination, the file and its
+    modification time, so an upload interrupted for whatever reason can be
+    resumed with the same arguments, while changing the file starts afresh.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.etags = {}
+        self._file = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def open(cls, directory, endpoint, filename, segment_size):
+        stat = os.stat(filename)
+        key = hashlib.sha256(json.dumps([
+            endpoint, os.path.abspath(filename), stat.st_size,
+            stat.st_mtime_ns, stat.st_ino, segment_size,
+        ]).encode('utf-8')).hexdigest()
+        journal = cls(os.path.join(directory, key + '.journal'))
+        try:
+            with open(journal.path) as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        # Last write torn by the interruption
+                        break
+                    journal.etags[entry['name']] = entry['etag']
+        except FileNotFoundError:
+            pass
+        os.makedirs(directory, exist_ok=True)
+        journal._file = open(journal.path, 'a')
+        return journal
+
+    def record(self, name, etag):
+        with self._lock:
+            self.etags[name] = etag
+            self._file.write(json.dumps(dict(name=name, etag=etag)) + '\n')
+            self._file.flush()
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def discard(self):
+        """Close and remove the journal once the upload is complete."""
+        self.close()
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+
+
+class _HashedSegment:
+    """Segment handing the data read from it over to a SegmentHasher."""
+
+    def __init__(self, segment, hasher, index):
+        self._segment = segment
+        self._hasher = hasher
+        self._index = index
+
+    def __getattr__(self, name):
+        return getattr(self._segment, name)
+
+    def read(self, size=-1):
+        offset = self._segment.tell()
+        chunk = self._segment.read(size)
+        if chunk:
+            self._hasher._add(self._index, offset, chunk)
+        return chunk
+
+
+def _new_data(chunk, offset, end):
+    """Return the part of ``chunk`` read at ``offset`` following ``end``."""
+    if offset <= end < offset + len(chunk):
+        return chunk[end - offset:]
+    return None
+
+
+class SegmentHasher:
+    """Compute the checksums of a file from its segments being uploaded.
+
+    The md5 and sha256 digests of the whole file need its data in order,
+    while the segments are uploaded concurrently. The data read to upload
+    the segment the digests are at is hashed right away, the data of the
+    following segments is kept until their turn comes, up to
+    ``buffer_size`` bytes. Only the data which did not fit, and the segments
+    which were not read at all, such as those already uploaded by a resumed
+    upload, are read from the file again.
+
+    The segments uploaded are hashed in order on a thread of the hasher, so
+    that reading a segment from the file again holds neither the uploads
+    nor the data read from the following segments.
+
+    :param segments: Mapping of segment names to
+        :class:`~openstack.cloud._utils.FileSegment` objects, in the order of
+        the file.
+    :param buffer_size: Maximum number of bytes kept in memory.
+    """
+
+    def __init__(self, segments, buffer_size=None):
+        self._segments = list(segments.values())
+        self._indexes = {name: i for i, name in enumerate(segments)}
+        self._buffer_size = buffer_size or DEFAULT_HASH_BUFFER_SIZE
+        self._hasher = utils._DataHasher()
+        self._lock = threading.Lock()
+        # Segment being hashed and number of its bytes hashed
+        self._index = 0
+        self._offset = 0
+        # index -> [number of bytes, chunks] of the data kept from the start
+        # of the following segments
+        self._pending = {}
+        self._buffered = 0
+        self._uploaded = set()
+        self._executor = None
+        self._futures = []
+
+    def wrap(self, name, segment):
+        """Return ``segment`` hashing the data read from it."""
+        return _HashedSegment(segment, self, self._indexes[name])
+
+    def _add(self, index, offset, chunk):
+        with self._lock:
+            if index == self._index:
+                # Data read again by a retry is hashed already, data after
+                # a gap is read from the file again once uploaded.
+                chunk = _new_data(chunk, offset, self._offset)
+                if chunk:
+                    self._hasher.update(chunk)
+                    self._offset += len(chunk)
+            elif index > self._index:
+                pending = self._pending.setdefault(index, [0, []])
+                chunk = _new_data(chunk, offset, pending[0])
+                if (
+                    chunk
+                    and self._buffered + len(chunk) <= self._buffer_size
+                ):
+                    pending[0] += len(chunk)
+                    pending[1].append(chunk)
+                    self._buffered += len(chunk)
+
+    def _hash_file(self, segment, offset):
+        with open(segment.filename, 'rb') as file_obj:
+            file_obj.seek(segment.offset + offset)
+            remaining = segment.length - offset
+            while remaining > 0:
+                chunk = file_obj.read(
+                    min(remaining, utils._HASH_CHUNK_SIZE))
+                if not chunk:
+                    raise exceptions.SDKException(
+                        "File {filename} was truncated while being"
+                        " uploaded".format(filename=segment.filename))
+                self._hasher.update(chunk)
+                remaining -= len(chunk)
+
+    def _hash_uploaded(self, index):
+        # Only run on the thread of the hasher, one segment at a time
+        with self._lock:
+            self._uploaded.add(index)
+        while True:
+            with self._lock:
+                if self._index not in self._uploaded:
+                    return
+                segment = self._segments[self._index]
+                offset = self._offset
+            # The segment is uploaded, so _add does not hash any more of it
+            # and the file can be read without holding the lock.
+            if offset < segment.length:
+                self._hash_file(segment, offset)
+            with self._lock:
+                self._index += 1
+                length, chunks = self._pending.pop(self._index, (0, ()))
+                for chunk in chunks:
+                    self._hasher.update(chunk)
+                self._offset = length
+                self._buffered -= length
+
+    def _wait(self):
+        futures, self._futures = self._futures, []
+        for future in futures:
+            future.result()
+
+    def uploaded(self, name):
+        """Record that a segment was uploaded."""
+        if self._executor is None:
+            self._executor = concurrent.futures.ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix='openstack-segment-hash')
+        self._futures.append(self._executor.submit(
+            self._hash_uploaded, self._indexes[name]))
+
+    def hexdigests(self):
+        """Return the (md5, sha256) hex digests once all are uploaded."""
+        try:
+            self._wait()
+        finally:
+            if self._executor is not None:
+                self._executor.shutdown()
+                self._executor = None
+        if self._index < len(self._segments):
+            raise exceptions.SDKException(
+                "Checksums requested before all the segments were uploaded")
+        return self._hasher.hexdigests()
+
+
+class SegmentUploader:
+    """Upload segments with bounded concurrency and retries.
+
+    At most ``max_concurrency`` segments, and no more than
+    ``max_inflight_bytes`` bytes of segments, are being uploaded at any time.
+    A segment which failed on a connection error, a server error, a request
+    timeout or a rate limit is retried up to ``retries`` times, waiting for
+    an exponentially growing delay between attempts while other segments go
+    on being uploaded. Other errors are raised right away.
+
+    With a ``journal``, every uploaded segment is recorded, and segments
+    recorded by a previous attempt are only uploaded again if the etag of
+    the segment stored in the object store does not match.
+
+    :param proxy: The object store :class:`~openstack.proxy.Proxy`.
+    :param headers: Headers sent with every segment.
+    :param hasher: A :class:`SegmentHasher` computing the checksums of the
+        file from the segments being uploaded.
+    """
+
+    def __init__(
+        self,
+        proxy,
+        headers,
+        max_concurrency=None,
+        max_inflight_bytes=None,
+        retries=None,
+        backoff=None,
+        journal=None,
+        hasher=None,
+    ):
+        self.proxy = proxy
+        self.headers = headers
+        self.max_concurrency = max_concurrency or DEFAULT_MAX_CONCURRENCY
+        self.max_inflight_bytes = max_inflight_bytes
+        self.retries = DEFAULT_RETRIES if retries is None else retries
+        self.backoff = DEFAULT_BACKOFF if backoff is None else backoff
+        self.journal = journal
+        self.hasher = hasher
+
+    def _segment_uploaded(self, name, etag):
+        try:
+            response = self.proxy.head(name)
+            exceptions.raise_from_response(response)
+        except exceptions.HttpException:
+            return False
+        return _strip_etag(response.headers.get('Etag')) == _strip_etag(etag)
+
+    def _upload_segment(self, name, segment):
+        try:
+            if self.journal is not None:
+                etag = self.journal.etags.get(name)
+                if etag and self._segment_uploaded(name, etag):
+                    self.proxy.log.debug(
+                        "Segment %s already uploaded, skipping", name)
+                    return etag
+            segment.seek(0)
+            data = segment
+            if self.hasher is not None:
+                data = self.hasher.wrap(name, segment)
+            response = self.proxy.put(
+                name, headers=self.headers, data=data, raise_exc=False)
+            exceptions.raise_from_response(response)
+            etag = response.headers.get('Etag')
+            if self.journal is not None and etag:
+                self.journal.record(name, etag)
+            return etag
+        finally:
+            segment.close()
+
+    def _can_submit(self, inflight, inflight_bytes, segment):
+        if len(inflight) >= self.max_concurrency:
+            return False
+        # Always let one segment through, whatever its size
+        return (not inflight or self.max_inflight_bytes is None
+                or inflight_bytes + segment.length <= self.max_inflight_bytes)
+
+    def upload(self, segments):
+        """Upload segments.
+
+        :param segments: Mapping of segment names to
+            :class:`~openstack.cloud._utils.FileSegment` objects.
+        :returns: A dict of the etags of the segments by name.
+        :raises: The error of the last attempt of a segment which could not
+            be uploaded.
+        """
+        etags = {}
+        ready = collections.deque(
+            (name, segment, 0) for name, segment in segments.items())
+        # Heap of (time, sequence, name, segment, attempt) to retry
+        delayed = []
+        sequence = itertools.count()
+        inflight = {}
+        inflight_bytes = 0
+
+        with concurrent.futures.ThreadPoolExecutor(
+                max_workers=self.max_concurrency) as executor:
+            try:
+                while ready or delayed or inflight:
+                    while delayed and delayed[0][0] <= time.monotonic():
+                        _, _, name, segment, attempt = heapq.heappop(delayed)
+                        ready.append((name, segment, attempt))
+                    while ready and self._can_submit(
+                            inflight, inflight_bytes, ready[0][1]):
+                        name, segment, attempt = ready.popleft()
+                        future = executor.submit(
+                            self._upload_segment, name, segment)
+                        inflight[future] = (name, segment, attempt)
+                        inflight_bytes += segment.length
+
+                    timeout = None
+                    if delayed:
+                        timeout = max(0, delayed[0][0] - time.monotonic())
+                    if not inflight:
+                        time.sleep(timeout)
+                        continue
+                    done, _ = concurrent.futures.wait(
+                        inflight, timeout=timeout,
+                        return_when=concurrent.futures.FIRST_COMPLETED)
+
+                    for future in done:
+                        name, segment, attempt = inflight.pop(future)
+                        inflight_bytes -= segment.length
+                        try:
+                            etags[name] = future.result()
+                        except (keystoneauth1.exceptions.
+                                RetriableConnectionFailure,
+                                exceptions.HttpException) as e:
+                            if attempt >= self.retries or not _is_retriable(e):
+                                self.proxy.log.error(
+                                    "Failed to upload segment %s: %s",
+                                    name, e)
+                                raise
+                            delay = min(
+                                self.backoff * 2 ** attempt, MAX_BACKOFF)
+                            self.proxy.log.debug(
+                                "Failed to upload segment %s, retrying in"
+                                " %s seconds: %s", name, delay, e)
+                            heapq.heappush(delayed, (
+                                time.monotonic() + delay, next(sequence),
+                                name, segment, attempt + 1))
+                        else:
+                            if self.hasher is not None:
+                                self.hasher.uploaded(name)
+            finally:
+                for future in inflight:
+                    future.cancel()
+        return etags
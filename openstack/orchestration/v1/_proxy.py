@@ -488,19 +488,21 @@ class Proxy(proxy.Proxy):
 
     def _service_cleanup(self, dry_run=True, client_status_queue=None,
                          identified_resources=None,
-                         filters=None, resource_evaluation_fn=None):
-        stacks = []
-        for obj in self.stacks():
-            need_delete = self._service_cleanup_del_res(
-                self.delete_stack,
-                obj,
-                dry_run=dry_run,
-                client_status_queue=client_status_queue,
-                identified_resources=identified_resources,
-                filters=filters,
-                resource_evaluation_fn=resource_evaluation_fn)
-            if not dry_run and need_delete:
-                stacks.append(obj)
-
-        for stack in stacks:
-            self.wait_for_delete(stack)
+                         filters=None, resource_evaluation_fn=None,
+                         max_concurrency=1, rate_limiter=None,
+                         errors=None, wait_timeout=120):
+        stacks = self._service_cleanup_del_res_many(
+            self.delete_stack,
+            self.stacks(),
+            max_concurrency=max_concurrency,
+            dry_run=dry_run,
+            client_status_queue=client_status_queue,
+            identified_resources=identified_resources,
+            filters=filters,
+            resource_evaluation_fn=resource_evaluation_fn,
+            rate_limiter=rate_limiter,
+            errors=errors)
+
+        if not dry_run:
+            self._wait_for_delete_many(
+                stacks, self.stacks, wait=wait_timeout)
@@ -10,6 +10,7 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 
+import concurrent.futures
 import functools
 import urllib
 from urllib.parse import urlparse
@@ -26,6 +27,7 @@ from keystoneauth1 import adapter
 from openstack import _log
 from openstack import exceptions
 from openstack import resource
+from openstack import utils
 
 
 # The _check_resource decorator is used on Proxy methods to ensure that
@@ -85,6 +87,7 @@ class Proxy(adapter.Adapter):
         prometheus_histogram=None,
         influxdb_config=None,
         influxdb_client=None,
+        wait_strategy=None,
         *args,
         **kwargs
     ):
@@ -100,6 +103,7 @@ class Proxy(adapter.Adapter):
         self._prometheus_histogram = prometheus_histogram
         self._influxdb_client = influxdb_client
         self._influxdb_config = influxdb_config
+        self._wait_strategy = wait_strategy
         if self.service_type:
             log_name = 'openstack.{0}'.format(self.service_type)
         else:
@@ -116,10 +120,17 @@ class Proxy(adapter.Adapter):
 
     def _invalidate_cache(self, conn, key_prefix):
         """Invalidate all cache entries starting with given prefix"""
-        for k in set(conn._api_cache_keys):
-            if k.startswith(key_prefix):
-                conn._cache.delete(k)
-                conn._api_cache_keys.remove(k)
+        conn._api_cache_keys.invalidate(key_prefix)
+
+    def _notify_write(self, action, res):
+        """Tell the write observers of the connection about a write
+
+        :param action: One of ``create``, ``update`` and ``delete``.
+        :param res: The resource written.
+        """
+        observers = getattr(self._get_connection(), '_write_observers', None)
+        if observers is not None:
+            observers.notify(action, res)
 
     def request(
         self,
@@ -137,25 +148,36 @@ class Proxy(adapter.Adapter):
             # Per-request setting should take precedence
             global_request_id = conn._global_request_id
 
-        key = None
+        if kwargs.get('json') is not None:
+            data = conn._json_codec.dumps(kwargs['json'])
+            if data is not None:
+                del kwargs['json']
+                kwargs['data'] = data
+                kwargs['headers'] = dict(kwargs.get('headers') or {})
+                kwargs['headers'].setdefault(
+                    'Content-Type', 'application/json')
+
         key_prefix = self._get_cache_key_prefix(url)
         # The caller might want to force cache bypass.
         skip_cache = kwargs.pop('skip_cache', False)
-        if conn.cache_enabled:
-            # Construct cache key. It consists of:
-            # service.name_parts.URL.str(kwargs)
-            key = '.'.join([key_prefix, url, str(kwargs)])
-
-            # Track cache key for invalidating possibility
-            conn._api_cache_keys.add(key)
+        # Get the object expiration time from config
+        # default to 0 to disable caching for this resource type
+        expiration_time = int(conn._cache_expirations.get(key_prefix, 0))
 
         try:
-            if conn.cache_enabled and not skip_cache and method == 'GET':
-                # Get the object expiration time from config
-                # default to 0 to disable caching for this resource type
-                expiration_time = int(
-                    conn._cache_expirations.get(key_prefix, 0)
-                )
+            if (
+                conn.cache_enabled
+                and expiration_time
+                and not skip_cache
+                and method == 'GET'
+            ):
+                # Construct cache key. It consists of:
+                # service.name_parts.URL.str(kwargs)
+                key = '.'.join([key_prefix, url, str(kwargs)])
+
+                # Track cache key for invalidating possibility
+                conn._api_cache_keys.add(key_prefix, key, expiration_time)
+
                 # Get from cache or execute and cache
                 response = conn._cache.get_or_create(
                     key=key,
@@ -172,9 +194,10 @@ class Proxy(adapter.Adapter):
                     expiration_time=expiration_time,
                 )
             else:
-                # invalidate cache if we send modification request or user
-                # asked for cache bypass
-                self._invalidate_cache(conn, key_prefix)
+                if method != 'GET' or skip_cache:
+                    # invalidate cache if we send modification request or
+                    # user asked for cache bypass
+                    self._invalidate_cache(conn, key_prefix)
                 # Pass through the API request bypassing cache
                 response = super(Proxy, self).request(
                     url,
@@ -188,6 +211,8 @@ class Proxy(adapter.Adapter):
             for h in response.history:
                 self._report_stats(h)
             self._report_stats(response)
+            utils.note_retry_after(response)
+            conn._json_codec.attach(response)
             return response
         except Exception as e:
             # If we want metrics to be generated we also need to generate some
@@ -519,9 +544,12 @@ class Proxy(adapter.Adapter):
             rv = res.delete(self)
         except exceptions.ResourceNotFound:
             if ignore_missing:
+                # It might still be cached
+                self._notify_write('delete', res)
                 return None
             raise
 
+        self._notify_write('delete', res)
         return rv
 
     @_check_resource(strict=False)
@@ -571,7 +599,9 @@ class Proxy(adapter.Adapter):
         """
         conn = self._get_connection()
         res = resource_type.new(connection=conn, **attrs)
-        return res.create(self, base_path=base_path)
+        res = res.create(self, base_path=base_path)
+        self._notify_write('create', res)
+        return res
 
     def _bulk_create(self, resource_type, data, base_path=None):
         """Create a resource from attributes
@@ -697,6 +727,10 @@ class Proxy(adapter.Adapter):
         identified_resources=None,
         filters=None,
         resource_evaluation_fn=None,
+        max_concurrency=1,
+        rate_limiter=None,
+        errors=None,
+        wait_timeout=120,
     ):
         return None
 
@@ -709,6 +743,8 @@ class Proxy(adapter.Adapter):
         identified_resources=None,
         filters=None,
         resource_evaluation_fn=None,
+        rate_limiter=None,
+        errors=None,
     ):
         need_delete = False
         try:
@@ -738,11 +774,83 @@ class Proxy(adapter.Adapter):
                     # identified
                     identified_resources[obj.id] = obj
                 if not dry_run:
+                    if rate_limiter is not None:
+                        rate_limiter.wait()
                     del_fn(obj)
         except Exception as e:
             self.log.exception('Cannot delete resource %s: %s', obj, str(e))
+            if errors is not None:
+                errors.append((obj, e))
         return need_delete
 
+    def _service_cleanup_del_res_many(
+        self, del_fn, objs, max_concurrency=1, **kwargs
+    ):
+        """Run :meth:`_service_cleanup_del_res` for many resources.
+
+        Up to ``max_concurrency`` resources are evaluated and deleted at the
+        same time.
+
+        :param del_fn: The function deleting a resource.
+        :param objs: The resources.
+        :param max_concurrency: The number of resources deleted concurrently.
+        :param kwargs: The other arguments of
+            :meth:`_service_cleanup_del_res`. The ``(resource, exception)``
+            of the resources which could not be deleted are appended to
+            ``errors`` when given.
+        :returns: The list of the resources which need to be deleted, in
+            the order of ``objs``.
+        """
+        def del_res(obj):
+            return self._service_cleanup_del_res(del_fn, obj, **kwargs)
+
+        objs = list(objs)
+        if max_concurrency <= 1 or len(objs) <= 1:
+            need_delete = [del_res(obj) for obj in objs]
+        else:
+            with concurrent.futures.ThreadPoolExecutor(
+                max_workers=min(max_concurrency, len(objs))
+            ) as executor:
+                need_delete = list(executor.map(del_res, objs))
+        return [obj for obj, need in zip(objs, need_delete) if need]
+
+    def _wait_for_delete_many(self, resources, list_fn, interval=2, wait=120):
+        """Wait for many resources to be deleted.
+
+        Unlike :meth:`~openstack.resource.Resource.wait_for_delete` for
+        every resource, the resources are listed once per ``interval``.
+
+        :param resources: The resources being deleted.
+        :param list_fn: A function listing the resources, including all the
+            ``resources`` which are not deleted yet.
+        :param interval: Number of seconds to wait between two listings.
+        :param wait: Maximum number of seconds to wait for the deletion.
+        :raises: :class:`~openstack.exceptions.ResourceTimeout` if some
+            resources are still listed after ``wait`` seconds.
+        """
+        pending = {res.id for res in resources}
+        if not pending:
+            return
+        try:
+            for count in utils.iterate_timeout(
+                timeout=wait,
+                message="Timeout waiting for resources to be deleted",
+                wait=interval,
+                strategy=utils.get_wait_strategy(self),
+            ):
+                pending.intersection_update(res.id for res in list_fn())
+                if not pending:
+                    return
+                self.log.debug(
+                    'Still waiting for %d resources to be deleted',
+                    len(pending))
+        except exceptions.ResourceTimeout:
+            raise exceptions.ResourceTimeout(
+                "Timeout waiting for {count} resources to be deleted:"
+                " {ids}".format(
+                    count=len(pending),
+                    ids=', '.join(sorted(str(i) for i in pending))))
+
     def _service_cleanup_resource_filters_evaluation(self, obj, filters=None):
         part_cond = []
         if filters is not None and isinstance(filters, dict):
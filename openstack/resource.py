@@ -36,6 +36,8 @@ import collections
 import inspect
 import itertools
 import operator
+import queue
+import threading
 import urllib.parse
 import warnings
 
@@ -45,6 +47,7 @@ from keystoneauth1 import discover
 import munch
 from requests import structures
 
+from openstack import _json_stream
 from openstack import _log
 from openstack import exceptions
 from openstack import format
@@ -430,6 +433,368 @@ class QueryParameters:
         return result
 
 
+def _to_dict_value(value, _to_munch=False):
+    """Convert an attribute value the way to_dict returns it."""
+    if isinstance(value, (Resource, ResourceView)):
+        return value.to_dict(_to_munch=_to_munch)
+    elif isinstance(value, dict) and _to_munch:
+        return munch.Munch(value)
+    elif value and isinstance(value, list):
+        converted = []
+        for raw in value:
+            if isinstance(raw, (Resource, ResourceView)):
+                converted.append(raw.to_dict(_to_munch=_to_munch))
+            elif isinstance(raw, dict) and _to_munch:
+                converted.append(munch.Munch(raw))
+            else:
+                converted.append(raw)
+        return converted
+    return value
+
+
+class _MappingIndex:
+    """Lookup table of the keys matching a mapping for _consume_attrs."""
+
+    def __init__(self, mapping):
+        self.names = set(mapping.values())
+        self.case_insensitive = isinstance(
+            mapping, structures.CaseInsensitiveDict
+        )
+        if self.case_insensitive:
+            self.keys = {key.lower() for key in mapping}
+        else:
+            self.keys = set(mapping)
+        #: Keys of the mapping matched by a lower case attribute name
+        self.targets = {}
+        for map_key, map_value in mapping.items():
+            for lowered in {map_key.lower(), map_value.lower()}:
+                self.targets.setdefault(lowered, []).append(map_key)
+
+    def match(self, key):
+        """Return the keys of the mapping which ``key`` stands for."""
+        if key in self.names or (
+            key.lower() if self.case_insensitive else key
+        ) in self.keys:
+            return self.targets.get(key.lower(), ())
+        return ()
+
+
+#: Methods of Resource turning the listed data into attributes. Views cannot
+#: apply what subclasses overriding them do.
+_BUILD_HOOKS = (
+    '__init__',
+    'existing',
+    '_consume_attrs',
+    '_consume_mapped_attrs',
+    '_consume_body_attrs',
+    '_consume_uri_attrs',
+)
+
+
+class _AttributeSchema:
+    """Attributes of a Resource class.
+
+    Finding the components of a Resource means walking its MRO, which used
+    to happen several times for every instance built. The components of a
+    class do not change once it is created, so everything derived from them
+    is computed once per class and shared by all of its instances.
+    """
+
+    def __init__(self, resource_cls):
+        self.resource_cls = resource_cls
+        #: (attr, component) pairs of the class and its bases, in MRO order
+        self.attributes = tuple(
+            (attr, component)
+            for klass in resource_cls.__mro__
+            for attr, component in klass.__dict__.items()
+            if isinstance(component, _BaseComponent)
+        )
+        #: Attributes by alias
+        self.aliases = {}
+        #: Body attributes by server side name
+        self.body_names = {}
+        for attr, component in self.attributes:
+            if component.aka:
+                self.aliases[component.aka] = attr
+            if isinstance(component, Body):
+                self.body_names.setdefault(component.name, attr)
+        self.alternate_id = ""
+        for value in resource_cls.__dict__.values():
+            if isinstance(value, Body) and value.alternate_id:
+                self.alternate_id = value.name
+                break
+        self._selections = {}
+        self._mappings = {}
+        self._indexes = {}
+        self._dict_keys = {}
+
+    def select(self, components):
+        """Return the (attr, component) pairs of the given component types."""
+        try:
+            return self._selections[components]
+        except KeyError:
+            pass
+        selection = tuple(
+            (attr, component)
+            for attr, component in self.attributes
+            if isinstance(component, components)
+        )
+        self._selections[components] = selection
+        return selection
+
+    def mapping(self, component):
+        """Return the mapping of server side names to attributes.
+
+        The mapping is shared by all instances and must not be modified.
+        """
+        try:
+            return self._mappings[component]
+        except KeyError:
+            pass
+        attrs = component._map_cls()
+        for key, value in self.select(component):
+            # Make sure base classes don't end up overwriting
+            # mappings we've found previously in subclasses.
+            if key not in attrs:
+                attrs[key] = value.name
+        mapping = component._map_cls()
+        for k, v in attrs.items():
+            mapping[v] = k
+        self._indexes[component] = _MappingIndex(mapping)
+        self._mappings[component] = mapping
+        return mapping
+
+    def index(self, mapping):
+        """Return the :class:`_MappingIndex` of a mapping."""
+        for component, known in self._mappings.items():
+            if known is mapping:
+                return self._indexes[component]
+        return _MappingIndex(mapping)
+
+    def dict_keys(self, components, original_names):
+        """Return the (key, attr) pairs making up the keys of to_dict."""
+        try:
+            return self._dict_keys[components, original_names]
+        except KeyError:
+            pass
+        pairs = []
+        for attr, component in self.select(components):
+            key = component.name if original_names else attr
+            for key in filter(None, (key, component.aka)):
+                if (key, attr) not in pairs:
+                    pairs.append((key, attr))
+        pairs = tuple(pairs)
+        self._dict_keys[components, original_names] = pairs
+        return pairs
+
+    @property
+    def supports_views(self):
+        """Whether views of the class see the data its resources would.
+
+        Classes overriding the methods building resources out of the listed
+        data, such as to unwrap or rename attributes, do not.
+        """
+        try:
+            return self._supports_views
+        except AttributeError:
+            pass
+        self._supports_views = all(
+            next(
+                klass for klass in self.resource_cls.__mro__
+                if name in klass.__dict__
+            ) is Resource
+            for name in _BUILD_HOOKS
+        )
+        return self._supports_views
+
+    @property
+    def view_class(self):
+        """Return the :class:`ResourceView` subclass of the class."""
+        try:
+            return self._view_class
+        except AttributeError:
+            pass
+        namespace = {
+            '__slots__': (),
+            '__module__': self.resource_cls.__module__,
+            'resource_type': self.resource_cls,
+        }
+        for attr, component in self.attributes:
+            # Subclasses come first in the MRO
+            namespace.setdefault(attr, _ViewAttribute(component))
+        for attr, component in self.attributes:
+            view_attribute = namespace[attr]
+            if component.alias and isinstance(
+                namespace.get(component.alias), _ViewAttribute
+            ):
+                view_attribute.alias = namespace[component.alias]
+            if component.aka:
+                namespace.setdefault(component.aka, view_attribute)
+        namespace['id'] = _ViewId(self.alternate_id)
+        self._view_class = type(
+            self.resource_cls.__name__ + 'View', (ResourceView,), namespace
+        )
+        return self._view_class
+
+    @property
+    def empty_dict(self):
+        """Return a dict of the keys of to_dict() with None values."""
+        try:
+            return self._empty_dict
+        except AttributeError:
+            pass
+        keys = self.dict_keys((Body, Header, Computed), False)
+        self._empty_dict = dict.fromkeys(key for key, attr in keys)
+        return self._empty_dict
+
+
+class _ViewAttribute:
+    """Read-only attribute of a ResourceView.
+
+    It reads the same data as the :class:`_BaseComponent` it stands for,
+    with the same defaults and type conversion.
+    """
+
+    def __init__(self, component):
+        self.key = component.key
+        self.name = component.name
+        self.type = component.type
+        self.list_type = component.list_type
+        self.default = component.default
+        #: The _ViewAttribute the value is read from when it is missing
+        self.alias = None
+
+    def _get(self, instance, follow_alias=True):
+        try:
+            value = getattr(instance, self.key)[self.name]
+        except KeyError:
+            if follow_alias and self.alias is not None:
+                # Do not follow the alias of the alias, which may well be
+                # this attribute.
+                return self.alias._get(instance, follow_alias=False)
+            return self.default
+        if value is None:
+            return None
+        return _convert_type(value, self.type, self.list_type)
+
+    def __get__(self, instance, owner):
+        if instance is None:
+            return self
+        return self._get(instance)
+
+    def __set__(self, instance, value):
+        raise AttributeError(
+            "{cls} objects are read-only".format(
+                cls=instance.__class__.__name__
+            )
+        )
+
+
+class _ViewId(_ViewAttribute):
+    """The id of a ResourceView, which may be an alternate id."""
+
+    def __init__(self, alternate_id):
+        super().__init__(Body('id'))
+        self.alternate_id = alternate_id
+
+    def _get(self, instance, follow_alias=True):
+        body = instance._body
+        if 'id' in body:
+            return body['id']
+        if self.alternate_id:
+            return body.get(self.alternate_id)
+        return None
+
+
+class ResourceView:
+    """Read-only view of a resource, as listed with ``lightweight=True``.
+
+    A view has the attributes of the :class:`Resource` class it is a view
+    of, with the same type conversions, but they are read from the data
+    returned by the server as they are accessed. Views do not track changes,
+    do not compute ``location`` and do not support the actions of the
+    Resource, which makes them much smaller and faster to build. Use
+    :meth:`to_resource` to get the full Resource.
+    """
+
+    __slots__ = ('_body', '_uri')
+
+    _header = {}
+    _computed = {}
+
+    #: The :class:`Resource` class this is a view of.
+    resource_type = None
+
+    def __init__(self, body, uri=None):
+        self._body = body
+        self._uri = uri if uri is not None else {}
+
+    def __repr__(self):
+        pairs = [
+            "%s=%s" % (k, v if v is not None else 'None')
+            for k, v in itertools.chain(
+                self._body.items(), self._uri.items()
+            )
+        ]
+        return "%s.%s(%s)" % (
+            self.__module__, self.__class__.__name__, ", ".join(pairs)
+        )
+
+    def __eq__(self, comparand):
+        return (
+            type(self) is type(comparand)
+            and self._body == comparand._body
+            and self._uri == comparand._uri
+        )
+
+    def __getitem__(self, name):
+        if isinstance(getattr(type(self), name, None), _ViewAttribute):
+            return getattr(self, name)
+        raise KeyError(name)
+
+    def to_dict(
+        self,
+        body=True,
+        headers=True,
+        computed=True,
+        ignore_none=False,
+        original_names=False,
+        _to_munch=False,
+    ):
+        """Return a dictionary of the contents of the view.
+
+        See :meth:`Resource.to_dict`.
+        """
+        mapping = munch.Munch() if _to_munch else {}
+        components = tuple(
+            component
+            for component, wanted in (
+                (Body, body),
+                (Header, headers),
+                (Computed, computed),
+            )
+            if wanted
+        )
+        if not components:
+            raise ValueError(
+                "At least one of `body`, `headers` or `computed` must be True"
+            )
+        schema = self.resource_type._get_schema()
+        for key, attr in schema.dict_keys(components, original_names):
+            if key not in mapping:
+                value = getattr(self, attr, None)
+                if ignore_none and value is None:
+                    continue
+                mapping[key] = _to_dict_value(value, _to_munch)
+        return mapping
+
+    def to_resource(self, connection=None):
+        """Return the full :class:`Resource` the view is a view of."""
+        return self.resource_type.existing(
+            connection=connection, **self._body, **self._uri
+        )
+
+
 class Resource(dict):
     # TODO(mordred) While this behaves mostly like a munch for the purposes
     # we need, sub-resources, such as Server.security_groups, which is a list
@@ -518,8 +883,29 @@ class Resource(dict):
 
     # Placeholder for aliases as dict of {__alias__:__original}
     _attr_aliases = {}
+    # Attributes of the class, see _get_schema
+    _schema = None
+    # Whether the dict storage has to be filled with values, see _sync_dict
+    _lazy_dict = False
+    _dict_pending = False
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._schema = _AttributeSchema(cls)
+        cls._attr_aliases = cls._schema.aliases
+
+    @classmethod
+    def _get_schema(cls):
+        """Return the :class:`_AttributeSchema` of the class."""
+        schema = cls.__dict__.get('_schema')
+        if schema is None:
+            # Resource itself, which __init_subclass__ is not called for
+            schema = cls._schema = _AttributeSchema(cls)
+        return schema
 
-    def __init__(self, _synchronized=False, connection=None, **attrs):
+    def __init__(
+        self, _synchronized=False, connection=None, _lazy_dict=False, **attrs
+    ):
         """The base resource
 
         :param bool _synchronized:
@@ -531,8 +917,12 @@ class Resource(dict):
             Resource objects to be used without an active Connection, such as
             in unit tests. Use of ``self._connection`` in Resource code should
             protect itself with a check for None.
+        :param bool _lazy_dict:
+            This is not intended to be used directly. See the ``lazy_dict``
+            argument of :meth:`~openstack.resource.Resource.list`.
         """
         self._connection = connection
+        self._lazy_dict = _lazy_dict
         self.microversion = attrs.pop('microversion', None)
 
         self._unknown_attrs_in_body = {}
@@ -576,28 +966,44 @@ class Resource(dict):
 
         self._update_location()
 
-        for attr, component in self._attributes_iterator():
-            if component.aka:
-                # Register alias for the attribute (local name)
-                self._attr_aliases[component.aka] = attr
+        self._sync_dict()
+
+    def _sync_dict(self):
+        """Update the dict storage of the resource from its attributes.
 
+        In lazy mode, only the keys are stored, so that ``len()``, ``in``
+        and iteration work, and the values are only computed by the first
+        call to :meth:`get` or :meth:`values`.
+        """
         # TODO(mordred) This is terrible, but is a hack at the moment to ensure
         # json.dumps works. The json library does basically if not obj: and
         # obj.items() ... but I think the if not obj: is short-circuiting down
         # in the C code and thus since we don't store the data in self[] it's
         # always False even if we override __len__ or __bool__.
-        dict.update(self, self.to_dict())
+        if self._lazy_dict:
+            dict.update(self, self._get_schema().empty_dict)
+            self._dict_pending = True
+        else:
+            dict.update(self, self.to_dict())
+
+    def _materialize_dict(self):
+        if self._dict_pending:
+            dict.update(self, self.to_dict())
+            self._dict_pending = False
+
+    def get(self, key, default=None):
+        self._materialize_dict()
+        return dict.get(self, key, default)
+
+    def values(self):
+        self._materialize_dict()
+        return dict.values(self)
 
     @classmethod
     def _attributes_iterator(cls, components=tuple([Body, Header])):
         """Iterator over all Resource attributes"""
         # isinstance stricly requires this to be a tuple
-        # Since we're looking at class definitions we need to include
-        # subclasses, so check the whole MRO.
-        for klass in cls.__mro__:
-            for attr, component in klass.__dict__.items():
-                if isinstance(component, components):
-                    yield attr, component
+        return iter(cls._get_schema().select(components))
 
     def __repr__(self):
         pairs = [
@@ -628,6 +1034,12 @@ class Resource(dict):
             ]
         )
 
+    def __ne__(self, comparand):
+        if isinstance(comparand, Resource):
+            return not self == comparand
+        self._materialize_dict()
+        return dict.__ne__(self, comparand)
+
     def warning_if_attribute_deprecated(self, attr, value):
         if value and self.deprecated:
             if not self.deprecation_reason:
@@ -686,15 +1098,15 @@ class Resource(dict):
             # returning Munch (and server side names) and Resource object with
             # normalized attributes we can offer dict access via server side
             # names.
-            for attr, component in self._attributes_iterator(tuple([Body])):
-                if component.name == name:
-                    warnings.warn(
-                        'Access to "%s[%s]" is deprecated. '
-                        'Please access using "%s.%s" attribute.'
-                        % (self.__class__, name, self.__class__, attr),
-                        DeprecationWarning,
-                    )
-                    return getattr(self, attr)
+            attr = self._get_schema().body_names.get(name)
+            if attr is not None:
+                warnings.warn(
+                    'Access to "%s[%s]" is deprecated. '
+                    'Please access using "%s.%s" attribute.'
+                    % (self.__class__, name, self.__class__, attr),
+                    DeprecationWarning,
+                )
+                return getattr(self, attr)
         raise KeyError(name)
 
     def __delitem__(self, name):
@@ -778,12 +1190,7 @@ class Resource(dict):
         self._computed.update(computed)
         self._update_location()
 
-        # TODO(mordred) This is terrible, but is a hack at the moment to ensure
-        # json.dumps works. The json library does basically if not obj: and
-        # obj.items() ... but I think the if not obj: is short-circuiting down
-        # in the C code and thus since we don't store the data in self[] it's
-        # always False even if we override __len__ or __bool__.
-        dict.update(self, self.to_dict())
+        self._sync_dict()
 
     def _collect_attrs(self, attrs):
         """Given attributes, return a dict per type of attribute
@@ -803,14 +1210,15 @@ class Resource(dict):
                 # Keep also remaining (unknown) attributes
                 body = self._pack_attrs_under_properties(body, attrs)
 
+        schema = self._get_schema()
         if any([body, header, uri]):
             attrs = self._compute_attributes(body, header, uri)
 
-            body.update(self._consume_attrs(self._body_mapping(), attrs))
+            body.update(self._consume_attrs(schema.mapping(Body), attrs))
 
-            header.update(self._consume_attrs(self._header_mapping(), attrs))
-            uri.update(self._consume_attrs(self._uri_mapping(), attrs))
-        computed = self._consume_attrs(self._computed_mapping(), attrs)
+            header.update(self._consume_attrs(schema.mapping(Header), attrs))
+            uri.update(self._consume_attrs(schema.mapping(URI), attrs))
+        computed = self._consume_attrs(schema.mapping(Computed), attrs)
         # TODO(mordred) We should make a Location Resource and add it here
         # instead of just the dict.
         if self._connection:
@@ -868,7 +1276,7 @@ class Resource(dict):
         self._uri.clean()
 
     def _consume_mapped_attrs(self, mapping_cls, attrs):
-        mapping = self._get_mapping(mapping_cls)
+        mapping = self._get_schema().mapping(mapping_cls)
         return self._consume_attrs(mapping, attrs)
 
     def _consume_attrs(self, mapping, attrs):
@@ -882,20 +1290,20 @@ class Resource(dict):
         same source dict several times.
         """
         relevant_attrs = {}
+        if not attrs:
+            return relevant_attrs
+        # The key lookup in mapping is case insensitive if the mapping is,
+        # while the lookup of attribute names is exact. Matching keys are
+        # then transposed to the keys of the mapping they match once lower
+        # cased, which the index of the mapping has precomputed.
+        index = self._get_schema().index(mapping)
         consumed_keys = []
         for key, value in attrs.items():
-            # We want the key lookup in mapping to be case insensitive if the
-            # mapping is, thus the use of get. We want value to be exact.
-            # If we find a match, we then have to loop over the mapping for
-            # to find the key to return, as there isn't really a "get me the
-            # key that matches this other key". We lower() in the inner loop
-            # because we've already done case matching in the outer loop.
-            if key in mapping.values() or mapping.get(key):
-                for map_key, map_value in mapping.items():
-                    if key.lower() in (map_key.lower(), map_value.lower()):
-                        relevant_attrs[map_key] = value
-                        consumed_keys.append(key)
-                continue
+            map_keys = index.match(key)
+            for map_key in map_keys:
+                relevant_attrs[map_key] = value
+            if map_keys:
+                consumed_keys.append(key)
 
         for key in consumed_keys:
             attrs.pop(key)
@@ -913,17 +1321,7 @@ class Resource(dict):
     @classmethod
     def _get_mapping(cls, component):
         """Return a dict of attributes of a given component on the class"""
-        mapping = component._map_cls()
-        ret = component._map_cls()
-        for key, value in cls._attributes_iterator(component):
-            # Make sure base classes don't end up overwriting
-            # mappings we've found previously in subclasses.
-            if key not in mapping:
-                # Make it this way first, to get MRO stuff correct.
-                mapping[key] = value.name
-        for k, v in mapping.items():
-            ret[v] = k
-        return ret
+        return component._map_cls(cls._get_schema().mapping(component))
 
     @classmethod
     def _body_mapping(cls):
@@ -955,11 +1353,7 @@ class Resource(dict):
         Returns an empty string if no name exists, as this method is
         consumed by _get_id and passed to getattr.
         """
-        for value in cls.__dict__.values():
-            if isinstance(value, Body):
-                if value.alternate_id:
-                    return value.name
-        return ""
+        return cls._get_schema().alternate_id
 
     @staticmethod
     def _get_id(value):
@@ -1071,36 +1465,15 @@ class Resource(dict):
         # but is slightly different in that we're looking at an instance
         # and we're mapping names on this class to their actual stored
         # values.
-        for attr, component in self._attributes_iterator(components):
-            if original_names:
-                key = component.name
-            else:
-                key = attr
-            for key in filter(None, (key, component.aka)):
-                # Make sure base classes don't end up overwriting
-                # mappings we've found previously in subclasses.
-                if key not in mapping:
-                    value = getattr(self, attr, None)
-                    if ignore_none and value is None:
-                        continue
-                    if isinstance(value, Resource):
-                        mapping[key] = value.to_dict(_to_munch=_to_munch)
-                    elif isinstance(value, dict) and _to_munch:
-                        mapping[key] = munch.Munch(value)
-                    elif value and isinstance(value, list):
-                        converted = []
-                        for raw in value:
-                            if isinstance(raw, Resource):
-                                converted.append(
-                                    raw.to_dict(_to_munch=_to_munch)
-                                )
-                            elif isinstance(raw, dict) and _to_munch:
-                                converted.append(munch.Munch(raw))
-                            else:
-                                converted.append(raw)
-                        mapping[key] = converted
-                    else:
-                        mapping[key] = value
+        dict_keys = self._get_schema().dict_keys(components, original_names)
+        for key, attr in dict_keys:
+            # Make sure base classes don't end up overwriting
+            # mappings we've found previously in subclasses.
+            if key not in mapping:
+                value = getattr(self, attr, None)
+                if ignore_none and value is None:
+                    continue
+                mapping[key] = _to_dict_value(value, _to_munch)
 
         return mapping
 
@@ -1273,7 +1646,7 @@ class Resource(dict):
         self._header.attributes.update(headers)
         self._header.clean()
         self._update_location()
-        dict.update(self, self.to_dict())
+        self._sync_dict()
 
     @classmethod
     def _get_session(cls, session):
@@ -1736,6 +2109,11 @@ class Resource(dict):
 
         self.microversion = microversion
         self._translate_response(response, has_body=has_body)
+        # Let the write observers of the connection know, when committed
+        # through a proxy
+        notify_write = getattr(session, '_notify_write', None)
+        if notify_write is not None:
+            notify_write('update', self)
         return self
 
     def _convert_patch(self, patch):
@@ -1865,6 +2243,10 @@ class Resource(dict):
         paginated=True,
         base_path=None,
         allow_unknown_params=False,
+        prefetch=0,
+        lazy_dict=False,
+        lightweight=False,
+        stream=False,
         **params,
     ):
         """This method is a generator which yields resource objects.
@@ -1884,6 +2266,29 @@ class Resource(dict):
             unknown query parameters. This allows getting list of 'filters' and
             passing everything known to the server. ``False`` will result in
             validation exception when unknown query parameters are passed.
+        :param int prefetch: Number of pages to fetch ahead in a background
+            thread while the current page is being consumed. At most ``prefetch`` pages are buffered at any time.
+            ``0`` (the default) fetches pages only when they are needed.
+            Ignored when ``paginated`` is ``False``.
+        :param bool lazy_dict: Defer computing the values of the dict
+            storage of the resources, used by ``get()`` and ``values()``,
+            until they are first used, instead of building it for every
+            resource listed. Attribute access, ``json.dumps`` and
+            :meth:`to_dict` are not affected, but ``dict(resource)`` or
+            ``{**resource}`` read the storage directly and only see ``None``
+            values until then, so :meth:`to_dict` has to be used instead.
+        :param bool lightweight: Yield read-only :class:`ResourceView`
+            objects reading the listed data as it is accessed rather than
+            :class:`Resource` objects. Meant for listings which are only
+            read, such as reports, where they use a fraction of the memory
+            and time of full resources. Classes which change the listed data
+            while building resources, by overriding :meth:`existing` or the
+            ``_consume_*_attrs`` methods, still yield full resources.
+        :param bool stream: Decode the resources of every page as they are
+            received instead of once the whole page has been, so that only
+            the resource being decoded has to be held in memory rather than
+            the whole response. Meant for services returning very large
+            pages. ``prefetch`` is ignored when set.
         :param dict params: These keyword arguments are passed through the
             :meth:`~openstack.resource.QueryParamter._transpose` method
             to find if any of them match expected query parameters to be sent
@@ -1893,7 +2298,9 @@ class Resource(dict):
             format string to see if any path fragments need to be filled in by
             the contents of this argument.
 
-        :return: A generator of :class:`Resource` objects.
+        :return: A generator of :class:`Resource` objects, or of
+            :class:`ResourceView` objects when ``lightweight`` is ``True``
+            and the class supports them.
         :raises: :exc:`~openstack.exceptions.MethodNotSupported` if
             :data:`Resource.allow_list` is not set to ``True``.
         :raises: :exc:`~openstack.exceptions.InvalidResourceQuery` if query
@@ -1923,53 +2330,90 @@ class Resource(dict):
             if hasattr(cls, k) and isinstance(getattr(cls, k), URI):
                 uri_params[k] = v
 
-        # Track the total number of resources yielded so we can paginate
-        # swift objects
-        total_yielded = 0
-        while uri:
-            # Copy query_params due to weird mock unittest interactions
-            response = session.get(
-                uri,
-                headers={"Accept": "application/json"},
-                params=query_params.copy(),
+        connection = session._get_connection()
+        if lightweight and not cls._get_schema().supports_views:
+            lightweight = False
+        if lightweight:
+            view_class = cls._get_schema().view_class
+            # Views read URI attributes by their name in the URI
+            view_uri = {getattr(cls, k).name: v for k, v in uri_params.items()}
+
+        def _build(raw_resource):
+            # Do not allow keys called "self" through. Glance chose
+            # to name a key "self", so we need to pop it out because
+            # we can't send it through cls.existing and into the
+            # Resource initializer. "self" is already the first
+            # argument and is practically a reserved word.
+            raw_resource.pop("self", None)
+            if lightweight:
+                return view_class(raw_resource, view_uri)
+            # We want that URI props are available on the resource
+            raw_resource.update(uri_params)
+
+            return cls.existing(
                 microversion=microversion,
+                connection=connection,
+                _lazy_dict=lazy_dict,
+                **raw_resource,
             )
-            exceptions.raise_from_response(response)
-            data = response.json()
 
-            # Discard any existing pagination keys
-            last_marker = query_params.pop('marker', None)
-            query_params.pop('limit', None)
+        def _pages(uri):
+            # Track the total number of resources yielded so we can paginate
+            # swift objects
+            total_yielded = 0
+            while uri:
+                # Copy query_params due to weird mock unittest interactions
+                response = session.get(
+                    uri,
+                    headers={"Accept": "application/json"},
+                    params=query_params.copy(),
+                    microversion=microversion,
+                    **({'stream': True} if stream else {}),
+                )
+                exceptions.raise_from_response(response)
+
+                # Discard any existing pagination keys
+                last_marker = query_params.pop('marker', None)
+                query_params.pop('limit', None)
+
+                if stream:
+                    # The other members, such as links, are read along
+                    data = {} if cls.resources_key else []
+                    page = _StreamedPage(
+                        _json_stream.iter_items(
+                            response.iter_content(
+                                _json_stream.DEFAULT_CHUNK_SIZE
+                            ),
+                            cls.resources_key,
+                            data,
+                        ),
+                        _build,
+                    )
+                    try:
+                        yield page
+                    finally:
+                        response.close()
+                    count, last = page.count, page.last
+                else:
+                    data = response.json()
 
-            if cls.resources_key:
-                resources = data[cls.resources_key]
-            else:
-                resources = data
+                    if cls.resources_key:
+                        resources = data[cls.resources_key]
+                    else:
+                        resources = data
 
-            if not isinstance(resources, list):
-                resources = [resources]
+                    if not isinstance(resources, list):
+                        resources = [resources]
 
-            marker = None
-            for raw_resource in resources:
-                # Do not allow keys called "self" through. Glance chose
-                # to name a key "self", so we need to pop it out because
-                # we can't send it through cls.existing and into the
-                # Resource initializer. "self" is already the first
-                # argument and is practically a reserved word.
-                raw_resource.pop("self", None)
-                # We want that URI props are available on the resource
-                raw_resource.update(uri_params)
+                    page = [_build(raw_resource) for raw_resource in resources]
+                    yield page
+                    count, last = len(page), page[-1] if page else None
+                total_yielded += count
 
-                value = cls.existing(
-                    microversion=microversion,
-                    connection=session._get_connection(),
-                    **raw_resource,
-                )
-                marker = value.id
-                yield value
-                total_yielded += 1
+                if not (count and paginated):
+                    return
 
-            if resources and paginated:
+                marker = last.id
                 uri, next_params = cls._get_next_link(
                     uri, response, data, marker, limit, total_yielded
                 )
@@ -1985,8 +2429,12 @@ class Resource(dict):
                     # do nothing, exception handling is cheaper then "if"
                     pass
                 query_params.update(next_params)
-            else:
-                return
+
+        pages = _pages(uri)
+        if prefetch and paginated and not stream:
+            pages = _prefetch_pages(pages, prefetch)
+        for page in pages:
+            yield from page
 
     @classmethod
     def _get_next_link(cls, uri, response, data, marker, limit, total_yielded):
@@ -2136,6 +2584,72 @@ class Resource(dict):
         )
 
 
+class _StreamedPage:
+    """Page of resources built as they are decoded from the response."""
+
+    def __init__(self, resources, build):
+        self._resources = resources
+        self._build = build
+        #: Number of resources built so far
+        self.count = 0
+        #: Last resource built
+        self.last = None
+
+    def __iter__(self):
+        for raw_resource in self._resources:
+            self.last = self._build(raw_resource)
+            self.count += 1
+            yield self.last
+
+
+def _prefetch_pages(pages, depth):
+    """Consume a page generator in the background.
+
+    ``pages`` is iterated on a thread of its own and its items are handed
+    over through a queue holding at most ``depth`` pages, so that the next
+    pages are fetched while the caller is still processing the current one.
+    Exceptions raised while fetching are re-raised to the caller in order.
+
+    The connection's pool executor is not used: the caller may be running
+    on it, and would wait forever for a page if every worker was waiting.
+    """
+    buffer = queue.Queue(maxsize=depth)
+    stop = threading.Event()
+    end = object()
+
+    def _put(item):
+        # Do not block forever on a full queue if the caller went away.
+        while not stop.is_set():
+            try:
+                buffer.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def _produce():
+        try:
+            for page in pages:
+                if not _put((page, None)):
+                    return
+        except Exception as e:
+            _put((None, e))
+        else:
+            _put((end, None))
+
+    threading.Thread(target=_produce, daemon=True).start()
+    try:
+        while True:
+            page, exc = buffer.get()
+            if exc is not None:
+                raise exc
+            if page is end:
+                return
+            yield page
+    finally:
+        stop.set()
+
+
 def _normalize_status(status):
     if status is not None:
         status = status.lower()
@@ -2190,7 +2704,10 @@ def wait_for_status(
     )
 
     for count in utils.iterate_timeout(
-        timeout=wait, message=msg, wait=interval
+        timeout=wait,
+        message=msg,
+        wait=interval,
+        strategy=utils.get_wait_strategy(session),
     ):
         resource = resource.fetch(session, skip_cache=True)
 
@@ -2242,6 +2759,7 @@ def wait_for_delete(session, resource, interval, wait):
             res=resource.__class__.__name__, id=resource.id
         ),
         wait=interval,
+        strategy=utils.get_wait_strategy(session),
     ):
         try:
             resource = resource.fetch(session, skip_cache=True)
@@ -2251,3 +2769,171 @@ def wait_for_delete(session, resource, interval, wait):
                 return resource
         except exceptions.NotFoundException:
             return orig_resource
+
+
+class WaitResult(
+    collections.namedtuple('WaitResult', ['success', 'failure', 'timeout'])
+):
+    """The result of waiting for several resources.
+
+    Each component is a list of :class:`~openstack.resource.Resource`
+    objects, in the order they were given:
+
+    :ivar ~.success: the resources that reached the status.
+    :ivar ~.failure: the resources that hit a failure.
+    :ivar ~.timeout: the resources that were still waited for on timeout.
+    """
+
+    __slots__ = ()
+
+
+def wait_for_many(
+    session,
+    resources,
+    status,
+    failures=None,
+    interval=None,
+    wait=None,
+    attribute='status',
+    fail=True,
+    **query,
+):
+    """Wait for many resources of the same type to be in a status.
+
+    Unlike :func:`wait_for_status`, which fetches every resource on each
+    check, the resources are listed once per check. When the resource type
+    can be listed by ``changes_since``, only the resources changed since the
+    previous check are listed, and resources missing from the listing have
+    not changed. Otherwise resources missing from the listing are gone.
+
+    Each resource is resolved as soon as it reaches ``status`` or one of the
+    ``failures``, the others are still waited for.
+
+    :param session: The session to use for making this request.
+    :type session: :class:`~keystoneauth1.adapter.Adapter`
+    :param resources: The resources to wait on to reach the status. They
+        must all be of the same type and have a status attribute specified
+        via ``attribute``.
+    :param status: Desired status of the resources. Resources which are
+        gone are in the ``DELETED`` status.
+    :param list failures: Statuses that would indicate the transition
+        failed such as 'ERROR'. Defaults to ['ERROR'].
+    :param interval: Number of seconds to wait between checks.
+        Set to ``None`` to use the default interval.
+    :param wait: Maximum number of seconds to wait for transition.
+        Set to ``None`` to wait forever.
+    :param attribute: Name of the resource attribute that contains the status.
+    :param fail: If set to ``False`` this call will not raise on timeouts
+        and failures.
+    :param query: Additional arguments of the listing, such as its
+        ``base_path`` or the ``all_projects`` query parameter.
+
+    :return: If ``fail`` is ``True`` (the default), the list of the updated
+        resources. If ``fail`` is ``False``, a :class:`WaitResult`.
+    :raises: :class:`~openstack.exceptions.ResourceTimeout` transition
+        to status failed to occur in wait seconds.
+    :raises: :class:`~openstack.exceptions.ResourceFailure` a resource
+        transitioned to one of the failure states, or went away.
+    """
+    resources = list(resources)
+    if not resources:
+        return [] if fail else WaitResult([], [], [])
+
+    if failures is None:
+        failures = ['ERROR']
+    failures = [f.lower() for f in failures]
+    status = status.lower()
+
+    resource_type = type(resources[0])
+    # Index of each resource by ID, to return them in the given order
+    indexes = {res.id: index for index, res in enumerate(resources)}
+    pending = dict(zip(indexes, resources))
+    finished = {}
+    failed = {}
+
+    def resolve(res, new_status):
+        if new_status == status:
+            finished[res.id] = res
+        elif new_status == 'deleted' or new_status in failures:
+            if fail:
+                name = "{res}:{id}".format(
+                    res=resource_type.__name__, id=res.id)
+                if new_status == 'deleted':
+                    raise exceptions.ResourceFailure(
+                        "{name} went away while waiting for {status}".format(
+                            name=name, status=status
+                        )
+                    )
+                raise exceptions.ResourceFailure(
+                    "{name} transitioned to failure state {status}".format(
+                        name=name, status=getattr(res, attribute)
+                    )
+                )
+            failed[res.id] = res
+        else:
+            return
+        del pending[res.id]
+
+    def result():
+        def ordered(results):
+            return sorted(results.values(), key=lambda r: indexes[r.id])
+
+        if fail:
+            return ordered(finished)
+        return WaitResult(ordered(finished), ordered(failed), ordered(pending))
+
+    for res in list(pending.values()):
+        resolve(res, _normalize_status(getattr(res, attribute)))
+
+    # Resources changed since the oldest of them was last updated are
+    # listed first, then those changed since the last change listed.
+    changes_since = None
+    if 'changes_since' in resource_type._query_mapping._mapping:
+        updated = [getattr(res, 'updated_at', None) for res in resources]
+        if all(updated):
+            changes_since = min(updated)
+
+    params = dict(resources[0]._uri.attributes)
+    params.update(query)
+    try:
+        for count in utils.iterate_timeout(
+            timeout=wait,
+            message="Timeout waiting for {count} {res} resources to"
+            " transition to {status}".format(
+                count=len(pending), res=resource_type.__name__, status=status
+            ),
+            wait=interval,
+            strategy=utils.get_wait_strategy(session),
+        ):
+            if not pending:
+                return result()
+
+            if changes_since is not None:
+                params['changes_since'] = changes_since
+            listed = {}
+            for res in resource_type.list(session, **params):
+                listed[res.id] = res
+                updated_at = getattr(res, 'updated_at', None)
+                if changes_since is not None and updated_at:
+                    changes_since = max(changes_since, updated_at)
+
+            for res_id in list(pending):
+                res = listed.get(res_id)
+                if res is not None:
+                    resolve(res, _normalize_status(getattr(res, attribute)))
+                elif changes_since is None:
+                    resolve(pending[res_id], 'deleted')
+
+            if not pending:
+                return result()
+
+            LOG.debug(
+                'Still waiting for %d %s resources to reach state %s',
+                len(pending),
+                resource_type.__name__,
+                status,
+            )
+    except exceptions.ResourceTimeout:
+        if fail:
+            raise
+        return result()
@@ -306,8 +306,10 @@ class TestWaitForNodesProvisionState(base.TestCase):
             n._check_state_reached.return_value = not (i % 2)
             mock_get.side_effect = nodes
 
+        # the mocked nodes are returned in order, fetch them serially
         result = self.proxy.wait_for_nodes_provision_state(
-            ['abcd', node.Node(id='1234')], 'fake state')
+            ['abcd', node.Node(id='1234')], 'fake state',
+            max_concurrency=1)
         self.assertEqual([nodes[0], nodes[2]], result)
 
         for n in nodes:
@@ -324,7 +326,8 @@ class TestWaitForNodesProvisionState(base.TestCase):
             mock_get.side_effect = nodes
 
         result = self.proxy.wait_for_nodes_provision_state(
-            ['abcd', node.Node(id='1234')], 'fake state', fail=False)
+            ['abcd', node.Node(id='1234')], 'fake state', fail=False,
+            max_concurrency=1)
         self.assertEqual([nodes[0], nodes[2]], result.success)
         self.assertEqual([], result.failure)
         self.assertEqual([], result.timeout)
@@ -378,3 +381,114 @@ class TestWaitForNodesProvisionState(base.TestCase):
         self.assertEqual(['1'], [x.id for x in result.success])
         self.assertEqual(['3'], [x.id for x in result.timeout])
         self.assertEqual(['2'], [x.id for x in result.failure])
+
+    def _fake_get(self, states):
+        # every fetch of a node returns its next state check result
+        states = {k: iter(v) for k, v in states.items()}
+
+        def _get(_self, node_id):
+            result = mock.Mock(spec=node.Node)
+            result.id = getattr(node_id, 'id', node_id)
+            state = next(states[result.id])
+            if isinstance(state, Exception):
+                result._check_state_reached.side_effect = state
+            else:
+                result._check_state_reached.return_value = state
+            return result
+
+        return _get
+
+    def test_concurrent(self, mock_get):
+        mock_get.side_effect = self._fake_get({
+            '1': [True],
+            '2': [False, True],
+            '3': [exceptions.ResourceFailure("boom")],
+        })
+
+        result = self.proxy.wait_for_nodes_provision_state(
+            ['1', '2', '3'], 'fake state', fail=False, max_concurrency=3)
+
+        self.assertEqual(['1', '2'], [x.id for x in result.success])
+        self.assertEqual([], result.timeout)
+        self.assertEqual(['3'], [x.id for x in result.failure])
+        self.assertEqual(4, mock_get.call_count)
+
+    @mock.patch.object(_proxy, 'WAIT_LIST_THRESHOLD', 2)
+    @mock.patch.object(_proxy.Proxy, 'nodes', autospec=True)
+    def test_list(self, mock_list, mock_get):
+        listed = []
+        for i, reached in enumerate([True, False, True]):
+            n = mock.Mock(spec=node.Node, id=str(i))
+            n.name = 'node%d' % i
+            n._check_state_reached.return_value = reached
+            listed.append(n)
+        mock_list.return_value = listed
+        mock_get.side_effect = self._fake_get({
+            '0': [True], '1': [True], '2': [True], '3': [False, True],
+        })
+
+        result = self.proxy.wait_for_nodes_provision_state(
+            ['node0', '1', node.Node(id='2'), '3'], 'fake state')
+
+        # the nodes are listed once with the fields needed to check them,
+        # then the 2 remaining nodes are fetched
+        mock_list.assert_called_once_with(
+            self.proxy, fields=_proxy._WAIT_FIELDS)
+        self.assertEqual(['0', '2', '1', '3'], [x.id for x in result])
+        # node 3 is missing from the listing and fetched, the nodes found
+        # in the listing are fetched once they reached the state
+        self.assertEqual(5, mock_get.call_count)
+
+    @mock.patch.object(_proxy, 'WAIT_LIST_THRESHOLD', 2)
+    @mock.patch.object(_proxy.Proxy, 'nodes', autospec=True)
+    def test_list_timeout_and_failures_not_fail(self, mock_list, mock_get):
+        listed = []
+        for i, reached in enumerate(
+                [True, exceptions.ResourceFailure("boom"), False]):
+            n = mock.Mock(spec=node.Node, id=str(i))
+            n.name = 'node%d' % i
+            if isinstance(reached, Exception):
+                n._check_state_reached.side_effect = reached
+            else:
+                n._check_state_reached.return_value = reached
+            listed.append(n)
+        mock_list.return_value = listed
+        mock_get.side_effect = self._fake_get({
+            '0': [True], '1': [True], '2': [True],
+        })
+
+        result = self.proxy.wait_for_nodes_provision_state(
+            ['0', '1', '2'], 'fake state', timeout=0.001, fail=False)
+
+        self.assertEqual(['0'], [x.id for x in result.success])
+        self.assertEqual(['1'], [x.id for x in result.failure])
+        self.assertEqual(['2'], [x.id for x in result.timeout])
+        # every node is fetched instead of returning the partial listing
+        self.assertEqual(3, mock_get.call_count)
+        for n in result.success + result.failure + result.timeout:
+            self.assertNotIn(n, listed)
+
+    def test_iter(self, mock_get):
+        mock_get.side_effect = self._fake_get({
+            '1': [False, False, True],
+            '2': [True],
+        })
+
+        result = self.proxy.iter_nodes_provision_state(
+            ['1', '2'], 'fake state')
+
+        self.assertEqual('2', next(result).id)
+        self.assertEqual(2, mock_get.call_count)
+        self.assertEqual('1', next(result).id)
+        self.assertRaises(StopIteration, next, result)
+
+    def test_iter_failure(self, mock_get):
+        mock_get.side_effect = self._fake_get({
+            '1': [False, True],
+            '2': [exceptions.ResourceFailure("boom")],
+        })
+
+        result = self.proxy.iter_nodes_provision_state(
+            ['1', '2'], 'fake state')
+
+        self.assertRaises(exceptions.ResourceFailure, list, result)
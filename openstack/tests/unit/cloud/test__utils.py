@@ -12,13 +12,16 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 
+import os
 from unittest import mock
 from uuid import uuid4
 
+import fixtures
 import testtools
 
 from openstack.cloud import _utils
 from openstack.cloud import exc
+from openstack.network.v2 import port
 from openstack.tests.unit import base
 
 RANGE_DATA = [
@@ -140,6 +143,63 @@ class TestUtils(base.TestCase):
             }})
         self.assertEqual([el2, el3], ret)
 
+    def test__compiled_filter(self):
+        el1 = dict(id=100, name='donald', last='duck',
+                   other=dict(category='duck'))
+        el2 = dict(id=200, name='daisy', last='duck',
+                   other=dict(category='duck'))
+        el3 = dict(id=300, name='donald', last='trump', other=None)
+        compiled = _utils._CompiledFilter(
+            'd*', {'last': 'duck', 'other': {'category': 'duck'}})
+        self.assertEqual([el1, el2], compiled([el1, el2, el3]))
+        self.assertEqual([el2], compiled([el3, el2]))
+        self.assertTrue(compiled.match_identifier(el3))
+        self.assertFalse(compiled.match_identifier(dict(id=1, name='x')))
+
+    def test__compiled_filter_cache(self):
+        self.assertIs(
+            _utils._compile_pattern('nb*'), _utils._compile_pattern('nb*'))
+        self.assertIs(
+            _utils._compile_jmespath("[?other == `duck`]"),
+            _utils._compile_jmespath("[?other == `duck`]"))
+
+    def test__compiled_filter_no_filters(self):
+        data = [dict(id=100, name='donald')]
+        self.assertIs(data, _utils._CompiledFilter(None, None)(data))
+        self.assertIs(data, _utils._CompiledFilter(None, {})(data))
+
+    def test__split_filters(self):
+        pushdown, local = _utils._split_filters(port.Port, {
+            'device_id': 'server',
+            'binding:host_id': 'host',
+            'is_admin_state_up': True,
+            'tags': ['a', 'b'],
+            'fields': 'id',
+            'mac_address': None,
+            'binding_profile': {'a': 1},
+            'fixed_ips': [{'subnet_id': 'subnet'}],
+            'other': 'value',
+        })
+        self.assertEqual({
+            'device_id': 'server',
+            'binding:host_id': 'host',
+            'is_admin_state_up': True,
+            'tags': ['a', 'b'],
+        }, pushdown)
+        self.assertEqual({
+            'fields': 'id',
+            'mac_address': None,
+            'binding_profile': {'a': 1},
+            'fixed_ips': [{'subnet_id': 'subnet'}],
+            'other': 'value',
+        }, local)
+
+    def test__split_filters_jmespath(self):
+        self.assertEqual(
+            ({}, "[?name=='port']"),
+            _utils._split_filters(port.Port, "[?name=='port']"))
+        self.assertEqual(({}, None), _utils._split_filters(port.Port, None))
+
     def test_safe_dict_min_ints(self):
         """Test integer comparison"""
         data = [{'f1': 3}, {'f1': 2}, {'f1': 1}]
@@ -294,6 +354,16 @@ class TestUtils(base.TestCase):
         ):
             _utils.range_filter(RANGE_DATA, "key1", "<>100")
 
+    def test_compile_range_filter(self):
+        predicate = _utils.compile_range_filter(RANGE_DATA, "key1", ">=2")
+        self.assertEqual(
+            RANGE_DATA[2:], [d for d in RANGE_DATA if predicate(d)])
+
+    def test_compile_range_filter_key_not_found(self):
+        self.assertIsNone(
+            _utils.compile_range_filter(RANGE_DATA, "key3", "min"))
+        self.assertEqual([], _utils.range_filter(RANGE_DATA, "key3", "max"))
+
     def test_get_entity_pass_object(self):
         obj = mock.Mock(id=uuid4().hex)
         self.cloud.use_direct_get = True
@@ -356,3 +426,34 @@ class TestUtils(base.TestCase):
         for r in resources:
             self.assertTrue(hasattr(self.cloud, 'get_%s_by_id' % r))
             self.assertTrue(hasattr(self.cloud, 'search_%ss' % r))
+
+
+class TestFileSegment(base.TestCase):
+
+    def setUp(self):
+        super(TestFileSegment, self).setUp()
+        self.data = bytes(range(256)) * 64
+        self.filename = os.path.join(
+            self.useFixture(fixtures.TempDir()).path, 'data')
+        with open(self.filename, 'wb') as f:
+            f.write(self.data)
+
+    def test_read_mapped(self):
+        segment = _utils.FileSegment(self.filename, 1000, 5000)
+        self.addCleanup(segment.close)
+        chunk = segment.read(100)
+        self.assertIsInstance(chunk, memoryview)
+        self.assertEqual(self.data[1000:1100], chunk)
+        self.assertEqual(self.data[1100:6000], segment.read())
+        self.assertEqual(b'', segment.read())
+        segment.seek(10)
+        self.assertEqual(self.data[1010:1020], segment.read(10))
+
+    def test_read_unmapped(self):
+        # Beyond the end of the file, read it as it is
+        segment = _utils.FileSegment(
+            self.filename, len(self.data) - 10, 100)
+        self.addCleanup(segment.close)
+        self.assertEqual(self.data[-10:], segment.read())
+        segment.seek(5)
+        self.assertEqual(self.data[-5:], segment.read())
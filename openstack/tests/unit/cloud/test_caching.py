@@ -213,6 +213,31 @@ class TestMemoryCache(base.TestCase):
             self._compare_volumes(a, b)
         self.assert_calls()
 
+    def test_list_volumes_proxy_write_invalidates(self):
+        fake_volume = fakes.FakeVolume('volume1', 'available',
+                                       'Volume 1 Display Name')
+        fake_volume_dict = meta.obj_to_munch(fake_volume)
+        self.register_uris([
+            self.get_cinder_discovery_mock_dict(),
+            dict(method='GET',
+                 uri=self.get_mock_url(
+                     'volumev3', 'public', append=['volumes', 'detail']),
+                 json={'volumes': [fake_volume_dict]}),
+            dict(method='DELETE',
+                 uri=self.get_mock_url(
+                     'volumev3', 'public', append=['volumes', 'volume1'])),
+            dict(method='GET',
+                 uri=self.get_mock_url(
+                     'volumev3', 'public', append=['volumes', 'detail']),
+                 json={'volumes': []})])
+
+        self.assertEqual(1, len(self.cloud.list_volumes()))
+        # this call should hit the cache
+        self.assertEqual(1, len(self.cloud.list_volumes()))
+        self.cloud.block_storage.delete_volume('volume1')
+        self.assertEqual([], self.cloud.list_volumes())
+        self.assert_calls()
+
     def test_list_volumes_creating_invalidates(self):
         fake_volume = fakes.FakeVolume('volume1', 'creating',
                                        'Volume 1 Display Name')
@@ -555,6 +580,51 @@ class TestMemoryCache(base.TestCase):
         self.assert_calls()
 
 
+    def test_list_ports_snapshot(self):
+        self.cloud._PORT_AGE = 60
+        down_port = test_port.TestPort.mock_neutron_port_create_rep['port']
+        active_port = dict(
+            down_port, id='other', device_id='other', status='ACTIVE')
+        self.register_uris([
+            dict(method='GET',
+                 uri=self.get_mock_url(
+                     'network', 'public', append=['v2.0', 'ports']),
+                 json={'ports': [down_port, active_port]}),
+        ])
+
+        ports = self.cloud.list_ports(filters={'status': 'DOWN'})
+        self.assertEqual([down_port['id']], [p['id'] for p in ports])
+        ports = self.cloud.search_ports(
+            filters={'device_id': down_port['device_id']})
+        self.assertEqual([down_port['id']], [p['id'] for p in ports])
+        self.assertEqual(2, len(self.cloud.list_ports()))
+
+        self.assert_calls()
+        self.assertEqual(
+            dict(hits=2, stale_hits=0, misses=1, refreshes=0, errors=0),
+            self.cloud.get_snapshot_cache_stats()['ports'])
+
+    def test_list_ports_snapshot_proxy_delete(self):
+        self.cloud._PORT_AGE = 60
+        down_port = test_port.TestPort.mock_neutron_port_create_rep['port']
+        active_port = dict(down_port, id='other', status='ACTIVE')
+        self.register_uris([
+            dict(method='GET',
+                 uri=self.get_mock_url(
+                     'network', 'public', append=['v2.0', 'ports']),
+                 json={'ports': [down_port, active_port]}),
+            dict(method='DELETE',
+                 uri=self.get_mock_url(
+                     'network', 'public', append=['v2.0', 'ports', 'other'])),
+        ])
+
+        self.assertEqual(2, len(self.cloud.list_ports()))
+        self.cloud.network.delete_port('other')
+        self.assertEqual(
+            [down_port['id']], [p['id'] for p in self.cloud.list_ports()])
+
+        self.assert_calls()
+
 class TestCacheIgnoresQueuedStatus(base.TestCase):
 
     scenarios = [
@@ -10,10 +10,15 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 
+import json
+import os
 from unittest import mock
 
+import fixtures
+
 from openstack.cloud import inventory
 import openstack.config
+from openstack import exceptions
 from openstack.tests import fakes
 from openstack.tests.unit import base
 
@@ -93,6 +98,28 @@ class TestInventory(base.TestCase):
                                                            all_projects=False)
         self.assertFalse(inv.clouds[0].get_openstack_vars.called)
 
+    @mock.patch("openstack.cloud.meta.get_hostvars_from_servers")
+    @mock.patch("openstack.config.loader.OpenStackConfig")
+    @mock.patch("openstack.connection.Connection")
+    def test_list_hosts_batched(self, mock_cloud, mock_config,
+                                mock_get_hostvars):
+        mock_config.return_value.get_all.return_value = [{}]
+
+        inv = inventory.OpenStackInventory()
+
+        server = self.cloud._normalize_server(
+            fakes.make_fake_server(
+                '1234', 'test', 'ACTIVE', addresses={}))
+        inv.clouds[0].list_servers.return_value = [server]
+        mock_get_hostvars.return_value = [server]
+
+        ret = inv.list_hosts(batched=True)
+
+        inv.clouds[0].list_servers.assert_called_once_with(bare=True,
+                                                           all_projects=False)
+        mock_get_hostvars.assert_called_once_with(inv.clouds[0], [server])
+        self.assertEqual([server], ret)
+
     @mock.patch("openstack.config.loader.OpenStackConfig")
     @mock.patch("openstack.connection.Connection")
     def test_list_hosts_all_projects(self, mock_cloud, mock_config):
@@ -144,3 +171,228 @@ class TestInventory(base.TestCase):
 
         ret = inv.get_host('server_id')
         self.assertEqual(server, ret)
+
+    @mock.patch("openstack.config.loader.OpenStackConfig")
+    @mock.patch("openstack.connection.Connection")
+    def test_list_hosts_multiple_clouds(self, mock_cloud, mock_config):
+        mock_config.return_value.get_all.return_value = [{}, {}, {}]
+        mock_cloud.side_effect = [mock.Mock(), mock.Mock(), mock.Mock()]
+
+        inv = inventory.OpenStackInventory(max_workers=2)
+
+        self.assertEqual(3, len(inv.clouds))
+        self.assertEqual(2, inv.max_workers)
+        for i, cloud in enumerate(inv.clouds):
+            cloud.list_servers.return_value = [dict(id='server%d' % i)]
+
+        ret = inv.list_hosts()
+
+        self.assertEqual(['server0', 'server1', 'server2'],
+                         [server['id'] for server in ret])
+        for cloud in inv.clouds:
+            cloud.list_servers.assert_called_once_with(detailed=True,
+                                                       all_projects=False)
+
+    @mock.patch("openstack.config.loader.OpenStackConfig")
+    @mock.patch("openstack.connection.Connection")
+    def test_list_hosts_cloud_failure(self, mock_cloud, mock_config):
+        mock_config.return_value.get_all.return_value = [{}, {}]
+        mock_cloud.side_effect = [mock.Mock(), mock.Mock()]
+
+        inv = inventory.OpenStackInventory()
+
+        self.assertEqual(2, inv.max_workers)
+        inv.clouds[0].list_servers.side_effect = (
+            exceptions.OpenStackCloudException('broken'))
+        inv.clouds[1].list_servers.return_value = [dict(id='server1')]
+
+        self.assertRaises(exceptions.OpenStackCloudException,
+                          inv.list_hosts)
+        ret = inv.list_hosts(fail_on_cloud_config=False)
+        self.assertEqual([dict(id='server1')], ret)
+
+    @mock.patch("openstack.config.loader.OpenStackConfig")
+    @mock.patch("openstack.connection.Connection")
+    def test_iter_hosts(self, mock_cloud, mock_config):
+        mock_config.return_value.get_all.return_value = [{}, {}]
+        mock_cloud.side_effect = [mock.Mock(), mock.Mock()]
+
+        inv = inventory.OpenStackInventory()
+
+        for i, cloud in enumerate(inv.clouds):
+            cloud.list_servers.return_value = [dict(id='server%d' % i)]
+
+        ret = inv.iter_hosts(expand=False)
+
+        self.assertEqual(['server0', 'server1'],
+                         sorted(server['id'] for server in ret))
+
+    def _mock_network(self, cloud, ports=(), ips=(), changed_ports=(),
+                      changed_ips=()):
+        # The listings with changed_since return the changed resources,
+        # the others all the current resources.
+        cloud.network.ports.side_effect = lambda **kwargs: list(
+            changed_ports if 'changed_since' in kwargs else ports)
+        cloud.network.ips.side_effect = lambda **kwargs: list(
+            changed_ips if 'changed_since' in kwargs else ips)
+
+    def _make_snapshot_inventory(self, mock_cloud, **kwargs):
+        mock_cloud.return_value.name = 'mycloud'
+        mock_cloud.return_value.config.get_region_name.return_value = 'R1'
+        return inventory.OpenStackInventory(
+            snapshot_dir=self.snapshot_dir, **kwargs)
+
+    @mock.patch("openstack.config.loader.OpenStackConfig")
+    @mock.patch("openstack.connection.Connection")
+    def test_list_hosts_snapshot(self, mock_cloud, mock_config):
+        mock_config.return_value.get_all.return_value = [{}]
+        self.snapshot_dir = self.useFixture(fixtures.TempDir()).path
+        path = os.path.join(self.snapshot_dir, 'mycloud_R1_expanded.json')
+
+        inv = self._make_snapshot_inventory(mock_cloud)
+        cloud = inv.clouds[0]
+        cloud.list_servers.return_value = [
+            dict(id='server1', name='one', addresses={}),
+            dict(id='server2', name='two', addresses={}),
+            dict(id='server3', name='three', addresses={
+                'public': [dict(addr='172.24.4.3')]}),
+        ]
+        self._mock_network(
+            cloud, ports=[mock.Mock(id='port1', device_id='server1')])
+
+        ret = inv.list_hosts()
+
+        self.assertEqual(['server1', 'server2', 'server3'],
+                         [host['id'] for host in ret])
+        with open(path) as f:
+            snapshot = json.load(f)
+        self.assertEqual({'port1': 'server1'}, snapshot['port_devices'])
+        self.assertEqual(0o600, os.stat(path).st_mode & 0o777)
+
+        # Second run only merges the changes
+        inv = self._make_snapshot_inventory(mock_cloud)
+        cloud.reset_mock()
+        cloud.compute.servers.return_value = [
+            mock.Mock(id='server2', status='DELETED'),
+            mock.Mock(id='server4', status='ACTIVE'),
+        ]
+        self._mock_network(
+            cloud,
+            ports=[mock.Mock(id='port1', device_id='server1')],
+            changed_ports=[mock.Mock(id='port1', device_id='server1')],
+            changed_ips=[
+                mock.Mock(port_id=None, floating_ip_address='172.24.4.3'),
+            ])
+        cloud.compute.get_server.side_effect = [
+            mock.Mock(id=server_id, status='ACTIVE')
+            for server_id in ('server1', 'server3')
+        ]
+        cloud._expand_server.side_effect = (
+            lambda server, detailed, bare: dict(
+                id=server.id, name='new', addresses={}))
+
+        ret = inv.list_hosts()
+
+        self.assertFalse(cloud.list_servers.called)
+        since = cloud.compute.servers.call_args[1]['changes_since']
+        cloud.compute.servers.assert_called_once_with(
+            details=True, all_projects=False, changes_since=since)
+        cloud.network.ports.assert_has_calls([
+            mock.call(fields=['id', 'device_id']),
+            mock.call(changed_since=since),
+        ])
+        cloud.network.ips.assert_has_calls([
+            mock.call(fields=['id', 'floating_ip_address', 'port_id']),
+            mock.call(changed_since=since),
+        ])
+        self.assertEqual(
+            ['server1', 'server3'],
+            sorted(c[0][0] for c in cloud.compute.get_server.call_args_list))
+        self.assertEqual(
+            [('server1', 'new'), ('server3', 'new'), ('server4', 'new')],
+            [(host['id'], host['name']) for host in ret])
+
+    @mock.patch("openstack.config.loader.OpenStackConfig")
+    @mock.patch("openstack.connection.Connection")
+    def test_list_hosts_snapshot_max_age(self, mock_cloud, mock_config):
+        mock_config.return_value.get_all.return_value = [{}]
+        self.snapshot_dir = self.useFixture(fixtures.TempDir()).path
+
+        inv = self._make_snapshot_inventory(mock_cloud, snapshot_max_age=60)
+        cloud = inv.clouds[0]
+        cloud.list_servers.return_value = [dict(id='server1', name='one')]
+        cloud.network.ports.return_value = []
+
+        self.assertEqual(inv.list_hosts(), inv.list_hosts())
+
+        cloud.list_servers.assert_called_once_with(detailed=True,
+                                                   all_projects=False)
+        self.assertFalse(cloud.compute.servers.called)
+
+        # refresh discards the snapshot
+        inv = self._make_snapshot_inventory(
+            mock_cloud, snapshot_max_age=60, refresh=True)
+        inv.list_hosts()
+        self.assertEqual(2, cloud.list_servers.call_count)
+
+    @mock.patch("openstack.config.loader.OpenStackConfig")
+    @mock.patch("openstack.connection.Connection")
+    def test_list_hosts_snapshot_deleted(self, mock_cloud, mock_config):
+        mock_config.return_value.get_all.return_value = [{}]
+        self.snapshot_dir = self.useFixture(fixtures.TempDir()).path
+
+        inv = self._make_snapshot_inventory(mock_cloud)
+        cloud = inv.clouds[0]
+        cloud.list_servers.return_value = [
+            dict(id='server1', name='one', addresses={
+                'public': [dict(addr='172.24.4.1')]}),
+            dict(id='server2', name='two', addresses={}),
+            dict(id='server3', name='three', addresses={}),
+        ]
+        fip = mock.Mock(
+            id='fip1', floating_ip_address='172.24.4.1', port_id='port1')
+        self._mock_network(
+            cloud,
+            ports=[
+                mock.Mock(id='port1', device_id='server1'),
+                mock.Mock(id='port2', device_id='server2'),
+                mock.Mock(id='port3', device_id='server3'),
+            ],
+            ips=[fip])
+
+        inv.list_hosts()
+
+        # The floating IP and port2 are deleted, port3 is detached. None
+        # of them is returned by changed_since and no server changed.
+        inv = self._make_snapshot_inventory(mock_cloud)
+        cloud.reset_mock()
+        cloud.compute.servers.return_value = []
+        self._mock_network(
+            cloud,
+            ports=[
+                mock.Mock(id='port1', device_id='server1'),
+                mock.Mock(id='port3', device_id=''),
+            ])
+        cloud.compute.get_server.side_effect = (
+            lambda server_id: mock.Mock(id=server_id, status='ACTIVE'))
+        cloud._expand_server.side_effect = (
+            lambda server, detailed, bare: dict(
+                id=server.id, name='new', addresses={}))
+
+        ret = inv.list_hosts()
+
+        self.assertEqual(
+            ['server1', 'server2', 'server3'],
+            sorted(c[0][0] for c in cloud.compute.get_server.call_args_list))
+        self.assertEqual(
+            [('server1', 'new'), ('server2', 'new'), ('server3', 'new')],
+            [(host['id'], host['name']) for host in ret])
+
+        # Nothing changed since, nothing is refreshed
+        inv = self._make_snapshot_inventory(mock_cloud)
+        cloud.reset_mock()
+        cloud.compute.servers.return_value = []
+
+        inv.list_hosts()
+
+        self.assertFalse(cloud.compute.get_server.called)
@@ -12,8 +12,12 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import copy
+import pickle
 from unittest import mock
 
+import munch
+
 from openstack.cloud import meta
 from openstack.compute.v2 import server as _server
 from openstack import connection
@@ -978,6 +982,83 @@ class TestMeta(base.TestCase):
         self.assertEqual('testgroup',
                          hostvars['security_groups'][0]['name'])
 
+    @mock.patch.object(FakeCloud, 'get_volumes')
+    @mock.patch.object(FakeCloud, 'get_image_name')
+    @mock.patch.object(FakeCloud, 'get_flavor_name')
+    @mock.patch.object(FakeCloud, 'list_server_security_groups')
+    def test_get_hostvars_from_servers(
+            self, mock_list_server_security_groups, mock_get_flavor_name,
+            mock_get_image_name, mock_get_volumes):
+
+        class BatchCloud(FakeCloud):
+            def _has_secgroups(self):
+                return True
+
+            def _use_neutron_secgroups(self):
+                return True
+
+            def _has_floating_ips(self):
+                return True
+
+            def list_ports(self):
+                return [
+                    {'id': 'port-%d' % i, 'device_id': 'server-%d' % i,
+                     'mac_address': 'fa:16:3e:00:00:0%d' % i,
+                     'security_group_ids': ['sg-1']}
+                    for i in range(3)]
+
+            def list_floating_ips(self):
+                return [{'id': 'fip-1', 'port_id': 'port-1',
+                         'fixed_ip_address': '10.0.0.1',
+                         'floating_ip_address': PUBLIC_V4}]
+
+            def list_security_groups(self):
+                return [{'id': 'sg-1', 'name': 'testgroup'}]
+
+            def list_flavors(self, get_extra=False):
+                return [{'id': '101', 'name': 'test-flavor-name'}]
+
+            def list_images(self):
+                return [{'id': 'image-id', 'name': 'test-image-name'}]
+
+            def list_volumes(self):
+                return [{'id': 'volume1', 'attachments': [
+                    {'server_id': 'server-2', 'device': '/dev/vdb'}]}]
+
+        cloud = BatchCloud()
+        list_ports = mock.Mock(wraps=cloud.list_ports)
+        cloud.list_ports = list_ports
+        servers = [
+            meta.obj_to_munch(fakes.make_fake_server(
+                server_id='server-%d' % i, name='server-%d' % i,
+                status='ACTIVE',
+                addresses={'private': [{'OS-EXT-IPS:type': 'fixed',
+                                        'addr': '10.0.0.%d' % i,
+                                        'version': 4}]},
+                flavor={'id': '101'},
+                image={'id': 'image-id'}))
+            for i in range(3)
+        ]
+
+        hostvars = meta.get_hostvars_from_servers(cloud, servers)
+
+        self.assertEqual(3, len(hostvars))
+        list_ports.assert_called_once_with()
+        for method in (mock_list_server_security_groups,
+                       mock_get_flavor_name, mock_get_image_name,
+                       mock_get_volumes):
+            self.assertFalse(method.called)
+        for host in hostvars:
+            self.assertEqual('test-flavor-name', host['flavor']['name'])
+            self.assertEqual('test-image-name', host['image']['name'])
+            self.assertEqual(
+                ['testgroup'],
+                [sg['name'] for sg in host['security_groups']])
+        self.assertEqual('', hostvars[0]['public_v4'])
+        self.assertEqual(PUBLIC_V4, hostvars[1]['public_v4'])
+        self.assertEqual([], hostvars[0]['volumes'])
+        self.assertEqual('/dev/vdb', hostvars[2]['volumes'][0]['device'])
+
     @mock.patch.object(meta, 'get_server_external_ipv6')
     @mock.patch.object(meta, 'get_server_external_ipv4')
     def test_basic_hostvars(
@@ -1068,6 +1149,27 @@ class TestMeta(base.TestCase):
             'zone': None},
             self.cloud.current_location)
 
+    def test_current_location_shared(self):
+        location = self.cloud.current_location
+
+        self.assertIs(location, self.cloud.current_location)
+        self.assertIs(location, copy.deepcopy(location))
+        self.assertIsNot(
+            location, self.cloud._get_current_location(zone='az1'))
+        self.assertRaises(TypeError, location.__setitem__, 'zone', 'az1')
+        self.assertRaises(AttributeError, setattr, location, 'zone', 'az1')
+        self.assertRaises(
+            TypeError, location.project.__setitem__, 'id', 'other')
+        self.assertEqual(location, pickle.loads(pickle.dumps(location)))
+
+        modifiable = location.copy()
+        modifiable.zone = 'az1'
+        self.assertEqual('az1', modifiable.zone)
+
+        self.cloud.session.auth.invalidate()
+        self.assertIsNot(location, self.cloud.current_location)
+        self.assertEqual(location, self.cloud.current_location)
+
     def test_current_project(self):
         self.assertEqual({
             'id': mock.ANY,
@@ -1091,6 +1193,33 @@ class TestMeta(base.TestCase):
         self.assertEqual('volume1', hostvars['volumes'][0]['id'])
         self.assertEqual('/dev/sda0', hostvars['volumes'][0]['device'])
 
+    def test_has_volume_multiattach(self):
+        mock_cloud = mock.MagicMock()
+        mock_cloud.list_volumes.return_value = [munch.Munch(
+            id='volume1', display_name='shared', attachments=[
+                {'server_id': 'server1', 'device': '/dev/vdb'},
+                {'server_id': 'server2', 'device': '/dev/vdc'},
+            ])]
+        lookups = meta.get_server_lookups(mock_cloud)
+        servers = []
+        for server_id in ('server1', 'server2'):
+            server = meta.obj_to_munch(standard_fake_server)
+            server['id'] = server_id
+            servers.append(server)
+
+        hostvars1 = meta.get_hostvars_from_server(
+            mock_cloud, servers[0], lookups=lookups,
+            mounts=[{'display_name': 'shared', 'mount': '/data'}])
+        hostvars2 = meta.get_hostvars_from_server(
+            mock_cloud, servers[1], lookups=lookups)
+
+        self.assertEqual('/dev/vdb', hostvars1['volumes'][0]['device'])
+        self.assertEqual('/data', hostvars1['volumes'][0]['mount'])
+        self.assertEqual('/dev/vdc', hostvars2['volumes'][0]['device'])
+        self.assertNotIn('mount', hostvars2['volumes'][0])
+        self.assertNotIn(
+            'device', lookups.volumes_by_server['server1'][0])
+
     def test_has_no_volume_service(self):
         fake_cloud = FakeCloud()
         fake_cloud.service_val = False
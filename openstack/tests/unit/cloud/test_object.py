@@ -12,9 +12,11 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 
+import os
 import tempfile
 from unittest import mock
 
+import fixtures
 import testtools
 
 import openstack.cloud
@@ -22,6 +24,7 @@ from openstack.cloud import exc
 import openstack.cloud.openstackcloud as oc_oc
 from openstack import exceptions
 from openstack.object_store.v1 import _proxy
+from openstack.object_store.v1 import _upload
 from openstack.object_store.v1 import container
 from openstack.object_store.v1 import obj
 from openstack.tests.unit import base
@@ -662,6 +665,8 @@ class TestObjectUploads(BaseTestObject):
 
     def setUp(self):
         super(TestObjectUploads, self).setUp()
+        self.useFixture(fixtures.MockPatch(
+            'openstack.object_store.v1._upload.DEFAULT_BACKOFF', 0))
 
         self.content = self.getUniqueString().encode('latin-1')
         self.object_file = tempfile.NamedTemporaryFile(delete=False)
@@ -702,6 +707,136 @@ class TestObjectUploads(BaseTestObject):
 
         self.assert_calls()
 
+    def test_create_object_stream_checksums(self):
+
+        self.register_uris([
+            dict(method='GET',
+                 uri='https://object-store.example.com/info',
+                 json=dict(
+                     swift={'max_file_size': 1000},
+                     slo={'min_segment_size': 500})),
+            dict(method='HEAD',
+                 uri='{endpoint}/{container}/{object}'.format(
+                     endpoint=self.endpoint, container=self.container,
+                     object=self.object),
+                 status_code=404),
+            dict(method='PUT',
+                 uri='{endpoint}/{container}/{object}'.format(
+                     endpoint=self.endpoint,
+                     container=self.container, object=self.object),
+                 status_code=201,
+                 # Consume the body like a real upload would
+                 text=lambda request, context: request.body.read() and '',
+                 validate=dict(
+                     headers={'x-object-meta-foo': 'bar'})),
+            dict(method='POST',
+                 uri='{endpoint}/{container}/{object}'.format(
+                     endpoint=self.endpoint,
+                     container=self.container, object=self.object),
+                 status_code=202,
+                 validate=dict(
+                     headers={
+                         'x-object-meta-foo': 'bar',
+                         'x-object-meta-x-sdk-md5': self.md5,
+                         'x-object-meta-x-sdk-sha256': self.sha256,
+                     })),
+        ])
+
+        self.cloud.create_object(
+            container=self.container, name=self.object,
+            filename=self.object_file.name, metadata={'foo': 'bar'},
+            stream_checksums=True)
+
+        self.assert_calls()
+        self.assertNotIn(
+            'x-object-meta-x-sdk-md5',
+            self.adapter.request_history[2].headers)
+        self.assertEqual(
+            (self.md5, self.sha256),
+            utils._get_cached_file_hashes(
+                self.object_file.name, self.cloud._file_hash_cache))
+
+    def test_create_object_stream_checksums_headers(self):
+        headers = {
+            'x-delete-at': '1893456000',
+            'content-disposition': 'attachment; filename="data.bin"',
+        }
+
+        self.register_uris([
+            dict(method='GET',
+                 uri='https://object-store.example.com/info',
+                 json=dict(
+                     swift={'max_file_size': 1000},
+                     slo={'min_segment_size': 500})),
+            dict(method='HEAD',
+                 uri='{endpoint}/{container}/{object}'.format(
+                     endpoint=self.endpoint, container=self.container,
+                     object=self.object),
+                 status_code=404),
+            dict(method='PUT',
+                 uri='{endpoint}/{container}/{object}'.format(
+                     endpoint=self.endpoint,
+                     container=self.container, object=self.object),
+                 status_code=201,
+                 text=lambda request, context: request.body.read() and '',
+                 validate=dict(headers=headers)),
+            dict(method='POST',
+                 uri='{endpoint}/{container}/{object}'.format(
+                     endpoint=self.endpoint,
+                     container=self.container, object=self.object),
+                 status_code=202,
+                 validate=dict(
+                     headers=dict(
+                         headers,
+                         **{
+                             'x-object-meta-x-sdk-md5': self.md5,
+                             'x-object-meta-x-sdk-sha256': self.sha256,
+                         }))),
+        ])
+
+        self.cloud.create_object(
+            container=self.container, name=self.object,
+            filename=self.object_file.name, stream_checksums=True,
+            **headers)
+
+        self.assert_calls()
+        self.assertNotIn('etag', self.adapter.request_history[3].headers)
+
+    def test_create_object_cached_checksums(self):
+        self.cloud._file_hash_cache[
+            os.path.abspath(self.object_file.name)] = (
+                utils._get_file_stat_key(self.object_file.name),
+                ('cached-md5', 'cached-sha256'))
+
+        self.register_uris([
+            dict(method='GET',
+                 uri='https://object-store.example.com/info',
+                 json=dict(
+                     swift={'max_file_size': 1000},
+                     slo={'min_segment_size': 500})),
+            dict(method='HEAD',
+                 uri='{endpoint}/{container}/{object}'.format(
+                     endpoint=self.endpoint, container=self.container,
+                     object=self.object),
+                 status_code=404),
+            dict(method='PUT',
+                 uri='{endpoint}/{container}/{object}'.format(
+                     endpoint=self.endpoint,
+                     container=self.container, object=self.object),
+                 status_code=201,
+                 validate=dict(
+                     headers={
+                         'x-object-meta-x-sdk-md5': 'cached-md5',
+                         'x-object-meta-x-sdk-sha256': 'cached-sha256',
+                     }))
+        ])
+
+        self.cloud.create_object(
+            container=self.container, name=self.object,
+            filename=self.object_file.name)
+
+        self.assert_calls()
+
     def test_create_object_index_rax(self):
 
         self.register_uris([
@@ -892,6 +1027,71 @@ class TestObjectUploads(BaseTestObject):
             },
         ], self.adapter.request_history[-1].json())
 
+    def test_create_static_large_object_stream_checksums(self):
+
+        max_file_size = 25
+        min_file_size = 1
+
+        uris_to_mock = [
+            dict(method='GET', uri='https://object-store.example.com/info',
+                 json=dict(
+                     swift={'max_file_size': max_file_size},
+                     slo={'min_segment_size': min_file_size})),
+            dict(method='HEAD',
+                 uri='{endpoint}/{container}/{object}'.format(
+                     endpoint=self.endpoint,
+                     container=self.container, object=self.object),
+                 status_code=404)
+        ]
+
+        uris_to_mock.extend([
+            dict(method='PUT',
+                 uri='{endpoint}/{container}/{object}/{index:0>6}'.format(
+                     endpoint=self.endpoint,
+                     container=self.container,
+                     object=self.object,
+                     index=index),
+                 status_code=201,
+                 headers=dict(Etag='etag{index}'.format(index=index)))
+            for index, offset in enumerate(
+                range(0, len(self.content), max_file_size))
+        ])
+
+        uris_to_mock.append(
+            dict(method='PUT',
+                 uri='{endpoint}/{container}/{object}'.format(
+                     endpoint=self.endpoint,
+                     container=self.container, object=self.object),
+                 status_code=201,
+                 validate=dict(
+                     params={
+                         'multipart-manifest', 'put'
+                     },
+                     headers={
+                         'x-object-meta-x-sdk-md5': self.md5,
+                         'x-object-meta-x-sdk-sha256': self.sha256,
+                     })))
+        self.register_uris(uris_to_mock)
+
+        with mock.patch.object(
+                utils, '_get_file_hashes') as get_file_hashes:
+            self.cloud.create_object(
+                container=self.container, name=self.object,
+                filename=self.object_file.name, use_slo=True,
+                stream_checksums=True)
+        # The segments are hashed as they are uploaded
+        get_file_hashes.assert_not_called()
+
+        # After call 3, order become indeterminate because of thread pool
+        self.assert_calls(stop_after=3)
+
+        for key, value in self.calls[-1]['headers'].items():
+            self.assertEqual(
+                value, self.adapter.request_history[-1].headers[key],
+                'header mismatch in manifest call')
+        for request in self.adapter.request_history[2:-1]:
+            self.assertNotIn('x-object-meta-x-sdk-md5', request.headers)
+
     def test_slo_manifest_retry(self):
         """
         Uploading the SLO manifest file should be retried up to 3 times before
@@ -1147,6 +1347,84 @@ class TestObjectUploads(BaseTestObject):
         # After call 3, order become indeterminate because of thread pool
         self.assert_calls(stop_after=3)
 
+    def test_create_large_object_resume(self):
+
+        max_file_size = 25
+        min_file_size = 1
+        cache_path = self.useFixture(fixtures.TempDir()).path
+        self.useFixture(fixtures.MockPatchObject(
+            self.cloud.config, 'get_cache_path', return_value=cache_path))
+        journal = _upload.UploadJournal.open(
+            os.path.join(cache_path, 'object-uploads'),
+            '{container}/{object}'.format(
+                container=self.container, object=self.object),
+            self.object_file.name, max_file_size)
+        segment_name = '{container}/{object}/{index:0>6}'.format
+        journal.record(
+            segment_name(container=self.container, object=self.object,
+                         index=0), 'etag0')
+        journal.record(
+            segment_name(container=self.container, object=self.object,
+                         index=1), 'stale')
+        journal.close()
+        segment_uri = '{endpoint}/{container}/{object}/{index:0>6}'.format
+
+        self.register_uris([
+            dict(method='GET', uri='https://object-store.example.com/info',
+                 json=dict(
+                     swift={'max_file_size': max_file_size},
+                     slo={'min_segment_size': min_file_size})),
+            dict(method='HEAD',
+                 uri='{endpoint}/{container}/{object}'.format(
+                     endpoint=self.endpoint,
+                     container=self.container, object=self.object),
+                 status_code=404),
+            dict(method='HEAD',
+                 uri=segment_uri(endpoint=self.endpoint,
+                                 container=self.container,
+                                 object=self.object, index=0),
+                 status_code=200,
+                 headers={'Etag': 'etag0'}),
+            dict(method='HEAD',
+                 uri=segment_uri(endpoint=self.endpoint,
+                                 container=self.container,
+                                 object=self.object, index=1),
+                 status_code=200,
+                 headers={'Etag': 'other'}),
+        ] + [
+            dict(method='PUT',
+                 uri=segment_uri(endpoint=self.endpoint,
+                                 container=self.container,
+                                 object=self.object, index=index),
+                 status_code=201,
+                 headers={'Etag': 'etag{index}'.format(index=index)})
+            for index in range(1, 4)
+        ] + [
+            dict(method='PUT',
+                 uri='{endpoint}/{container}/{object}'.format(
+                     endpoint=self.endpoint,
+                     container=self.container, object=self.object),
+                 status_code=201),
+        ])
+
+        self.cloud.create_object(
+            container=self.container, name=self.object,
+            filename=self.object_file.name, use_slo=True, resumable=True)
+
+        # After call 3, order become indeterminate because of thread pool
+        self.assert_calls(stop_after=3)
+        self.assertEqual(
+            ['etag0', 'etag1', 'etag2', 'etag3'],
+            [entry['etag']
+             for entry in self.adapter.request_history[-1].json()])
+        self.assertNotIn(
+            segment_uri(endpoint=self.endpoint, container=self.container,
+                        object=self.object, index=0),
+            [request.url for request in self.adapter.request_history
+             if request.method == 'PUT'])
+        # The journal is removed once the upload is complete
+        self.assertFalse(os.path.exists(journal.path))
+
     def test_object_segment_retry_failure(self):
 
         max_file_size = 25
@@ -1180,17 +1458,15 @@ class TestObjectUploads(BaseTestObject):
                      container=self.container,
                      object=self.object),
                  status_code=201),
+        ] + [
+            # First attempt and retries
             dict(method='PUT',
                  uri='{endpoint}/{container}/{object}/000003'.format(
                      endpoint=self.endpoint,
                      container=self.container,
                      object=self.object),
-                 status_code=501),
-            dict(method='PUT',
-                 uri='{endpoint}/{container}/{object}'.format(
-                     endpoint=self.endpoint,
-                     container=self.container, object=self.object),
-                 status_code=201)
+                 status_code=501)
+            for attempt in range(_upload.DEFAULT_RETRIES + 1)
         ])
 
         self.assertRaises(
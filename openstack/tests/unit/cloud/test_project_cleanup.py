@@ -0,0 +1,288 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+import queue
+import threading
+from unittest import mock
+
+import fixtures
+
+from openstack.cloud import project_cleanup
+from openstack.compute.v2 import server
+from openstack import exceptions
+from openstack.identity.v3 import project
+from openstack.tests.unit import base
+from openstack import utils
+
+
+class TestMultiProjectCleanup(base.TestCase):
+
+    def setUp(self):
+        super(TestMultiProjectCleanup, self).setUp()
+        self.projects = [
+            project.Project(id='p%d' % i, name='project%d' % i)
+            for i in range(3)
+        ]
+        self.cloud = mock.Mock()
+        self.cloud.current_project_id = 'p0'
+        self.cloud.list_projects.return_value = self.projects
+        self.project_clouds = {}
+        self.cloud.connect_as_project.side_effect = self._connect_as_project
+
+    def _connect_as_project(self, project):
+        project_cloud = mock.MagicMock()
+        project_cloud.__enter__.return_value = project_cloud
+        project_cloud.project_cleanup.side_effect = (
+            lambda status_queue, **kwargs: status_queue.put(
+                server.Server(id='s-' + project.id, name='server')))
+        self.project_clouds[project.id] = project_cloud
+        return project_cloud
+
+    def _get_events(self, events):
+        result = []
+        while not events.empty():
+            result.append(events.get_nowait())
+        return result
+
+    def test_run_filters(self):
+        events = queue.Queue()
+        sot = project_cleanup.MultiProjectCleanup(
+            self.cloud, project_filters={'tags': 'expired'}, domain_id='d',
+            max_workers=2, status_queue=events)
+
+        summary = sot.run(dry_run=False, max_concurrency=4)
+
+        self.cloud.list_projects.assert_called_once_with(
+            domain_id='d', filters={'tags': 'expired'})
+        # The project of the connection is never cleaned up
+        self.assertEqual(['p1', 'p2'], sorted(self.project_clouds))
+        for project_cloud in self.project_clouds.values():
+            project_cloud.project_cleanup.assert_called_once_with(
+                status_queue=mock.ANY, dry_run=False, wait_timeout=120,
+                filters=None, resource_evaluation_fn=None,
+                max_concurrency=4, max_rate=None)
+            project_cloud.__exit__.assert_called_once()
+        self.assertEqual(
+            ['p1', 'p2'], [p['id'] for p in summary['projects']])
+        self.assertEqual(
+            {'server': 1}, summary['projects'][0]['resources'])
+        self.assertEqual(
+            dict(projects=2, failed=0, resources=2), summary['total'])
+
+        events = self._get_events(events)
+        self.assertEqual(6, len(events))
+        p1_events = [e for e in events if e['project_id'] == 'p1']
+        self.assertEqual(
+            ['start', 'resource', 'done'], [e['event'] for e in p1_events])
+        self.assertEqual(
+            dict(type='server', id='s-p1', name='server'),
+            p1_events[1]['resource'])
+        self.assertEqual('project1', p1_events[2]['summary']['name'])
+
+    def test_run_projects(self):
+        self.cloud.get_project.side_effect = lambda name_or_id, **kw: (
+            [p for p in self.projects if p.name == name_or_id][0])
+
+        sot = project_cleanup.MultiProjectCleanup(
+            self.cloud, projects=['project0', self.projects[2]])
+        summary = sot.run()
+
+        self.cloud.list_projects.assert_not_called()
+        self.assertEqual(
+            ['p0', 'p2'], [p['id'] for p in summary['projects']])
+
+    def test_run_project_not_found(self):
+        self.cloud.get_project.return_value = None
+
+        sot = project_cleanup.MultiProjectCleanup(
+            self.cloud, projects=['missing'])
+
+        self.assertRaises(exceptions.SDKException, sot.run)
+
+    def test_run_error(self):
+        events = queue.Queue()
+        self.cloud.connect_as_project.side_effect = [
+            self._connect_as_project(self.projects[1]),
+            exceptions.SDKException('boom'),
+        ]
+
+        sot = project_cleanup.MultiProjectCleanup(
+            self.cloud, max_workers=1, status_queue=events)
+        summary = sot.run()
+
+        self.assertEqual(
+            ['done', 'error'], [p['status'] for p in summary['projects']])
+        self.assertEqual('boom', summary['projects'][1]['error'])
+        self.assertEqual(
+            dict(projects=2, failed=1, resources=1), summary['total'])
+        self.assertEqual(
+            'error', self._get_events(events)[-1]['event'])
+
+    def test_run_max_rate(self):
+        sot = project_cleanup.MultiProjectCleanup(self.cloud)
+        sot.run(max_rate=10)
+
+        rate_limiters = [
+            c.project_cleanup.call_args[1]['max_rate']
+            for c in self.project_clouds.values()
+        ]
+        self.assertIsInstance(rate_limiters[0], utils.RateLimiter)
+        self.assertIs(rate_limiters[0], rate_limiters[1])
+
+    def test_run_no_projects(self):
+        self.cloud.list_projects.return_value = []
+
+        sot = project_cleanup.MultiProjectCleanup(self.cloud)
+
+        self.assertEqual(
+            dict(projects=0, failed=0, resources=0), sot.run()['total'])
+
+    def test_run_cleanup_errors(self):
+        events = queue.Queue()
+        failed = server.Server(id='s1', name='server')
+        self.cloud.list_projects.return_value = self.projects[:2]
+        project_cloud = self._connect_as_project(self.projects[1])
+        project_cloud.project_cleanup.side_effect = None
+        project_cloud.project_cleanup.return_value = [
+            ('compute', failed, exceptions.ConflictException('in use')),
+            ('network', None, exceptions.SDKException('boom')),
+        ]
+        self.cloud.connect_as_project.side_effect = None
+        self.cloud.connect_as_project.return_value = project_cloud
+
+        sot = project_cleanup.MultiProjectCleanup(
+            self.cloud, status_queue=events)
+        summary = sot.run(dry_run=False)
+
+        result = summary['projects'][0]
+        self.assertEqual('error', result['status'])
+        self.assertEqual('2 errors in the cleanup', result['error'])
+        self.assertEqual(
+            [
+                dict(service='compute',
+                     resource=dict(type='server', id='s1', name='server'),
+                     error='in use'),
+                dict(service='network', resource=None, error='boom'),
+            ],
+            result['errors'])
+        self.assertEqual(
+            dict(projects=1, failed=1, resources=0), summary['total'])
+        self.assertEqual(
+            'error', self._get_events(events)[-1]['event'])
+
+    def test_status_queue_concurrent(self):
+        sot = project_cleanup.MultiProjectCleanup(self.cloud)
+        status_queue = project_cleanup._ProjectStatusQueue(
+            sot, self.projects[0])
+        resource = server.Server(id='s1', name='server')
+
+        def put():
+            for _ in range(1000):
+                status_queue.put(resource)
+
+        threads = [threading.Thread(target=put) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual({'server': 8000}, dict(status_queue.resources))
+
+
+class TestProjectCleanupErrors(base.TestCase):
+
+    def setUp(self):
+        super(TestProjectCleanupErrors, self).setUp()
+        self.use_designate()
+        self.cloud.config.get_enabled_services = mock.Mock(
+            return_value=['dns'])
+        # DNS is cleaned up after the network, which is not tested here
+        self.network_cleanup = self.useFixture(fixtures.MockPatchObject(
+            self.cloud.network, '_service_cleanup')).mock
+
+    def test_project_cleanup_delete_error(self):
+        self.register_uris([
+            dict(method='GET',
+                 uri=self.get_mock_url(
+                     'dns', 'public', append=['v2', 'zones']),
+                 json={'zones': [{'id': 'z1', 'name': 'example.net.'}]}),
+            dict(method='DELETE',
+                 uri=self.get_mock_url(
+                     'dns', 'public', append=['v2', 'zones', 'z1']),
+                 status_code=409),
+            dict(method='GET',
+                 uri=self.get_mock_url(
+                     'dns', 'public',
+                     append=['v2', 'reverse', 'floatingips']),
+                 json={'floatingips': []}),
+        ])
+
+        errors = self.cloud.project_cleanup(dry_run=False)
+
+        self.assertEqual(1, len(errors))
+        service, resource, error = errors[0]
+        self.assertEqual('dns', service)
+        self.assertEqual('z1', resource.id)
+        self.assertIsInstance(error, exceptions.ConflictException)
+        self.assert_calls()
+
+    def test_project_cleanup_service_error(self):
+        self.register_uris([
+            dict(method='GET',
+                 uri=self.get_mock_url(
+                     'dns', 'public', append=['v2', 'zones']),
+                 status_code=500),
+        ])
+
+        errors = self.cloud.project_cleanup(dry_run=False)
+
+        self.assertEqual(1, len(errors))
+        service, resource, error = errors[0]
+        self.assertEqual('dns', service)
+        self.assertIsNone(resource)
+        self.assertIsInstance(error, exceptions.HttpException)
+        self.assert_calls()
+
+    def test_project_cleanup_no_errors(self):
+        self.register_uris([
+            dict(method='GET',
+                 uri=self.get_mock_url(
+                     'dns', 'public', append=['v2', 'zones']),
+                 json={'zones': []}),
+            dict(method='GET',
+                 uri=self.get_mock_url(
+                     'dns', 'public',
+                     append=['v2', 'reverse', 'floatingips']),
+                 json={'floatingips': []}),
+        ])
+
+        self.assertEqual([], self.cloud.project_cleanup(dry_run=False))
+        self.assert_calls()
+
+    def test_project_cleanup_wait_timeout(self):
+        self.register_uris([
+            dict(method='GET',
+                 uri=self.get_mock_url(
+                     'dns', 'public', append=['v2', 'zones']),
+                 json={'zones': []}),
+            dict(method='GET',
+                 uri=self.get_mock_url(
+                     'dns', 'public',
+                     append=['v2', 'reverse', 'floatingips']),
+                 json={'floatingips': []}),
+        ])
+
+        self.cloud.project_cleanup(dry_run=False, wait_timeout=30)
+
+        self.assertEqual(
+            30, self.network_cleanup.call_args[1]['wait_timeout'])
+        self.assert_calls()
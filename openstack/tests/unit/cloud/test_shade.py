@@ -728,3 +728,9 @@ class TestShade(base.TestCase):
         self.assertIsInstance(retval, list)
         self.assertEqual(1, len(retval))
         self.assertEqual([RANGE_DATA[0]], retval)
+
+    def test_range_search_6(self):
+        filters = {"key1": "4", "key2": ">10"}
+        retval = self.cloud.range_search(RANGE_DATA, filters)
+        self.assertIsInstance(retval, list)
+        self.assertEqual(0, len(retval))
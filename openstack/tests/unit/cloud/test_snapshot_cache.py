@@ -0,0 +1,172 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+from unittest import mock
+
+from openstack.cloud import _snapshot_cache
+from openstack.tests.unit import base
+
+
+class _Executor:
+    """Runs the submitted functions when asked to."""
+
+    def __init__(self):
+        self.submitted = []
+
+    def submit(self, fn, *args):
+        self.submitted.append((fn, args))
+
+    def run(self):
+        submitted, self.submitted = self.submitted, []
+        for fn, args in submitted:
+            fn(*args)
+
+
+class TestSnapshotCache(base.TestCase):
+
+    def setUp(self):
+        super(TestSnapshotCache, self).setUp()
+        self.now = 1000.0
+        self.useFixture(base.fixtures.MockPatch(
+            'openstack.cloud._snapshot_cache.time.monotonic',
+            lambda: self.now))
+        self.fetch = mock.Mock(side_effect=self._fetch)
+        self.fetched = 0
+        self.max_age = 10
+        self.executor = _Executor()
+        self.cache = _snapshot_cache.SnapshotCache(
+            'ports', self.fetch, lambda: self.max_age,
+            get_executor=lambda: self.executor,
+            index_names=('id', 'device_id'))
+
+    def _fetch(self, *key):
+        self.fetched += 1
+        return [
+            dict(id='p1', device_id='s1', status='ACTIVE', fetch=self.fetched),
+            dict(id='p2', device_id='s1', status='DOWN', fetch=self.fetched),
+            dict(id='p3', device_id='s2', status='DOWN', fetch=self.fetched),
+        ]
+
+    def _stats(self, **stats):
+        expected = dict(
+            hits=0, stale_hits=0, misses=0, refreshes=0, errors=0)
+        expected.update(stats)
+        self.assertEqual(expected, self.cache.get_stats())
+
+    def test_get(self):
+        snapshot = self.cache.get()
+        self.now += 4
+        self.assertIs(snapshot, self.cache.get())
+
+        self.fetch.assert_called_once_with()
+        self.assertEqual([], self.executor.submitted)
+        self._stats(hits=1, misses=1)
+
+    def test_get_key(self):
+        self.cache.get(True)
+        self.cache.get(False)
+        self.cache.get(True)
+
+        self.assertEqual(
+            [mock.call(True), mock.call(False)], self.fetch.call_args_list)
+        self._stats(hits=1, misses=2)
+
+    def test_get_refresh_in_background(self):
+        snapshot = self.cache.get()
+        self.now += 6
+        self.assertIs(snapshot, self.cache.get())
+        self.assertIs(snapshot, self.cache.get())
+        self.assertEqual(1, len(self.executor.submitted))
+
+        self.executor.run()
+
+        refreshed = self.cache.get()
+        self.assertIsNot(snapshot, refreshed)
+        self.assertEqual(2, refreshed.items[0]['fetch'])
+        self.assertEqual(2, self.fetch.call_count)
+        self._stats(hits=1, stale_hits=2, misses=1, refreshes=1)
+
+    def test_get_expired(self):
+        snapshot = self.cache.get()
+        self.now += 10
+
+        self.assertIsNot(snapshot, self.cache.get())
+        self.assertEqual([], self.executor.submitted)
+        self._stats(misses=2)
+
+    def test_get_no_max_age(self):
+        self.max_age = 0
+        self.cache.get()
+        self.cache.get()
+
+        self.assertEqual(2, self.fetch.call_count)
+        self._stats(misses=2)
+
+    def test_refresh_error(self):
+        snapshot = self.cache.get()
+        self.now += 6
+        self.cache.get()
+        self.fetch.side_effect = Exception('boom')
+
+        self.executor.run()
+
+        self.assertIs(snapshot, self.cache.get())
+        self._stats(stale_hits=2, misses=1, errors=1)
+
+    def test_invalidate(self):
+        snapshot = self.cache.get()
+        self.cache.invalidate()
+
+        self.assertIsNot(snapshot, self.cache.get())
+        self._stats(misses=2)
+
+    def test_invalidate_while_refreshing(self):
+        self.cache.get()
+        self.now += 6
+        self.cache.get()
+
+        def _fetch(*key):
+            self.cache.invalidate()
+            return self._fetch(*key)
+
+        self.fetch.side_effect = _fetch
+        self.executor.run()
+        self.fetch.side_effect = self._fetch
+
+        self.assertEqual(3, self.cache.get().items[0]['fetch'])
+        self._stats(stale_hits=1, misses=2, refreshes=1)
+
+    def test_select(self):
+        snapshot = self.cache.get()
+
+        self.assertEqual(
+            ['p1', 'p2'],
+            [p['id'] for p in snapshot.select({'device_id': 's1'})])
+        self.assertEqual(
+            ['p2'],
+            [p['id'] for p in snapshot.select(
+                {'device_id': 's1', 'status': 'DOWN'})])
+        self.assertEqual(
+            ['p2', 'p3'],
+            [p['id'] for p in snapshot.select({'status': 'DOWN'})])
+        self.assertEqual([], snapshot.select({'id': 'p4'}))
+        self.assertEqual(
+            ['p3'],
+            [p['id'] for p in snapshot.select("[?device_id=='s2']")])
+
+    def test_select_copy(self):
+        snapshot = self.cache.get()
+
+        ports = snapshot.select()
+        ports.pop()
+
+        self.assertEqual(3, len(snapshot.select()))
@@ -11,6 +11,8 @@
 # under the License.
 
 
+from unittest import mock
+
 import testtools
 
 from openstack.block_storage.v3 import volume
@@ -393,6 +395,38 @@ class TestVolume(base.TestCase):
         self._compare_volumes(vol1, self.cloud.get_volume_by_id('01'))
         self.assert_calls()
 
+    def test_search_volumes_cached(self):
+        vol1 = meta.obj_to_munch(fakes.FakeVolume('01', 'available', 'vol1'))
+        vol2 = meta.obj_to_munch(fakes.FakeVolume('02', 'available', 'vol2'))
+
+        with mock.patch.object(
+                self.cloud, 'list_volumes',
+                return_value=[vol1, vol2]) as list_volumes:
+            result = self.cloud.search_volumes('vol1')
+
+        # Nothing to push down, the listing may come from the cache
+        list_volumes.assert_called_once_with()
+        self.assertEqual([vol1], result)
+
+    def test_search_volumes_pushdown(self):
+        vol1 = meta.obj_to_munch(fakes.FakeVolume('01', 'available', 'vol1'))
+        vol2 = meta.obj_to_munch(fakes.FakeVolume('02', 'available', 'vol2'))
+        self.register_uris([
+            self.get_cinder_discovery_mock_dict(),
+            dict(method='GET',
+                 uri=self.get_mock_url(
+                     'volumev3', 'public', append=['volumes', 'detail'],
+                     qs_elements=['status=available']),
+                 json={'volumes': [vol1, vol2]}),
+        ])
+
+        result = self.cloud.search_volumes(
+            'vol1', filters={'status': 'available'})
+
+        self.assertEqual(1, len(result))
+        self._compare_volumes(vol1, result[0])
+        self.assert_calls()
+
     def test_create_volume(self):
         vol1 = meta.obj_to_munch(fakes.FakeVolume('01', 'available', 'vol1'))
         self.register_uris([
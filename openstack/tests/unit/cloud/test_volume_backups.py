@@ -40,6 +40,24 @@ class TestVolumeBackups(base.TestCase):
             self._compare_backups(a, b)
         self.assert_calls()
 
+    def test_search_volume_backups_pushdown(self):
+        name = 'Volume1'
+        vol1 = {'name': name, 'status': 'available',
+                'availability_zone': 'az1'}
+        vol2 = {'name': name, 'status': 'available',
+                'availability_zone': 'az2'}
+        self.register_uris([
+            dict(method='GET',
+                 uri=self.get_mock_url(
+                     'volumev3', 'public', append=['backups', 'detail'],
+                     qs_elements=['status=available']),
+                 json={"backups": [vol1, vol2]})])
+        result = self.cloud.search_volume_backups(
+            name, {'status': 'available', 'availability_zone': 'az1'})
+        self.assertEqual(1, len(result))
+        self._compare_backups(vol1, result[0])
+        self.assert_calls()
+
     def test_get_volume_backup(self):
         name = 'Volume1'
         vol1 = {'name': name, 'availability_zone': 'az1'}
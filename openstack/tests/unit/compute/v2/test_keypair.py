@@ -10,6 +10,10 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 
+from unittest import mock
+
+from keystoneauth1 import adapter
+
 from openstack.compute.v2 import keypair
 from openstack.tests.unit import base
 
@@ -60,3 +64,25 @@ class TestKeypair(base.TestCase):
         EXAMPLE_DEFAULT.pop('type')
         sot = keypair.Keypair(**EXAMPLE_DEFAULT)
         self.assertEqual(EXAMPLE['type'], sot.type)
+
+    def test_list_lightweight(self):
+        response = mock.Mock()
+        response.status_code = 200
+        response.links = {}
+        response.json.return_value = {
+            'keypairs': [{'keypair': {'name': 'k1', 'fingerprint': 'ff'}}]}
+        session = mock.Mock(spec=adapter.Adapter)
+        session.get.return_value = response
+        session._get_connection = mock.Mock(return_value=None)
+        session.default_microversion = None
+        session.get_endpoint_data.return_value = mock.Mock(
+            max_microversion='2.1', min_microversion=None)
+
+        # Keypair unwraps the listed data, views could not
+        result = list(keypair.Keypair.list(session, lightweight=True))
+
+        self.assertEqual(1, len(result))
+        self.assertIsInstance(result[0], keypair.Keypair)
+        self.assertEqual('k1', result[0].name)
+        self.assertEqual('k1', result[0].id)
+        self.assertEqual('ff', result[0].fingerprint)
@@ -696,6 +696,18 @@ class TestCompute(TestComputeProxy):
             method_args=[value],
             expected_args=[self.proxy, value, 'ACTIVE', ['ERROR'], 2, 120])
 
+    @mock.patch('openstack.resource.wait_for_many')
+    def test_servers_wait_for(self, mock_wait):
+        value = server.Server(id='1234')
+
+        self.proxy.wait_for_servers(
+            [value, '5678'], all_projects=True, fail=False)
+
+        mock_wait.assert_called_once_with(
+            self.proxy, [value, mock.ANY], 'ACTIVE', ['ERROR'], 2, 120,
+            fail=False, base_path='/servers/detail', all_projects=True)
+        self.assertEqual('5678', mock_wait.call_args[0][1][1].id)
+
     def test_server_resize(self):
         self._verify(
             "openstack.compute.v2.server.Server.resize",
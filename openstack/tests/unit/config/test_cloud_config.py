@@ -20,6 +20,7 @@ from openstack.config import cloud_region
 from openstack.config import defaults
 from openstack import exceptions
 from openstack.tests.unit.config import base
+from openstack import utils
 from openstack import version as openstack_version
 
 fake_config_dict = {'a': 1, 'os_b': 2, 'c': 3, 'os_c': 4}
@@ -180,6 +181,32 @@ class TestCloudRegion(base.TestCase):
         self.assertEqual(1, cc.get_connect_retries('compute'))
         self.assertEqual(3, cc.get_connect_retries('baremetal'))
 
+    def test_get_wait_strategy(self):
+        cc = cloud_region.CloudRegion("test1", "region-al", {
+            'wait_strategy': 'jitter',
+            'load_balancer_wait_strategy': 'backoff',
+            'load_balancer_wait_max_interval': '60',
+        })
+
+        strategy = cc.get_wait_strategy('compute')
+        self.assertIsInstance(strategy, utils.DecorrelatedJitter)
+        self.assertEqual(30, strategy.max_interval)
+        strategy = cc.get_wait_strategy('load-balancer')
+        self.assertIsInstance(strategy, utils.ExponentialBackoff)
+        self.assertEqual(60, strategy.max_interval)
+
+    def test_get_wait_strategy_default(self):
+        cc = cloud_region.CloudRegion("test1", "region-al", {})
+
+        self.assertIsNone(cc.get_wait_strategy('compute'))
+
+    def test_get_wait_strategy_unknown(self):
+        cc = cloud_region.CloudRegion("test1", "region-al", {
+            'wait_strategy': 'sometimes'})
+
+        self.assertRaises(
+            exceptions.SDKException, cc.get_wait_strategy, 'compute')
+
     def test_rackspace_workaround(self):
         # We're skipping loader here, so we have to expand relevant
         # parts from the rackspace profile. The thing we're testing
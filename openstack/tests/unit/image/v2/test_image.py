@@ -18,6 +18,7 @@ from unittest import mock
 from keystoneauth1 import adapter
 import requests
 
+from openstack import _download
 from openstack import _log
 from openstack import exceptions
 from openstack.image.v2 import image
@@ -396,6 +397,37 @@ class TestImage(base.TestCase):
 
         self.assertRaises(exceptions.InvalidResponse, sot.download, self.sess)
 
+    def test_download_parallel(self):
+        data = b'0123456789abc'
+        sot = image.Image(**dict(
+            EXAMPLE, checksum=calculate_md5_checksum([data])))
+
+        def _get(url, headers, stream):
+            start, end = headers['Range'][6:].split('-')
+            response = mock.Mock()
+            response.status_code = 206
+            response.iter_content.return_value = [
+                data[int(start):int(end) + 1]]
+            return response
+
+        self.sess.get.side_effect = _get
+        output = tempfile.NamedTemporaryFile()
+        self.addCleanup(output.close)
+
+        with mock.patch(
+                'openstack._download.split_ranges',
+                lambda url, size: [
+                    _download.Part(url, offset, min(5, size - offset),
+                                   ranged=True)
+                    for offset in range(0, size, 5)]):
+            rv = sot.download(self.sess, output=output.name, max_workers=2)
+
+        self.assertEqual(sot, rv)
+        self.assertEqual(data, output.read())
+        self.sess.get.assert_any_call(
+            'images/IDENTIFIER/file', headers={'Range': 'bytes=10-12'},
+            stream=True)
+
     def test_download_no_checksum_header(self):
         sot = image.Image(**EXAMPLE)
 
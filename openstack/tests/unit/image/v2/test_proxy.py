@@ -218,6 +218,35 @@ class TestImage(TestImageProxy):
         args, kwargs = self.proxy._create.call_args
         self.assertEqual(kwargs["is_protected"], True)
 
+    def _upload_image_put(self, data):
+        created_image = mock.Mock(spec=image.Image(id="id"))
+        created_image.image_import_methods = []
+        created_image.upload.return_value = FakeResponse(
+            response="", status_code=200)
+        created_image.fetch.return_value = {'checksum': 'fake_md5'}
+        self.proxy._create = mock.Mock(return_value=created_image)
+
+        result = self.proxy._upload_image_put(
+            'fake', filename=None, data=data, meta={},
+            validate_checksum=True, container_format='bare',
+            disk_format='raw',
+            properties={self.proxy._IMAGE_MD5_KEY: 'fake_md5'})
+
+        self.assertIs(created_image, result)
+        self.assertIs(data, created_image.data)
+        created_image.fetch.assert_called_once_with(self.proxy)
+
+    def test_image_upload_put_validate_checksum_data_binary(self):
+        self._upload_image_put(b'fake')
+
+    def test_image_upload_put_file_not_closed(self):
+        data = io.BytesIO(b'fake')
+
+        self._upload_image_put(data)
+
+        # The caller owns the file
+        self.assertFalse(data.closed)
+
     def test_image_upload_no_args(self):
         # container_format and disk_format are required args
         self.assertRaises(exceptions.InvalidRequest, self.proxy.upload_image)
@@ -257,6 +286,7 @@ class TestImage(TestImageProxy):
                 'output': 'some_output',
                 'chunk_size': 1,
                 'stream': True,
+                'max_workers': None,
             })
 
     @mock.patch("openstack.image.v2.image.Image.fetch")
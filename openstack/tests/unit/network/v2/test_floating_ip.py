@@ -76,6 +76,7 @@ class TestFloatingIP(base.TestCase):
             {'limit': 'limit',
              'marker': 'marker',
              'description': 'description',
+             'fields': 'fields',
              'project_id': 'project_id',
              'tenant_id': 'project_id',
              'status': 'status',
@@ -85,6 +86,7 @@ class TestFloatingIP(base.TestCase):
              'fixed_ip_address': 'fixed_ip_address',
              'floating_ip_address': 'floating_ip_address',
              'floating_network_id': 'floating_network_id',
+             'changed_since': 'changed_since',
              'tags': 'tags',
              'any_tags': 'tags-any',
              'not_tags': 'not-tags',
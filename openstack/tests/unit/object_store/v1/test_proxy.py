@@ -10,21 +10,26 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 
+import functools
 from hashlib import sha1
+import os
 import random
 import string
 import tempfile
 import time
 from unittest import mock
 
+import fixtures
 import requests_mock
 from testscenarios import load_tests_apply_scenarios as load_tests  # noqa
 
+from openstack import _download
 from openstack.object_store.v1 import account
 from openstack.object_store.v1 import container
 from openstack.object_store.v1 import obj
 from openstack.tests.unit.cloud import test_object as base_test_object
 from openstack.tests.unit import test_proxy_base
+from openstack import utils
 
 
 class FakeResponse:
@@ -285,6 +290,94 @@ class TestDownloadObject(base_test_object.BaseTestObject):
         self.assert_calls()
 
 
+class TestDownloadObjectParallel(base_test_object.BaseTestObject):
+
+    def setUp(self):
+        super(TestDownloadObjectParallel, self).setUp()
+        self.the_data = b'0123456789' * 100
+        self.outfile = os.path.join(
+            self.useFixture(fixtures.TempDir()).path, 'data')
+
+    def _ranged_content(self, data):
+        def content(request, context):
+            start, end = request.headers['Range'][6:].split('-')
+            context.status_code = 206
+            return data[int(start):int(end) + 1]
+        return content
+
+    def test_download_ranges(self):
+        part_size = 300
+        self.register_uris([
+            dict(method='HEAD', uri=self.object_endpoint,
+                 headers={
+                     'Content-Length': str(len(self.the_data)),
+                     'Etag': utils.md5(
+                         self.the_data, usedforsecurity=False).hexdigest(),
+                 }),
+        ] + [
+            dict(method='GET', uri=self.object_endpoint,
+                 content=self._ranged_content(self.the_data))
+            for offset in range(0, len(self.the_data), part_size)
+        ])
+
+        with mock.patch.object(
+                _download, 'split_ranges',
+                functools.partial(_download.split_ranges,
+                                  part_size=part_size)):
+            self.cloud.object_store.get_object(
+                self.object, container=self.container,
+                outfile=self.outfile, max_workers=3)
+
+        with open(self.outfile, 'rb') as f:
+            self.assertEqual(self.the_data, f.read())
+        self.assertEqual(
+            sorted('bytes=%d-%d' % (offset, offset + part_size - 1)
+                   if offset + part_size < len(self.the_data)
+                   else 'bytes=%d-%d' % (offset, len(self.the_data) - 1)
+                   for offset in range(0, len(self.the_data), part_size)),
+            sorted(request.headers['Range']
+                   for request in self.adapter.request_history
+                   if 'Range' in request.headers))
+        self.assert_calls()
+
+    def test_download_slo_segments(self):
+        segments = [self.the_data[:600], self.the_data[600:]]
+        segment_endpoint = '{endpoint}/segments/{object}/{index:0>6}'.format
+        self.register_uris([
+            dict(method='HEAD', uri=self.object_endpoint,
+                 headers={
+                     'Content-Length': str(len(self.the_data)),
+                     'Etag': '"manifest-etag"',
+                     'X-Static-Large-Object': 'True',
+                 }),
+            dict(method='GET', uri=self.object_endpoint + (
+                '?multipart-manifest=get'),
+                json=[
+                    dict(name='/segments/{object}/{index:0>6}'.format(
+                        object=self.object, index=index),
+                        bytes=len(segment),
+                        hash=utils.md5(
+                            segment, usedforsecurity=False).hexdigest())
+                    for index, segment in enumerate(segments)
+                ]),
+        ] + [
+            dict(method='GET',
+                 uri=segment_endpoint(
+                     endpoint=self.endpoint, object=self.object,
+                     index=index),
+                 content=segment)
+            for index, segment in enumerate(segments)
+        ])
+
+        self.cloud.object_store.get_object(
+            self.object, container=self.container,
+            outfile=self.outfile, max_workers=2)
+
+        with open(self.outfile, 'rb') as f:
+            self.assertEqual(self.the_data, f.read())
+        self.assert_calls(stop_after=3)
+
+
 class TestExtractName(TestObjectStoreProxy):
 
     scenarios = [
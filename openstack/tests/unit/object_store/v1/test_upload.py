@@ -0,0 +1,279 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+import hashlib
+import os
+import threading
+import time
+from unittest import mock
+
+import fixtures
+
+from openstack.cloud import _utils
+from openstack import exceptions
+from openstack.object_store.v1 import _upload
+from openstack.tests.unit import base
+from openstack import utils
+
+
+class FakeSegment:
+
+    def __init__(self, length):
+        self.length = length
+
+    def seek(self, offset):
+        pass
+
+    def close(self):
+        pass
+
+
+class TestSegmentUploader(base.TestCase):
+
+    def setUp(self):
+        super(TestSegmentUploader, self).setUp()
+        self.lock = threading.Lock()
+        self.inflight = []
+        self.max_inflight = 0
+        self.max_inflight_bytes = 0
+        self.failures = {}
+        self.failure_status = 503
+        self.proxy = mock.Mock()
+        self.proxy.put.side_effect = self._put
+
+    def _put(self, name, headers, data, raise_exc):
+        with self.lock:
+            self.inflight.append(data)
+            self.max_inflight = max(self.max_inflight, len(self.inflight))
+            self.max_inflight_bytes = max(
+                self.max_inflight_bytes,
+                sum(segment.length for segment in self.inflight))
+        time.sleep(0.01)
+        with self.lock:
+            self.inflight.remove(data)
+        response = mock.Mock()
+        response.headers = {'Etag': 'etag-' + name}
+        response.status_code = 201
+        if self.failures.get(name):
+            self.failures[name] -= 1
+            response.status_code = self.failure_status
+            response.headers = {}
+        return response
+
+    def test_upload_bounded(self):
+        segments = {'seg%d' % i: FakeSegment(10) for i in range(20)}
+
+        etags = _upload.SegmentUploader(
+            self.proxy, {}, max_concurrency=4, max_inflight_bytes=30,
+        ).upload(segments)
+
+        self.assertEqual(
+            {name: 'etag-' + name for name in segments}, etags)
+        self.assertLessEqual(self.max_inflight, 3)
+        self.assertLessEqual(self.max_inflight_bytes, 30)
+
+    def test_upload_retries(self):
+        segments = {'seg%d' % i: FakeSegment(10) for i in range(3)}
+        self.failures['seg1'] = 2
+
+        etags = _upload.SegmentUploader(
+            self.proxy, {}, retries=2, backoff=0).upload(segments)
+
+        self.assertEqual('etag-seg1', etags['seg1'])
+        self.assertEqual(5, self.proxy.put.call_count)
+
+    def test_upload_retries_exhausted(self):
+        segments = {'seg%d' % i: FakeSegment(10) for i in range(3)}
+        self.failures['seg1'] = 3
+
+        self.assertRaises(
+            exceptions.HttpException,
+            _upload.SegmentUploader(
+                self.proxy, {}, retries=2, backoff=0).upload,
+            segments)
+
+    def test_upload_not_retriable(self):
+        segments = {'seg%d' % i: FakeSegment(10) for i in range(3)}
+        self.failures['seg1'] = 1
+        self.failure_status = 413
+
+        self.assertRaises(
+            exceptions.HttpException,
+            _upload.SegmentUploader(
+                self.proxy, {}, retries=2, backoff=60).upload,
+            segments)
+        self.assertEqual(
+            1, [c[0][0] for c in self.proxy.put.call_args_list].count('seg1'))
+
+    def test_upload_retries_rate_limited(self):
+        segments = {'seg%d' % i: FakeSegment(10) for i in range(3)}
+        self.failures['seg1'] = 1
+        self.failure_status = 429
+
+        etags = _upload.SegmentUploader(
+            self.proxy, {}, retries=2, backoff=0).upload(segments)
+
+        self.assertEqual('etag-seg1', etags['seg1'])
+        self.assertEqual(4, self.proxy.put.call_count)
+
+    def test_upload_hasher(self):
+        hasher = mock.Mock()
+        hasher.wrap.side_effect = lambda name, segment: segment
+        segments = {'seg%d' % i: FakeSegment(10) for i in range(3)}
+        self.failures['seg1'] = 1
+
+        _upload.SegmentUploader(
+            self.proxy, {}, backoff=0, hasher=hasher).upload(segments)
+
+        self.assertEqual(
+            ['seg0', 'seg1', 'seg2'],
+            sorted(c[0][0] for c in hasher.uploaded.call_args_list))
+        self.assertEqual(
+            ['seg0', 'seg1', 'seg1', 'seg2'],
+            sorted(c[0][0] for c in hasher.wrap.call_args_list))
+
+
+class TestSegmentHasher(base.TestCase):
+
+    def setUp(self):
+        super(TestSegmentHasher, self).setUp()
+        self.data = os.urandom(30)
+        self.expected = (
+            utils.md5(self.data, usedforsecurity=False).hexdigest(),
+            hashlib.sha256(self.data).hexdigest())
+        self.filename = os.path.join(
+            self.useFixture(fixtures.TempDir()).path, 'data')
+        with open(self.filename, 'wb') as f:
+            f.write(self.data)
+        self.segments = {
+            'seg%d' % i: _utils.FileSegment(self.filename, i * 10, 10)
+            for i in range(3)
+        }
+
+    def _read(self, hasher, name, size=-1):
+        segment = hasher.wrap(name, self.segments[name])
+        segment.seek(0)
+        self.assertEqual(10, segment.length)
+        data = segment.read(size)
+        segment.close()
+        return data
+
+    def test_out_of_order(self):
+        hasher = _upload.SegmentHasher(self.segments)
+        hasher._hash_file = mock.Mock()
+
+        self._read(hasher, 'seg2')
+        hasher.uploaded('seg2')
+        # Interrupted then retried from the start
+        self._read(hasher, 'seg0', 4)
+        self._read(hasher, 'seg0')
+        self._read(hasher, 'seg1')
+        hasher.uploaded('seg1')
+        hasher.uploaded('seg0')
+
+        self.assertEqual(self.expected, hasher.hexdigests())
+        # All the data was hashed as it was read
+        hasher._hash_file.assert_not_called()
+
+    def test_read_again(self):
+        hasher = _upload.SegmentHasher(self.segments, buffer_size=15)
+
+        self._read(hasher, 'seg1')
+        # Beyond the buffer size
+        self._read(hasher, 'seg2')
+        hasher.uploaded('seg2')
+        self._read(hasher, 'seg0', 5)
+        # seg0 is partially hashed, seg2 is read again
+        with mock.patch.object(
+                hasher, '_hash_file', wraps=hasher._hash_file) as hash_file:
+            hasher.uploaded('seg0')
+            hasher.uploaded('seg1')
+            hasher._wait()
+        self.assertEqual(
+            [mock.call(self.segments['seg0'], 5),
+             mock.call(self.segments['seg2'], 0)],
+            hash_file.call_args_list)
+
+        self.assertEqual(self.expected, hasher.hexdigests())
+
+    def test_read_again_concurrent(self):
+        hasher = _upload.SegmentHasher(self.segments)
+        hash_file = hasher._hash_file
+        hashing = threading.Event()
+        release = threading.Event()
+        self.addCleanup(release.set)
+
+        def _hash_file(segment, offset):
+            hashing.set()
+            release.wait()
+            hash_file(segment, offset)
+
+        hasher._hash_file = _hash_file
+
+        # seg0 was not read, it is read from the file once uploaded
+        hasher.uploaded('seg0')
+        self.assertTrue(hashing.wait(10))
+        # The data of the other segments is kept while seg0 is read again
+        self._read(hasher, 'seg1')
+        hasher.uploaded('seg1')
+        self._read(hasher, 'seg2')
+        hasher.uploaded('seg2')
+        self.assertEqual(20, hasher._buffered)
+        release.set()
+
+        self.assertEqual(self.expected, hasher.hexdigests())
+        self.assertEqual(0, hasher._buffered)
+
+    def test_not_uploaded(self):
+        hasher = _upload.SegmentHasher(self.segments)
+        hasher.uploaded('seg0')
+
+        self.assertRaises(exceptions.SDKException, hasher.hexdigests)
+
+
+class TestUploadJournal(base.TestCase):
+
+    def setUp(self):
+        super(TestUploadJournal, self).setUp()
+        self.directory = self.useFixture(fixtures.TempDir()).path
+        self.filename = os.path.join(self.directory, 'data')
+        with open(self.filename, 'wb') as f:
+            f.write(b'data')
+
+    def _open(self):
+        return _upload.UploadJournal.open(
+            os.path.join(self.directory, 'journals'),
+            'container/object', self.filename, 2)
+
+    def test_resume(self):
+        journal = self._open()
+        journal.record('container/object/000000', 'etag0')
+        journal.close()
+        # Simulate a write torn by the interruption
+        with open(journal.path, 'a') as f:
+            f.write('{"name": "container/obj')
+
+        journal = self._open()
+        self.assertEqual({'container/object/000000': 'etag0'}, journal.etags)
+        journal.discard()
+        self.assertFalse(os.path.exists(journal.path))
+
+    def test_file_changed(self):
+        journal = self._open()
+        journal.record('container/object/000000', 'etag0')
+        journal.close()
+        with open(self.filename, 'ab') as f:
+            f.write(b'more')
+
+        journal = self._open()
+        self.assertEqual({}, journal.etags)
+        journal.close()
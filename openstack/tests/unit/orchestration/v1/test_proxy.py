@@ -137,6 +137,17 @@ class TestOrchestrationStack(TestOrchestrationProxy):
         mock_stack.assert_called_once_with(id='FAKE_ID')
         stk.check.assert_called_once_with(self.proxy)
 
+    @mock.patch.object(_proxy.Proxy, '_wait_for_delete_many')
+    @mock.patch.object(_proxy.Proxy, '_service_cleanup_del_res_many')
+    def test_service_cleanup_wait_timeout(self, mock_del, mock_wait):
+        stacks = [stack.Stack(id='FAKE_ID')]
+        mock_del.return_value = stacks
+
+        self.proxy._service_cleanup(dry_run=False, wait_timeout=30)
+
+        mock_wait.assert_called_once_with(
+            stacks, self.proxy.stacks, wait=30)
+
 
 class TestOrchestrationStackEnvironment(TestOrchestrationProxy):
     @mock.patch.object(stack.Stack, 'find')
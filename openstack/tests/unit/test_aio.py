@@ -0,0 +1,139 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+import asyncio
+
+from openstack import aio
+from openstack import exceptions
+from openstack.network.v2 import port as _port
+from openstack.tests.unit import base
+
+
+class TestAsyncConnection(base.TestCase):
+
+    def setUp(self):
+        super(TestAsyncConnection, self).setUp()
+        self.ports = [
+            {'id': 'port-%d' % i, 'name': 'port%d' % i,
+             'network_id': 'net-id'}
+            for i in range(5)
+        ]
+
+    def test_aio_is_cached(self):
+        self.assertIsInstance(self.cloud.aio, aio.AsyncConnection)
+        self.assertIs(self.cloud.aio, self.cloud.aio)
+        self.assertIsInstance(self.cloud.aio.network, aio.AsyncProxy)
+        self.assertIs(self.cloud.network, self.cloud.aio.network.proxy)
+
+    def test_create(self):
+        self.register_uris([
+            dict(method='POST',
+                 uri=self.get_mock_url(
+                     'network', 'public', append=['v2.0', 'ports']),
+                 json={'port': self.ports[0]},
+                 validate=dict(
+                     json={'port': {'network_id': 'net-id',
+                                    'name': 'port0'}})),
+        ])
+
+        port = asyncio.run(
+            self.cloud.aio.network.create_port(
+                network_id='net-id', name='port0'))
+
+        self.assertIsInstance(port, _port.Port)
+        self.assertEqual('port-0', port.id)
+        self.assert_calls()
+
+    def test_list_async_for(self):
+        self.register_uris([
+            dict(method='GET',
+                 uri=self.get_mock_url(
+                     'network', 'public', append=['v2.0', 'ports']),
+                 json={'ports': self.ports}),
+        ])
+
+        async def _list():
+            return [p async for p in self.cloud.aio.network.ports()]
+
+        ports = asyncio.run(_list())
+
+        self.assertEqual([p['id'] for p in self.ports],
+                         [p.id for p in ports])
+        self.assertIsInstance(ports[0], _port.Port)
+        self.assert_calls()
+
+    def test_list_small_batches(self):
+        self.register_uris([
+            dict(method='GET',
+                 uri=self.get_mock_url(
+                     'network', 'public', append=['v2.0', 'ports']),
+                 json={'ports': self.ports}),
+        ])
+        conn = aio.AsyncConnection(self.cloud, batch_size=2)
+        self.addCleanup(conn.close)
+
+        async def _list():
+            return [p async for p in conn.network.ports()]
+
+        ports = asyncio.run(_list())
+
+        self.assertEqual(5, len(ports))
+        self.assert_calls()
+
+    def test_concurrent_gets(self):
+        self.register_uris([
+            dict(method='GET',
+                 uri=self.get_mock_url(
+                     'network', 'public',
+                     append=['v2.0', 'ports', port['id']]),
+                 json={'port': port})
+            for port in self.ports
+        ])
+
+        async def _get_all():
+            return await asyncio.gather(*[
+                self.cloud.aio.network.get_port(port['id'])
+                for port in self.ports
+            ])
+
+        ports = asyncio.run(_get_all())
+
+        self.assertEqual([p['id'] for p in self.ports],
+                         [p.id for p in ports])
+
+    def test_error(self):
+        self.register_uris([
+            dict(method='GET',
+                 uri=self.get_mock_url(
+                     'network', 'public',
+                     append=['v2.0', 'ports', 'missing']),
+                 status_code=404),
+        ])
+
+        self.assertRaises(
+            exceptions.ResourceNotFound,
+            asyncio.run,
+            self.cloud.aio.network.get_port('missing'))
+        self.assert_calls()
+
+    def test_cloud_layer(self):
+        self.register_uris([
+            dict(method='GET',
+                 uri=self.get_mock_url(
+                     'network', 'public', append=['v2.0', 'ports']),
+                 json={'ports': self.ports}),
+        ])
+
+        ports = asyncio.run(self.cloud.aio.list_ports())
+
+        self.assertEqual(5, len(ports))
+        self.assert_calls()
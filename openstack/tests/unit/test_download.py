@@ -0,0 +1,87 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+import os
+import re
+from unittest import mock
+
+import fixtures
+
+from openstack import _download
+from openstack import exceptions
+from openstack.tests.unit import base
+from openstack import utils
+
+
+class TestDownloadParts(base.TestCase):
+
+    def setUp(self):
+        super(TestDownloadParts, self).setUp()
+        self.data = bytes(range(256)) * 40
+        self.md5 = utils.md5(self.data, usedforsecurity=False).hexdigest()
+        self.path = os.path.join(
+            self.useFixture(fixtures.TempDir()).path, 'data')
+        self.session = mock.Mock()
+        self.session.get.side_effect = self._get
+        self.ignore_range = False
+
+    def _get(self, url, headers, stream):
+        data = self.data
+        status_code = 200
+        match = re.match(r'bytes=(\d+)-(\d+)', headers.get('Range', ''))
+        if match and not self.ignore_range:
+            data = data[int(match.group(1)):int(match.group(2)) + 1]
+            status_code = 206
+        response = mock.Mock()
+        response.status_code = status_code
+        response.iter_content.side_effect = lambda chunk_size: (
+            data[i:i + chunk_size] for i in range(0, len(data), chunk_size))
+        return response
+
+    def test_download_ranges(self):
+        _download.download_parts(
+            self.session, self.path, len(self.data),
+            _download.split_ranges('object', len(self.data), 1000),
+            max_workers=3, chunk_size=100, checksum=self.md5)
+
+        with open(self.path, 'rb') as f:
+            self.assertEqual(self.data, f.read())
+        self.assertEqual(11, self.session.get.call_count)
+        self.session.get.assert_any_call(
+            'object', headers={'Range': 'bytes=10000-10239'}, stream=True)
+
+    def test_download_checksum_mismatch(self):
+        self.assertRaises(
+            exceptions.InvalidResponse,
+            _download.download_parts,
+            self.session, self.path, len(self.data),
+            _download.split_ranges('object', len(self.data), 1000),
+            checksum='wrong')
+
+    def test_download_range_ignored(self):
+        self.ignore_range = True
+        self.assertRaises(
+            exceptions.SDKException,
+            _download.download_parts,
+            self.session, self.path, len(self.data),
+            _download.split_ranges('object', len(self.data), 1000))
+
+    def test_download_part_checksum(self):
+        parts = [
+            _download.Part('segment', 0, len(self.data), md5=self.md5),
+            _download.Part(
+                'segment', len(self.data), len(self.data), md5='wrong'),
+        ]
+        self.assertRaises(
+            exceptions.InvalidResponse,
+            _download.download_parts,
+            self.session, self.path, 2 * len(self.data), parts)
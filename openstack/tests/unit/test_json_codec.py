@@ -0,0 +1,152 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+import collections
+import datetime
+import json
+import uuid
+
+from keystoneauth1 import session as ks_session
+import munch
+import requests
+
+from openstack import _json_codec
+from openstack import exceptions
+from openstack import resource
+from openstack.tests.unit import base
+
+
+class Res(resource.Resource):
+    name = resource.Body('name')
+    tags = resource.Body('tags', type=list)
+
+
+Point = collections.namedtuple('Point', 'x y')
+
+
+def _response(body, encoding='utf-8'):
+    response = requests.Response()
+    response._content = body
+    response.encoding = encoding
+    response.status_code = 200
+    return response
+
+
+class TestJSONCodecs(base.TestCase):
+    """Every codec behaves like the standard library."""
+
+    bodies = [
+        b'{"ports": [{"id": "a", "size": 1.5, "up": true, "x": null}]}',
+        '{"name": "été ☃"}'.encode('utf-8'),
+        b'[1, -2, 3.25e10, 18446744073709551615, "\\u00e9"]',
+        b'{"value": NaN, "other": Infinity}',
+        b'{"a": 1, "a": 2}',
+        b'"\\ud800"',
+        b'  {}  ',
+    ]
+
+    invalid_bodies = [b'', b'{"a": }', b'[1, 2', b'{} []', b'<html></html>']
+
+    def _objects(self):
+        lazy = Res.existing(name='lazy', tags=['a'], _lazy_dict=True)
+        return [
+            {'ports': [{'id': 'a', 'size': 1.5, 'up': True, 'x': None}]},
+            {'name': 'été ☃', 'list': [1, [2, (3, 4)]]},
+            {1: 'int key', None: 'none key', True: 'bool key'},
+            {'big': 12345678901234567890123},
+            Res(name='res', tags=['a', 'b']),
+            {'nested': [Res(name='nested'), lazy]},
+            lazy,
+            munch.Munch(a=munch.Munch(b=1)),
+            {'point': Point(1, 2)},
+            {'when': datetime.datetime(2021, 1, 2, 3, 4, 5, 6)},
+            {'when': datetime.datetime(
+                2021, 1, 2, tzinfo=datetime.timezone.utc)},
+            {'id': uuid.UUID('65c0ee9f-d634-4522-8954-51021b570b0d')},
+        ]
+
+    def test_dumps(self):
+        encoder = ks_session._JSONEncoder()
+        for codec in _json_codec.CODECS.values():
+            for obj in self._objects():
+                expected = json.loads(encoder.encode(obj))
+                data = codec.dumps(obj)
+                if data is None:
+                    continue
+                self.assertEqual(
+                    expected, json.loads(data),
+                    '{codec} encoded {obj!r}'.format(
+                        codec=codec.name, obj=obj))
+
+    def test_dumps_unknown(self):
+        for codec in _json_codec.CODECS.values():
+            self.assertIsNone(codec.dumps({'a': object()}))
+
+    def test_decode_response(self):
+        for codec in _json_codec.CODECS.values():
+            for body in self.bodies:
+                response = _response(body)
+                codec.attach(response)
+                self.assertEqual(
+                    repr(_response(body).json()), repr(response.json()),
+                    '{codec} decoded {body!r}'.format(
+                        codec=codec.name, body=body))
+
+    def test_decode_response_large_integer(self):
+        for codec in _json_codec.CODECS.values():
+            response = _response(b'[12345678901234567890123]')
+            codec.attach(response)
+            if codec.name == 'orjson':
+                self.assertEqual([1.2345678901234568e+22], response.json())
+            else:
+                self.assertEqual([12345678901234567890123], response.json())
+
+    def test_decode_response_encoding(self):
+        body = '{"name": "été"}'
+        for codec in _json_codec.CODECS.values():
+            for encoding in ('utf-16', 'latin-1'):
+                response = _response(body.encode(encoding), encoding)
+                codec.attach(response)
+                self.assertEqual({'name': 'été'}, response.json())
+
+    def test_decode_response_invalid(self):
+        for codec in _json_codec.CODECS.values():
+            for body in self.invalid_bodies:
+                response = _response(body)
+                codec.attach(response)
+                self.assertRaises(
+                    requests.exceptions.JSONDecodeError, response.json)
+
+    def test_attach_not_a_response(self):
+        for codec in _json_codec.CODECS.values():
+            response = object()
+            codec.attach(response)
+
+
+class TestGetCodec(base.TestCase):
+
+    def test_get_codec(self):
+        self.assertIs(
+            _json_codec.CODECS['json'], _json_codec.get_codec('json'))
+
+    def test_get_codec_auto(self):
+        fastest = next(iter(_json_codec.CODECS.values()))
+        self.assertIs(fastest, _json_codec.get_codec())
+        self.assertIs(fastest, _json_codec.get_codec('auto'))
+
+    def test_get_codec_unknown(self):
+        self.assertRaises(
+            exceptions.ConfigException, _json_codec.get_codec, 'yaml')
+
+    def test_connection(self):
+        self.assertIs(
+            _json_codec.get_codec(), self.cloud._json_codec)
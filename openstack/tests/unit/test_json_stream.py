@@ -0,0 +1,86 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+import json
+
+from openstack import _json_stream
+from openstack.tests.unit import base
+
+
+def _chunks(data, size):
+    return [data[i:i + size] for i in range(0, len(data), size)]
+
+
+class TestIterItems(base.TestCase):
+
+    def setUp(self):
+        super(TestIterItems, self).setUp()
+        self.document = {
+            'count': 12345,
+            'ports': [
+                {'id': str(i), 'name': 'port-é%d' % i, 'size': i * 1.5,
+                 'tags': ['a', 'b'], 'up': i % 2 == 0, 'extra': None}
+                for i in range(50)
+            ],
+            'ports_links': [{'rel': 'next', 'href': 'http://next'}],
+        }
+        self.data = json.dumps(self.document, indent=1).encode('utf-8')
+
+    def test_iter_items(self):
+        for size in (1, 2, 7, 64, len(self.data)):
+            rest = {}
+            items = list(_json_stream.iter_items(
+                _chunks(self.data, size), 'ports', rest))
+
+            self.assertEqual(self.document['ports'], items)
+            self.assertEqual(
+                {'count': 12345,
+                 'ports_links': self.document['ports_links']},
+                rest)
+
+    def test_iter_items_incremental(self):
+        chunks = iter(_chunks(self.data, 64))
+
+        items = _json_stream.iter_items(chunks, 'ports')
+
+        self.assertEqual(self.document['ports'][0], next(items))
+        self.assertGreater(len(list(chunks)), 0)
+
+    def test_iter_items_list(self):
+        data = json.dumps([1, 22, 333, {'a': []}, 'x']).encode()
+
+        self.assertEqual(
+            [1, 22, 333, {'a': []}, 'x'],
+            list(_json_stream.iter_items(_chunks(data, 1))))
+        self.assertEqual(
+            [], list(_json_stream.iter_items([b' [ ] '])))
+
+    def test_iter_items_not_a_list(self):
+        self.assertEqual(
+            [{'id': 1}],
+            list(_json_stream.iter_items([b'{"port": {"id": 1}}'], 'port')))
+        self.assertEqual(
+            [{'id': 1}], list(_json_stream.iter_items([b'{"id": 1}'])))
+
+    def test_iter_items_missing_key(self):
+        self.assertRaises(
+            KeyError, list,
+            _json_stream.iter_items([b'{"networks": []}'], 'ports'))
+        self.assertRaises(
+            KeyError, list, _json_stream.iter_items([b'{}'], 'ports'))
+
+    def test_iter_items_invalid(self):
+        for data in (b'', b'{"ports": [1, 2', b'{"ports": [1 2]}',
+                     b'{"ports": []} []', b'{1: []}', b'[1, tru]'):
+            self.assertRaises(
+                json.JSONDecodeError, list,
+                _json_stream.iter_items(_chunks(data, 3), 'ports'))
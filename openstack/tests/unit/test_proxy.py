@@ -11,16 +11,21 @@
 # under the License.
 
 import copy
+import itertools
 import queue
 from unittest import mock
 
 import munch
 from testscenarios import load_tests_apply_scenarios as load_tests  # noqa
 
+from openstack import _json_codec
+from openstack.compute.v2 import server
 from openstack import exceptions
 from openstack import proxy
 from openstack import resource
+from openstack.tests import fakes
 from openstack.tests.unit import base
+from openstack import utils
 
 
 class DeleteableResource(resource.Resource):
@@ -241,6 +246,28 @@ class TestProxyDelete(base.TestCase):
                           DeleteableResource, self.res, ignore_missing=False)
 
 
+    def test_delete_notify_write(self):
+        observer = mock.Mock()
+        self.cloud.add_write_observer(DeleteableResource, observer)
+
+        self.sot._delete(DeleteableResource, self.res)
+        self.res.delete.side_effect = exceptions.ResourceNotFound()
+        self.sot._delete(DeleteableResource, self.res)
+
+        self.assertEqual(
+            [mock.call('delete', self.res), mock.call('delete', self.res)],
+            observer.call_args_list)
+
+    def test_delete_notify_write_error(self):
+        observer = mock.Mock()
+        self.cloud.add_write_observer(DeleteableResource, observer)
+        self.res.delete.side_effect = exceptions.ResourceNotFound()
+
+        self.assertRaises(
+            exceptions.ResourceNotFound, self.sot._delete,
+            DeleteableResource, self.res, ignore_missing=False)
+        observer.assert_not_called()
+
 class TestProxyUpdate(base.TestCase):
 
     def setUp(self):
@@ -323,6 +350,17 @@ class TestProxyCreate(base.TestCase):
         self.res.create.assert_called_once_with(self.sot, base_path=base_path)
 
 
+    def test_create_notify_write(self):
+        CreateableResource.new = mock.Mock(return_value=self.res)
+        observer = mock.Mock()
+        self.cloud.add_write_observer(CreateableResource, observer)
+        created = mock.Mock(spec=CreateableResource)
+        self.res.create.return_value = created
+
+        self.sot._create(CreateableResource, x=1)
+
+        observer.assert_called_once_with('create', created)
+
 class TestProxyBulkCreate(base.TestCase):
 
     def setUp(self):
@@ -580,6 +618,42 @@ class TestProxyCache(base.TestCase):
             self._get_key(1),
             self.cloud._api_cache_keys)
 
+    def test_json_codec(self):
+        codec = mock.Mock(spec=_json_codec.JSONCodec)
+        codec.dumps.return_value = b'{"foo":"bar"}'
+        self.cloud._json_codec = codec
+
+        self.sot.put('fake/1', json={'foo': 'bar'})
+
+        codec.dumps.assert_called_once_with({'foo': 'bar'})
+        codec.attach.assert_called_once_with(self.response)
+        self.session.request.assert_called_with(
+            'fake/1',
+            'PUT',
+            connect_retries=mock.ANY, raise_exc=mock.ANY,
+            global_request_id=mock.ANY,
+            endpoint_filter=mock.ANY,
+            headers={'Content-Type': 'application/json'},
+            data=b'{"foo":"bar"}',
+        )
+
+    def test_json_codec_fallback(self):
+        codec = mock.Mock(spec=_json_codec.JSONCodec)
+        codec.dumps.return_value = None
+        self.cloud._json_codec = codec
+
+        self.sot.put('fake/1', json={'foo': 'bar'})
+
+        self.session.request.assert_called_with(
+            'fake/1',
+            'PUT',
+            connect_retries=mock.ANY, raise_exc=mock.ANY,
+            global_request_id=mock.ANY,
+            endpoint_filter=mock.ANY,
+            headers=mock.ANY,
+            json={'foo': 'bar'},
+        )
+
     def test_get_from_cache(self):
         key = self._get_key(2)
 
@@ -594,7 +668,7 @@ class TestProxyCache(base.TestCase):
         key = self._get_key(3)
 
         self.cloud._cache.set(key, self.response)
-        self.cloud._api_cache_keys.add(key)
+        self.cloud._api_cache_keys.add('srv.fake', key, 5)
         self.cloud._cache_expirations['srv.fake'] = 5
 
         # Ensure first call gets value from cache
@@ -621,7 +695,7 @@ class TestProxyCache(base.TestCase):
 
         resp = copy.deepcopy(self.response)
         resp.body = {'foo': 'bar'}
-        self.cloud._api_cache_keys.add(key)
+        self.cloud._api_cache_keys.add('srv.fake', key, 5)
         self.cloud._cache.set(key, resp)
         # set expiration for the resource to respect cache
         self.cloud._cache_expirations['srv.fake'] = 5
@@ -635,6 +709,80 @@ class TestProxyCache(base.TestCase):
             'NoValue',
             type(self.cloud._cache.get(key)).__name__)
 
+    def test_get_not_cached_resource_not_tracked(self):
+        self.sot._get(self.Res, '5')
+
+        self.session.request.assert_called()
+        self.assertEqual(0, len(self.cloud._api_cache_keys))
+
+    def test_modify_invalidates_only_prefix(self):
+        key = self._get_key(6)
+        other_key = "srv.other.other/6.{'microversion': None, 'params': {}}"
+        self.cloud._cache.set(key, self.response)
+        self.cloud._cache.set(other_key, self.response)
+        self.cloud._api_cache_keys.add('srv.fake', key, 5)
+        self.cloud._api_cache_keys.add('srv.other', other_key, 5)
+
+        rs = self.Res.existing(id='6')
+        self.sot._update(self.Res, rs, foo='bar')
+
+        self.assertNotIn(key, self.cloud._api_cache_keys)
+        self.assertIn(other_key, self.cloud._api_cache_keys)
+        self.assertEqual(
+            'NoValue',
+            type(self.cloud._cache.get(key)).__name__)
+        self.assertEqual(self.response, self.cloud._cache.get(other_key))
+
+
+class TestProxyWaitStrategy(base.TestCase):
+
+    def setUp(self):
+        super(TestProxyWaitStrategy, self).setUp()
+        self.sleep = self.useFixture(
+            base.fixtures.MockPatch('openstack.utils.time.sleep')).mock
+        self.server_id = '1234'
+        self.server_uri = '{endpoint}/servers/{id}'.format(
+            endpoint=fakes.COMPUTE_ENDPOINT, id=self.server_id)
+
+    def _server(self, status):
+        return {'server': fakes.make_fake_server(
+            self.server_id, 'server', status=status)}
+
+    def test_wait_for_server(self):
+        self.register_uris([
+            self.get_nova_discovery_mock_dict(),
+            dict(method='GET', uri=self.server_uri,
+                 json=self._server('BUILD')),
+            dict(method='GET', uri=self.server_uri,
+                 json=self._server('BUILD')),
+            dict(method='GET', uri=self.server_uri,
+                 json=self._server('ACTIVE')),
+        ])
+        self.cloud.compute._wait_strategy = utils.ExponentialBackoff()
+
+        self.cloud.compute.wait_for_server(
+            server.Server(id=self.server_id, status='BUILD'), interval=1)
+
+        self.assertEqual(
+            [mock.call(1), mock.call(2)], self.sleep.call_args_list)
+        self.assert_calls()
+
+    def test_wait_for_server_retry_after(self):
+        self.register_uris([
+            self.get_nova_discovery_mock_dict(),
+            dict(method='GET', uri=self.server_uri,
+                 json=self._server('BUILD'),
+                 headers={'Retry-After': '5'}),
+            dict(method='GET', uri=self.server_uri,
+                 json=self._server('ACTIVE')),
+        ])
+
+        self.cloud.compute.wait_for_server(
+            server.Server(id=self.server_id, status='BUILD'), interval=1)
+
+        self.assertEqual([mock.call(5)], self.sleep.call_args_list)
+        self.assert_calls()
+
 
 class TestProxyCleanup(base.TestCase):
 
@@ -813,3 +961,96 @@ class TestProxyCleanup(base.TestCase):
             )
         )
         self.assertEqual(self.res, q.get_nowait())
+
+    def test_service_cleanup_rate_limiter(self):
+        rate_limiter = mock.Mock()
+        self.sot._service_cleanup_del_res(
+            self.delete_mock,
+            self.res,
+            dry_run=False,
+            rate_limiter=rate_limiter
+        )
+        rate_limiter.wait.assert_called_once_with()
+        self.delete_mock.assert_called_with(self.res)
+
+    def test_service_cleanup_rate_limiter_dry_run(self):
+        rate_limiter = mock.Mock()
+        self.sot._service_cleanup_del_res(
+            self.delete_mock,
+            self.res,
+            rate_limiter=rate_limiter
+        )
+        rate_limiter.wait.assert_not_called()
+
+    def test_service_cleanup_errors(self):
+        errors = []
+        error = exceptions.ConflictException('in use')
+        self.delete_mock.side_effect = error
+        self.sot._service_cleanup_del_res(
+            self.delete_mock,
+            self.res,
+            dry_run=False,
+            errors=errors
+        )
+        self.assertEqual([(self.res, error)], errors)
+
+    def test_service_cleanup_del_res_many(self):
+        objs = [mock.Mock(spec=resource.Resource, id=i) for i in range(10)]
+        rd = dict()
+        self.assertEqual(
+            objs[::2],
+            self.sot._service_cleanup_del_res_many(
+                self.delete_mock,
+                iter(objs),
+                max_concurrency=4,
+                dry_run=False,
+                identified_resources=rd,
+                resource_evaluation_fn=lambda x, y, z: x.id % 2 == 0
+            )
+        )
+        self.assertCountEqual(
+            objs[::2],
+            [c[0][0] for c in self.delete_mock.call_args_list])
+        self.assertEqual(sorted(rd), [0, 2, 4, 6, 8])
+
+    def test_service_cleanup_del_res_many_serial(self):
+        objs = [mock.Mock(spec=resource.Resource, id=i) for i in range(3)]
+        self.assertEqual(
+            objs,
+            self.sot._service_cleanup_del_res_many(
+                self.delete_mock, objs, dry_run=False)
+        )
+        self.assertEqual(
+            [mock.call(obj) for obj in objs],
+            self.delete_mock.call_args_list)
+
+    @mock.patch('time.sleep', return_value=None)
+    def test_wait_for_delete_many(self, mock_sleep):
+        objs = [mock.Mock(spec=resource.Resource, id=i) for i in range(3)]
+        list_fn = mock.Mock(side_effect=[objs, objs[1:2], []])
+
+        self.sot._wait_for_delete_many(objs, list_fn)
+
+        self.assertEqual(3, list_fn.call_count)
+
+    def test_wait_for_delete_many_nothing(self):
+        list_fn = mock.Mock()
+
+        self.sot._wait_for_delete_many([], list_fn)
+
+        list_fn.assert_not_called()
+
+    @mock.patch('time.sleep', return_value=None)
+    @mock.patch('time.time', side_effect=itertools.count(step=10))
+    def test_wait_for_delete_many_timeout(self, mock_time, mock_sleep):
+        objs = [mock.Mock(spec=resource.Resource, id=i) for i in range(3)]
+        list_fn = mock.Mock(return_value=objs[1:])
+
+        error = self.assertRaises(
+            exceptions.ResourceTimeout,
+            self.sot._wait_for_delete_many, objs, list_fn, interval=1,
+            wait=15)
+        list_fn.assert_called_once_with()
+        self.assertEqual(
+            'Timeout waiting for 2 resources to be deleted: 1, 2',
+            error.message)
@@ -10,14 +10,18 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 
+import concurrent.futures
 import itertools
 import json
+import queue
+import threading
 from unittest import mock
 
 from keystoneauth1 import adapter
 import munch
 import requests
 
+from openstack import connection
 from openstack import exceptions
 from openstack import format
 from openstack import resource
@@ -755,6 +759,44 @@ class TestResource(base.TestCase):
                 expected.remove(attr)
         self.assertEqual([], expected)
 
+    def test__get_schema(self):
+        class Parent(resource.Resource):
+            foo = resource.Header('foo')
+            bar = resource.Body('bar')
+
+        class Child(Parent):
+            bar = resource.Body('remote_bar', aka='_bar')
+            baz = resource.Body('baz')
+
+        schema = Child._get_schema()
+        self.assertIs(schema, Child._get_schema())
+        self.assertIsNot(schema, Parent._get_schema())
+        self.assertIs(
+            resource.Resource._get_schema(),
+            resource.Resource._get_schema())
+
+        self.assertEqual(
+            {'remote_bar': 'bar', 'baz': 'baz', 'id': 'id', 'name': 'name'},
+            schema.mapping(resource.Body))
+        self.assertEqual(
+            {'bar': 'bar', 'id': 'id', 'name': 'name'},
+            Parent._get_schema().mapping(resource.Body))
+
+        # Aliases are registered per class
+        self.assertEqual({'_bar': 'bar'}, Child._attr_aliases)
+        self.assertEqual({}, Parent._attr_aliases)
+        self.assertEqual('value', Child(bar='value')._bar)
+
+    def test__get_mapping_copy(self):
+        class Test(resource.Resource):
+            foo = resource.Body('foo')
+
+        mapping = Test._body_mapping()
+        mapping['other'] = 'other'
+
+        self.assertNotIn('other', Test._body_mapping())
+        self.assertEqual('value', Test(foo='value').foo)
+
     def test_to_dict(self):
 
         class Test(resource.Resource):
@@ -903,6 +945,94 @@ class TestResource(base.TestCase):
         actual = json.dumps(res, sort_keys=True)
         self.assertEqual(expected, actual)
 
+    def test_lazy_dict(self):
+        class Test(resource.Resource):
+            foo = resource.Body('foo_remote')
+
+        res = Test(foo='bar', _lazy_dict=True)
+
+        self.assertEqual(['foo', 'id', 'name', 'location'], list(res))
+        self.assertIn('foo', res)
+        self.assertEqual(4, len(res))
+        self.assertEqual(
+            '{"foo": "bar", "id": null, "location": null, "name": null}',
+            json.dumps(res, sort_keys=True))
+        self.assertTrue(res._dict_pending)
+
+        self.assertEqual('bar', res.get('foo'))
+        self.assertFalse(res._dict_pending)
+        self.assertEqual(
+            {'foo': 'bar', 'id': None, 'location': None, 'name': None},
+            dict(res))
+
+        res._translate_response(FakeResponse({'foo_remote': 'new_bar'}))
+
+        self.assertTrue(res._dict_pending)
+        self.assertEqual('new_bar', res.get('foo'))
+        self.assertIn('new_bar', res.values())
+
+    def test_lazy_dict_compare(self):
+        class Test(resource.Resource):
+            foo = resource.Body('foo')
+
+        self.assertNotEqual(
+            Test(foo='a', _lazy_dict=True), Test(foo='b', _lazy_dict=True))
+        self.assertFalse(
+            Test(foo='a', _lazy_dict=True) != Test(foo='a', _lazy_dict=True))
+        self.assertFalse(
+            Test(foo='a', _lazy_dict=True)
+            != {'foo': 'a', 'id': None, 'location': None, 'name': None})
+
+    def test_view(self):
+        class Test(resource.Resource):
+            base_path = '/parents/%(parent_id)s/tests'
+            foo = resource.Body('foo_remote', type=int)
+            bar = resource.Body('bar', aka='baz', alias='foo')
+            is_enabled = resource.Body('enabled', type=bool)
+            parent_id = resource.URI('parent_id')
+
+        view_class = Test._get_schema().view_class
+        self.assertIs(view_class, Test._get_schema().view_class)
+        self.assertTrue(issubclass(view_class, resource.ResourceView))
+        self.assertIs(Test, view_class.resource_type)
+
+        view = view_class(
+            {'id': 'abc', 'foo_remote': '1', 'enabled': None},
+            {'parent_id': 'parent'})
+
+        self.assertEqual('abc', view.id)
+        self.assertEqual(1, view.foo)
+        self.assertEqual(1, view.bar)
+        self.assertEqual(1, view.baz)
+        self.assertIsNone(view.is_enabled)
+        self.assertIsNone(view.name)
+        self.assertEqual('parent', view.parent_id)
+        self.assertEqual(1, view['foo'])
+        self.assertRaises(KeyError, view.__getitem__, 'to_dict')
+        self.assertRaises(AttributeError, setattr, view, 'foo', 2)
+        self.assertRaises(AttributeError, setattr, view, 'other', 2)
+        self.assertEqual(
+            Test.existing(
+                id='abc', foo_remote='1', enabled=None, parent_id='parent'
+            ).to_dict(),
+            view.to_dict())
+        self.assertEqual(
+            view_class({'id': 'abc'}, {}), view_class({'id': 'abc'}))
+
+        res = view.to_resource()
+        self.assertIsInstance(res, Test)
+        self.assertEqual(1, res.foo)
+        self.assertEqual('parent', res.parent_id)
+
+    def test_view_alternate_id(self):
+        class Test(resource.Resource):
+            name = resource.Body('name', alternate_id=True)
+
+        view_class = Test._get_schema().view_class
+
+        self.assertEqual('a', view_class({'name': 'a'}).id)
+        self.assertEqual('b', view_class({'id': 'b', 'name': 'a'}).id)
+
     def test_items(self):
         class Test(resource.Resource):
             foo = resource.Body('foo')
@@ -1780,6 +1910,13 @@ class TestResourceActions(base.TestCase):
         self._test_commit(
             commit_method='PATCH', prepend_key=False, has_body=False)
 
+    def test_commit_notify_write(self):
+        self.session._notify_write = mock.Mock()
+
+        self._test_commit(commit_method='PUT', prepend_key=True, has_body=True)
+
+        self.session._notify_write.assert_called_once_with('update', self.sot)
+
     def test_commit_base_path(self):
         self._test_commit(commit_method='PUT', prepend_key=True, has_body=True,
                           base_path='dummy')
@@ -1815,10 +1952,12 @@ class TestResourceActions(base.TestCase):
         self.sot._body.dirty = dict()
         self.sot._header = mock.Mock()
         self.sot._header.dirty = dict()
+        self.session._notify_write = mock.Mock()
 
         self.sot.commit(self.session)
 
         self.session.put.assert_not_called()
+        self.session._notify_write.assert_not_called()
 
     def test_patch_with_sdk_names(self):
         class Test(resource.Resource):
@@ -1949,6 +2088,71 @@ class TestResourceActions(base.TestCase):
         self.assertEqual(id_value, results[0].id)
         self.assertIsInstance(results[0], self.test_class)
 
+    def test_list_lazy_dict(self):
+        mock_response = mock.Mock()
+        mock_response.status_code = 200
+        mock_response.links = {}
+        mock_response.json.return_value = {
+            "resources": [{"id": 1, "name": "first"}]}
+
+        self.session.get.return_value = mock_response
+
+        results = list(self.sot.list(self.session, lazy_dict=True))
+
+        self.assertEqual(1, len(results))
+        self.assertTrue(results[0]._dict_pending)
+        self.assertEqual("first", results[0].name)
+        self.assertEqual("first", results[0].get("name"))
+        self.session.get.assert_called_once_with(
+            self.base_path,
+            headers={"Accept": "application/json"},
+            params={},
+            microversion=None)
+
+    def test_list_lightweight(self):
+        mock_response = mock.Mock()
+        mock_response.status_code = 200
+        mock_response.links = {}
+        mock_response.json.return_value = {
+            "resources": [{"id": 1, "name": "first"}]}
+
+        self.session.get.return_value = mock_response
+
+        results = list(self.sot.list(self.session, lightweight=True))
+
+        self.assertEqual(1, len(results))
+        self.assertIsInstance(results[0], resource.ResourceView)
+        self.assertIs(self.test_class, results[0].resource_type)
+        self.assertEqual(1, results[0].id)
+        self.assertEqual("first", results[0].name)
+        self.session.get.assert_called_once_with(
+            self.base_path,
+            headers={"Accept": "application/json"},
+            params={},
+            microversion=None)
+
+    def test_list_lightweight_build_hooks(self):
+        mock_response = mock.Mock()
+        mock_response.status_code = 200
+        mock_response.links = {}
+        mock_response.json.return_value = {
+            "resources": [{"id": 1, "name": None}]}
+        self.session.get.return_value = mock_response
+
+        class Test(self.test_class):
+            name = resource.Body("name")
+
+            def _consume_body_attrs(self, attrs):
+                attrs['name'] = attrs['name'] or 'unnamed'
+                return super()._consume_body_attrs(attrs)
+
+        results = list(Test.list(self.session, lightweight=True))
+
+        self.assertTrue(self.test_class._get_schema().supports_views)
+        self.assertFalse(Test._get_schema().supports_views)
+        self.assertIsInstance(results[0], Test)
+        self.assertEqual("unnamed", results[0].name)
+
     def test_list_one_page_response_not_paginated(self):
         id_value = 1
         mock_response = mock.Mock()
@@ -2072,6 +2276,45 @@ class TestResourceActions(base.TestCase):
         self.assertEqual(2, len(self.session.get.call_args_list))
         self.assertIsInstance(results[0], self.test_class)
 
+    def test_list_stream(self):
+        pages = [
+            {
+                "resources": [{"id": 1}, {"id": 2}],
+                "resources_links": [{
+                    "href": "https://example.com/next-url",
+                    "rel": "next",
+                }]
+            }, {
+                "resources": [{"id": 3}],
+            }]
+        responses = []
+        for page in pages:
+            mock_response = mock.Mock()
+            mock_response.status_code = 200
+            mock_response.links = {}
+            data = json.dumps(page).encode('utf-8')
+            mock_response.iter_content.return_value = [
+                data[i:i + 5] for i in range(0, len(data), 5)]
+            responses.append(mock_response)
+
+        self.session.get.side_effect = responses
+
+        results = list(self.sot.list(self.session, stream=True))
+
+        self.assertEqual([1, 2, 3], [result.id for result in results])
+        self.assertIsInstance(results[0], self.test_class)
+        self.session.get.assert_has_calls([
+            mock.call('base_path',
+                      headers={'Accept': 'application/json'}, params={},
+                      microversion=None, stream=True),
+            mock.call('https://example.com/next-url',
+                      headers={'Accept': 'application/json'}, params={},
+                      microversion=None, stream=True),
+        ])
+        for mock_response in responses:
+            mock_response.json.assert_not_called()
+            mock_response.close.assert_called_once_with()
+
     def test_list_response_paginated_with_links_and_query(self):
         q_limit = 1
         ids = [1, 2]
@@ -2208,6 +2451,132 @@ class TestResourceActions(base.TestCase):
             res
         )
 
+    def test_list_paginated_prefetch(self):
+        ids = [1, 2, 3]
+        responses = []
+        for i, id in enumerate(ids):
+            mock_response = mock.Mock()
+            mock_response.status_code = 200
+            mock_response.links = {}
+            body = {"resources": [{"id": id}]}
+            if i < len(ids) - 1:
+                body["resources_links"] = [{
+                    "href": "https://example.com/next-url-%d" % i,
+                    "rel": "next",
+                }]
+            mock_response.json.return_value = body
+            responses.append(mock_response)
+
+        self.session.get.side_effect = responses
+
+        results = list(self.sot.list(self.session, prefetch=2))
+
+        self.assertEqual(ids, [r.id for r in results])
+        self.assertEqual(3, len(self.session.get.call_args_list))
+        self.assertEqual(
+            mock.call('https://example.com/next-url-1',
+                      headers={'Accept': 'application/json'}, params={},
+                      microversion=None),
+            self.session.get.mock_calls[2])
+
+    def test_list_paginated_prefetch_bounded(self):
+        mock_response = mock.Mock()
+        mock_response.status_code = 200
+        mock_response.links = {}
+        mock_response.json.side_effect = lambda: {
+            "resources": [{"id": self.session.get.call_count}],
+            "resources_links": [{
+                "href": "https://example.com/next-url",
+                "rel": "next",
+            }]
+        }
+        fetching = threading.Event()
+        release = threading.Event()
+        self.addCleanup(release.set)
+
+        def _get(*args, **kwargs):
+            if self.session.get.call_count == 4:
+                # Hold the fetcher while it fetches the fourth page.
+                fetching.set()
+                release.wait()
+            return mock_response
+
+        self.session.get.side_effect = _get
+
+        buffers = []
+        queue_class = queue.Queue
+
+        def _queue(maxsize=0):
+            buffers.append(queue_class(maxsize))
+            return buffers[-1]
+
+        res = self.sot.list(self.session, prefetch=2)
+        with mock.patch.object(resource.queue, 'Queue', side_effect=_queue):
+            self.assertEqual(1, next(res).id)
+        self.assertTrue(fetching.wait(10))
+
+        # The fourth page is only fetched once the second and third pages
+        # filled the buffer behind the page being consumed.
+        self.assertEqual(1, len(buffers))
+        self.assertTrue(buffers[0].full())
+        self.assertEqual(2, buffers[0].qsize())
+        self.assertEqual(4, self.session.get.call_count)
+        release.set()
+        res.close()
+
+    def test_list_paginated_prefetch_saturated_pool(self):
+        mock_response = mock.Mock()
+        mock_response.status_code = 200
+        mock_response.links = {}
+        mock_response.json.side_effect = [
+            {
+                "resources": [{"id": 1}],
+                "resources_links": [{
+                    "href": "https://example.com/next-url",
+                    "rel": "next",
+                }],
+            }, {
+                "resources": [{"id": 2}],
+            }]
+        self.session.get.return_value = mock_response
+
+        # Listing from the only worker of the connection's pool
+        executor = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+        self.addCleanup(executor.shutdown, wait=False)
+        with mock.patch.object(
+            connection.Connection, '_pool_executor', executor
+        ):
+            future = executor.submit(
+                lambda: [r.id for r in self.sot.list(
+                    self.session, prefetch=2)])
+
+            self.assertEqual([1, 2], future.result(timeout=10))
+
+    def test_list_paginated_prefetch_infinite_loop(self):
+        mock_response = mock.Mock()
+        mock_response.status_code = 200
+        mock_response.links = {}
+        mock_response.json.side_effect = [
+            {
+                "resources": [{"id": 1}],
+            }, {
+                "resources": [{"id": 1}],
+            }]
+
+        self.session.get.return_value = mock_response
+
+        class Test(self.test_class):
+            _query_mapping = resource.QueryParameters("limit")
+
+        res = Test.list(self.session, paginated=True, limit=1, prefetch=1)
+
+        self.assertEqual(1, next(res).id)
+        self.assertRaises(
+            exceptions.SDKException,
+            list,
+            res
+        )
+
     def test_list_query_params(self):
         id = 1
         qp = "query param!"
@@ -3086,6 +3455,149 @@ class TestWaitForDelete(base.TestCase):
             self.cloud.compute, res, 0.1, 0.3)
 
 
+class TestWaitForMany(base.TestCase):
+
+    class Res(resource.Resource):
+        base_path = '/res'
+        allow_list = True
+        _query_mapping = resource.QueryParameters()
+
+        status = resource.Body('status')
+
+    class ChangesRes(resource.Resource):
+        base_path = '/res'
+        allow_list = True
+        _query_mapping = resource.QueryParameters(
+            changes_since='changes-since')
+
+        status = resource.Body('status')
+        updated_at = resource.Body('updated_at')
+
+    def _listings(self, res_type, *listings, repeat=False):
+        listings = [
+            [res_type(**attrs) for attrs in listing] for listing in listings
+        ]
+        if repeat:
+            listings = itertools.repeat(listings[0])
+        patcher = mock.patch.object(res_type, 'list', side_effect=listings)
+        self.addCleanup(patcher.stop)
+        return patcher.start()
+
+    def test_status_match(self):
+        resources = [
+            self.Res(id=str(i), status='BUILD') for i in range(3)
+        ]
+        mock_list = self._listings(
+            self.Res,
+            [dict(id='0', status='ACTIVE'), dict(id='1', status='BUILD'),
+             dict(id='2', status='BUILD'), dict(id='3', status='BUILD')],
+            [dict(id='1', status='ACTIVE'), dict(id='2', status='ACTIVE')])
+
+        result = resource.wait_for_many(
+            mock.sentinel.session, resources, 'active', None, 0.01, 5,
+            all_projects=True)
+
+        self.assertEqual(['0', '1', '2'], [r.id for r in result])
+        self.assertEqual(['ACTIVE'] * 3, [r.status for r in result])
+        mock_list.assert_called_with(
+            mock.sentinel.session, all_projects=True)
+        self.assertEqual(2, mock_list.call_count)
+
+    def test_immediate_status(self):
+        resources = [self.Res(id='0', status='ACTIVE')]
+        mock_list = self._listings(self.Res)
+
+        result = resource.wait_for_many(
+            mock.sentinel.session, resources, 'ACTIVE', None, 0.01, 5)
+
+        self.assertEqual(resources, result)
+        mock_list.assert_not_called()
+
+    def test_empty(self):
+        self.assertEqual(
+            [], resource.wait_for_many(
+                mock.sentinel.session, [], 'ACTIVE', None, 0.01, 5))
+
+    def test_status_fails(self):
+        resources = [self.Res(id=str(i), status='BUILD') for i in range(2)]
+        self._listings(
+            self.Res,
+            [dict(id='0', status='BUILD'), dict(id='1', status='ERROR')])
+
+        self.assertRaises(
+            exceptions.ResourceFailure,
+            resource.wait_for_many,
+            mock.sentinel.session, resources, 'ACTIVE', None, 0.01, 5)
+
+    def test_gone(self):
+        resources = [self.Res(id=str(i), status='BUILD') for i in range(2)]
+        self._listings(self.Res, [dict(id='0', status='BUILD')])
+
+        self.assertRaises(
+            exceptions.ResourceFailure,
+            resource.wait_for_many,
+            mock.sentinel.session, resources, 'ACTIVE', None, 0.01, 5)
+
+    def test_deleted(self):
+        resources = [self.Res(id=str(i), status='ACTIVE') for i in range(2)]
+        self._listings(
+            self.Res, [dict(id='1', status='DELETING')], [])
+
+        result = resource.wait_for_many(
+            mock.sentinel.session, resources, 'DELETED', None, 0.01, 5)
+
+        self.assertEqual(resources, result)
+
+    def test_no_fail(self):
+        resources = [self.Res(id=str(i), status='BUILD') for i in range(3)]
+        self._listings(
+            self.Res,
+            [dict(id='0', status='ACTIVE'), dict(id='1', status='ERROR'),
+             dict(id='2', status='BUILD')],
+            repeat=True)
+
+        result = resource.wait_for_many(
+            mock.sentinel.session, resources, 'ACTIVE', None, 0.01, 0.05,
+            fail=False)
+
+        self.assertIsInstance(result, resource.WaitResult)
+        self.assertEqual(['0'], [r.id for r in result.success])
+        self.assertEqual(['1'], [r.id for r in result.failure])
+        self.assertEqual(['2'], [r.id for r in result.timeout])
+
+    def test_timeout(self):
+        resources = [self.Res(id='0', status='BUILD')]
+        self._listings(self.Res, [dict(id='0', status='BUILD')], repeat=True)
+
+        self.assertRaises(
+            exceptions.ResourceTimeout,
+            resource.wait_for_many,
+            mock.sentinel.session, resources, 'ACTIVE', None, 0.01, 0.05)
+
+    def test_changes_since(self):
+        resources = [
+            self.ChangesRes(id='0', status='BUILD', updated_at='2022-01-02'),
+            self.ChangesRes(id='1', status='BUILD', updated_at='2022-01-01'),
+        ]
+        mock_list = self._listings(
+            self.ChangesRes,
+            [dict(id='0', status='ACTIVE', updated_at='2022-01-03'),
+             dict(id='2', status='BUILD', updated_at='2022-01-04')],
+            [],
+            [dict(id='1', status='DELETED', updated_at='2022-01-05')])
+
+        result = resource.wait_for_many(
+            mock.sentinel.session, resources, 'ACTIVE', None, 0.01, 5,
+            fail=False)
+
+        self.assertEqual(['0'], [r.id for r in result.success])
+        self.assertEqual(['1'], [r.id for r in result.failure])
+        self.assertEqual(
+            [mock.call(mock.sentinel.session, changes_since=since)
+             for since in ('2022-01-01', '2022-01-04', '2022-01-04')],
+            mock_list.call_args_list)
+
+
 @mock.patch.object(resource.Resource, '_get_microversion', autospec=True)
 class TestAssertMicroversionFor(base.TestCase):
     session = mock.Mock()
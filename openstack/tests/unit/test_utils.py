@@ -13,9 +13,12 @@
 # under the License.
 
 import concurrent.futures
+import email.utils
 import hashlib
 import logging
+import os
 import sys
+import time
 from unittest import mock
 
 import fixtures
@@ -24,6 +27,7 @@ import testtools
 
 import openstack
 from openstack import exceptions
+from openstack import resource
 from openstack.tests.unit import base
 from openstack import utils
 
@@ -305,6 +309,402 @@ def test_walker_fn(graph, node, lst):
     graph.node_done(node)
 
 
+class TestCacheKeyIndex(base.TestCase):
+
+    def setUp(self):
+        super(TestCacheKeyIndex, self).setUp()
+        self.deleted = []
+        self.sot = utils.CacheKeyIndex(self.deleted.append, max_size=10)
+
+    def test_invalidate_prefix(self):
+        self.sot.add('compute.server', 'compute.server.a', 10)
+        self.sot.add('compute.servers.detail', 'compute.servers.detail.b', 10)
+        self.sot.add('compute.flavor', 'compute.flavor.c', 10)
+
+        self.sot.invalidate('compute.server')
+
+        self.assertEqual(
+            ['compute.server.a', 'compute.servers.detail.b'],
+            sorted(self.deleted))
+        self.assertIn('compute.flavor.c', self.sot)
+        self.assertEqual(1, len(self.sot))
+        self.assertEqual(['compute.flavor'], self.sot._sorted_prefixes)
+
+    def test_invalidate_unknown_prefix(self):
+        self.sot.add('compute.flavor', 'compute.flavor.c', 10)
+
+        self.sot.invalidate('network.port')
+
+        self.assertEqual([], self.deleted)
+        self.assertEqual(1, len(self.sot))
+
+    def test_add_twice(self):
+        self.sot.add('compute.flavor', 'compute.flavor.c', 10)
+        self.sot.add('compute.flavor', 'compute.flavor.c', 10)
+
+        self.assertEqual(1, len(self.sot))
+
+    @mock.patch('time.time')
+    def test_shrink_drops_expired_first(self, mock_time):
+        mock_time.return_value = 1000
+        for i in range(5):
+            self.sot.add('network.port', 'network.port.%d' % i, 10)
+        for i in range(5):
+            self.sot.add('network.network', 'network.network.%d' % i, 1)
+        mock_time.return_value = 1005
+        self.sot.add('network.network', 'network.network.5', 1)
+
+        # Expired keys are dropped without touching the cache
+        self.assertEqual([], self.deleted)
+        self.assertEqual(6, len(self.sot))
+        self.assertEqual(
+            ['network.network', 'network.port'], self.sot._sorted_prefixes)
+        self.assertEqual(
+            {'network.network.5'}, self.sot._prefixes['network.network'])
+
+    @mock.patch('time.time')
+    def test_shrink_keeps_never_expiring(self, mock_time):
+        mock_time.return_value = 1000
+        for i in range(5):
+            self.sot.add('network.port', 'network.port.%d' % i, -1)
+        for i in range(5):
+            self.sot.add('network.network', 'network.network.%d' % i, None)
+        mock_time.return_value = 10 ** 9
+        self.sot.add('network.network', 'network.network.5', 10)
+
+        # Keys which never expire are evicted from the cache too
+        self.assertEqual(
+            ['network.port.0', 'network.port.1'], self.deleted)
+        self.assertEqual(9, len(self.sot))
+
+    def test_invalidate_never_expiring(self):
+        self.sot.add('network.port', 'network.port.0', -1)
+
+        self.sot.invalidate('network')
+
+        self.assertEqual(['network.port.0'], self.deleted)
+
+    def test_shrink_evicts_oldest(self):
+        for i in range(11):
+            self.sot.add('network.port', 'network.port.%d' % i, 10)
+
+        self.assertEqual(
+            ['network.port.0', 'network.port.1'], self.deleted)
+        self.assertEqual(9, len(self.sot))
+
+
+class TestWriteObservers(base.TestCase):
+
+    def setUp(self):
+        super(TestWriteObservers, self).setUp()
+        self.sot = utils.WriteObservers()
+
+        class Parent(resource.Resource):
+            pass
+
+        class Child(Parent):
+            pass
+
+        self.parent = Parent
+        self.child = Child
+
+    def test_notify(self):
+        observer = mock.Mock()
+        self.sot.add(self.parent, observer)
+        res = self.child()
+
+        self.sot.notify('create', res)
+        self.sot.notify('delete', resource.Resource())
+
+        observer.assert_called_once_with('create', res)
+
+    def test_notify_types(self):
+        observer = mock.Mock()
+        other = mock.Mock()
+        self.sot.add((self.parent, self.child), observer)
+        self.sot.add(self.child, other)
+        res = self.child()
+
+        self.sot.notify('update', res)
+
+        # Once per observed type
+        self.assertEqual(2, observer.call_count)
+        other.assert_called_once_with('update', res)
+
+    def test_notify_error(self):
+        failing = mock.Mock(side_effect=Exception('boom'))
+        observer = mock.Mock()
+        self.sot.add(self.parent, failing)
+        self.sot.add(self.parent, observer)
+        res = self.parent()
+
+        self.sot.notify('delete', res)
+
+        observer.assert_called_once_with('delete', res)
+
+    def test_remove(self):
+        observer = mock.Mock()
+        self.sot.add((self.parent, self.child), observer)
+        self.sot.remove((self.parent, self.child), observer)
+
+        self.sot.notify('create', self.child())
+
+        observer.assert_not_called()
+        self.assertEqual({}, self.sot._observers)
+
+
+class TestRateLimiter(base.TestCase):
+
+    def setUp(self):
+        super(TestRateLimiter, self).setUp()
+        self.now = 100.0
+        self.sleeps = []
+        self.useFixture(fixtures.MockPatch(
+            'openstack.utils.time.monotonic', lambda: self.now))
+        self.useFixture(fixtures.MockPatch(
+            'openstack.utils.time.sleep', self.sleeps.append))
+
+    def test_wait(self):
+        sot = utils.RateLimiter(4)
+        for _ in range(3):
+            sot.wait()
+
+        self.assertEqual([0.25, 0.5], self.sleeps)
+
+    def test_wait_idle(self):
+        sot = utils.RateLimiter(4)
+        sot.wait()
+        self.now += 10
+        sot.wait()
+
+        self.assertEqual([], self.sleeps)
+
+    def test_invalid_rate(self):
+        self.assertRaises(exceptions.SDKException, utils.RateLimiter, 0)
+
+
+class TestPollStrategy(base.TestCase):
+
+    def _intervals(self, strategy, wait=2, count=6):
+        intervals = strategy.intervals(wait)
+        return [next(intervals) for _ in range(count)]
+
+    def test_fixed(self):
+        self.assertEqual([2] * 6, self._intervals(utils.FixedPolling()))
+
+    def test_backoff(self):
+        self.assertEqual(
+            [2, 4, 8, 16, 20, 20],
+            self._intervals(utils.ExponentialBackoff(max_interval=20)))
+
+    def test_jitter(self):
+        intervals = self._intervals(
+            utils.DecorrelatedJitter(max_interval=20), count=100)
+
+        previous = 2
+        for interval in intervals:
+            self.assertTrue(2 <= interval <= min(20, previous * 3))
+            previous = interval
+
+    def test_get_poll_strategy(self):
+        self.assertIsInstance(
+            utils.get_poll_strategy('fixed', max_interval=10),
+            utils.FixedPolling)
+        strategy = utils.get_poll_strategy('backoff', max_interval=10)
+        self.assertIsInstance(strategy, utils.ExponentialBackoff)
+        self.assertEqual(10, strategy.max_interval)
+
+    def test_get_poll_strategy_unknown(self):
+        self.assertRaises(
+            exceptions.SDKException, utils.get_poll_strategy, 'sometimes')
+
+    def test_get_wait_strategy(self):
+        strategy = utils.FixedPolling()
+
+        self.assertIs(
+            strategy,
+            utils.get_wait_strategy(mock.Mock(_wait_strategy=strategy)))
+        self.assertIsNone(utils.get_wait_strategy(mock.Mock()))
+
+
+class TestIterateTimeout(base.TestCase):
+
+    def setUp(self):
+        super(TestIterateTimeout, self).setUp()
+        self.sleep = self.useFixture(
+            fixtures.MockPatch('openstack.utils.time.sleep')).mock
+
+    def _sleeps(self):
+        return [c[0][0] for c in self.sleep.call_args_list]
+
+    def test_strategy(self):
+        for count in utils.iterate_timeout(
+            None, 'timeout', wait=1,
+            strategy=utils.ExponentialBackoff(max_interval=5),
+        ):
+            if count == 5:
+                break
+
+        self.assertEqual([1, 2, 4, 5], self._sleeps())
+
+    def test_retry_after(self):
+        response = mock.Mock(headers={'Retry-After': '7'})
+        for count in utils.iterate_timeout(None, 'timeout', wait=1):
+            if count == 1:
+                utils.note_retry_after(response)
+            if count == 3:
+                break
+
+        self.assertEqual([7, 1], self._sleeps())
+
+    def test_retry_after_date(self):
+        date = email.utils.formatdate(time.time() + 60, usegmt=True)
+        response = mock.Mock(headers={'Retry-After': date})
+        for count in utils.iterate_timeout(None, 'timeout', wait=1):
+            if count == 1:
+                utils.note_retry_after(response)
+            else:
+                break
+
+        self.assertTrue(55 < self._sleeps()[0] <= 60)
+
+    def test_retry_after_invalid(self):
+        response = mock.Mock(headers={'Retry-After': 'soon'})
+        for count in utils.iterate_timeout(None, 'timeout', wait=1):
+            if count == 1:
+                utils.note_retry_after(response)
+            else:
+                break
+
+        self.assertEqual([1], self._sleeps())
+
+    def test_retry_after_not_waiting(self):
+        response = mock.Mock(headers={'Retry-After': '7'})
+        utils.note_retry_after(response)
+        for count in utils.iterate_timeout(None, 'timeout', wait=1):
+            if count == 2:
+                break
+
+        self.assertEqual([1], self._sleeps())
+
+
+class TestFileHashes(base.TestCase):
+
+    def setUp(self):
+        super(TestFileHashes, self).setUp()
+        # Larger than the parallel hashing threshold, spanning several reads
+        self.data = b'0123456789abcdef' * (300 * 1024)
+        self.expected = (
+            utils.md5(self.data, usedforsecurity=False).hexdigest(),
+            hashlib.sha256(self.data).hexdigest())
+        self.filename = os.path.join(
+            self.useFixture(fixtures.TempDir()).path, 'data')
+        with open(self.filename, 'wb') as f:
+            f.write(self.data)
+
+    def test_calculate_data_hashes(self):
+        self.assertEqual(
+            self.expected, utils._calculate_data_hashes(self.data))
+        with open(self.filename, 'rb') as f:
+            self.assertEqual(
+                self.expected, utils._calculate_data_hashes(f))
+
+    def test_hashing_reader(self):
+        hasher = utils._DataHasher()
+        with open(self.filename, 'rb') as f:
+            reader = utils._HashingReader(f, hasher, len(self.data))
+            self.assertEqual(len(self.data), len(reader))
+            for chunk in iter(lambda: reader.read(100000), b''):
+                pass
+        self.assertEqual(self.expected, hasher.hexdigests())
+
+    def test_hashing_reader_small_reads(self):
+        hasher = utils._DataHasher()
+        hasher._md5 = mock.Mock(wraps=hasher._md5)
+        with open(self.filename, 'rb') as f:
+            reader = utils._HashingReader(f, hasher, len(self.data))
+            for chunk in iter(lambda: reader.read(16384), b''):
+                pass
+        # The reads are gathered and hashed on the threads
+        hasher._wait()
+        buffers = len(self.data) // utils._HASH_BUFFER_SIZE
+        self.assertEqual(buffers, hasher._md5.update.call_count)
+        self.assertIsNotNone(hasher._executor)
+        self.assertEqual(self.expected, hasher.hexdigests())
+        self.assertEqual(buffers + 1, hasher._md5.update.call_count)
+
+    def test_get_file_hashes_cache(self):
+        cache = {}
+        self.assertEqual(
+            self.expected, utils._get_file_hashes(self.filename, cache=cache))
+        self.assertEqual(
+            self.expected,
+            utils._get_cached_file_hashes(self.filename, cache))
+
+        with mock.patch.object(
+                utils, '_calculate_data_hashes') as calculate:
+            self.assertEqual(
+                self.expected,
+                utils._get_file_hashes(self.filename, cache=cache))
+            self.assertFalse(calculate.called)
+
+        with open(self.filename, 'ab') as f:
+            f.write(b'more')
+        self.assertIsNone(utils._get_cached_file_hashes(self.filename, cache))
+        self.assertNotEqual(
+            self.expected, utils._get_file_hashes(self.filename, cache=cache))
+
+
+
+class TestFileMapping(base.TestCase):
+
+    def setUp(self):
+        super(TestFileMapping, self).setUp()
+        self.data = bytes(range(256)) * 1024
+        self.filename = os.path.join(
+            self.useFixture(fixtures.TempDir()).path, 'data')
+        with open(self.filename, 'wb') as f:
+            f.write(self.data)
+
+    def _map(self, offset, length):
+        with open(self.filename, 'rb') as f:
+            mapping = utils._FileMapping(f.fileno(), offset, length)
+        self.addCleanup(mapping.close)
+        return mapping
+
+    def test_slice(self):
+        # Not aligned on the allocation granularity
+        mapping = self._map(1000, 5000)
+        chunk = mapping.slice(10, 20)
+        self.assertIsInstance(chunk, memoryview)
+        self.assertEqual(self.data[1010:1020], chunk)
+        self.assertEqual(self.data[5990:6000], mapping.slice(4990, 6000))
+
+    def test_release(self):
+        self.useFixture(fixtures.MockPatchObject(
+            utils, '_MAPPING_RELEASE_SIZE', 8192))
+        mapping = self._map(0, len(self.data))
+        mapping.slice(0, 100000).tobytes()
+        mapping.release(100000)
+        # Pages are mapped in again when read after being dropped
+        self.assertEqual(self.data[:100], mapping.slice(0, 100))
+        self.assertEqual(self.data[-100:], mapping.slice(
+            len(self.data) - 100, len(self.data)))
+
+    def test_close_referenced(self):
+        mapping = self._map(0, len(self.data))
+        chunk = mapping.slice(0, 10)
+        mapping.close()
+        self.assertEqual(self.data[:10], chunk)
+
+    def test_unmappable(self):
+        with open(self.filename, 'rb') as f:
+            self.assertRaises(
+                ValueError, utils._FileMapping, f.fileno(), 0, 0)
+            self.assertRaises(
+                ValueError, utils._FileMapping, f.fileno(), 0,
+                len(self.data) + 1)
+
 class Test_md5(base.TestCase):
 
     def setUp(self):
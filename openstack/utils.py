@@ -10,8 +10,16 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 
+import bisect
+import collections
+import concurrent.futures
+import email.utils
 import hashlib
+import math
+import mmap
+import os
 import queue
+import random
 import string
 import threading
 import time
@@ -33,13 +41,152 @@ def urljoin(*args):
     return '/'.join(str(a or '').strip('/') for a in args)
 
 
-def iterate_timeout(timeout, message, wait=2):
+class PollStrategy:
+    """Base of the strategies spacing the checks of the waiters.
+
+    A strategy is given to :func:`iterate_timeout`, which asks it for the
+    intervals of every wait.
+    """
+
+    def intervals(self, wait):
+        """Yield the number of seconds to sleep before each next check.
+
+        :param wait: The interval given to :func:`iterate_timeout`.
+        """
+        raise NotImplementedError
+
+
+class FixedPolling(PollStrategy):
+    """Check every ``wait`` seconds."""
+
+    def intervals(self, wait):
+        while True:
+            yield wait
+
+
+class ExponentialBackoff(PollStrategy):
+    """Multiply the interval by ``factor`` after every check.
+
+    :param max_interval: The maximum interval in seconds.
+    :param factor: The factor applied to the interval after every check.
+    """
+
+    def __init__(self, max_interval=30, factor=2):
+        self.max_interval = max_interval
+        self.factor = factor
+
+    def intervals(self, wait):
+        interval = wait
+        while True:
+            yield min(interval, self.max_interval)
+            interval *= self.factor
+
+
+class DecorrelatedJitter(PollStrategy):
+    """Pick every interval at random, growing with the previous one.
+
+    Each interval is between ``wait`` and three times the previous interval,
+    so that waiters started at the same time do not check at the same time.
+
+    :param max_interval: The maximum interval in seconds.
+    """
+
+    def __init__(self, max_interval=30):
+        self.max_interval = max_interval
+
+    def intervals(self, wait):
+        interval = wait
+        while True:
+            interval = min(
+                self.max_interval, random.uniform(wait, interval * 3))
+            yield interval
+
+
+#: The strategies which can be configured with ``wait_strategy``.
+POLL_STRATEGIES = {
+    'fixed': FixedPolling,
+    'backoff': ExponentialBackoff,
+    'jitter': DecorrelatedJitter,
+}
+
+
+def get_poll_strategy(name, max_interval=None):
+    """Return the :class:`PollStrategy` configured by name.
+
+    :param name: One of the keys of :data:`POLL_STRATEGIES`.
+    :param max_interval: The maximum interval in seconds of the strategies
+        growing the interval.
+    :raises: :class:`~openstack.exceptions.SDKException` if the name is
+        unknown.
+    """
+    try:
+        strategy = POLL_STRATEGIES[name]
+    except KeyError:
+        raise exceptions.SDKException(
+            "Unknown wait strategy {name}, valid strategies are"
+            " {names}".format(name=name, names=', '.join(POLL_STRATEGIES)))
+    if strategy is FixedPolling or max_interval is None:
+        return strategy()
+    return strategy(max_interval=max_interval)
+
+
+def get_wait_strategy(session):
+    """Return the :class:`PollStrategy` configured for a proxy, if any."""
+    strategy = getattr(session, '_wait_strategy', None)
+    if isinstance(strategy, PollStrategy):
+        return strategy
+    return None
+
+
+# The wait of iterate_timeout whose caller is checking in each thread.
+_poll_state = threading.local()
+
+
+class _PollContext:
+
+    __slots__ = ('retry_after',)
+
+    def __init__(self):
+        self.retry_after = None
+
+
+def _parse_retry_after(value):
+    try:
+        return max(0.0, float(value))
+    except (TypeError, ValueError):
+        pass
+    try:
+        date = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError, IndexError):
+        return None
+    return max(0.0, date.timestamp() - time.time())
+
+
+def note_retry_after(response):
+    """Make the current wait honour the Retry-After header of a response.
+
+    Called for every response of the proxies. When the response is received
+    while checking in :func:`iterate_timeout`, the next check does not happen
+    before the delay given by the server.
+    """
+    context = getattr(_poll_state, 'context', None)
+    if context is None:
+        return
+    retry_after = _parse_retry_after(response.headers.get('Retry-After'))
+    if retry_after is not None:
+        context.retry_after = max(context.retry_after or 0, retry_after)
+
+
+def iterate_timeout(timeout, message, wait=2, strategy=None):
     """Iterate and raise an exception on timeout.
 
     This is a generator that will continually yield and sleep for
     wait seconds, and if the timeout is reached, will raise an exception
     with <message>.
 
+    :param strategy: The :class:`PollStrategy` spacing the iterations.
+        Defaults to :class:`FixedPolling`. Iterations are also spaced by the
+        Retry-After header of the responses received while iterating.
     """
     log = _log.setup_logging('openstack.iterate_timeout')
 
@@ -59,13 +206,24 @@ def iterate_timeout(timeout, message, wait=2):
             "Wait value must be an int or float value. {wait} given"
             " instead".format(wait=wait))
 
+    intervals = (strategy or FixedPolling()).intervals(wait)
+    context = _PollContext()
     start = time.time()
     count = 0
     while (timeout is None) or (time.time() < start + timeout):
         count += 1
-        yield count
-        log.debug('Waiting %s seconds', wait)
-        time.sleep(wait)
+        previous_context = getattr(_poll_state, 'context', None)
+        _poll_state.context = context
+        try:
+            yield count
+        finally:
+            _poll_state.context = previous_context
+        interval = next(intervals)
+        if context.retry_after is not None:
+            interval = max(interval, context.retry_after)
+            context.retry_after = None
+        log.debug('Waiting %s seconds', interval)
+        time.sleep(interval)
     raise exceptions.ResourceTimeout(message)
 
 
@@ -273,26 +431,216 @@ except TypeError:
         return hashlib.md5(string)  # nosec
 
 
+#: Size of the reads performed when hashing files.
+_HASH_CHUNK_SIZE = 4 * 1024 * 1024
+#: Smaller chunks are gathered up to this size before being handed over to
+#: the hashing threads, which costs more than hashing small chunks.
+_HASH_BUFFER_SIZE = 1024 * 1024
+#: Amount of data read from a file mapping before its pages are dropped.
+_MAPPING_RELEASE_SIZE = 16 * 1024 * 1024
+
+
+class _DataHasher:
+    """Compute the md5 and sha256 digests of a stream of chunks.
+
+    hashlib releases the GIL while hashing large buffers, so large chunks are
+    hashed by md5 and sha256 on two threads of their own while the caller
+    goes on reading the next chunk. Smaller chunks, such as the 8 to 16 KiB
+    reads http.client makes of a request body, are gathered until
+    ``_HASH_BUFFER_SIZE`` bytes are available and hashed together.
+    """
+
+    def __init__(self):
+        self._md5 = md5(usedforsecurity=False)
+        self._sha256 = hashlib.sha256()
+        self._executor = None
+        self._pending = ()
+        self._buffer = []
+        self._buffered = 0
+
+    def _wait(self):
+        for future in self._pending:
+            future.result()
+        self._pending = ()
+
+    def _flush(self):
+        chunk = b''.join(self._buffer)
+        self._buffer = []
+        self._buffered = 0
+        return chunk
+
+    def update(self, chunk):
+        if self._buffered or len(chunk) < _HASH_BUFFER_SIZE:
+            self._buffer.append(chunk)
+            self._buffered += len(chunk)
+            if self._buffered < _HASH_BUFFER_SIZE:
+                return
+            chunk = self._flush()
+        self._wait()
+        if self._executor is None:
+            self._executor = concurrent.futures.ThreadPoolExecutor(
+                max_workers=2, thread_name_prefix='openstack-hash')
+        self._pending = (
+            self._executor.submit(self._md5.update, chunk),
+            self._executor.submit(self._sha256.update, chunk),
+        )
+
+    def hexdigests(self):
+        """Return the (md5, sha256) hex digests of the data seen so far."""
+        try:
+            self._wait()
+            if self._buffered:
+                chunk = self._flush()
+                self._md5.update(chunk)
+                self._sha256.update(chunk)
+        finally:
+            if self._executor is not None:
+                self._executor.shutdown()
+                self._executor = None
+        return (self._md5.hexdigest(), self._sha256.hexdigest())
+
+
+class _HashingReader:
+    """File-like object hashing the data as it is read.
+
+    Lets the checksums of a file be computed while it is being uploaded
+    instead of reading the file once more beforehand.
+    """
+
+    def __init__(self, file_obj, hasher, length):
+        self._file = file_obj
+        self._hasher = hasher
+        self._length = length
+
+    def __len__(self):
+        return self._length
+
+    def read(self, size=-1):
+        chunk = self._file.read(size)
+        if chunk:
+            self._hasher.update(chunk)
+        return chunk
+
+
 def _calculate_data_hashes(data):
-    _md5 = md5(usedforsecurity=False)
-    _sha256 = hashlib.sha256()
+    hasher = _DataHasher()
 
     if hasattr(data, 'read'):
-        for chunk in iter(lambda: data.read(8192), b''):
-            _md5.update(chunk)
-            _sha256.update(chunk)
+        for chunk in iter(lambda: data.read(_HASH_CHUNK_SIZE), b''):
+            hasher.update(chunk)
     else:
-        _md5.update(data)
-        _sha256.update(data)
-    return (_md5.hexdigest(), _sha256.hexdigest())
+        hasher.update(data)
+    return hasher.hexdigests()
+
+
+def _get_file_stat_key(filename):
+    stat = os.stat(filename)
+    return (stat.st_size, stat.st_mtime_ns, stat.st_ino)
 
 
-def _get_file_hashes(filename):
-    (_md5, _sha256) = (None, None)
+def _get_cached_file_hashes(filename, cache):
+    """Return the cached (md5, sha256) of a file, or None.
+
+    Entries of ``cache`` are only valid as long as the size, modification
+    time and inode of the file are unchanged.
+    """
+    if cache is None:
+        return None
+    entry = cache.get(os.path.abspath(filename))
+    if entry is None or entry[0] != _get_file_stat_key(filename):
+        return None
+    return entry[1]
+
+
+def _set_cached_file_hashes(filename, cache, stat_key, hashes):
+    if cache is not None:
+        cache[os.path.abspath(filename)] = (stat_key, hashes)
+
+
+def _get_file_hashes(filename, cache=None):
+    """Return the (md5, sha256) hex digests of a file.
+
+    :param cache: Optional dict used to remember the digests of files which
+        have not changed since they were last hashed.
+    """
+    hashes = _get_cached_file_hashes(filename, cache)
+    if hashes is not None:
+        return hashes
+    # Stat before reading so a file modified while being hashed is hashed
+    # again next time.
+    stat_key = _get_file_stat_key(filename)
     with open(filename, 'rb') as file_obj:
-        (_md5, _sha256) = _calculate_data_hashes(file_obj)
+        hashes = _calculate_data_hashes(file_obj)
+    _set_cached_file_hashes(filename, cache, stat_key, hashes)
+    return hashes
+
+
+class _FileMapping:
+    """Read-only memory mapping of a range of a file.
+
+    Slices of the mapping are :class:`memoryview` objects of the pages of the
+    file, so reading the file through them does not allocate nor copy
+    buffers the size of the reads. The pages of the range already consumed
+    are dropped with :meth:`release`, so the resident memory stays bounded
+    whatever the size of the file.
+
+    :param fileno: Descriptor of the file. It may be closed once the mapping
+        is created.
+    :param offset: Offset of the range in the file.
+    :param length: Length of the range.
+    :raises: OSError or ValueError when the range cannot be mapped, such as
+        when it is empty, beyond the end of the file or the file is not a
+        regular file.
+    """
 
-    return (_md5, _sha256)
+    def __init__(self, fileno, offset, length):
+        if length <= 0:
+            raise ValueError("Cannot map an empty range")
+        # Mappings have to start at a multiple of the allocation granularity
+        self._delta = offset % mmap.ALLOCATIONGRANULARITY
+        self._mmap = mmap.mmap(
+            fileno, self._delta + length, offset=offset - self._delta,
+            access=mmap.ACCESS_READ)
+        self._view = memoryview(self._mmap)
+        self._released = 0
+        self.length = length
+        if hasattr(mmap, 'MADV_SEQUENTIAL'):
+            self._mmap.madvise(mmap.MADV_SEQUENTIAL)
+
+    def slice(self, start, end):
+        """Return the bytes of the range from ``start`` to ``end``."""
+        end = min(end, self.length)
+        return self._view[self._delta + start:self._delta + end]
+
+    def release(self, end):
+        """Drop the pages of the range before ``end`` which were read.
+
+        Pages are only dropped by batches of ``_MAPPING_RELEASE_SIZE`` bytes
+        to keep the number of system calls low. Reading them again after
+        seeking backwards maps them in again.
+        """
+        if not hasattr(mmap, 'MADV_DONTNEED'):
+            return
+        end = (self._delta + end) // mmap.PAGESIZE * mmap.PAGESIZE
+        if end < self._released:
+            self._released = end
+        elif end - self._released >= _MAPPING_RELEASE_SIZE:
+            self._mmap.madvise(
+                mmap.MADV_DONTNEED, self._released, end - self._released)
+            self._released = end
+
+    def close(self):
+        if self._mmap is None:
+            return
+        view, mapping = self._view, self._mmap
+        self._view = self._mmap = None
+        try:
+            view.release()
+            mapping.close()
+        except BufferError:
+            # Slices are still referenced by the caller, the mapping is
+            # closed once they are garbage collected.
+            pass
 
 
 class TinyDAG:
@@ -403,3 +751,193 @@ class TinyDAG:
 
     def is_complete(self):
         return len(self._done) == self.size()
+
+
+class CacheKeyIndex:
+    """Index of API cache keys grouped by their cache key prefix
+
+    Keys are stored under the prefix calculated by
+    :meth:`~openstack.proxy.Proxy._get_cache_key_prefix`, so invalidating a
+    prefix only visits the keys stored under prefixes starting with it,
+    instead of every key ever cached.
+
+    The index keeps at most ``max_size`` keys. When it grows beyond that,
+    keys past their expiration time are dropped first (the cache does not
+    serve them anymore) and then the oldest keys are evicted, which also
+    removes them from the cache through ``delete`` so that they cannot be
+    served without being tracked for invalidation.
+    """
+
+    def __init__(self, delete, max_size=10000):
+        self._delete = delete
+        self._max_size = max_size
+        # key -> (prefix, expiration timestamp), in insertion order
+        self._keys = collections.OrderedDict()
+        # prefix -> set of keys
+        self._prefixes = dict()
+        # sorted list of prefixes, prefixes starting with the same string
+        # are adjacent
+        self._sorted_prefixes = []
+        self._lock = threading.Lock()
+
+    def __contains__(self, key):
+        return key in self._keys
+
+    def __len__(self):
+        return len(self._keys)
+
+    def add(self, prefix, key, expiration_time):
+        """Track a cache key.
+
+        :param str prefix: Cache key prefix of the key.
+        :param str key: The cache key.
+        :param expiration_time: Number of seconds the key is valid for.
+            ``None`` or a negative number, like the ``-1`` of dogpile.cache,
+            means the key never expires.
+        """
+        if expiration_time is None or expiration_time < 0:
+            expires_at = math.inf
+        else:
+            expires_at = time.time() + expiration_time
+        with self._lock:
+            if key in self._keys:
+                self._keys.move_to_end(key)
+            elif prefix not in self._prefixes:
+                bisect.insort(self._sorted_prefixes, prefix)
+                self._prefixes[prefix] = set()
+            self._keys[key] = (prefix, expires_at)
+            self._prefixes[prefix].add(key)
+            if len(self._keys) > self._max_size:
+                self._shrink()
+
+    def invalidate(self, prefix):
+        """Delete all keys with a prefix starting with ``prefix``.
+
+        :param str prefix: Cache key prefix to invalidate.
+        """
+        with self._lock:
+            start = bisect.bisect_left(self._sorted_prefixes, prefix)
+            end = start
+            while (
+                end < len(self._sorted_prefixes)
+                and self._sorted_prefixes[end].startswith(prefix)
+            ):
+                end += 1
+            for key_prefix in self._sorted_prefixes[start:end]:
+                for key in self._prefixes.pop(key_prefix):
+                    del self._keys[key]
+                    self._delete(key)
+            del self._sorted_prefixes[start:end]
+
+    def _remove(self, key):
+        prefix, _ = self._keys.pop(key)
+        keys = self._prefixes[prefix]
+        keys.discard(key)
+        if not keys:
+            del self._prefixes[prefix]
+            del self._sorted_prefixes[
+                bisect.bisect_left(self._sorted_prefixes, prefix)]
+
+    def _shrink(self):
+        # Leave some headroom so that we do not scan on every insert
+        target = self._max_size - self._max_size // 10
+        now = time.time()
+        for key in [
+            key for key, (_, expires_at) in self._keys.items()
+            if expires_at <= now
+        ]:
+            self._remove(key)
+        while len(self._keys) > target:
+            key = next(iter(self._keys))
+            self._remove(key)
+            self._delete(key)
+
+
+class WriteObservers:
+    """Observers of the resources written through proxies
+
+    Observers are called with the action, one of ``create``, ``update`` and
+    ``delete``, and the resource created, updated or deleted by
+    :meth:`~openstack.proxy.Proxy._create`,
+    :meth:`~openstack.proxy.Proxy._delete` or
+    :meth:`~openstack.resource.Resource.commit`, so that caches of
+    resources can be kept up to date.
+
+    Observers are registered for resource types and are called for their
+    subclasses too. Errors of observers are logged and otherwise ignored, the
+    write has succeeded already.
+    """
+
+    def __init__(self):
+        # resource type -> tuple of observers
+        self._observers = {}
+        self._lock = threading.Lock()
+        self._log = _log.setup_logging('openstack')
+
+    def add(self, resource_types, observer):
+        """Call ``observer(action, resource)`` for writes of resource types.
+
+        :param resource_types: A :class:`~openstack.resource.Resource`
+            subclass or a tuple of them.
+        :param observer: The function to call.
+        """
+        if not isinstance(resource_types, tuple):
+            resource_types = (resource_types,)
+        with self._lock:
+            for resource_type in resource_types:
+                observers = self._observers.get(resource_type, ())
+                self._observers[resource_type] = observers + (observer,)
+
+    def remove(self, resource_types, observer):
+        """Stop calling an observer added with :meth:`add`."""
+        if not isinstance(resource_types, tuple):
+            resource_types = (resource_types,)
+        with self._lock:
+            for resource_type in resource_types:
+                observers = tuple(
+                    o for o in self._observers.get(resource_type, ())
+                    if o != observer)
+                if observers:
+                    self._observers[resource_type] = observers
+                else:
+                    self._observers.pop(resource_type, None)
+
+    def notify(self, action, resource):
+        """Call the observers of the type of a written resource."""
+        if not self._observers:
+            return
+        for resource_type in resource.__class__.__mro__:
+            for observer in self._observers.get(resource_type, ()):
+                try:
+                    observer(action, resource)
+                except Exception:
+                    self._log.warning(
+                        "Observer of %s of %s failed", action,
+                        type(resource).__name__, exc_info=True)
+
+
+class RateLimiter:
+    """Spread calls over time so that at most ``rate`` happen per second
+
+    :meth:`wait` is called before every rate limited call, by any number of
+    threads, and blocks until the call can proceed. Calls are given slots
+    ``1 / rate`` seconds apart in the order they asked for one.
+    """
+
+    def __init__(self, rate):
+        if rate <= 0:
+            raise exceptions.SDKException(
+                "Rate must be a positive number. {rate} given"
+                " instead".format(rate=rate))
+        self.interval = 1.0 / rate
+        self._next = time.monotonic()
+        self._lock = threading.Lock()
+
+    def wait(self):
+        """Block until the next call is allowed."""
+        with self._lock:
+            now = time.monotonic()
+            slot = max(self._next, now)
+            self._next = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
@@ -0,0 +1,95 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+"""Measure how fast the cloud layer filters lists of resources.
+
+Runs the local filtering of the search_* methods and range_search over a
+generated list of flavor-like dicts and reports the time of each::
+
+    python tools/filter-benchmark.py --count 100000
+"""
+
+import argparse
+import time
+
+from openstack.cloud import _utils
+from openstack.cloud import openstackcloud
+
+
+def _data(count):
+    return [
+        {
+            'id': 'id-%d' % i,
+            'name': 'flavor-%d' % i,
+            'vcpus': i % 64,
+            'ram': (i % 128) * 512,
+            'disk': i % 200,
+            'is_public': i % 2 == 0,
+            'extra_specs': {'hw:cpu_policy': 'dedicated' if i % 3 else None},
+        }
+        for i in range(count)
+    ]
+
+
+CASES = [
+    ('name_or_id exact', 'flavor-1234', None),
+    ('name_or_id glob', 'flavor-12*', None),
+    ('dict filters', None, {'vcpus': 8, 'is_public': True}),
+    ('nested dict filters', None,
+     {'extra_specs': {'hw:cpu_policy': 'dedicated'}}),
+    ('glob and dict filters', 'flavor-1*', {'vcpus': 8}),
+    ('jmespath', None, '[?vcpus==`8`]'),
+]
+
+RANGES = [
+    ('range', {'vcpus': '<=8', 'ram': '>2048'}),
+    ('range min/max', {'vcpus': 'min', 'disk': 'max'}),
+]
+
+
+def _best(func, rounds):
+    best = float('inf')
+    for _ in range(rounds):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, len(result)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        '--count', type=int, default=100000,
+        help='Number of items in the filtered list')
+    parser.add_argument(
+        '--rounds', type=int, default=3,
+        help='Number of rounds, the best one is reported')
+    args = parser.parse_args()
+
+    data = _data(args.count)
+    for name, name_or_id, filters in CASES:
+        duration, found = _best(
+            lambda: _utils._filter_list(data, name_or_id, filters),
+            args.rounds)
+        print('{name}: {ms:.1f} ms ({found} found)'.format(
+            name=name, ms=duration * 1000, found=found))
+    for name, filters in RANGES:
+        duration, found = _best(
+            lambda: openstackcloud._OpenStackCloudMixin.range_search(
+                None, data, filters),
+            args.rounds)
+        print('{name}: {ms:.1f} ms ({found} found)'.format(
+            name=name, ms=duration * 1000, found=found))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,107 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+"""Compare the JSON codecs available to connections.
+
+Decodes responses and encodes their content back with every available
+codec and reports the throughput of each. The responses are pages of
+ports and servers made of the samples of resource-benchmark.py, or
+recorded response bodies given as files::
+
+    python tools/json-benchmark.py --count 1000
+    python tools/json-benchmark.py ports.json servers.json
+"""
+
+import argparse
+import json
+import os
+import runpy
+import time
+
+import requests
+
+from openstack import _json_codec
+
+
+def _pages(count):
+    samples = runpy.run_path(
+        os.path.join(os.path.dirname(__file__), 'resource-benchmark.py'))
+    return {
+        'ports': {'ports': [
+            dict(samples['PORT'], id=str(i)) for i in range(count)]},
+        'servers': {'servers': [
+            dict(samples['SERVER'], id=str(i)) for i in range(count)]},
+    }
+
+
+def _response(body):
+    response = requests.Response()
+    response._content = body
+    response.encoding = 'utf-8'
+    response.status_code = 200
+    return response
+
+
+def measure(codec, body, rounds):
+    """Return the best decode and encode rates in MiB/s."""
+    response = _response(body)
+    codec.attach(response)
+    decode = encode = float('inf')
+    for _ in range(rounds):
+        start = time.perf_counter()
+        data = response.json()
+        decode = min(decode, time.perf_counter() - start)
+        start = time.perf_counter()
+        # The standard library codec leaves encoding to keystoneauth, which
+        # encodes with json.dumps.
+        codec.dumps(data) or json.dumps(data)
+        encode = min(encode, time.perf_counter() - start)
+    size = len(body) / 2 ** 20
+    return size / decode, size / encode
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        '--count', type=int, default=1000,
+        help='Number of resources in the generated pages')
+    parser.add_argument(
+        '--rounds', type=int, default=10,
+        help='Number of rounds, the best one is reported')
+    parser.add_argument(
+        'files', nargs='*', metavar='FILE',
+        help='Recorded response bodies to use instead of generated pages')
+    args = parser.parse_args()
+
+    if args.files:
+        bodies = {}
+        for path in args.files:
+            with open(path, 'rb') as f:
+                bodies[os.path.basename(path)] = f.read()
+    else:
+        bodies = {
+            name: json.dumps(page).encode('utf-8')
+            for name, page in _pages(args.count).items()
+        }
+
+    for name, body in bodies.items():
+        print('{name} ({size:.1f} MiB):'.format(
+            name=name, size=len(body) / 2 ** 20))
+        for codec in _json_codec.CODECS.values():
+            decode, encode = measure(codec, body, args.rounds)
+            print('  {codec:8} decode {decode:7.1f} MiB/s,'
+                  ' encode {encode:7.1f} MiB/s'.format(
+                      codec=codec.name, decode=decode, encode=encode))
+
+
+if __name__ == '__main__':
+    main()
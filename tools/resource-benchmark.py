@@ -0,0 +1,156 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+"""Measure how fast Resource objects are built from API responses.
+
+Builds Resource objects out of representative API responses the way
+listings do, with ``Resource.existing``, and reports the number of objects
+built per second along with the memory each object holds::
+
+    python tools/resource-benchmark.py --count 20000
+"""
+
+import argparse
+import copy
+import time
+import tracemalloc
+
+from openstack.compute.v2 import server
+from openstack.network.v2 import port
+
+PORT = {
+    'admin_state_up': True,
+    'allowed_address_pairs': [],
+    'binding:host_id': 'compute-1',
+    'binding:profile': {},
+    'binding:vif_details': {'port_filter': True},
+    'binding:vif_type': 'ovs',
+    'binding:vnic_type': 'normal',
+    'created_at': '2021-01-01T00:00:00Z',
+    'description': '',
+    'device_id': '0b7d8c2e-4f0d-4c4e-9a55-3f9f5a1f3c11',
+    'device_owner': 'compute:nova',
+    'extra_dhcp_opts': [],
+    'fixed_ips': [{'ip_address': '10.0.0.5',
+                   'subnet_id': 'a0304c3a-4f08-4c43-88af-d796509c97d2'}],
+    'id': '65c0ee9f-d634-4522-8954-51021b570b0d',
+    'mac_address': 'fa:16:3e:c9:cb:f0',
+    'name': 'port-1',
+    'network_id': 'a87cc70a-3e15-4acf-8205-9b711a3531b7',
+    'port_security_enabled': True,
+    'project_id': 'd6700c0c9ffa4f1cb322cd4a1f3906fa',
+    'revision_number': 3,
+    'security_groups': ['f0ac4394-7e4a-4409-9701-ba8be283dbc3'],
+    'status': 'ACTIVE',
+    'tags': [],
+    'tenant_id': 'd6700c0c9ffa4f1cb322cd4a1f3906fa',
+    'updated_at': '2021-01-01T00:00:01Z',
+}
+
+SERVER = {
+    'OS-DCF:diskConfig': 'AUTO',
+    'OS-EXT-AZ:availability_zone': 'nova',
+    'OS-EXT-STS:power_state': 1,
+    'OS-EXT-STS:task_state': None,
+    'OS-EXT-STS:vm_state': 'active',
+    'accessIPv4': '',
+    'accessIPv6': '',
+    'addresses': {'private': [{'addr': '10.0.0.5', 'version': 4}]},
+    'created': '2021-01-01T00:00:00Z',
+    'flavor': {'id': '1'},
+    'hostId': 'b2e5a7cf2a6e7c3e5e8c5d1f1c3b4a5d6e7f8a9b0c1d2e3f4a5b6c7d',
+    'id': '9168b536-cd40-4630-b43f-b259807c6e87',
+    'image': {'id': '70a599e0-31e7-49b7-b260-868f441e862b'},
+    'key_name': None,
+    'metadata': {'My Server Name': 'Apache1'},
+    'name': 'new-server-test',
+    'progress': 0,
+    'security_groups': [{'name': 'default'}],
+    'status': 'ACTIVE',
+    'tenant_id': '6f70656e737461636b20342065766572',
+    'updated': '2021-01-01T00:00:01Z',
+    'user_id': 'fake',
+}
+
+RESOURCES = {
+    'port': (port.Port, PORT),
+    'server': (server.Server, SERVER),
+}
+
+
+def _builder(resource_cls, lazy_dict=False, lightweight=False):
+    if lightweight:
+        view_class = resource_cls._get_schema().view_class
+        return lambda data: view_class(data)
+    return lambda data: resource_cls.existing(_lazy_dict=lazy_dict, **data)
+
+
+def measure(resource_cls, data, count, lazy_dict=False, lightweight=False):
+    build = _builder(resource_cls, lazy_dict, lightweight)
+    responses = [copy.deepcopy(data) for _ in range(count)]
+    start = time.perf_counter()
+    for response in responses:
+        build(response)
+    return count / (time.perf_counter() - start)
+
+
+def measure_size(resource_cls, data, count, lazy_dict=False,
+                 lightweight=False):
+    """Return the bytes allocated per object, listed data included."""
+    build = _builder(resource_cls, lazy_dict, lightweight)
+    tracemalloc.start()
+    try:
+        objects = [build(copy.deepcopy(data)) for _ in range(count)]
+        size = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    del objects
+    return size / count
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        '--count', type=int, default=20000,
+        help='Number of objects built per resource type and round')
+    parser.add_argument(
+        '--rounds', type=int, default=3,
+        help='Number of rounds, the best one is reported')
+    parser.add_argument(
+        '--lazy-dict', action='store_true',
+        help='Build the objects the way Resource.list(lazy_dict=True) does')
+    parser.add_argument(
+        '--lightweight', action='store_true',
+        help='Build the views Resource.list(lightweight=True) yields')
+    parser.add_argument(
+        'resources', nargs='*', metavar='RESOURCE',
+        help='Resource types to measure among {names}, all of them by'
+             ' default'.format(names=', '.join(sorted(RESOURCES))))
+    args = parser.parse_args()
+    unknown = set(args.resources) - set(RESOURCES)
+    if unknown:
+        parser.error('unknown resources: ' + ', '.join(sorted(unknown)))
+
+    for name in args.resources or sorted(RESOURCES):
+        resource_cls, data = RESOURCES[name]
+        rate = max(
+            measure(resource_cls, data, args.count, args.lazy_dict,
+                    args.lightweight)
+            for _ in range(args.rounds))
+        size = measure_size(resource_cls, data, min(args.count, 1000),
+                            args.lazy_dict, args.lightweight)
+        print('{name}: {rate:.0f} objects/s, {size:.0f} bytes/object'.format(
+            name=name, rate=rate, size=size))
+
+
+if __name__ == '__main__':
+    main()